@@ -0,0 +1,568 @@
+"""Speed benchmark for strategies, utilities, bankroll settlement and simulators.
+
+The strategy benchmark measures what a strategy earns; this one measures how fast
+the library computes it. Each case is timed over several repeats and its best
+repeat is reported, because the fastest run is the one least disturbed by the
+rest of the machine. Results are written as JSON with enough environment
+metadata to tell whether two files are comparable, and can be checked against a
+stored baseline.
+
+Reproduce with::
+
+    uv run python benchmarks/performance_benchmark.py
+
+which writes ``benchmarks/output/performance.json`` and compares it with the
+committed ``benchmarks/performance_baseline.json``, exiting nonzero if any case
+is slower than the baseline by more than ``--threshold`` (default 25%). Pass
+``--update-baseline`` to overwrite the baseline after an intended change, and
+``--filter`` to run only the cases whose name contains a substring. The two
+combine: ``--update-baseline --filter NAME`` re-records only the matching cases
+and keeps every other entry of the baseline, which is how a new case is added.
+Entries recorded that way carry their own ``environment``; the others were
+timed in the baseline's.
+
+Timings depend on the machine, so a baseline is only meaningful against runs on
+the machine that recorded it; compare the ``environment`` blocks before reading
+anything into a difference.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from keeks.bankroll import BankRoll, ConcurrentBankRoll
+from keeks.binary_strategies import (
+    AdaptiveKellyCriterion,
+    CPPIStrategy,
+    DrawdownAdjustedKelly,
+    DynamicBankrollManagement,
+    FixedFractionStrategy,
+    FractionalKellyCriterion,
+    KellyCriterion,
+    MertonShare,
+    NaiveStrategy,
+    OptimalF,
+)
+from keeks.service import SizingService
+from keeks.simulators import (
+    AsynchronousBinarySimulator,
+    BootstrapSimulator,
+    CorrelatedMarketSimulator,
+    PathSimulator,
+    RandomBinarySimulator,
+    RandomUncertainBinarySimulator,
+    RepeatedBinarySimulator,
+    ReplaySimulator,
+)
+from keeks.utils import crra_utility, find_indifference_price
+
+BENCHMARK_DIR = Path(__file__).resolve().parent
+OUTPUT_PATH = BENCHMARK_DIR / "output" / "performance.json"
+BASELINE_PATH = BENCHMARK_DIR / "performance_baseline.json"
+
+REPEATS = 5
+# Each repeat runs the case enough times to last at least this long, so timer
+# resolution and per-call jitter stay small next to what is measured.
+MIN_REPEAT_SECONDS = 0.1
+SEED = 20260803
+SIMULATED_TRIALS = 2_000
+# Paths stepped together by the path simulator cases.
+PATHS = 1_000
+# Markets bet on together each trial by the correlated simulator case.
+MARKETS = 50
+GAMBLE_SIZES = (2, 16, 256)
+
+# One factory per name in keeks.binary_strategies.__all__, at the same even-money
+# odds, so the evaluate cases differ only in the sizing rule.
+STRATEGY_FACTORIES = {
+    "KellyCriterion": lambda: KellyCriterion(
+        payoff=1.0, loss=1.0, transaction_cost=0.01
+    ),
+    "FractionalKellyCriterion": lambda: FractionalKellyCriterion(
+        payoff=1.0, loss=1.0, transaction_cost=0.01, fraction=0.5
+    ),
+    "DrawdownAdjustedKelly": lambda: DrawdownAdjustedKelly(
+        payoff=1.0, loss=1.0, transaction_cost=0.01, max_acceptable_drawdown=0.2
+    ),
+    "AdaptiveKellyCriterion": lambda: AdaptiveKellyCriterion(
+        payoff=1.0, loss=1.0, transaction_cost=0.01
+    ),
+    "OptimalF": lambda: OptimalF(
+        payoff=1.0,
+        loss=1.0,
+        transaction_cost=0.01,
+        win_rate=0.55,
+        max_risk_fraction=0.2,
+    ),
+    "NaiveStrategy": lambda: NaiveStrategy(payoff=1.0, loss=1.0, transaction_cost=0.01),
+    "FixedFractionStrategy": lambda: FixedFractionStrategy(
+        fraction=0.02, payoff=1.0, loss=1.0, transaction_cost=0.01
+    ),
+    "CPPIStrategy": lambda: CPPIStrategy(
+        floor_fraction=0.8,
+        multiplier=2.0,
+        initial_bankroll=1000.0,
+        payoff=1.0,
+        loss=1.0,
+        transaction_cost=0.01,
+    ),
+    "DynamicBankrollManagement": lambda: DynamicBankrollManagement(
+        base_fraction=0.05, payoff=1.0, loss=1.0, transaction_cost=0.01
+    ),
+    "MertonShare": lambda: MertonShare(
+        payoff=1.0, loss=1.0, transaction_cost=0.01, risk_aversion=2.0
+    ),
+}
+
+
+def _replay_frame(rows):
+    rng = np.random.default_rng(SEED)
+    probabilities = np.round(rng.uniform(0.45, 0.65, rows), 2)
+    return pd.DataFrame(
+        {
+            "probability": probabilities,
+            "payoff": 1.0,
+            "loss": 1.0,
+            "outcome": (rng.random(rows) < probabilities).astype(int),
+        }
+    )
+
+
+SIMULATOR_FACTORIES = {
+    "RepeatedBinarySimulator": lambda: RepeatedBinarySimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.0,
+        probability=0.55,
+        trials=SIMULATED_TRIALS,
+        seed=SEED,
+    ),
+    "RandomBinarySimulator": lambda: RandomBinarySimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.0,
+        trials=SIMULATED_TRIALS,
+        seed=SEED,
+    ),
+    "RandomUncertainBinarySimulator": lambda: RandomUncertainBinarySimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.0,
+        trials=SIMULATED_TRIALS,
+        seed=SEED,
+    ),
+    "AsynchronousBinarySimulator": lambda: AsynchronousBinarySimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.0,
+        probability=0.55,
+        trials=SIMULATED_TRIALS,
+        max_settlement_delay=8,
+        seed=SEED,
+    ),
+    "ReplaySimulator": lambda: ReplaySimulator(_replay_frame(SIMULATED_TRIALS)),
+    "PathSimulator": lambda: PathSimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.0,
+        probability=0.55,
+        trials=SIMULATED_TRIALS,
+        paths=PATHS,
+        seed=SEED,
+    ),
+    "BootstrapSimulator": lambda: BootstrapSimulator(
+        _replay_frame(SIMULATED_TRIALS),
+        trials=SIMULATED_TRIALS,
+        paths=PATHS,
+        seed=SEED,
+    ),
+    "CorrelatedMarketSimulator": lambda: CorrelatedMarketSimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.0,
+        probabilities=np.linspace(0.52, 0.6, MARKETS),
+        correlation=np.full((MARKETS, MARKETS), 0.3) + 0.7 * np.eye(MARKETS),
+        trials=SIMULATED_TRIALS,
+        seed=SEED,
+    ),
+}
+
+
+def _gamble(size):
+    rng = np.random.default_rng(size)
+    outcomes = rng.normal(20.0, 100.0, size)
+    probabilities = rng.dirichlet(np.ones(size))
+    return outcomes, probabilities
+
+
+# --- cases ------------------------------------------------------------------
+# A case is (name, unit, build). build() returns (run, ops): run() performs ops
+# units of work, and the case reports units per second.
+
+
+def _strategy_case(name):
+    def build():
+        strategy = STRATEGY_FACTORIES[name]()
+        probabilities = np.linspace(0.3, 0.8, 1_000).tolist()
+
+        def run():
+            for probability in probabilities:
+                strategy.evaluate(probability, 1000.0)
+
+        return run, len(probabilities)
+
+    return f"evaluate[{name}]", "calls", build
+
+
+def _table_case(name, method):
+    def build():
+        lookup = STRATEGY_FACTORIES[name]().compile_table(method=method).lookup
+        probabilities = np.linspace(0.3, 0.8, 1_000).tolist()
+
+        def run():
+            for probability in probabilities:
+                lookup(probability)
+
+        return run, len(probabilities)
+
+    return f"SizingTable.lookup[{name},{method}]", "calls", build
+
+
+def _crra_case(size):
+    def build():
+        wealth = np.random.default_rng(size).uniform(1.0, 2_000.0, size)
+
+        def run():
+            crra_utility(wealth, 2.0)
+
+        return run, 1
+
+    return f"crra_utility[n={size}]", "calls", build
+
+
+def _indifference_case(size):
+    def build():
+        outcomes, probabilities = _gamble(size)
+
+        def run():
+            find_indifference_price(outcomes, probabilities, 1000.0, risk_aversion=2.0)
+
+        return run, 1
+
+    return f"find_indifference_price[n={size}]", "calls", build
+
+
+def _settlement_case():
+    def build():
+        def run():
+            bankroll = BankRoll(initial_funds=1000.0, max_draw_down=None)
+            for _ in range(500):
+                bankroll.deposit(1.0)
+                bankroll.withdraw(1.0)
+
+        return run, 1_000
+
+    return "BankRoll.settle", "settlements", build
+
+
+def _reservation_case(threads):
+    def build():
+        per_thread = 1_000 // threads
+
+        def bettor(bankroll):
+            for _ in range(per_thread):
+                bankroll.commit(bankroll.reserve(1.0), -1.0)
+
+        def run():
+            bankroll = ConcurrentBankRoll(initial_funds=1e6, max_draw_down=None)
+            workers = [
+                threading.Thread(target=bettor, args=(bankroll,))
+                for _ in range(threads)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        return run, per_thread * threads
+
+    return (
+        f"ConcurrentBankRoll.reserve_commit[threads={threads}]",
+        "reservations",
+        build,
+    )
+
+
+def _simulator_case(name):
+    def build():
+        simulator = SIMULATOR_FACTORIES[name]()
+
+        def run():
+            # A fixed fraction never sizes a bet to ruin, so every run plays
+            # all of its trials and the rate is trials actually simulated.
+            strategy = FixedFractionStrategy(fraction=0.02, payoff=1.0, loss=1.0)
+            bankroll = BankRoll(initial_funds=1000.0, max_draw_down=None)
+            simulator.evaluate_strategy(strategy, bankroll)
+
+        # A path simulator plays every trial on each of its paths.
+        return run, SIMULATED_TRIALS * getattr(simulator, "paths", 1)
+
+    return f"simulate[{name}]", "trials", build
+
+
+def _path_case(name, engine):
+    """Time a stateful strategy on the scalar loop or stepped over ``PATHS``."""
+
+    def build():
+        strategy = STRATEGY_FACTORIES[name]
+        if engine == "paths":
+            simulator = SIMULATOR_FACTORIES["PathSimulator"]()
+            ops = SIMULATED_TRIALS * PATHS
+        else:
+            simulator = SIMULATOR_FACTORIES["RepeatedBinarySimulator"]()
+            ops = SIMULATED_TRIALS
+
+        def run():
+            simulator.evaluate_strategy(strategy(), BankRoll(initial_funds=1000.0))
+
+        return run, ops
+
+    label = {
+        "CPPIStrategy": "cppi",
+        "DynamicBankrollManagement": "dynamic",
+        "AdaptiveKellyCriterion": "adaptive_kelly",
+    }[name]
+    return f"simulate_{label}[{engine}]", "trials", build
+
+
+def _service_case(max_batch_size):
+    label = "per_request" if max_batch_size == 1 else f"batch={max_batch_size}"
+
+    def build():
+        service = SizingService(
+            {"kelly": STRATEGY_FACTORIES["KellyCriterion"]()},
+            max_batch_size=max_batch_size,
+        )
+        probabilities = np.linspace(0.3, 0.8, 1_000).tolist()
+
+        async def quote():
+            await asyncio.gather(
+                *(service.size("kelly", p, 1000.0) for p in probabilities)
+            )
+
+        def run():
+            asyncio.run(quote())
+
+        return run, len(probabilities)
+
+    return f"SizingService[{label}]", "requests", build
+
+
+CASES = [
+    *(_strategy_case(name) for name in STRATEGY_FACTORIES),
+    _table_case("KellyCriterion", "linear"),
+    _table_case("MertonShare", "linear"),
+    _table_case("MertonShare", "step"),
+    *(_crra_case(size) for size in GAMBLE_SIZES),
+    *(_indifference_case(size) for size in GAMBLE_SIZES),
+    _settlement_case(),
+    _reservation_case(1),
+    _reservation_case(8),
+    _service_case(1),
+    _service_case(256),
+    *(_simulator_case(name) for name in SIMULATOR_FACTORIES),
+    _path_case("CPPIStrategy", "scalar"),
+    _path_case("CPPIStrategy", "paths"),
+    _path_case("DynamicBankrollManagement", "scalar"),
+    _path_case("DynamicBankrollManagement", "paths"),
+    _path_case("AdaptiveKellyCriterion", "scalar"),
+    _path_case("AdaptiveKellyCriterion", "paths"),
+]
+
+
+def time_case(build, repeats=REPEATS, min_repeat_seconds=MIN_REPEAT_SECONDS):
+    """Time one case and return its best rate and the loop count used."""
+    run, ops = build()
+    # Calibrate: double the loop count until one repeat lasts long enough.
+    number = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            run()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_repeat_seconds * 1e9:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(repeats - 1):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            run()
+        best = min(best, time.perf_counter_ns() - start)
+    ns_per_op = best / (number * ops)
+    return {"per_second": 1e9 / ns_per_op, "ns_per_op": ns_per_op, "number": number}
+
+
+def environment():
+    """Describe the interpreter, libraries and machine a run was recorded on."""
+
+    def package_version(name):
+        try:
+            return version(name)
+        except PackageNotFoundError:
+            return None
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=BENCHMARK_DIR,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "packages": {
+            name: package_version(name) for name in ("keeks", "numpy", "pandas")
+        },
+    }
+
+
+def run_cases(cases=CASES, repeats=REPEATS, min_repeat_seconds=MIN_REPEAT_SECONDS):
+    """Run every case and return the JSON-ready report."""
+    results = {}
+    for name, unit, build in cases:
+        timing = time_case(build, repeats, min_repeat_seconds)
+        results[name] = {"unit": unit, "repeats": repeats, **timing}
+        print(f"  {name:<48} {timing['per_second']:>14,.0f} {unit}/s")
+    return {"environment": environment(), "results": results}
+
+
+def compare(report, baseline, threshold):
+    """
+    List the cases that are slower than ``baseline`` by more than ``threshold``.
+
+    Cases present in only one of the two reports are skipped, so adding a case
+    does not fail the comparison before a baseline records it.
+
+    Returns
+    -------
+    list of dict
+        One entry per regression, with the case ``name``, both rates and the
+        fractional ``slowdown``.
+    """
+    regressions = []
+    for name, result in report["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None:
+            continue
+        slowdown = 1.0 - result["per_second"] / reference["per_second"]
+        if slowdown > threshold:
+            regressions.append(
+                {
+                    "name": name,
+                    "per_second": result["per_second"],
+                    "baseline_per_second": reference["per_second"],
+                    "slowdown": slowdown,
+                }
+            )
+    return regressions
+
+
+def merge_baseline(report, baseline):
+    """
+    Return ``baseline`` with the cases in ``report`` re-recorded.
+
+    Cases the report did not run keep their baseline entries, so a filtered
+    run can add or refresh a few cases without re-recording the rest. The
+    baseline keeps the environment its other entries were timed in, and each
+    re-recorded entry carries the report's own under ``environment``.
+    """
+    recorded = {
+        name: {**result, "environment": report["environment"]}
+        for name, result in report["results"].items()
+    }
+    return {
+        "environment": baseline["environment"],
+        "results": {**baseline["results"], **recorded},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", type=Path, default=OUTPUT_PATH)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="fractional slowdown against the baseline that counts as a regression",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write this run to the baseline instead of comparing against it",
+    )
+    parser.add_argument(
+        "--filter", default="", help="run only cases whose name contains this"
+    )
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    args = parser.parse_args(argv)
+
+    cases = [case for case in CASES if args.filter in case[0]]
+    print(f"keeks performance benchmark: {len(cases)} cases x {args.repeats} repeats")
+    report = run_cases(cases, repeats=args.repeats)
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"wrote {args.output}")
+
+    if args.update_baseline:
+        if args.filter and args.baseline.exists():
+            report = merge_baseline(report, json.loads(args.baseline.read_text()))
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"updated baseline {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; nothing to compare")
+        return 0
+
+    regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+    for regression in regressions:
+        print(
+            f"REGRESSION {regression['name']}: "
+            f"{regression['per_second']:,.0f}/s vs "
+            f"{regression['baseline_per_second']:,.0f}/s baseline "
+            f"({regression['slowdown']:.0%} slower)"
+        )
+    if regressions:
+        return 1
+    print(f"no case slower than the baseline by more than {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
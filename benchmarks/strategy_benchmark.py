@@ -1,4 +1,4 @@
-"""Deterministic nine-strategy risk benchmark.
+"""Deterministic ten-strategy risk benchmark.
 
 Runs every strategy exported from ``keeks.binary_strategies`` through
 ``RepeatedBinarySimulator`` over a fixed scenario matrix and writes the growth,
@@ -8,15 +8,24 @@ Reproduce with::
 
     uv run python benchmarks/strategy_benchmark.py
 
+Add ``--profile PATH`` to also write per-strategy, per-phase loop timings to a CSV
+at ``PATH``. Timings depend on the machine, so that file is not committed.
+
+Add ``--cache DIR`` to keep each cell's results in ``DIR`` keyed on the cell's
+scenario, strategy, run settings and code, so a rerun only simulates the cells
+that changed (``make benchmark`` does this in ``benchmarks/.cache``). Add
+``--workers N`` to simulate cells in N processes; the draws are generated once into
+shared memory that every worker reads, and the output is identical.
+
 Design notes that the numbers depend on:
 
 * **Fresh state per run.** Every (scenario, strategy, path) triple builds a new
   ``BankRoll`` and a new strategy instance, because simulators mutate the bankroll
-  in place and ``CPPIStrategy`` / ``DynamicBankrollManagement`` carry state between
-  ``evaluate`` calls.
+  in place and ``CPPIStrategy`` / ``DynamicBankrollManagement`` /
+  ``AdaptiveKellyCriterion`` carry state between ``evaluate`` calls.
 * **Common random numbers.** Outcomes are drawn once per path from a seeded
   ``random.Random`` and replayed by trial index, so trial *t* of a given path
-  resolves identically for all nine strategies even when some of them decline to
+  resolves identically for all ten strategies even when some of them decline to
   bet. Seeding the global RNG alone would not achieve this: the simulator only
   draws when a bet is placed, so a strategy that skips a trial would otherwise
   shift every later outcome.
@@ -31,9 +40,11 @@ Design notes that the numbers depend on:
   rather than assumed away.
 """
 
+import argparse
+import concurrent.futures
 import math
 import random
-from dataclasses import dataclass, replace
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
 
 import matplotlib
@@ -41,10 +52,12 @@ import matplotlib
 matplotlib.use("Agg")
 
 import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
 import pandas as pd  # noqa: E402
 
 from keeks.bankroll import BankRoll  # noqa: E402
 from keeks.binary_strategies import (  # noqa: E402
+    AdaptiveKellyCriterion,
     CPPIStrategy,
     DrawdownAdjustedKelly,
     DynamicBankrollManagement,
@@ -55,7 +68,9 @@ from keeks.binary_strategies import (  # noqa: E402
     NaiveStrategy,
     OptimalF,
 )
-from keeks.simulators import repeated_binary  # noqa: E402
+from keeks.cache import ResultCache, cache_key  # noqa: E402
+from keeks.shared import SharedArrays  # noqa: E402
+from keeks.simulators import SimulationProfile, repeated_binary  # noqa: E402
 from keeks.simulators.repeated_binary import RepeatedBinarySimulator  # noqa: E402
 from keeks.utils import RuinError  # noqa: E402
 
@@ -139,8 +154,8 @@ SCENARIOS = [
 ]
 
 # One factory per name in keeks.binary_strategies.__all__. Factories rather than
-# instances because CPPIStrategy and DynamicBankrollManagement carry state across
-# evaluate() calls, so each path needs its own object.
+# instances because CPPIStrategy, DynamicBankrollManagement and AdaptiveKellyCriterion
+# carry state across evaluate() calls, so each path needs its own object.
 STRATEGY_FACTORIES = {
     "Kelly": lambda s: KellyCriterion(
         payoff=s.payoff, loss=s.loss, transaction_cost=s.cost
@@ -154,6 +169,9 @@ STRATEGY_FACTORIES = {
         transaction_cost=s.cost,
         max_acceptable_drawdown=0.2,
     ),
+    "Adaptive Kelly": lambda s: AdaptiveKellyCriterion(
+        payoff=s.payoff, loss=s.loss, transaction_cost=s.cost
+    ),
     "Optimal f": lambda s: OptimalF(
         payoff=s.payoff,
         loss=s.loss,
@@ -251,8 +269,8 @@ def _max_drawdown(history):
     return worst
 
 
-def run_path(scenario, strategy_name, path_index):
-    """Run one strategy over one seeded path and return its metrics."""
+def path_draws(path_index):
+    """The outcome uniforms of one path, one per trial."""
     # random.Random seeds a string deterministically (SHA-512 of the bytes), unlike
     # hash(), which is salted per process. Both streams are keyed on the path index
     # alone, so the same 200 outcome sequences and the same estimate-error shocks
@@ -260,19 +278,32 @@ def run_path(scenario, strategy_name, path_index):
     # does not touch reproduces its base-scenario number exactly rather than
     # re-rolling it.
     outcome_rng = random.Random(f"outcomes|{SEED}|{path_index}")
-    draws = [outcome_rng.random() for _ in range(TRIALS)]
+    return [outcome_rng.random() for _ in range(TRIALS)]
+
+
+def path_shocks(path_index):
+    """The standard normal estimate-error shocks of one path, one per trial."""
+    shock_rng = random.Random(f"shocks|{SEED}|{path_index}")
+    return [shock_rng.gauss(0, 1) for _ in range(TRIALS)]
+
+
+def run_path(
+    scenario, strategy_name, path_index, profile=None, draws=None, shocks=None
+):
+    """Run one strategy over one seeded path and return its metrics.
+
+    A ``SimulationProfile`` passed as ``profile`` accumulates the loop's phase
+    timings; the metrics are the same either way. ``draws`` and ``shocks`` are the
+    path's pre-drawn ``path_draws`` and ``path_shocks``, drawn here when omitted.
+    """
+    if draws is None:
+        draws = path_draws(path_index)
     if scenario.estimate_stdev:
-        shock_rng = random.Random(f"shocks|{SEED}|{path_index}")
+        if shocks is None:
+            shocks = path_shocks(path_index)
         beliefs = [
-            min(
-                0.99,
-                max(
-                    0.01,
-                    scenario.probability
-                    + scenario.estimate_stdev * shock_rng.gauss(0, 1),
-                ),
-            )
-            for _ in range(TRIALS)
+            min(0.99, max(0.01, scenario.probability + scenario.estimate_stdev * shock))
+            for shock in shocks
         ]
     else:
         beliefs = [scenario.probability] * TRIALS
@@ -309,7 +340,7 @@ def run_path(scenario, strategy_name, path_index):
     saved_random = repeated_binary.random
     repeated_binary.random = _ReplayedOutcomes(draws, clock)
     try:
-        simulator.evaluate_strategy(strategy, bankroll)
+        simulator.evaluate_strategy(strategy, bankroll, profile=profile)
     finally:
         repeated_binary.random = saved_random
 
@@ -378,15 +409,141 @@ def summarise(scenario, strategy_name, results):
     }
 
 
-def run_matrix():
-    """Run the whole matrix and return one row per (scenario, strategy)."""
-    rows = []
+# Everything a cell's row depends on beyond its scenario and strategy. Functions
+# are keyed on their own source, so editing the charts below reuses cached cells.
+_CELL_CODE = (
+    path_draws,
+    path_shocks,
+    run_path,
+    summarise,
+    _max_drawdown,
+    _StoppedBankRoll.withdraw,
+    _ReplayedOutcomes.random,
+    BankRoll,
+    RepeatedBinarySimulator,
+)
+
+
+def cell_key(scenario, strategy_name):
+    """The cache key of one cell: its inputs, the run settings and the code."""
+    return cache_key(
+        "strategy_benchmark",
+        asdict(scenario),
+        STRATEGY_FACTORIES[strategy_name](scenario),
+        SEED,
+        INITIAL_FUNDS,
+        TRIALS,
+        PATHS,
+        WEALTH_FLOOR,
+        _CELL_CODE,
+    )
+
+
+def run_matrix(profiles=None, cache=None, workers=None):
+    """Run the whole matrix and return one row per (scenario, strategy).
+
+    When ``profiles`` is a dict, each strategy's phase timings across every
+    scenario and path accumulate in ``profiles[strategy_name]``. When ``cache`` is
+    a ``ResultCache``, a cell whose inputs and code are unchanged since it was
+    last run is read back instead of simulated, and every simulated cell is
+    stored with its per-path results. When ``workers`` is set, cells are
+    simulated in a process pool of that size. Profiling always simulates, in this
+    process.
+    """
+    if profiles is not None:
+        cache = workers = None
+    cells = [
+        (scenario, strategy_name)
+        for scenario in SCENARIOS
+        for strategy_name in STRATEGY_FACTORIES
+    ]
+    keys, rows = {}, {}
+    if cache is not None:
+        for cell in cells:
+            keys[cell] = cell_key(*cell)
+            row = cache.get(keys[cell])
+            if row is not None:
+                rows[cell] = row
+    pending = [cell for cell in cells if cell not in rows]
+
+    if workers is not None:
+        simulated = _pooled_cells(pending, workers)
+    else:
+        simulated = (
+            _simulate_cell(scenario, strategy_name, _profile(profiles, strategy_name))
+            for scenario, strategy_name in pending
+        )
+    frame = []
     for scenario in SCENARIOS:
+        cached = 0
         for strategy_name in STRATEGY_FACTORIES:
-            results = [run_path(scenario, strategy_name, i) for i in range(PATHS)]
-            rows.append(summarise(scenario, strategy_name, results))
-        print(f"  {scenario.key}: {len(STRATEGY_FACTORIES)} strategies")
-    return pd.DataFrame(rows)
+            cell = (scenario, strategy_name)
+            if cell in rows:
+                cached += 1
+            else:
+                results = next(simulated)
+                rows[cell] = summarise(scenario, strategy_name, results)
+                if cache is not None:
+                    paths = pd.DataFrame(results)
+                    arrays = {name: np.asarray(paths[name].tolist()) for name in paths}
+                    cache.put(keys[cell], rows[cell], arrays=arrays)
+            frame.append(rows[cell])
+        reused = f" ({cached} cached)" if cached else ""
+        print(f"  {scenario.key}: {len(STRATEGY_FACTORIES)} strategies{reused}")
+    return pd.DataFrame(frame)
+
+
+def _profile(profiles, strategy_name):
+    if profiles is None:
+        return None
+    return profiles.setdefault(strategy_name, SimulationProfile())
+
+
+def _simulate_cell(scenario, strategy_name, profile=None):
+    return [run_path(scenario, strategy_name, i, profile=profile) for i in range(PATHS)]
+
+
+# The shared draw matrices of a pool worker, attached once when the worker starts.
+_WORKER_DRAWS = None
+
+
+def _attach_draws(shared):
+    global _WORKER_DRAWS
+    _WORKER_DRAWS = shared
+
+
+def _simulate_pooled_cell(scenario, strategy_name):
+    draws, shocks = _WORKER_DRAWS["draws"], _WORKER_DRAWS["shocks"]
+    return [
+        run_path(
+            scenario,
+            strategy_name,
+            i,
+            draws=draws[i].tolist(),
+            shocks=shocks[i].tolist(),
+        )
+        for i in range(PATHS)
+    ]
+
+
+def _pooled_cells(cells, workers):
+    """Simulate ``cells`` in a process pool, yielding their results in order.
+
+    Every path's draws and shocks are drawn once into shared memory, which each
+    worker attaches to when it starts, so no worker redraws them and no job
+    carries them.
+    """
+    if not cells:
+        return
+    shape = (PATHS, TRIALS)
+    with SharedArrays({"draws": (shape, float), "shocks": (shape, float)}) as shared:
+        for path in range(PATHS):
+            shared["draws"][path] = path_draws(path)
+            shared["shocks"][path] = path_shocks(path)
+        with concurrent.futures.ProcessPoolExecutor(
+            workers, initializer=_attach_draws, initargs=(shared,)
+        ) as executor:
+            yield from executor.map(_simulate_pooled_cell, *zip(*cells, strict=True))
 
 
 # --- charts -----------------------------------------------------------------
@@ -541,19 +698,58 @@ def chart_early_stops(frame, path):
     plt.close(fig)
 
 
-def main():
+def profile_frame(profiles):
+    """Flatten per-strategy profiles to one row per (strategy, phase)."""
+    return pd.DataFrame(
+        [
+            {"strategy": strategy_name, **row}
+            for strategy_name, profile in profiles.items()
+            for row in profile.as_rows()
+        ]
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="PATH",
+        help="also write per-strategy, per-phase loop timings to this CSV",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="simulate cells in a pool of N processes sharing one copy of the draws",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        metavar="DIR",
+        help="reuse the results of unchanged cells stored in this directory",
+    )
+    args = parser.parse_args(argv)
+    if args.profile and args.workers:
+        parser.error("--profile times the loop in this process; drop --workers")
+
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     print(
         f"keeks strategy benchmark: {len(SCENARIOS)} scenarios x "
         f"{len(STRATEGY_FACTORIES)} strategies x {PATHS} paths x {TRIALS} bets"
     )
-    frame = run_matrix()
+    profiles = {} if args.profile else None
+    cache = ResultCache(args.cache) if args.cache else None
+    frame = run_matrix(profiles, cache, args.workers)
     csv_path = OUTPUT_DIR / "strategy_benchmark.csv"
     frame.to_csv(csv_path, index=False)
     chart_terminal_bands(frame, OUTPUT_DIR / "terminal_bankroll_bands.png")
     chart_growth_vs_drawdown(frame, OUTPUT_DIR / "growth_vs_drawdown.png")
     chart_early_stops(frame, OUTPUT_DIR / "early_stops_by_drawdown_limit.png")
     print(f"wrote {csv_path} and 3 charts to {OUTPUT_DIR}")
+    if profiles is not None:
+        profile_frame(profiles).to_csv(args.profile, index=False)
+        print(f"wrote phase timings to {args.profile}")
 
 
 if __name__ == "__main__":
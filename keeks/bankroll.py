@@ -1,8 +1,12 @@
+import heapq
+import itertools
 import math
+import threading
 
 import matplotlib.pyplot as plt
+import numpy as np
 
-from keeks.utils import RuinError
+from keeks.utils import _TRUSTED, RuinError, _positive_int
 
 
 class BankRoll:
@@ -116,7 +120,8 @@ class BankRoll:
         amt : float
             The amount to deposit into the bankroll.
         """
-        self._validate_nonnegative_finite(amt, "amt")
+        if not _TRUSTED.get():
+            self._validate_nonnegative_finite(amt, "amt")
         self._bank += amt
         self.update_history()
 
@@ -138,7 +143,8 @@ class BankRoll:
             If the withdrawal would exceed the maximum allowed drawdown or
             cause the bankroll to go negative (bankruptcy).
         """
-        self._validate_nonnegative_finite(amt, "amt")
+        if not _TRUSTED.get():
+            self._validate_nonnegative_finite(amt, "amt")
         self._remove_with_limits(amt, "withdrawal")
 
     def bet(self, amount):
@@ -161,7 +167,8 @@ class BankRoll:
             If the bet would exceed the maximum allowed drawdown or
             cause the bankroll to go negative (bankruptcy).
         """
-        self._validate_nonnegative_finite(amount, "amount")
+        if not _TRUSTED.get():
+            self._validate_nonnegative_finite(amount, "amount")
         if amount > self.bettable_funds:
             raise ValueError("Bet amount exceeds bettable funds")
         self._remove_with_limits(amount, "bet")
@@ -175,7 +182,8 @@ class BankRoll:
         amount : float
             The amount to add to the bankroll.
         """
-        self._validate_nonnegative_finite(amount, "amount")
+        if not _TRUSTED.get():
+            self._validate_nonnegative_finite(amount, "amount")
         self._bank += amount
         self.update_history()
 
@@ -194,23 +202,372 @@ class BankRoll:
             If the removal would exceed the maximum allowed drawdown or
             cause the bankroll to go negative (bankruptcy).
         """
-        self._validate_nonnegative_finite(amount, "amount")
+        if not _TRUSTED.get():
+            self._validate_nonnegative_finite(amount, "amount")
         self._remove_with_limits(amount, "removal")
 
-    def plot_history(self, fname=None):
+    def plot_history(self, fname=None, max_points=None):
         """
         Plot the history of the bankroll over time.
 
         Creates a line plot showing the bankroll value after each transaction.
+        A history longer than ``max_points`` is reduced before plotting by
+        min/max bucketing: the steps are split into equal buckets and only each
+        bucket's lowest and highest values are drawn, so every peak and trough
+        still shows at the plotted resolution.
 
         Parameters
         ----------
         fname : str, optional
             If provided, saves the plot to the specified filename instead of displaying it.
+        max_points : int, optional
+            The most points to draw, about two per horizontal pixel of the
+            figure when omitted. Shorter histories are drawn in full, with a
+            marker at every transaction.
+
+        Raises
+        ------
+        ValueError
+            If ``max_points`` is not a positive integer.
         """
+        max_points = _point_budget(max_points, per_pixel=2)
         plt.figure()
-        plt.plot(list(range(len(self.history))), self.history, "bo-")
-        if fname:
-            plt.savefig(fname)
+        if len(self.history) <= max_points:
+            plt.plot(list(range(len(self.history))), self.history, "bo-")
         else:
-            plt.show()
+            plt.plot(*_min_max_downsample(self.history, max_points), "b-")
+        _show_or_save(fname)
+
+    @staticmethod
+    def plot_histories(bankrolls, fname=None, intervals=(0.5, 0.9), max_points=None):
+        """
+        Plot many bankrolls' histories as a percentile fan chart.
+
+        At each plotted step the bankrolls' funds are summarized by their
+        median, drawn as a line, and by one shaded band per central interval,
+        wider intervals lighter. A history that ended early, for example when a
+        safeguard stopped its simulation, holds its final funds to the end.
+        Only up to ``max_points`` evenly spaced steps are read from each
+        history, so many long histories can be drawn together.
+
+        Parameters
+        ----------
+        bankrolls : iterable of BankRoll
+            The bankrolls to summarize, such as one per simulated run.
+        fname : str, optional
+            If provided, saves the plot to the specified filename instead of displaying it.
+        intervals : sequence of float, default=(0.5, 0.9)
+            The central probability of each band, each strictly between 0 and
+            1; ``0.9`` shades the 5th to the 95th percentile.
+        max_points : int, optional
+            The most steps to plot, about one per horizontal pixel of the
+            figure when omitted.
+
+        Raises
+        ------
+        ValueError
+            If ``bankrolls`` is empty, if an interval is not strictly between
+            0 and 1, or if ``max_points`` is not a positive integer.
+        """
+        histories = [bankroll.history for bankroll in bankrolls]
+        if not histories:
+            raise ValueError("bankrolls must not be empty")
+        intervals = sorted(float(interval) for interval in intervals)
+        if any(not 0 < interval < 1 for interval in intervals):
+            raise ValueError("intervals must be between 0 and 1, exclusive")
+
+        max_points = _point_budget(max_points, per_pixel=1)
+
+        longest = max(len(history) for history in histories)
+        steps = np.unique(
+            np.linspace(0, longest - 1, max_points).round().astype(np.int64)
+        )
+        funds = np.array(
+            [
+                [history[step] for step in np.minimum(steps, len(history) - 1).tolist()]
+                for history in histories
+            ],
+            dtype=float,
+        )
+        plt.figure()
+        for shade, interval in enumerate(reversed(intervals)):
+            low, high = np.quantile(
+                funds, [(1 - interval) / 2, (1 + interval) / 2], axis=0
+            )
+            plt.fill_between(
+                steps,
+                low,
+                high,
+                color="b",
+                alpha=0.15 * (shade + 1),
+                linewidth=0,
+                label=f"{interval:.0%} interval",
+            )
+        plt.plot(steps, np.median(funds, axis=0), "b-", label="median")
+        plt.legend()
+        _show_or_save(fname)
+
+
+def _point_budget(max_points, per_pixel):
+    """``max_points``, or ``per_pixel`` points per pixel across a new figure."""
+    if max_points is None:
+        width, _ = plt.rcParams["figure.figsize"]
+        return max(2, per_pixel * round(width * plt.rcParams["figure.dpi"]))
+    return _positive_int(max_points, "max_points")
+
+
+def _min_max_downsample(history, max_points):
+    """
+    The steps and values of ``history`` left by min/max bucketing.
+
+    The steps are split into ``max_points // 2`` buckets of equal length, the
+    last possibly shorter, and the lowest and highest value of each bucket are
+    kept in step order, along with the first and last step.
+    """
+    values = np.asarray(history, dtype=float)
+    size = -(-len(values) // max(1, max_points // 2))
+    full = len(values) // size * size
+    buckets = values[:full].reshape(-1, size)
+    starts = np.arange(0, full, size)
+    kept = [
+        [0, len(values) - 1],
+        starts + buckets.argmin(axis=1),
+        starts + buckets.argmax(axis=1),
+    ]
+    if full < len(values):
+        tail = values[full:]
+        kept.append([full + tail.argmin(), full + tail.argmax()])
+    steps = np.unique(np.concatenate(kept))
+    return steps, values[steps]
+
+
+def _show_or_save(fname):
+    if fname:
+        plt.savefig(fname)
+    else:
+        plt.show()
+
+
+class ConcurrentBankRoll(BankRoll):
+    """
+    A bankroll that several threads can bet against at once.
+
+    ``BankRoll`` checks a removal and then applies it in separate steps, so two
+    threads can both pass the drawdown check before either applies its loss.
+    Here every check-and-update runs under one lock, and bets that are still
+    open are tracked as *reservations*: :meth:`reserve` sets aside a stake's
+    worst-case loss, and :meth:`commit` settles it or :meth:`release` cancels
+    it.
+
+    A reservation is only granted if every open reservation could then lose in
+    full, in any order, without any single loss exceeding ``max_draw_down`` of
+    the bankroll at that moment and without the bankroll going negative. Since
+    no settlement can then trip a safeguard, the drawdown and bankruptcy
+    guarantees of ``BankRoll`` hold however settlements interleave.
+    Withdrawals, removals and bets made directly against the bankroll are
+    admitted by the same rule, so they cannot undercut open reservations.
+
+    Parameters
+    ----------
+    initial_funds : float, default=0.0
+        The starting amount of money in the bankroll.
+    percent_bettable : float, default=1.0
+        The percentage of total funds that can be reserved or bet (0.0 to 1.0).
+    max_draw_down : float, default=0.3
+        The maximum percentage of funds that can be lost in a single settlement
+        (0.0 to 1.0). If None, no drawdown limit is enforced.
+    verbose : int, default=0
+        Controls the verbosity level of the bankroll operations.
+
+    Examples
+    --------
+    >>> bankroll = ConcurrentBankRoll(initial_funds=1000.0, max_draw_down=0.3)
+    >>> token = bankroll.reserve(100.0)
+    >>> bankroll.available_funds
+    900.0
+    >>> bankroll.commit(token, -100.0)
+    >>> bankroll.total_funds
+    900.0
+    """
+
+    def __init__(
+        self, initial_funds=0.0, percent_bettable=1.0, max_draw_down=0.3, verbose=0
+    ):
+        super().__init__(
+            initial_funds=initial_funds,
+            percent_bettable=percent_bettable,
+            max_draw_down=max_draw_down,
+            verbose=verbose,
+        )
+        self._lock = threading.RLock()
+        self._reservations = {}
+        self._reserved = 0.0
+        # Max-heap of (-amount, token); entries for settled tokens are skipped
+        # lazily, so finding the largest open reservation stays O(log n).
+        self._largest = []
+        self._tokens = itertools.count()
+
+    @property
+    def reserved_funds(self):
+        """
+        Get the total amount set aside by open reservations.
+
+        Returns
+        -------
+        float
+            The sum of every open reservation, rounded to 2 decimal places.
+        """
+        return round(self._reserved, 2)
+
+    @property
+    def available_funds(self):
+        """
+        Get the bettable funds not already set aside by open reservations.
+
+        Returns
+        -------
+        float
+            ``bettable_funds`` minus ``reserved_funds``, rounded to 2 decimal
+            places.
+        """
+        with self._lock:
+            return round(self.bettable_funds - self._reserved, 2)
+
+    def reserve(self, amount):
+        """
+        Set aside the worst-case loss of a bet that is about to be placed.
+
+        Parameters
+        ----------
+        amount : float
+            The most the bet can lose, including any fee charged on a loss.
+
+        Returns
+        -------
+        int
+            A token that identifies the reservation to :meth:`commit` and
+            :meth:`release`.
+
+        Raises
+        ------
+        ValueError
+            If ``amount`` is not finite and nonnegative, or exceeds
+            ``available_funds``.
+        RuinError
+            If losing this and every other open reservation could exceed the
+            maximum allowed drawdown or cause bankruptcy.
+        """
+        if not _TRUSTED.get():
+            self._validate_nonnegative_finite(amount, "amount")
+        with self._lock:
+            if self._reserved + amount > self.bettable_funds:
+                raise ValueError("Reservation exceeds available funds")
+            self._admit(amount, "reservation")
+            token = next(self._tokens)
+            self._reservations[token] = amount
+            self._reserved += amount
+            heapq.heappush(self._largest, (-amount, token))
+            return token
+
+    def commit(self, token, pnl):
+        """
+        Settle a reservation with the bet's net profit or loss.
+
+        Parameters
+        ----------
+        token : int
+            The token :meth:`reserve` returned.
+        pnl : float
+            The net change to the bankroll: positive for a win, negative for a
+            loss. A loss may not exceed the reserved amount.
+
+        Raises
+        ------
+        ValueError
+            If ``token`` is not an open reservation, if ``pnl`` is not finite,
+            or if the loss exceeds the reserved amount. The reservation stays
+            open in each case.
+        """
+        if not _TRUSTED.get() and not math.isfinite(pnl):
+            raise ValueError("pnl must be a finite number")
+        with self._lock:
+            amount = self._open_reservation(token)
+            if -pnl > amount:
+                raise ValueError(f"Loss of {-pnl} exceeds the {amount} reserved for it")
+            self._drop(token, amount)
+            if pnl >= 0:
+                self._bank += pnl
+                self.update_history()
+            else:
+                # Admission already proved this loss safe in any order, so it
+                # bypasses the admission check that guards direct removals.
+                BankRoll._remove_with_limits(self, -pnl, "settlement")
+
+    def release(self, token):
+        """
+        Cancel a reservation without changing the bankroll.
+
+        Parameters
+        ----------
+        token : int
+            The token :meth:`reserve` returned.
+
+        Raises
+        ------
+        ValueError
+            If ``token`` is not an open reservation.
+        """
+        with self._lock:
+            self._drop(token, self._open_reservation(token))
+
+    def deposit(self, amt):
+        with self._lock:
+            super().deposit(amt)
+
+    def add_funds(self, amount):
+        with self._lock:
+            super().add_funds(amount)
+
+    def bet(self, amount):
+        if not _TRUSTED.get():
+            self._validate_nonnegative_finite(amount, "amount")
+        with self._lock:
+            if amount > self.bettable_funds - self._reserved:
+                raise ValueError("Bet amount exceeds bettable funds")
+            self._remove_with_limits(amount, "bet")
+
+    def _remove_with_limits(self, amount, description):
+        with self._lock:
+            self._admit(amount, description)
+            super()._remove_with_limits(amount, description)
+
+    def _admit(self, amount, description):
+        # Losing every open reservation plus this amount must be safe in any
+        # order. The binding case is the largest single loss x coming last,
+        # after every other loss: x <= max_draw_down * (bank - (total - x)).
+        total = self._reserved + amount
+        if total > self._bank:
+            raise RuinError(
+                f"Insufficient funds for {description} (would cause bankruptcy)"
+            )
+        if self.max_draw_down is None:
+            return
+        largest = max(amount, self._largest_reservation())
+        if largest > self.max_draw_down * (self._bank - (total - largest)):
+            raise RuinError("You lost too much money buddy, slow down.")
+
+    def _largest_reservation(self):
+        while self._largest and self._largest[0][1] not in self._reservations:
+            heapq.heappop(self._largest)
+        return -self._largest[0][0] if self._largest else 0.0
+
+    def _open_reservation(self, token):
+        try:
+            return self._reservations[token]
+        except (KeyError, TypeError) as exc:
+            raise ValueError(f"No open reservation for token {token!r}") from exc
+
+    def _drop(self, token, amount):
+        del self._reservations[token]
+        # Repeated subtraction drifts; with nothing open, nothing is reserved.
+        self._reserved = self._reserved - amount if self._reservations else 0.0
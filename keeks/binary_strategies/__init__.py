@@ -5,6 +5,7 @@ This module provides various strategies for binary betting scenarios, including:
 - Kelly Criterion: Optimal bet sizing based on probability and odds
 - Fractional Kelly: A more conservative version of Kelly using a fraction
 - Drawdown-Adjusted Kelly: Kelly variant that accounts for drawdown tolerance
+- Adaptive Kelly: Kelly variant that learns the win rate and odds from its results
 - Optimal f: Ralph Vince's method for maximizing geometric growth rate
 - Fixed Fraction: Simple strategy that bets a constant percentage
 - CPPI: Constant Proportion Portfolio Insurance for preserving capital
@@ -16,6 +17,7 @@ All strategies implement the BaseStrategy interface.
 """
 
 from keeks.binary_strategies.kelly import (
+    AdaptiveKellyCriterion,
     DrawdownAdjustedKelly,
     FractionalKellyCriterion,
     KellyCriterion,
@@ -35,6 +37,7 @@ __all__ = [
     "KellyCriterion",
     "FractionalKellyCriterion",
     "DrawdownAdjustedKelly",
+    "AdaptiveKellyCriterion",
     "OptimalF",
     "NaiveStrategy",
     "FixedFractionStrategy",
@@ -1,6 +1,8 @@
 import abc
 
-from keeks.utils import _require_finite
+import numpy as np
+
+from keeks.utils import _is_stateless_strategy, _require_finite
 
 __author__ = "willmcginnis"
 
@@ -90,6 +92,14 @@ class BaseStrategy(abc.ABC):
             return 0.0
         return min(1.0, 1.0 / (self.loss + self.transaction_cost))
 
+    def _max_safe_bet_batch(self, current_bankroll):
+        """Elementwise ``get_max_safe_bet`` over an array of bankrolls."""
+        return np.where(
+            current_bankroll <= 0,
+            0.0,
+            min(1.0, 1.0 / (self.loss + self.transaction_cost)),
+        )
+
     def calculate_max_entry_price(
         self,
         outcomes,
@@ -182,3 +192,116 @@ class BaseStrategy(abc.ABC):
             The proportion of the bankroll to bet.
         """
         pass
+
+    def evaluate_batch(self, probabilities, current_bankroll):
+        """
+        Evaluate the strategy for many probabilities at once.
+
+        The result is elementwise identical to calling :meth:`evaluate` once per
+        probability, in order. This default does exactly that; strategies whose
+        ``evaluate`` is a closed-form expression override it with a single
+        NumPy computation over the whole batch.
+
+        Parameters
+        ----------
+        probabilities : array-like
+            The probabilities of winning, each within ``[0, 1]``.
+        current_bankroll : float or array-like
+            The current bankroll, either one value shared by the whole batch or
+            one value per probability.
+
+        Returns
+        -------
+        numpy.ndarray
+            The proportion of the bankroll to bet for each probability, with the
+            shape of ``probabilities`` broadcast against ``current_bankroll``.
+        """
+        probabilities, current_bankroll = _batch_arguments(
+            probabilities, current_bankroll
+        )
+        stakes = [
+            self.evaluate(probability, bankroll)
+            for probability, bankroll in zip(
+                probabilities.ravel().tolist(),
+                current_bankroll.ravel().tolist(),
+                strict=True,
+            )
+        ]
+        return np.array(stakes, dtype=float).reshape(probabilities.shape)
+
+    def vectorize(self, paths):
+        """
+        Return this strategy stepped over ``paths`` independent bankrolls at once.
+
+        ``keeks.simulators.PathSimulator`` sizes every path with one call per
+        trial through the returned object. Each path starts from this
+        instance's current state and then evolves exactly as a separate copy of
+        the strategy would on that path; this instance is not modified.
+
+        Parameters
+        ----------
+        paths : int
+            The number of paths.
+
+        Returns
+        -------
+        VectorizedStrategy
+            For a stateless strategy, a wrapper around :meth:`evaluate_batch`.
+
+        Raises
+        ------
+        NotImplementedError
+            If the strategy exposes ``update_bankroll`` or ``record_result`` and
+            does not override this method with a form that keeps its state per
+            path.
+        """
+        from keeks.binary_strategies.vectorized import VectorizedStateless
+
+        if not _is_stateless_strategy(self):
+            raise NotImplementedError(
+                f"{self.__class__.__name__} keeps state between bets and has no "
+                "vectorized form, so it cannot be stepped over many paths at once"
+            )
+        return VectorizedStateless(self, paths)
+
+    def compile_table(self, resolution=1024, method="linear", tolerance=None):
+        """
+        Tabulate the stake fraction on a probability grid for constant-time lookup.
+
+        Only stateless strategies can be compiled: their stake for a positive
+        bankroll is a function of the probability alone. See
+        :class:`~keeks.binary_strategies.table.SizingTable` for how lookups
+        read the table and the error bounds they come with.
+
+        Parameters
+        ----------
+        resolution : int, default=1024
+            The number of equal probability cells in ``[0, 1]``.
+        method : {"linear", "step"}, default="linear"
+            Interpolate between cell edges, or return one value per cell.
+        tolerance : float, optional
+            The largest error bound a cell may have and still be served from
+            the table; lookups in other cells call :meth:`evaluate`.
+
+        Returns
+        -------
+        SizingTable
+            A callable taking a probability or an array of probabilities.
+
+        Raises
+        ------
+        ValueError
+            If the strategy exposes ``update_bankroll`` or ``record_result``, or
+            if the table parameters are invalid.
+        """
+        from keeks.binary_strategies.table import SizingTable
+
+        return SizingTable(self, resolution, method, tolerance)
+
+
+def _batch_arguments(probabilities, current_bankroll):
+    """Coerce batch inputs to float arrays of one broadcast shape."""
+    return np.broadcast_arrays(
+        np.asarray(probabilities, dtype=float),
+        np.asarray(current_bankroll, dtype=float),
+    )
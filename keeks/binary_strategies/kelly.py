@@ -1,4 +1,7 @@
-from keeks.binary_strategies.base import BaseStrategy
+import numpy as np
+
+from keeks.binary_strategies.base import BaseStrategy, _batch_arguments
+from keeks.utils import _require_finite
 
 __author__ = "willmcginnis"
 
@@ -93,6 +96,29 @@ class KellyCriterion(BaseStrategy):
         # Ensure we never bet more than would result in negative bankroll
         return min(max(0, kelly_fraction), self.get_max_safe_bet(current_bankroll))
 
+    def evaluate_batch(self, probabilities, current_bankroll):
+        """
+        Calculate the Kelly bet size for many probabilities at once.
+
+        Elementwise identical to :meth:`evaluate`. See
+        ``BaseStrategy.evaluate_batch`` for the parameters and return value.
+        """
+        probabilities, current_bankroll = _batch_arguments(
+            probabilities, current_bankroll
+        )
+        adjusted_payoff = self.payoff - self.transaction_cost
+        adjusted_loss = self.loss + self.transaction_cost
+        if adjusted_payoff <= 0 or adjusted_loss <= 0:
+            return np.zeros(probabilities.shape)
+
+        kelly_fraction = (
+            probabilities / adjusted_loss - (1 - probabilities) / adjusted_payoff
+        )
+        stakes = np.minimum(
+            np.maximum(0.0, kelly_fraction), self._max_safe_bet_batch(current_bankroll)
+        )
+        return np.where(probabilities < self.min_probability, 0.0, stakes)
+
     def calculate_max_entry_price(
         self,
         outcomes,
@@ -195,6 +221,16 @@ class FractionalKellyCriterion(BaseStrategy):
         kelly = KellyCriterion(self.payoff, self.loss, self.transaction_cost)
         return self.fraction * kelly.evaluate(probability, current_bankroll)
 
+    def evaluate_batch(self, probabilities, current_bankroll):
+        """
+        Calculate the fractional Kelly bet size for many probabilities at once.
+
+        Elementwise identical to :meth:`evaluate`. See
+        ``BaseStrategy.evaluate_batch`` for the parameters and return value.
+        """
+        kelly = KellyCriterion(self.payoff, self.loss, self.transaction_cost)
+        return self.fraction * kelly.evaluate_batch(probabilities, current_bankroll)
+
     def calculate_max_entry_price(
         self,
         outcomes,
@@ -337,6 +373,23 @@ class DrawdownAdjustedKelly(BaseStrategy):
         # Ensure we never bet more than would result in negative bankroll
         return min(adjusted_kelly, self.get_max_safe_bet(current_bankroll))
 
+    def evaluate_batch(self, probabilities, current_bankroll):
+        """
+        Calculate the drawdown-adjusted Kelly bet size for many probabilities.
+
+        Elementwise identical to :meth:`evaluate`. See
+        ``BaseStrategy.evaluate_batch`` for the parameters and return value.
+        """
+        probabilities, current_bankroll = _batch_arguments(
+            probabilities, current_bankroll
+        )
+        kelly = KellyCriterion(self.payoff, self.loss, self.transaction_cost)
+        full_kelly = kelly.evaluate_batch(probabilities, current_bankroll)
+        drawdown_factor = min(1.0, self.max_acceptable_drawdown / 0.5)
+        return np.minimum(
+            drawdown_factor * full_kelly, self._max_safe_bet_batch(current_bankroll)
+        )
+
     def calculate_max_entry_price(
         self,
         outcomes,
@@ -392,3 +445,335 @@ class DrawdownAdjustedKelly(BaseStrategy):
         drawdown_factor = min(1.0, self.max_acceptable_drawdown / 0.5)
 
         return drawdown_factor * kelly_price
+
+
+class AdaptiveKellyCriterion(BaseStrategy):
+    """
+    A Kelly Criterion that learns its odds and calibrates its quotes online.
+
+    ``KellyCriterion`` trusts the probability it is given and its configured
+    payoff and loss. This strategy updates both from its own results:
+
+    - the quotes are calibrated by how much more, or less, often the bets it
+      placed won than their quotes said, shrunk towards zero by
+      ``prior_strength`` bets' worth of trust in them. Every probability passed
+      to :meth:`evaluate` is shifted by that calibration before sizing, so
+      quotes that run five points optimistic are marked down by up to five
+      points each, while each quote still sets its own stake;
+    - the payoff and loss are the means of the realized win and loss per unit
+      staked, with the configured values counted as ``prior_strength`` results
+      each.
+
+    Every call to :meth:`evaluate` first scales the evidence by ``decay``, so
+    it ages with each bet offered, placed or not. The estimates then follow a
+    drifting market and never rest on more than ``1 / (1 - decay)`` bets.
+
+    The Kelly stake at the estimates is then shrunk for the uncertainty left in
+    the win rate, by ``edge**2 / (edge**2 + shrinkage * variance)``, where
+    ``edge`` is the expected return per unit staked and ``variance`` its
+    variance (Baker and McHale, 2013). Little evidence therefore means a
+    smaller stake, growing towards full Kelly as results accumulate.
+
+    The state is six running sums, the number of open bets and the last
+    stake, so each update takes constant time and the state never grows
+    however many bets are recorded. Call :meth:`evaluate` once per bet
+    offered, and :meth:`record_result` once per bet settled, as the
+    simulators do.
+
+    Parameters
+    ----------
+    payoff : float
+        The amount won per unit bet on a successful outcome, before any
+        results are recorded.
+    loss : float
+        The amount lost per unit bet on an unsuccessful outcome, before any
+        results are recorded.
+    transaction_cost : float
+        The fixed cost per transaction, regardless of outcome. It is charged
+        on top of the estimated payoff and loss.
+    prior_strength : float, default=100.0
+        The number of results the quotes and the configured payoff and loss
+        are worth.
+    decay : float, default=0.99
+        The weight past evidence keeps at each bet offered, within ``(0, 1]``.
+        ``1.0`` forgets nothing, which lets a stop in betting last for good
+        (see Notes).
+    shrinkage : float, default=1.0
+        How strongly uncertainty about the edge shrinks the stake; ``0.0`` bets
+        full Kelly at the estimates.
+    min_probability : float, default=0.5
+        The minimum quoted probability required to place a bet.
+
+    Attributes
+    ----------
+    wins, results : float
+        The decayed counts of recorded wins and of all recorded results.
+    quoted, placed : float
+        The decayed sum of the quoted probabilities of the bets placed, and
+        the decayed count of those bets.
+    win_amount, loss_amount : float
+        The decayed sums of the realized win and loss per unit staked.
+    open_bets : int
+        The number of bets placed and not yet recorded.
+    last_stake : float
+        The stake of the last bet placed, or 0 if another bet was open when it
+        was placed. It is only used while that bet is the only one open.
+
+    Notes
+    -----
+    A result does not say which bet it settles. When exactly one bet is open,
+    and none was open when it was placed, the result must be that bet's, and
+    its ``return_pct`` divided by its stake is the payoff or loss actually
+    obtained, flat fees and a bettable share below the whole bankroll
+    included. Any other result, or one recorded without a ``return_pct``,
+    counts as the configured payoff or loss. Most simulators settle each bet
+    before sizing the next, so only overlapping bets, the delayed ones of
+    ``AsynchronousBinarySimulator`` and the concurrent markets of
+    ``CorrelatedMarketSimulator``, fall back to the configured odds. A bet placed
+    and never recorded stays open, so record every bet :meth:`evaluate`
+    places.
+
+    For the same reason the calibration compares the wins recorded with the
+    average quote of the bets placed rather than matching each result to its
+    quote. The two agree exactly when every bet settles before the next is
+    sized, and on average when bets overlap.
+
+    The strategy only learns from the bets it places, so once its estimates
+    leave no edge it stops betting. Each bet offered still decays the
+    evidence, which draws the estimates back to the quotes and the configured
+    odds until betting resumes. With a ``decay`` of 1 nothing is forgotten and
+    such a stop is permanent.
+
+    Examples
+    --------
+    >>> strategy = AdaptiveKellyCriterion(
+    ...     payoff=1.0, loss=1.0, transaction_cost=0.0, prior_strength=10.0
+    ... )
+    >>> for won in [True, False] * 4:
+    ...     stake = strategy.evaluate(0.6, 1000.0)
+    ...     strategy.record_result(won, 0.9 * stake if won else -stake)
+    >>> round(strategy.calibration, 4), round(strategy.estimated_payoff, 4)
+    (-0.0447, 0.9722)
+    >>> [round(strategy.evaluate(quote, 1000.0), 4) for quote in (0.6, 0.75)]
+    [0.0149, 0.3145]
+    """
+
+    def __init__(
+        self,
+        payoff,
+        loss,
+        transaction_cost,
+        prior_strength=100.0,
+        decay=0.99,
+        shrinkage=1.0,
+        min_probability=0.5,
+    ):
+        """
+        Initialize the AdaptiveKellyCriterion strategy.
+
+        Raises
+        ------
+        ValueError
+            If ``prior_strength`` is not a finite number greater than 0,
+            ``decay`` is not within ``(0, 1]``, ``shrinkage`` is not a finite
+            non-negative number, ``min_probability`` is not within ``[0, 1]``,
+            or the odds are invalid.
+        """
+        prior_strength = _require_finite(prior_strength, "Prior strength")
+        if prior_strength <= 0:
+            raise ValueError("Prior strength must be greater than 0")
+        decay = _require_finite(decay, "Decay")
+        if not 0 < decay <= 1:
+            raise ValueError("Decay must be greater than 0 and at most 1")
+        shrinkage = _require_finite(shrinkage, "Shrinkage")
+        if shrinkage < 0:
+            raise ValueError("Shrinkage must be non-negative")
+        if not 0 <= min_probability <= 1:
+            raise ValueError("Minimum probability must be between 0 and 1")
+
+        super().__init__(payoff, loss, transaction_cost)
+        self.prior_strength = prior_strength
+        self.decay = decay
+        self.shrinkage = shrinkage
+        self.min_probability = min_probability
+        self.wins = 0.0
+        self.results = 0.0
+        self.quoted = 0.0
+        self.placed = 0.0
+        self.win_amount = 0.0
+        self.loss_amount = 0.0
+        self.open_bets = 0
+        self.last_stake = 0.0
+
+    @property
+    def calibration(self):
+        """The shift the recorded results add to every quoted probability."""
+        if self.placed <= 0:
+            return 0.0
+        expected = self.results * (self.quoted / self.placed)
+        return (self.wins - expected) / (self.prior_strength + self.results)
+
+    @property
+    def estimated_payoff(self):
+        """The mean amount won per unit staked, the configured payoff included."""
+        prior = self.prior_strength
+        return (prior * self.payoff + self.win_amount) / (prior + self.wins)
+
+    @property
+    def estimated_loss(self):
+        """The mean amount lost per unit staked, the configured loss included."""
+        prior = self.prior_strength
+        losses = self.results - self.wins
+        return (prior * self.loss + self.loss_amount) / (prior + losses)
+
+    def estimated_win_rate(self, probability):
+        """
+        Return the calibrated win rate of a quote and its variance.
+
+        Parameters
+        ----------
+        probability : float
+            The quoted probability.
+
+        Returns
+        -------
+        tuple of float
+            The quote shifted by the calibration, within ``[0, 1]``, and its
+            variance.
+        """
+        evidence = self.prior_strength + self.results
+        mean = min(max(probability + self.calibration, 0.0), 1.0)
+        return mean, mean * (1 - mean) / (evidence + 1)
+
+    def record_result(self, won, return_pct=None):
+        """
+        Update the estimates with the result of a bet.
+
+        Parameters
+        ----------
+        won : bool
+            Whether the bet was won.
+        return_pct : float, optional
+            The bet's net change as a fraction of the bankroll it was sized
+            against. It is learned from only when the bet it settles is
+            known; see Notes.
+        """
+        stake = self.last_stake if self.open_bets == 1 else 0.0
+        self.open_bets = max(self.open_bets - 1, 0)
+        self.results += 1.0
+        if won:
+            self.wins += 1.0
+            if return_pct is None or stake <= 0:
+                self.win_amount += self.payoff
+            else:
+                self.win_amount += return_pct / stake
+        elif return_pct is None or stake <= 0:
+            self.loss_amount += self.loss
+        else:
+            self.loss_amount += -return_pct / stake
+
+    def evaluate(self, probability, current_bankroll):
+        """
+        Calculate the shrunk Kelly bet size at the current estimates.
+
+        Parameters
+        ----------
+        probability : float
+            The quoted probability of a successful outcome.
+        current_bankroll : float
+            The current bankroll amount.
+
+        Returns
+        -------
+        float
+            The proportion of the bankroll to bet.
+        """
+        decay = self.decay
+        self.wins *= decay
+        self.results *= decay
+        self.quoted *= decay
+        self.placed *= decay
+        self.win_amount *= decay
+        self.loss_amount *= decay
+        if probability < self.min_probability:
+            return 0.0
+
+        adjusted_payoff = self.estimated_payoff - self.transaction_cost
+        adjusted_loss = self.estimated_loss + self.transaction_cost
+        if adjusted_payoff <= 0 or adjusted_loss <= 0:
+            return 0.0
+
+        p, variance = self.estimated_win_rate(probability)
+        kelly_fraction = p / adjusted_loss - (1 - p) / adjusted_payoff
+        if kelly_fraction > 0 and self.shrinkage > 0:
+            edge = p * adjusted_payoff - (1 - p) * adjusted_loss
+            width = adjusted_payoff + adjusted_loss
+            square = edge * edge
+            spread = self.shrinkage * (width * width * variance)
+            kelly_fraction = kelly_fraction * (square / (square + spread))
+
+        stake = min(max(0.0, kelly_fraction), self.get_max_safe_bet(current_bankroll))
+        if stake > 0:
+            self.quoted += probability
+            self.placed += 1.0
+            # A bet placed beside an open one cannot be told apart from it.
+            self.last_stake = stake if self.open_bets == 0 else 0.0
+            self.open_bets += 1
+        return stake
+
+    def vectorize(self, paths):
+        """
+        Return the strategy with its running sums and open bets kept per path.
+
+        See ``BaseStrategy.vectorize``; every path starts from this instance's
+        recorded results.
+        """
+        from keeks.binary_strategies.vectorized import VectorizedAdaptiveKelly
+
+        return VectorizedAdaptiveKelly(self, paths)
+
+    def calculate_max_entry_price(
+        self,
+        outcomes,
+        probabilities,
+        current_wealth,
+        tolerance=0.01,
+        max_search_fraction=0.5,
+    ):
+        """
+        Calculate maximum price willing to pay for a one-time gamble.
+
+        The gamble states its own outcomes and probabilities, so there is
+        nothing to estimate: this is the log-utility price of
+        :meth:`KellyCriterion.calculate_max_entry_price`.
+
+        Parameters
+        ----------
+        outcomes : array-like
+            The possible payoffs from the gamble
+        probabilities : array-like
+            The probability of each outcome (must sum to ≤ 1)
+        current_wealth : float
+            Current wealth before the gamble. Must be finite and greater than 0.
+        tolerance : float, default=0.01
+            Convergence tolerance for binary search. Must be finite and greater
+            than 0.
+        max_search_fraction : float, default=0.5
+            Maximum fraction of wealth to consider as upper bound. Must be
+            finite and non-negative; values above 1.0 are allowed.
+
+        Returns
+        -------
+        float
+            Maximum price willing to pay for the gamble
+
+        Raises
+        ------
+        ValueError
+            If the gamble arrays are malformed, or if any scalar control falls
+            outside the ranges documented above.
+        """
+        kelly = KellyCriterion(self.payoff, self.loss, self.transaction_cost)
+        return kelly.calculate_max_entry_price(
+            outcomes, probabilities, current_wealth, tolerance, max_search_fraction
+        )
@@ -2,7 +2,7 @@ import operator
 
 import numpy as np
 
-from keeks.binary_strategies.base import BaseStrategy
+from keeks.binary_strategies.base import BaseStrategy, _batch_arguments
 from keeks.utils import _require_finite
 
 __author__ = "willmcginnis"
@@ -79,6 +79,27 @@ class NaiveStrategy(BaseStrategy):
         # Ensure we never bet more than would result in negative bankroll
         return min(max(0, bet_size), self.get_max_safe_bet(current_bankroll))
 
+    def evaluate_batch(self, probabilities, current_bankroll):
+        """
+        Calculate the expected-value bet size for many probabilities at once.
+
+        Elementwise identical to :meth:`evaluate`. See
+        ``BaseStrategy.evaluate_batch`` for the parameters and return value.
+        """
+        probabilities, current_bankroll = _batch_arguments(
+            probabilities, current_bankroll
+        )
+        expected_value = (
+            (probabilities * self.payoff)
+            - ((1 - probabilities) * self.loss)
+            - self.transaction_cost
+        )
+        stakes = np.minimum(
+            np.maximum(0.0, expected_value / self.payoff),
+            self._max_safe_bet_batch(current_bankroll),
+        )
+        return np.where(expected_value <= 0, 0.0, stakes)
+
     def calculate_max_entry_price(
         self,
         outcomes,
@@ -211,6 +232,22 @@ class FixedFractionStrategy(BaseStrategy):
         else:
             return 0.0
 
+    def evaluate_batch(self, probabilities, current_bankroll):
+        """
+        Return the fixed fraction for every probability meeting the threshold.
+
+        Elementwise identical to :meth:`evaluate`. See
+        ``BaseStrategy.evaluate_batch`` for the parameters and return value.
+        """
+        probabilities, current_bankroll = _batch_arguments(
+            probabilities, current_bankroll
+        )
+        return np.where(
+            probabilities >= self.min_probability,
+            np.minimum(self.fraction, self._max_safe_bet_batch(current_bankroll)),
+            0.0,
+        )
+
     def calculate_max_entry_price(
         self,
         outcomes,
@@ -402,6 +439,17 @@ class CPPIStrategy(BaseStrategy):
 
         return max(0, proportion)
 
+    def vectorize(self, paths):
+        """
+        Return CPPI with its floor, peak and bankroll kept per path.
+
+        See ``BaseStrategy.vectorize``; every path starts from this instance's
+        floor and peak.
+        """
+        from keeks.binary_strategies.vectorized import VectorizedCPPI
+
+        return VectorizedCPPI(self, paths)
+
     def calculate_max_entry_price(
         self,
         outcomes,
@@ -660,6 +708,19 @@ class DynamicBankrollManagement(BaseStrategy):
         # Never exceed the ruin-safe fraction
         return min(bet_size, self.get_max_safe_bet(current_bankroll))
 
+    def vectorize(self, paths):
+        """
+        Return the strategy with its results window and peak kept per path.
+
+        See ``BaseStrategy.vectorize``; every path starts from this instance's
+        recorded results and bankroll tracking.
+        """
+        from keeks.binary_strategies.vectorized import (
+            VectorizedDynamicBankrollManagement,
+        )
+
+        return VectorizedDynamicBankrollManagement(self, paths)
+
     def calculate_max_entry_price(
         self,
         outcomes,
@@ -811,6 +872,30 @@ class OptimalF(BaseStrategy):
         # Ensure we never bet more than would result in negative bankroll
         return min(optimal_f, self.get_max_safe_bet(current_bankroll))
 
+    def evaluate_batch(self, probabilities, current_bankroll):
+        """
+        Calculate the optimal f bet size for many probabilities at once.
+
+        Elementwise identical to :meth:`evaluate`. See
+        ``BaseStrategy.evaluate_batch`` for the parameters and return value.
+        """
+        probabilities, current_bankroll = _batch_arguments(
+            probabilities, current_bankroll
+        )
+        reward = self.payoff - self.transaction_cost
+        risk = self.loss + self.transaction_cost
+        if reward <= 0:
+            return np.zeros(probabilities.shape)
+
+        # Sizing uses win_rate, not the probability, so it is one number.
+        optimal_f = self.win_rate - ((1 - self.win_rate) / (reward / risk))
+        optimal_f = min(max(0, optimal_f), self.max_risk_fraction)
+        return np.where(
+            probabilities < 0.5,
+            0.0,
+            np.minimum(optimal_f, self._max_safe_bet_batch(current_bankroll)),
+        )
+
     def calculate_max_entry_price(
         self,
         outcomes,
@@ -1007,6 +1092,41 @@ class MertonShare(BaseStrategy):
         # Ensure we never bet more than would result in negative bankroll
         return min(merton_fraction, self.get_max_safe_bet(current_bankroll))
 
+    def evaluate_batch(self, probabilities, current_bankroll):
+        """
+        Calculate the Merton Share bet size for many probabilities at once.
+
+        Equal to :meth:`evaluate` elementwise up to the last bit of rounding,
+        since the mean return is squared by NumPy rather than Python's ``**``.
+        See ``BaseStrategy.evaluate_batch`` for the parameters and return value.
+        """
+        probabilities, current_bankroll = _batch_arguments(
+            probabilities, current_bankroll
+        )
+        expected_return = probabilities * (self.payoff - self.transaction_cost) - (
+            1 - probabilities
+        ) * (self.loss + self.transaction_cost)
+        mean_squared_return = probabilities * (self.payoff**2) + (1 - probabilities) * (
+            self.loss**2
+        )
+        mean_return = probabilities * self.payoff - (1 - probabilities) * self.loss
+        variance = mean_squared_return - np.square(mean_return)
+
+        # Rows that do not bet may divide by a zero variance; they are masked.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            merton_fraction = expected_return / (self.risk_aversion * variance)
+        merton_fraction = np.maximum(
+            0.0, np.minimum(merton_fraction, self.max_fraction)
+        )
+        stakes = np.minimum(merton_fraction, self._max_safe_bet_batch(current_bankroll))
+
+        no_bet = (
+            (probabilities < self.min_probability)
+            | (expected_return <= 0)
+            | (variance <= 0)
+        )
+        return np.where(no_bet, 0.0, stakes)
+
     def calculate_max_entry_price(
         self,
         outcomes,
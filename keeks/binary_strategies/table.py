@@ -0,0 +1,221 @@
+"""
+Precompiled lookup tables for stateless strategies.
+
+A stateless strategy's stake fraction, for any positive bankroll, depends only
+on the probability of winning, so it can be tabulated once on a probability
+grid and read back in constant time. :class:`SizingTable` is what
+``BaseStrategy.compile_table`` returns.
+"""
+
+import operator
+
+import numpy as np
+
+from keeks.utils import _is_stateless_strategy, _require_finite
+
+__author__ = "willmcginnis"
+
+TABLE_METHODS = ("linear", "step")
+
+# Points checked inside each cell to confirm its stakes lie between the stakes
+# at the cell's edges, which is what the error bounds rest on.
+_CHECK_POINTS = 8
+
+# Slack for floating-point noise in that check.
+_CHECK_SLACK = 1e-12
+
+
+class SizingTable:
+    """
+    A strategy's stake fractions tabulated on a uniform probability grid.
+
+    The grid splits ``[0, 1]`` into ``resolution`` equal cells and holds the
+    strategy's stake at every cell edge, evaluated for a positive bankroll. A
+    lookup finds the probability's cell by arithmetic rather than search, then:
+
+    - ``"linear"`` interpolates between the cell's edges. This is exact at the
+      edges, and exact throughout any cell where the strategy is linear in
+      probability, as Kelly is away from its clipping points.
+    - ``"step"`` returns the midpoint of the stakes at the cell's edges, one
+      array read with no arithmetic.
+
+    If a cell's stakes all lie between its edge stakes, as they do wherever the
+    strategy is monotone in probability, the error in that cell is at most the
+    difference between the edge stakes for ``"linear"`` and half that for
+    ``"step"``. Cells where that check fails, and cells whose bound exceeds
+    ``tolerance``, are not served from the table: lookups there call the
+    strategy itself. ``error_bound`` is the largest bound among the cells that
+    are served from the table.
+
+    Parameters
+    ----------
+    strategy : BaseStrategy
+        A stateless strategy, one exposing neither ``update_bankroll`` nor
+        ``record_result``.
+    resolution : int, default=1024
+        The number of grid cells.
+    method : {"linear", "step"}, default="linear"
+        How to read a stake from its cell.
+    tolerance : float, optional
+        The largest error bound a cell may have and still be served from the
+        table. By default every cell that passes the check is served.
+
+    Attributes
+    ----------
+    grid : numpy.ndarray
+        The ``resolution + 1`` cell edges.
+    stakes : numpy.ndarray
+        The strategy's stake at each edge.
+    error_bound : float
+        The largest difference between a table lookup and ``evaluate``.
+    exact_cells : int
+        The number of cells whose lookups call the strategy instead.
+    lookup : callable
+        The scalar lookup on its own, for hot loops that only ever size one
+        float at a time and can skip the type dispatch of calling the table.
+
+    Raises
+    ------
+    ValueError
+        If the strategy exposes ``update_bankroll`` or ``record_result``, if
+        ``resolution`` is not a positive integer, if ``method`` is not one of
+        ``TABLE_METHODS``, or if ``tolerance`` is negative or not finite.
+
+    Notes
+    -----
+    The check behind the bounds samples each cell at ``8`` interior points, so
+    a strategy that leaves its edge range and returns between two samples is
+    not caught. None of the shipped strategies do.
+
+    Lookups do not validate their input beyond rejecting NaN. Probabilities
+    are clamped to ``[0, 1]``, and the result is the stake for a positive
+    bankroll; a bankroll with nothing left to stake should not be sized at all.
+
+    Examples
+    --------
+    >>> from keeks.binary_strategies import KellyCriterion
+    >>> strategy = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    >>> table = strategy.compile_table(resolution=100)
+    >>> round(table(0.6), 12), round(strategy.evaluate(0.6, 1000.0), 12)
+    (0.2, 0.2)
+    >>> table([0.55, 0.7]).round(12).tolist()
+    [0.1, 0.4]
+    """
+
+    def __init__(self, strategy, resolution=1024, method="linear", tolerance=None):
+        if not _is_stateless_strategy(strategy):
+            raise ValueError(
+                "Only stateless strategies can be compiled to a table; "
+                f"{type(strategy).__name__} exposes update_bankroll or record_result"
+            )
+        try:
+            if isinstance(resolution, bool):
+                raise TypeError
+            resolution = operator.index(resolution)
+        except TypeError as exc:
+            raise ValueError("Resolution must be a positive integer") from exc
+        if resolution <= 0:
+            raise ValueError("Resolution must be a positive integer")
+        if method not in TABLE_METHODS:
+            raise ValueError(f"Method must be one of {TABLE_METHODS}, got {method!r}")
+        if tolerance is not None:
+            tolerance = _require_finite(tolerance, "Tolerance")
+            if tolerance < 0:
+                raise ValueError("Tolerance must be non-negative")
+
+        self.strategy = strategy
+        self.resolution = resolution
+        self.method = method
+        self.tolerance = tolerance
+        self.grid = np.linspace(0.0, 1.0, resolution + 1)
+        self.stakes = strategy.evaluate_batch(self.grid, 1.0)
+
+        low = np.minimum(self.stakes[:-1], self.stakes[1:])
+        high = np.maximum(self.stakes[:-1], self.stakes[1:])
+        bounds = high - low
+        if method == "step":
+            bounds = bounds / 2
+
+        samples = strategy.evaluate_batch(
+            np.linspace(0.0, 1.0, resolution * _CHECK_POINTS + 1), 1.0
+        )
+        inside = samples[:-1].reshape(resolution, _CHECK_POINTS)
+        contained = np.all(
+            (inside >= low[:, None] - _CHECK_SLACK)
+            & (inside <= high[:, None] + _CHECK_SLACK),
+            axis=1,
+        )
+        exact = ~contained
+        if tolerance is not None:
+            exact |= bounds > tolerance
+
+        self.error_bound = float(bounds[~exact].max(initial=0.0))
+        self.exact_cells = int(exact.sum())
+        self._exact = exact
+        self._midpoints = (self.stakes[:-1] + self.stakes[1:]) / 2
+        self.lookup = self._compile_lookup()
+
+    def __call__(self, probability):
+        """
+        Look up the stake fraction for one probability or an array of them.
+
+        Parameters
+        ----------
+        probability : float or array-like
+            The probability of winning.
+
+        Returns
+        -------
+        float or numpy.ndarray
+            The proportion of the bankroll to bet: a float for a scalar
+            probability, otherwise an array of the input's shape.
+        """
+        if isinstance(probability, (float, int)):
+            return self.lookup(probability)
+        return self._lookup(np.asarray(probability, dtype=float))
+
+    def _compile_lookup(self):
+        """Build the scalar lookup as a closure over plain Python lists."""
+        resolution = self.resolution
+        step = self.method == "step"
+        evaluate = self.strategy.evaluate
+        values = (self._midpoints if step else self.stakes).tolist()
+        exact = self._exact.tolist()
+        # One extra cell so that a probability of 1, whose position is the
+        # last edge, needs no clamp on the fast path.
+        values.append(values[-1])
+        exact.append(exact[-1])
+
+        def lookup(probability):
+            if not 0.0 <= probability <= 1.0:
+                if probability != probability:
+                    raise ValueError("Probability must not be NaN")
+                probability = 0.0 if probability < 0.0 else 1.0
+            position = probability * resolution
+            cell = int(position)
+            if exact[cell]:
+                return evaluate(probability, 1.0)
+            if step:
+                return values[cell]
+            low = values[cell]
+            return low + (position - cell) * (values[cell + 1] - low)
+
+        return lookup
+
+    def _lookup(self, probabilities):
+        shape = probabilities.shape
+        probabilities = np.clip(probabilities.ravel(), 0.0, 1.0)
+        if np.isnan(probabilities).any():
+            raise ValueError("Probability must not be NaN")
+        cells = np.minimum(
+            (probabilities * self.resolution).astype(np.intp), self.resolution - 1
+        )
+        if self.method == "step":
+            stakes = self._midpoints[cells]
+        else:
+            stakes = np.interp(probabilities, self.grid, self.stakes)
+        if self.exact_cells:
+            exact = self._exact[cells]
+            if exact.any():
+                stakes[exact] = self.strategy.evaluate_batch(probabilities[exact], 1.0)
+        return stakes.reshape(shape)
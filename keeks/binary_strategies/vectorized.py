@@ -0,0 +1,368 @@
+"""
+Strategies stepped over many independent paths at once.
+
+``BaseStrategy.vectorize(paths)`` returns one of these. Where a strategy keeps
+state between bets, as ``CPPIStrategy`` keeps its floor and peak, the
+vectorized form keeps that state as one NumPy array entry per path, so every
+path can be sized with a single array expression per trial. Each entry follows
+exactly what a separate scalar instance would do on that path.
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+__author__ = "willmcginnis"
+
+
+class VectorizedStrategy:
+    """
+    Sizes ``paths`` bankrolls per call, one independent strategy state per path.
+
+    The path simulator calls :meth:`update_bankroll` and :meth:`evaluate` once
+    per trial with every path's bankroll, and :meth:`record_result` once per
+    trial with the outcomes of the paths that settled a bet. The hooks a
+    stateless strategy has no use for do nothing.
+
+    Parameters
+    ----------
+    strategy : BaseStrategy
+        The strategy whose current state every path starts from. It is not
+        modified.
+    paths : int
+        The number of paths.
+    """
+
+    def __init__(self, strategy, paths):
+        self.strategy = strategy
+        self.paths = paths
+
+    def update_bankroll(self, bankrolls):
+        """Record each path's current bankroll before it is sized."""
+
+    def evaluate(self, probability, bankrolls):
+        """
+        Return each path's stake fraction.
+
+        Parameters
+        ----------
+        probability : float or numpy.ndarray
+            The probability of winning, shared or one per path.
+        bankrolls : numpy.ndarray
+            Each path's current bankroll.
+
+        Returns
+        -------
+        numpy.ndarray
+            The proportion of each path's bankroll to bet.
+        """
+        raise NotImplementedError
+
+    def record_result(self, won, return_pct, settled):
+        """
+        Feed each settled bet's outcome back to its path's state.
+
+        Parameters
+        ----------
+        won : numpy.ndarray of bool
+            Whether each path's bet won.
+        return_pct : numpy.ndarray
+            Each settled bet's net change as a fraction of the bankroll it was
+            sized against.
+        settled : numpy.ndarray of bool
+            Which paths settled a bet this trial; the other entries of ``won``
+            and ``return_pct`` are meaningless.
+        """
+
+
+class VectorizedStateless(VectorizedStrategy):
+    """A stateless strategy, sized with its own ``evaluate_batch``."""
+
+    def evaluate(self, probability, bankrolls):
+        return self.strategy.evaluate_batch(probability, bankrolls)
+
+
+class VectorizedCPPI(VectorizedStrategy):
+    """
+    ``CPPIStrategy`` with its floor, peak and current bankroll held per path.
+
+    Each path ratchets its own floor up with its own peak, exactly as a
+    separate ``CPPIStrategy`` instance would, and the sizing arithmetic is the
+    scalar arithmetic written over arrays in the same order, so every stake
+    matches the scalar strategy bit for bit.
+    """
+
+    def __init__(self, strategy, paths):
+        super().__init__(strategy, paths)
+        self.floor = np.full(paths, float(strategy.floor))
+        self.peak_bankroll = np.full(paths, float(strategy.peak_bankroll))
+        self.current_bankroll = np.full(paths, float(strategy.current_bankroll))
+
+    def update_bankroll(self, bankrolls):
+        self.current_bankroll = np.array(bankrolls, dtype=float)
+        raised = self.current_bankroll > self.peak_bankroll
+        self.peak_bankroll = np.where(raised, self.current_bankroll, self.peak_bankroll)
+        self.floor = np.where(
+            raised, self.strategy.floor_fraction * self.peak_bankroll, self.floor
+        )
+
+    def evaluate(self, probability, bankrolls):
+        strategy = self.strategy
+        self.update_bankroll(bankrolls)
+        bankrolls = self.current_bankroll
+        probability = np.asarray(probability, dtype=float)
+
+        expected_value = probability * (strategy.payoff - strategy.transaction_cost) - (
+            1 - probability
+        ) * (strategy.loss + strategy.transaction_cost)
+        cushion = np.maximum(0.0, bankrolls - self.floor)
+        exposure = (strategy.multiplier * np.minimum(1.0, expected_value)) * cushion
+
+        # Paths that do not bet may divide by a zero bankroll; they are masked.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            proportion = np.minimum(1.0, exposure / bankrolls)
+            max_floor_bet = (bankrolls - self.floor) / (
+                bankrolls * (strategy.loss + strategy.transaction_cost)
+            )
+        max_safe_bet = min(1.0, 1.0 / (strategy.loss + strategy.transaction_cost))
+        capped = np.minimum(np.minimum(proportion, max_floor_bet), max_safe_bet)
+        proportion = np.maximum(0.0, np.where(proportion > 0, capped, proportion))
+
+        betting = (
+            (probability >= strategy.min_probability)
+            & (expected_value > 0)
+            & (bankrolls > 0)
+        )
+        return np.where(betting, proportion, 0.0)
+
+
+class VectorizedDynamicBankrollManagement(VectorizedStrategy):
+    """
+    ``DynamicBankrollManagement`` with its results window held per path.
+
+    The windows are one ``(paths, 2 * window_size)`` matrix used as a doubled
+    circular buffer per path: each result is written to its slot and again
+    ``window_size`` columns later, so every path's window is one contiguous
+    slice however far the buffer has wrapped. Running counts of the wins and
+    losses in each window keep the streak, drawdown and probability factors of
+    every path to a few array expressions per trial. The volatility factor takes the standard deviation
+    of each window in the order the bets were placed, grouped by how full the
+    window is, which keeps it bit-for-bit equal to the scalar ``np.std``.
+    """
+
+    def __init__(self, strategy, paths):
+        super().__init__(strategy, paths)
+        window = strategy.window_size
+        results = [float(value) for value in strategy.results[-window:]]
+        # Each result is written twice, ``window`` apart, so every path's window
+        # is one contiguous run of columns however far the buffer has wrapped.
+        self.returns = np.zeros((paths, 2 * window))
+        self.returns[:, : len(results)] = results
+        self.returns[:, window : window + len(results)] = results
+        # Bets recorded so far; the next one is written at ``recorded % window``.
+        self.recorded = np.full(paths, len(results), dtype=np.int64)
+        self.wins = np.full(paths, sum(value > 0 for value in results))
+        self.losses = np.full(paths, sum(value < 0 for value in results))
+        started = strategy.peak_bankroll is not None
+        self.started = np.full(paths, started)
+        self.peak_bankroll = np.full(
+            paths, float(strategy.peak_bankroll) if started else np.nan
+        )
+        self.current_bankroll = np.full(
+            paths, float(strategy.current_bankroll) if started else np.nan
+        )
+
+    def record_result(self, won, return_pct, settled):
+        strategy = self.strategy
+        if return_pct is None:
+            return_pct = np.where(won, strategy.payoff, -strategy.loss)
+        window = strategy.window_size
+        rows = np.arange(self.paths)
+        slots = self.recorded % window
+
+        # Paths that did not settle write back what their slot already held.
+        evicted = self.returns[rows, slots]
+        values = np.where(settled, return_pct, evicted)
+        full = settled & (self.recorded >= window)
+        self.wins += (settled & (values > 0)).astype(np.int64) - (full & (evicted > 0))
+        self.losses += (settled & (values < 0)).astype(np.int64) - (
+            full & (evicted < 0)
+        )
+        self.returns[rows, slots] = values
+        self.returns[rows, slots + window] = values
+        self.recorded += settled
+
+    def _volatility(self, counts):
+        """Each path's ``np.std`` of its window, oldest result first."""
+        window = self.strategy.window_size
+        start = (self.recorded - counts) % window
+        ordered = sliding_window_view(self.returns, window, axis=1)[
+            np.arange(self.paths), start
+        ]
+        # np.std sums in an order that depends on the length, so each length is
+        # reduced on its own rather than padded to the window.
+        lengths = np.flatnonzero(np.bincount(counts, minlength=window + 1))
+        if lengths.size == 1 and lengths[0] > 0:
+            return np.std(ordered[:, : lengths[0]], axis=1)
+        volatility = np.zeros(self.paths)
+        for count in lengths[lengths > 0]:
+            rows = counts == count
+            volatility[rows] = np.std(ordered[rows, :count], axis=1)
+        return volatility
+
+    def evaluate(self, probability, bankrolls):
+        strategy = self.strategy
+        probability = np.asarray(probability, dtype=float)
+        bankrolls = np.asarray(bankrolls, dtype=float)
+        # Don't bet, or track the bankroll, on sub-threshold probabilities
+        sizing = np.broadcast_to(probability >= strategy.min_probability, (self.paths,))
+
+        starting = sizing & ~self.started
+        self.peak_bankroll = np.where(starting, bankrolls, self.peak_bankroll)
+        self.started = self.started | sizing
+        self.current_bankroll = np.where(sizing, bankrolls, self.current_bankroll)
+        self.peak_bankroll = np.where(
+            sizing, np.maximum(self.peak_bankroll, bankrolls), self.peak_bankroll
+        )
+
+        counts = np.minimum(self.recorded, strategy.window_size)
+        empty = counts == 0
+        scale = counts / strategy.window_size
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            win_ratio = self.wins / (self.wins + self.losses)
+            streak_factor = np.where(
+                self.losses == 0,
+                1.0 + (0.5 * scale),
+                np.where(
+                    self.wins == 0,
+                    1.0 - (0.5 * scale),
+                    1.0 + ((win_ratio - 0.5) * scale),
+                ),
+            )
+            volatility = self._volatility(counts)
+            volatility_factor = np.where(
+                volatility == 0, 1.0, np.maximum(0.5, 1.0 - (volatility * scale))
+            )
+            drawdown = 1.0 - (self.current_bankroll / self.peak_bankroll)
+            drawdown_factor = np.where(
+                self.peak_bankroll > 0, np.maximum(0.5, 1.0 - drawdown), 1.0
+            )
+        probability_factor = np.where(
+            empty, 1.0, np.maximum(0.5, np.minimum(1.5, 1.0 + (probability - 0.5)))
+        )
+        streak_factor = np.where(empty, 1.0, streak_factor)
+
+        combined_factor = (
+            streak_factor * volatility_factor * drawdown_factor * probability_factor
+        )
+        bet_size = strategy.base_fraction * combined_factor
+        bet_size = np.maximum(
+            strategy.min_fraction, np.minimum(strategy.max_fraction, bet_size)
+        )
+        bet_size = np.minimum(bet_size, strategy._max_safe_bet_batch(bankrolls))
+        return np.where(sizing, bet_size, 0.0)
+
+
+class VectorizedAdaptiveKelly(VectorizedStrategy):
+    """
+    ``AdaptiveKellyCriterion`` with its running sums and open bets held per path.
+
+    Each path's six sums are decayed in place by :meth:`evaluate`, which adds
+    the quotes of the bets it places and counts them open, and added to in
+    place by :meth:`record_result`, with the paths that did not settle adding
+    zero. Sizing is the scalar arithmetic written over arrays in the same order,
+    so every stake matches the scalar strategy bit for bit.
+    """
+
+    def __init__(self, strategy, paths):
+        super().__init__(strategy, paths)
+        self.wins = np.full(paths, float(strategy.wins))
+        self.results = np.full(paths, float(strategy.results))
+        self.quoted = np.full(paths, float(strategy.quoted))
+        self.placed = np.full(paths, float(strategy.placed))
+        self.win_amount = np.full(paths, float(strategy.win_amount))
+        self.loss_amount = np.full(paths, float(strategy.loss_amount))
+        self.open_bets = np.full(paths, strategy.open_bets, dtype=np.int64)
+        self.last_stake = np.full(paths, float(strategy.last_stake))
+
+    def record_result(self, won, return_pct, settled):
+        strategy = self.strategy
+        winning = settled & won
+        losing = settled & ~won
+        known = settled & (self.open_bets == 1) & (self.last_stake > 0)
+        # Masked ufuncs are slow at this size, so unsettled paths add zeros.
+        self.open_bets -= settled & (self.open_bets > 0)
+        self.results += settled
+        self.wins += winning
+
+        # Paths without a known stake divide by zero; they are masked.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            realized = return_pct / self.last_stake
+        self.win_amount += np.where(
+            winning, np.where(known, realized, strategy.payoff), 0.0
+        )
+        self.loss_amount += np.where(
+            losing, np.where(known, -realized, strategy.loss), 0.0
+        )
+
+    def evaluate(self, probability, bankrolls):
+        strategy = self.strategy
+        probability = np.asarray(probability, dtype=float)
+        bankrolls = np.asarray(bankrolls, dtype=float)
+        for total in (
+            self.wins,
+            self.results,
+            self.quoted,
+            self.placed,
+            self.win_amount,
+            self.loss_amount,
+        ):
+            total *= strategy.decay
+
+        prior = strategy.prior_strength
+        payoff = (prior * strategy.payoff + self.win_amount) / (prior + self.wins)
+        losses = self.results - self.wins
+        loss = (prior * strategy.loss + self.loss_amount) / (prior + losses)
+        adjusted_payoff = payoff - strategy.transaction_cost
+        adjusted_loss = loss + strategy.transaction_cost
+        priced = (adjusted_payoff > 0) & (adjusted_loss > 0)
+
+        evidence = prior + self.results
+        # Paths that have placed nothing divide by zero; they are masked.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            expected = self.results * (self.quoted / self.placed)
+        calibration = np.where(self.placed > 0, (self.wins - expected) / evidence, 0.0)
+        p = np.minimum(np.maximum(probability + calibration, 0.0), 1.0)
+        variance = p * (1 - p) / (evidence + 1)
+
+        # Paths whose odds leave nothing to win or lose are masked below.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            kelly_fraction = p / adjusted_loss - (1 - p) / adjusted_payoff
+        if strategy.shrinkage > 0:
+            edge = p * adjusted_payoff - (1 - p) * adjusted_loss
+            width = adjusted_payoff + adjusted_loss
+            square = edge * edge
+            spread = strategy.shrinkage * (width * width * variance)
+            # A zero edge gives 0 / 0 on paths that are not shrunk anyway.
+            with np.errstate(invalid="ignore"):
+                kelly_fraction = np.where(
+                    kelly_fraction > 0,
+                    kelly_fraction * (square / (square + spread)),
+                    kelly_fraction,
+                )
+
+        stakes = np.minimum(
+            np.maximum(0.0, kelly_fraction), strategy._max_safe_bet_batch(bankrolls)
+        )
+        stakes = np.where(
+            priced & (probability >= strategy.min_probability), stakes, 0.0
+        )
+        placed = stakes > 0
+        self.quoted += np.where(placed, probability, 0.0)
+        self.placed += placed
+        # A bet placed beside an open one cannot be told apart from it.
+        self.last_stake = np.where(
+            placed, stakes * (self.open_bets == 0), self.last_stake
+        )
+        self.open_bets += placed
+        return stakes
@@ -0,0 +1,396 @@
+"""
+An on-disk cache for simulation results, addressed by what produced them.
+
+Rerunning a sweep recomputes every cell even when nothing that feeds a cell has
+changed. :func:`cache_key` hashes everything a result depends on, such as the
+strategy's class and parameters, the simulator's configuration, the seed and
+the trial and path counts, together with the keeks version and the source code
+of the classes involved, into a stable key. :class:`ResultCache` stores results
+under such keys in a local directory and evicts the least recently used ones
+once the directory grows past a size limit.
+"""
+
+import contextlib
+import dataclasses
+import enum
+import functools
+import hashlib
+import inspect
+import json
+import math
+import os
+import pickle
+import tempfile
+from importlib import metadata
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import keeks.utils
+from keeks.utils import _positive_int
+
+try:
+    _VERSION = metadata.version("keeks")
+except metadata.PackageNotFoundError:
+    # Running from a source checkout; the code digests still tell edits apart.
+    _VERSION = "source"
+
+# Every module of the package. A keeks class calls code it does not inherit,
+# such as the helpers in keeks.utils, its vectorized twin or the shared path
+# kernel, so any of them can change what it computes.
+_PACKAGE_SOURCES = [
+    str(path) for path in sorted(Path(keeks.utils.__file__).parent.rglob("*.py"))
+]
+
+
+def cache_key(*parts):
+    """
+    Return a stable key for a result computed from ``parts``.
+
+    Each part is reduced to a canonical description: numbers, strings and
+    ``None`` as themselves, sequences, sets and mappings element by element,
+    arrays and pandas objects by their contents, and any other object by its
+    class and attributes. A class, or an object's class, is also described by
+    the source files of the modules that define it and its bases, and a keeks
+    class, or one derived from it, by every module of the keeks package, whose
+    code it calls without inheriting it, so editing a strategy's code changes
+    the keys of the results it produced; a function is described by its own
+    source. The keeks version is always included.
+
+    Parameters
+    ----------
+    *parts : object
+        Everything the result depends on, such as a strategy, a simulator and
+        the seed.
+
+    Returns
+    -------
+    str
+        A 64-character hexadecimal SHA-256 digest, the same in every process
+        and on every machine for the same parts and code.
+
+    Raises
+    ------
+    TypeError
+        If a part, or an attribute of one, cannot be described.
+
+    Examples
+    --------
+    >>> from keeks.binary_strategies import KellyCriterion
+    >>> kelly = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    >>> cache_key(kelly, 500) == cache_key(kelly, 500)
+    True
+    >>> cache_key(kelly, 500) == cache_key(kelly, 501)
+    False
+    """
+    description = _describe(["keeks", _VERSION, list(parts)])
+    text = json.dumps(description, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Results stored on disk under content-addressed keys, with LRU eviction.
+
+    Each entry is a pickled value, such as one summary row of a benchmark
+    cell, optionally with a set of arrays, such as the cell's per-path
+    results, stored beside it compressed. Reading an entry marks it as
+    recently used, and once the entries together exceed ``max_bytes`` the
+    least recently used are deleted. Entries are written to a temporary file
+    and moved into place, so an interrupted run never leaves a partial entry
+    and several processes can share one directory.
+
+    Parameters
+    ----------
+    directory : str or os.PathLike
+        Where the entries are stored; created if it does not exist.
+    max_bytes : int, default=1 << 30
+        The most disk space the entries may use together. An entry larger than
+        this on its own is not kept.
+
+    Raises
+    ------
+    ValueError
+        If ``max_bytes`` is not a positive integer.
+
+    Notes
+    -----
+    Values are stored with :mod:`pickle`, so only use a directory whose
+    contents you trust.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> cache = ResultCache(tempfile.mkdtemp())
+    >>> key = cache_key("cell", 1)
+    >>> cache.fetch(key, lambda: {"median_terminal": 1250.0})
+    {'median_terminal': 1250.0}
+    >>> cache.get(key)
+    {'median_terminal': 1250.0}
+    """
+
+    def __init__(self, directory, max_bytes=1 << 30):
+        self.max_bytes = _positive_int(max_bytes, "max_bytes")
+        self.directory = Path(os.fspath(directory))
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __contains__(self, key):
+        return self._value_path(key).exists()
+
+    def get(self, key, default=None):
+        """
+        Return the value stored under ``key``, or ``default``.
+
+        Parameters
+        ----------
+        key : str
+            A key from :func:`cache_key`.
+        default : object, optional
+            Returned when nothing readable is stored under ``key``.
+
+        Returns
+        -------
+        object
+            The stored value, which is then the most recently used entry.
+        """
+        path = self._value_path(key)
+        try:
+            with path.open("rb") as file:
+                value = pickle.load(file)
+        except FileNotFoundError:
+            return default
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            # Unreadable, or written by code that no longer exists: a miss.
+            self._remove(key)
+            return default
+        self._touch(path)
+        return value
+
+    def get_arrays(self, key):
+        """
+        Return the arrays stored with the value under ``key``.
+
+        Parameters
+        ----------
+        key : str
+            A key from :func:`cache_key`.
+
+        Returns
+        -------
+        dict of numpy.ndarray or None
+            The arrays by name, or ``None`` if the entry is missing or was
+            stored without arrays.
+        """
+        path = self._arrays_path(key)
+        try:
+            with np.load(path) as arrays:
+                loaded = {name: arrays[name] for name in arrays.files}
+        except FileNotFoundError:
+            return None
+        self._touch(self._value_path(key))
+        return loaded
+
+    def put(self, key, value, arrays=None):
+        """
+        Store ``value``, and optionally ``arrays``, under ``key``.
+
+        Parameters
+        ----------
+        key : str
+            A key from :func:`cache_key`.
+        value : object
+            Any picklable result.
+        arrays : dict of array-like, optional
+            Named numeric, boolean or string arrays to store with the value,
+            compressed, and read back with :meth:`get_arrays`.
+        """
+        if arrays is not None:
+            self._write(
+                self._arrays_path(key),
+                lambda file: np.savez_compressed(file, **arrays),
+            )
+        else:
+            self._arrays_path(key).unlink(missing_ok=True)
+        self._write(
+            self._value_path(key),
+            lambda file: pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        self._evict()
+
+    def fetch(self, key, compute):
+        """
+        Return the value under ``key``, computing and storing it on a miss.
+
+        Parameters
+        ----------
+        key : str
+            A key from :func:`cache_key`.
+        compute : callable
+            Called with no arguments to produce the value when none is stored.
+
+        Returns
+        -------
+        object
+            The stored or newly computed value.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self):
+        """Delete every entry."""
+        for path in self._entry_files():
+            path.unlink(missing_ok=True)
+
+    @property
+    def size(self):
+        """The disk space, in bytes, used by the entries."""
+        return sum(path.stat().st_size for path in self._entry_files())
+
+    def _value_path(self, key):
+        return self.directory / f"{key}.pkl"
+
+    def _arrays_path(self, key):
+        return self.directory / f"{key}.npz"
+
+    def _entry_files(self):
+        return [
+            path
+            for path in self.directory.iterdir()
+            if path.suffix in (".pkl", ".npz") and not path.name.startswith(".")
+        ]
+
+    def _write(self, path, dump):
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix=".")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                dump(file)
+            os.replace(temporary, path)
+        except BaseException:
+            Path(temporary).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def _touch(path):
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(path)
+
+    def _remove(self, key):
+        self._value_path(key).unlink(missing_ok=True)
+        self._arrays_path(key).unlink(missing_ok=True)
+
+    def _evict(self):
+        entries = {}
+        for path in self._entry_files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            size, used = entries.get(path.stem, (0, 0))
+            if path.suffix == ".pkl":
+                used = stat.st_mtime_ns
+            entries[path.stem] = (size + stat.st_size, used)
+        total = sum(size for size, _ in entries.values())
+        for key in sorted(entries, key=lambda key: (entries[key][1], key)):
+            if total <= self.max_bytes:
+                break
+            self._remove(key)
+            total -= entries[key][0]
+
+
+def _describe(value):
+    """A JSON-serializable description of ``value`` for hashing."""
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if isinstance(value, float):
+        # repr round-trips every float and spells out nan and infinities.
+        return {"float": repr(value)} if not math.isfinite(value) else value
+    if isinstance(value, enum.Enum):
+        return {"enum": _qualified_name(type(value)), "name": value.name}
+    if isinstance(value, np.generic):
+        return _describe(value.item())
+    if isinstance(value, np.ndarray):
+        contents = np.ascontiguousarray(value)
+        if contents.dtype.hasobject:
+            return {"ndarray": [_describe(item) for item in contents.ravel().tolist()]}
+        return {
+            "ndarray": str(contents.dtype),
+            "shape": list(contents.shape),
+            "sha256": hashlib.sha256(contents.tobytes()).hexdigest(),
+        }
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        rows = pd.util.hash_pandas_object(value, index=True).to_numpy()
+        columns = list(value.columns) if isinstance(value, pd.DataFrame) else None
+        return {"pandas": _describe(columns), "rows": _describe(rows)}
+    if isinstance(value, (list, tuple)):
+        return [_describe(item) for item in value]
+    if isinstance(value, (set, frozenset)):
+        items = [_describe(item) for item in value]
+        return {"set": sorted(items, key=lambda item: json.dumps(item, sort_keys=True))}
+    if isinstance(value, dict):
+        items = [[_describe(key), _describe(item)] for key, item in value.items()]
+        return {
+            "dict": sorted(items, key=lambda item: json.dumps(item[0], sort_keys=True))
+        }
+    if isinstance(value, Path):
+        return {"path": str(value)}
+    if isinstance(value, type):
+        return {"class": _qualified_name(value), "code": _class_code(value)}
+    if inspect.isfunction(value) or inspect.ismethod(value):
+        function = getattr(value, "__func__", value)
+        return {"function": _qualified_name(function), "code": _source(function)}
+    if isinstance(value, np.random.SeedSequence):
+        # Not its spawn counter: keeks derives children by position instead.
+        return {
+            "seed_sequence": _describe(
+                [value.entropy, list(value.spawn_key), value.pool_size]
+            )
+        }
+    if isinstance(value, np.random.Generator):
+        return {"generator": _describe(value.bit_generator.state)}
+    if dataclasses.is_dataclass(value):
+        state = {
+            field.name: getattr(value, field.name)
+            for field in dataclasses.fields(value)
+        }
+    elif hasattr(value, "__dict__"):
+        state = vars(value)
+    else:
+        raise TypeError(f"Cannot build a cache key from {type(value).__name__} values")
+    return {"object": _describe(type(value)), "state": _describe(state)}
+
+
+def _qualified_name(value):
+    return f"{value.__module__}.{value.__qualname__}"
+
+
+def _class_code(cls):
+    """Digests of the source files defining ``cls`` and its bases, and of keeks."""
+    files = []
+    for base in cls.__mro__:
+        if base.__module__.partition(".")[0] == "keeks":
+            files.extend(_PACKAGE_SOURCES)
+            continue
+        try:
+            files.append(inspect.getsourcefile(base))
+        except TypeError:
+            continue  # Built in, with no source to change.
+    return [_file_digest(path) for path in dict.fromkeys(files) if path]
+
+
+@functools.cache
+def _file_digest(path):
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def _source(function):
+    try:
+        return hashlib.sha256(inspect.getsource(function).encode()).hexdigest()
+    except (OSError, TypeError):
+        # No source available (built in or defined interactively).
+        return None
@@ -0,0 +1,263 @@
+"""
+Growth-versus-drawdown frontiers over a strategy's parameters.
+
+The strategy benchmark plots one growth and drawdown point per strategy. Picking
+an operating point, such as a Kelly fraction or a CPPI multiplier and floor,
+needs the whole curve instead: the growth each setting buys at the drawdown it
+costs, and which settings are beaten on both counts by another.
+:func:`efficient_frontier` simulates a grid of parameters on the same outcome
+paths with :class:`~keeks.simulators.PathSimulator`, adds settings where the
+curve bends most, and returns every point with its Pareto set marked.
+"""
+
+import copy
+import itertools
+import math
+import operator
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from keeks.utils import WEALTH_FLOOR, _require_finite
+
+
+@dataclass(frozen=True)
+class FrontierResult:
+    """
+    The outcome of an :func:`efficient_frontier` run.
+
+    Attributes
+    ----------
+    points : pandas.DataFrame
+        One row per parameter setting simulated, in the order simulated, with
+        the parameters, ``growth`` (the chosen quantile of the per-bet log
+        growth rate), ``drawdown`` (the chosen quantile of the deepest
+        drawdown), ``stopped`` (the fraction of paths a safeguard stopped),
+        ``round`` (0 for the grid, then each refinement) and ``pareto``.
+    pareto : pandas.DataFrame
+        The rows of ``points`` that no other setting beats on both growth and
+        drawdown, by increasing drawdown.
+    knee : dict
+        The parameters of the Pareto point where the curve bends most: the one
+        furthest from the line between the ends of the Pareto set, once both
+        axes are scaled to its range.
+    seed : int or numpy.random.SeedSequence
+        The seed every setting's paths were drawn from, so that the run can be
+        reproduced even if the simulator had none.
+    """
+
+    points: pd.DataFrame
+    pareto: pd.DataFrame
+    knee: dict
+    seed: int | np.random.SeedSequence
+
+
+def efficient_frontier(
+    factory,
+    space,
+    simulator,
+    bankroll,
+    growth_quantile=0.5,
+    drawdown_quantile=0.5,
+    refinements=4,
+):
+    """
+    Trace the growth-versus-drawdown frontier of a family of strategies.
+
+    Every combination of the values in ``space`` is simulated on the
+    simulator's paths. Each setting meets the same outcomes (common random
+    numbers), so neighbouring settings differ by their parameters rather than
+    by luck and the curve comes out smooth. A stateless family such as
+    ``FractionalKellyCriterion`` runs fastest on a simulator with
+    ``log_domain=True``.
+
+    Each refinement round then finds the knee of the current Pareto set and
+    simulates the midpoints, parameter by parameter, between the knee and its
+    Pareto neighbours, so the settings concentrate where the trade between
+    growth and drawdown changes fastest. Rounds stop early once every such
+    midpoint has been simulated.
+
+    Parameters
+    ----------
+    factory : callable
+        Called as ``factory(**params)`` to build the strategy for each setting.
+        Fix the parameters that are not swept with ``functools.partial``.
+    space : dict
+        The values to sweep for each parameter, keyed by parameter name, for
+        example ``{"fraction": np.linspace(0.05, 1.0, 20)}``. Refinement
+        averages the parameters that differ between two settings, so those
+        must be numeric.
+    simulator : PathSimulator
+        The paths to simulate every setting on. When it has no seed, one is
+        drawn and used for every setting. Its outcomes must not be tilted.
+    bankroll : BankRoll
+        The bankroll every path starts as a copy of. It is not modified.
+    growth_quantile : float, default=0.5
+        The quantile of the per-bet log growth rates to maximize; the median
+        by default, as in the benchmark's growth-versus-drawdown chart.
+    drawdown_quantile : float, default=0.5
+        The quantile of the deepest drawdowns to minimize; use ``0.95`` to
+        trade growth against bad-case drawdowns instead.
+    refinements : int, default=4
+        The most refinement rounds to run after the grid.
+
+    Returns
+    -------
+    FrontierResult
+        Every setting simulated, the Pareto set and its knee.
+
+    Raises
+    ------
+    ValueError
+        If ``space`` is empty or holds an empty list of values, if a quantile
+        is not within ``[0, 1]``, if ``refinements`` is not a nonnegative
+        integer, or if the simulator has no trials or draws tilted outcomes.
+
+    Notes
+    -----
+    The growth rate of a path is ``log(terminal / initial) / trials``, with
+    terminal wealth floored at ``0.01`` so a ruined path has a finite rate, as
+    in :class:`~keeks.tuning.StrategyTuner`.
+
+    Examples
+    --------
+    >>> from functools import partial
+    >>> from keeks.bankroll import BankRoll
+    >>> from keeks.binary_strategies import FixedFractionStrategy
+    >>> from keeks.simulators import PathSimulator
+    >>> simulator = PathSimulator(
+    ...     payoff=1.0, loss=1.0, transaction_costs=0.0, probability=0.55,
+    ...     trials=500, paths=400, seed=3, log_domain=True,
+    ... )
+    >>> result = efficient_frontier(
+    ...     partial(FixedFractionStrategy, payoff=1.0, loss=1.0),
+    ...     {"fraction": [0.02, 0.05, 0.1, 0.2, 0.3]},
+    ...     simulator,
+    ...     BankRoll(1000.0, max_draw_down=None),
+    ...     refinements=2,
+    ... )
+    >>> bool(result.pareto["fraction"].max() <= 0.1)
+    True
+    >>> len(result.points)
+    9
+    """
+    space = {name: list(values) for name, values in dict(space).items()}
+    if not space or not all(space.values()):
+        raise ValueError("Space must give at least one value for each parameter")
+    growth_quantile = _quantile(growth_quantile, "Growth quantile")
+    drawdown_quantile = _quantile(drawdown_quantile, "Drawdown quantile")
+    try:
+        if isinstance(refinements, bool):
+            raise TypeError
+        refinements = operator.index(refinements)
+    except TypeError as exc:
+        raise ValueError("Refinements must be a nonnegative integer") from exc
+    if refinements < 0:
+        raise ValueError("Refinements must be a nonnegative integer")
+    if simulator.trials == 0:
+        raise ValueError("Frontiers need at least one trial per path")
+    if simulator.sampling_probability is not None:
+        raise ValueError("Frontiers need untilted paths")
+
+    if simulator.seed is None:
+        simulator = copy.copy(simulator)
+        simulator.seed = int(np.random.SeedSequence().entropy)
+    initial_funds = bankroll.total_funds
+    names = list(space)
+
+    rows = {}
+
+    def simulate(settings, round_number):
+        for params in settings:
+            results = simulator.evaluate_strategy(factory(**params), bankroll)
+            growth = (
+                np.log(np.maximum(results.terminal, WEALTH_FLOOR) / initial_funds)
+                / simulator.trials
+            )
+            rows[tuple(params.values())] = {
+                **params,
+                "growth": float(np.quantile(growth, growth_quantile)),
+                "drawdown": float(np.quantile(results.max_drawdown, drawdown_quantile)),
+                "stopped": float(results.stopped.mean()),
+                "round": round_number,
+            }
+
+    grid = [
+        dict(zip(names, values, strict=True))
+        for values in itertools.product(*space.values())
+    ]
+    # Repeated grid values would only be simulated again.
+    simulate(list({tuple(params.values()): params for params in grid}.values()), 0)
+    for round_number in range(1, refinements + 1):
+        front = _pareto(list(rows.values()))
+        knee = _knee(front)
+        midpoints = {}
+        for neighbour in (knee - 1, knee + 1):
+            if 0 <= neighbour < len(front):
+                params = {
+                    name: _midpoint(front[knee][name], front[neighbour][name])
+                    for name in names
+                }
+                key = tuple(params.values())
+                if key not in rows:
+                    midpoints[key] = params
+        if not midpoints:
+            break
+        simulate(list(midpoints.values()), round_number)
+
+    front = _pareto(list(rows.values()))
+    on_front = {id(row) for row in front}
+    points = pd.DataFrame(
+        [{**row, "pareto": id(row) in on_front} for row in rows.values()]
+    )
+    return FrontierResult(
+        points=points,
+        pareto=points[points["pareto"]]
+        .sort_values(["drawdown", "growth"], kind="stable")
+        .reset_index(drop=True),
+        knee={name: front[_knee(front)][name] for name in names},
+        seed=simulator.seed,
+    )
+
+
+def _quantile(value, name):
+    value = _require_finite(value, name)
+    if not 0 <= value <= 1:
+        raise ValueError(f"{name} must be between 0 and 1")
+    return value
+
+
+def _midpoint(low, high):
+    return low if low == high else (low + high) / 2
+
+
+def _pareto(rows):
+    """The rows no other row beats on both axes, by increasing drawdown."""
+    ordered = sorted(rows, key=lambda row: (row["drawdown"], -row["growth"]))
+    front = []
+    best = -math.inf
+    for row in ordered:
+        # Every row before this one has no more drawdown, so it is beaten
+        # unless it grows faster than all of them, or ties the best exactly.
+        if row["growth"] > best or (
+            front
+            and row["growth"] == front[-1]["growth"]
+            and row["drawdown"] == front[-1]["drawdown"]
+        ):
+            front.append(row)
+            best = row["growth"]
+    return front
+
+
+def _knee(front):
+    """The index of the front's point furthest from the chord between its ends."""
+    drawdown = np.array([row["drawdown"] for row in front])
+    growth = np.array([row["growth"] for row in front])
+    scaled = [
+        (values - values[0]) / (values[-1] - values[0])
+        if values[-1] > values[0]
+        else np.zeros_like(values)
+        for values in (drawdown, growth)
+    ]
+    return int(np.argmax(np.abs(scaled[1] - scaled[0])))
@@ -0,0 +1,233 @@
+"""
+Closed-form growth and risk of stateless strategies across grids of markets.
+
+A stateless strategy stakes a fraction ``f`` of its bankroll that depends only
+on the market: the probability ``p`` of winning, the ``payoff`` and ``loss`` per
+unit staked and the per-unit ``transaction_cost``. One bet multiplies wealth by
+``1 + f * (payoff - transaction_cost)`` with probability ``p`` and by
+``1 - f * (loss + transaction_cost)`` otherwise, so the expected log growth per
+bet, its variance and the moments of the return follow exactly from ``f``.
+:func:`growth_surface` evaluates them over whole grids of markets with each
+strategy's ``evaluate_batch``, answering what a Monte Carlo sweep estimates
+without drawing a single outcome.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from keeks.utils import _is_stateless_strategy, _validate_stake_fractions
+
+GROWTH_FIELDS = (
+    "stake",
+    "growth_rate",
+    "growth_variance",
+    "mean_return",
+    "return_variance",
+)
+
+
+@dataclass(frozen=True)
+class GrowthSurface:
+    """
+    Per-bet growth and risk of a strategy at every point of a market grid.
+
+    Every attribute is an array with the broadcast shape of the grid, so
+    ``surface.growth_rate[i, j]`` belongs to the market at
+    ``surface.probability[i, j]``, ``surface.payoff[i, j]`` and so on. Returns
+    are fractions of the bankroll staked from, net of the transaction cost.
+
+    Attributes
+    ----------
+    probability, payoff, loss, transaction_cost : numpy.ndarray
+        The market at each grid point, as read-only broadcast views.
+    stake : numpy.ndarray
+        The strategy's stake fraction.
+    growth_rate : numpy.ndarray
+        The expected log growth per bet, ``-inf`` where a loss leaves nothing.
+    growth_variance : numpy.ndarray
+        The variance of the log growth per bet, ``inf`` where a loss leaves
+        nothing and the bet can be lost.
+    mean_return : numpy.ndarray
+        The expected return per bet.
+    return_variance : numpy.ndarray
+        The variance of the return per bet.
+    """
+
+    probability: np.ndarray
+    payoff: np.ndarray
+    loss: np.ndarray
+    transaction_cost: np.ndarray
+    stake: np.ndarray
+    growth_rate: np.ndarray
+    growth_variance: np.ndarray
+    mean_return: np.ndarray
+    return_variance: np.ndarray
+
+    @property
+    def shape(self):
+        """The shape of the grid."""
+        return self.stake.shape
+
+    def to_frame(self):
+        """
+        Return the surface as a long table with one row per grid point.
+
+        Returns
+        -------
+        pandas.DataFrame
+            The market columns followed by the ``GROWTH_FIELDS`` columns, in
+            the grid's C order.
+        """
+        columns = ("probability", "payoff", "loss", "transaction_cost", *GROWTH_FIELDS)
+        return pd.DataFrame(
+            {column: np.ravel(getattr(self, column)) for column in columns}
+        )
+
+
+def growth_surface(factory, probability, payoff=1.0, loss=1.0, transaction_cost=0.0):
+    """
+    Evaluate a stateless strategy's growth and risk over a grid of markets.
+
+    The four market arguments broadcast against each other like NumPy operands,
+    so open grids such as ``probability[:, None]`` with
+    ``transaction_cost[None, :]`` give a full two-dimensional surface without
+    materializing the odds. One strategy is built per distinct
+    ``(payoff, loss, transaction_cost)`` triple and sizes every probability of
+    that market in a single ``evaluate_batch`` call for a positive bankroll;
+    everything else is closed-form array arithmetic.
+
+    With ``b = payoff - transaction_cost`` and ``a = loss + transaction_cost``,
+    the bet wins ``f * b`` with probability ``p`` and loses ``f * a`` otherwise,
+    so
+
+    - growth rate: ``p * log(1 + f * b) + (1 - p) * log(1 - f * a)``
+    - growth variance: ``p * (1 - p) * (log(1 + f * b) - log(1 - f * a))**2``
+    - mean return: ``f * (p * b - (1 - p) * a)``
+    - return variance: ``p * (1 - p) * f**2 * (payoff + loss)**2``
+
+    The transaction cost here is the strategies' own per-unit cost, not the
+    flat per-bet fee of the simulators.
+
+    Parameters
+    ----------
+    factory : callable
+        Builds a strategy when called as
+        ``factory(payoff=..., loss=..., transaction_cost=...)``, for example a
+        strategy class or a :func:`functools.partial` fixing its other
+        parameters.
+    probability : float or array-like
+        The probability of winning each bet.
+    payoff : float or array-like, default=1.0
+        The profit per unit staked on a win.
+    loss : float or array-like, default=1.0
+        The amount lost per unit staked on a loss.
+    transaction_cost : float or array-like, default=0.0
+        The cost per unit staked.
+
+    Returns
+    -------
+    GrowthSurface
+        The stakes, growth and return moments at every grid point.
+
+    Raises
+    ------
+    ValueError
+        If the market arguments do not broadcast together, a probability is not
+        within ``[0, 1]``, a strategy exposes ``update_bankroll`` or
+        ``record_result``, or a strategy returns a stake outside ``[0, 1]``.
+        The strategies' own constructors reject invalid odds.
+
+    Examples
+    --------
+    >>> import functools
+    >>> import numpy as np
+    >>> from keeks.binary_strategies import FractionalKellyCriterion
+    >>> half_kelly = functools.partial(FractionalKellyCriterion, fraction=0.5)
+    >>> surface = growth_surface(
+    ...     half_kelly, [[0.55], [0.6]], transaction_cost=[0.0, 0.02]
+    ... )
+    >>> surface.shape
+    (2, 2)
+    >>> surface.stake.round(4).tolist()
+    [[0.05, 0.04], [0.1, 0.09]]
+    >>> np.round(surface.growth_rate, 5).tolist()
+    [[0.00375, 0.0024], [0.01504, 0.0122]]
+    """
+    probability = np.asarray(probability, dtype=float)
+    # Written so that NaN fails too.
+    if not ((probability >= 0) & (probability <= 1)).all():
+        raise ValueError("Probability must be between 0 and 1")
+    odds = np.broadcast_arrays(
+        *(np.asarray(value, dtype=float) for value in (payoff, loss, transaction_cost))
+    )
+    try:
+        shape = np.broadcast_shapes(probability.shape, odds[0].shape)
+    except ValueError as exc:
+        raise ValueError(
+            "Probability, payoff, loss and transaction_cost must broadcast together"
+        ) from exc
+
+    markets, market_index = np.unique(
+        np.stack([np.ravel(value) for value in odds], axis=1),
+        axis=0,
+        return_inverse=True,
+    )
+    probabilities = np.broadcast_to(probability, shape)
+    if len(markets) == 1:
+        stake = _stakes(factory, markets[0], probabilities)
+    else:
+        groups = np.broadcast_to(market_index.reshape(odds[0].shape), shape).ravel()
+        points = np.argsort(groups, kind="stable")
+        bounds = np.searchsorted(groups[points], np.arange(len(markets) + 1))
+        flat = probabilities.ravel()
+        stake = np.empty(flat.size)
+        for market, start, stop in zip(markets, bounds[:-1], bounds[1:], strict=True):
+            group = points[start:stop]
+            stake[group] = _stakes(factory, market, flat[group])
+        stake = stake.reshape(shape)
+
+    payoff, loss, transaction_cost = (np.broadcast_to(value, shape) for value in odds)
+    win = stake * (payoff - transaction_cost)
+    lose = stake * (loss + transaction_cost)
+    # A loss of everything or more is ruin, whose log growth is -inf, and
+    # outcomes that cannot happen contribute nothing, even when they ruin.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_win = np.log1p(np.maximum(win, -1.0))
+        log_lose = np.log1p(-np.minimum(lose, 1.0))
+        won, lost = probabilities, 1.0 - probabilities
+        growth_rate = np.where(won > 0, won * log_win, 0.0) + np.where(
+            lost > 0, lost * log_lose, 0.0
+        )
+        mixed = won * lost
+        growth_variance = np.where(
+            mixed > 0, mixed * np.square(log_win - log_lose), 0.0
+        )
+    mean_return = won * win - lost * lose
+    return_variance = mixed * np.square(stake * (payoff + loss))
+
+    return GrowthSurface(
+        probability=probabilities,
+        payoff=payoff,
+        loss=loss,
+        transaction_cost=transaction_cost,
+        stake=stake,
+        growth_rate=growth_rate,
+        growth_variance=growth_variance,
+        mean_return=mean_return,
+        return_variance=return_variance,
+    )
+
+
+def _stakes(factory, market, probabilities):
+    """Size every probability of one market with one strategy."""
+    payoff, loss, transaction_cost = market.tolist()
+    strategy = factory(payoff=payoff, loss=loss, transaction_cost=transaction_cost)
+    if not _is_stateless_strategy(strategy):
+        raise ValueError(
+            "Growth surfaces need a stateless strategy; "
+            f"{type(strategy).__name__} exposes update_bankroll or record_result"
+        )
+    stakes = strategy.evaluate_batch(probabilities, 1.0)
+    return _validate_stake_fractions(np.broadcast_to(stakes, probabilities.shape))
@@ -0,0 +1,300 @@
+"""
+Monte Carlo that stops once each estimate is precise enough.
+
+A sweep that gives every cell the same number of paths over-simulates the cells
+whose answer is clear after a few hundred paths and under-simulates the ones
+that are not. :class:`SequentialRunner` simulates each cell in batches of paths
+instead, and stops a cell as soon as the confidence interval on its statistic
+is narrower than a target width, or once it has spent its path budget. Its
+result reports how many paths every cell actually used.
+"""
+
+import math
+import statistics
+
+import numpy as np
+import pandas as pd
+
+from keeks.bankroll import BankRoll
+from keeks.simulators.paths import PathSimulator
+from keeks.utils import (
+    WEALTH_FLOOR,
+    _child_seed,
+    _positive_int,
+    _require_finite,
+    _validate_simulator_seed,
+)
+
+
+def _median_terminal(paths, z):
+    # Distribution-free interval from the order statistics whose ranks bracket
+    # the median at the normal approximation to the binomial.
+    terminal = np.sort(paths["terminal"].to_numpy())
+    count = len(terminal)
+    median = float(np.median(terminal))
+    half = z * math.sqrt(count) / 2
+    lower = math.floor(count / 2 - half)
+    upper = math.ceil(1 + count / 2 + half)
+    if lower < 1 or upper > count:
+        # Too few paths for the ranks to fit in the sample; clipping them to
+        # its ends would claim coverage the sample cannot give.
+        return median, -math.inf, math.inf
+    return median, float(terminal[lower - 1]), float(terminal[upper - 1])
+
+
+def _ruin_rate(paths, z):
+    # Wilson score interval, which unlike the normal interval does not collapse
+    # to zero width when no path has been ruined yet.
+    count = len(paths)
+    rate = float(paths["ruined"].mean())
+    denominator = 1 + z**2 / count
+    centre = (rate + z**2 / (2 * count)) / denominator
+    margin = (
+        z * math.sqrt(rate * (1 - rate) / count + z**2 / (4 * count**2)) / denominator
+    )
+    return rate, max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def _growth_rate(paths, z):
+    growth = paths["growth_rate"]
+    mean = float(growth.mean())
+    if len(growth) < 2:
+        return mean, -math.inf, math.inf
+    margin = z * float(growth.std(ddof=1)) / math.sqrt(len(growth))
+    return mean, mean - margin, mean + margin
+
+
+STATISTICS = {
+    "median_terminal": _median_terminal,
+    "ruin_rate": _ruin_rate,
+    "growth_rate": _growth_rate,
+}
+
+
+def path_cell(
+    strategy,
+    probability,
+    payoff=1.0,
+    loss=1.0,
+    transaction_costs=0.0,
+    trials=500,
+    initial_funds=1000.0,
+    max_draw_down=0.3,
+    seed=None,
+):
+    """
+    Build a cell that simulates its batches with :class:`PathSimulator`.
+
+    Parameters
+    ----------
+    strategy : BaseStrategy
+        The strategy every path starts from, vectorized with
+        ``strategy.vectorize``. It is not modified.
+    probability : float
+        The probability each bet wins.
+    payoff : float, default=1.0
+        The amount won per unit bet on a win.
+    loss : float, default=1.0
+        The amount lost per unit bet on a loss.
+    transaction_costs : float, default=0.0
+        The flat fee charged once per settled bet, as in the simulators.
+    trials : int, default=500
+        The number of bets per path.
+    initial_funds : float, default=1000.0
+        The bankroll each path starts from.
+    max_draw_down : float or None, default=0.3
+        The drawdown limit of each path's bankroll.
+    seed : int, numpy.random.SeedSequence or None, default=None
+        Seed for the outcome paths. Batch *b* is drawn from ``(seed, b)``, or
+        from the seed's child *b* for a ``SeedSequence``, so a seeded cell
+        reproduces the same batches however many it runs and in any order.
+        When omitted, one is drawn now.
+
+    Returns
+    -------
+    callable
+        ``cell(batch, paths)``, which simulates batch number ``batch`` of
+        ``paths`` paths and returns a DataFrame with one row per path and
+        columns ``terminal``, ``growth_rate`` and ``ruined``.
+
+    Raises
+    ------
+    ValueError
+        If a market or bankroll setting is out of range as it would be for
+        ``PathSimulator`` or ``BankRoll``.
+    """
+    seed = _validate_simulator_seed(seed)
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy)
+    # Checked by the simulator and bankroll themselves, before any work is done.
+    PathSimulator(payoff, loss, transaction_costs, probability, trials=trials)
+    initial_funds = _require_finite(initial_funds, "Initial funds")
+    if initial_funds <= 0:
+        raise ValueError("Initial funds must be greater than 0")
+    BankRoll(initial_funds=initial_funds, max_draw_down=max_draw_down)
+
+    def cell(batch, paths):
+        batch_seed = _child_seed(seed, batch)
+        if not isinstance(seed, np.random.SeedSequence):
+            # An integer seed has always handed each batch an integer of its own.
+            batch_seed = int(batch_seed.generate_state(1)[0])
+        simulator = PathSimulator(
+            payoff,
+            loss,
+            transaction_costs,
+            probability,
+            trials=trials,
+            paths=paths,
+            seed=batch_seed,
+        )
+        results = simulator.evaluate_strategy(
+            strategy,
+            BankRoll(initial_funds=initial_funds, max_draw_down=max_draw_down),
+        )
+        growth = np.log(np.maximum(results.terminal, WEALTH_FLOOR) / initial_funds)
+        return pd.DataFrame(
+            {
+                "terminal": results.terminal,
+                "growth_rate": growth / trials if trials else 0.0,
+                "ruined": results.stopped | (results.terminal <= 0),
+            }
+        )
+
+    return cell
+
+
+class SequentialRunner:
+    """
+    Simulate cells in batches until each statistic is known to a target width.
+
+    Every round, each cell that is still open simulates another batch of
+    ``batch_paths`` paths, and its statistic and confidence interval are
+    recomputed over all of its paths so far. A cell closes once the interval
+    is at most ``target_width`` wide, or once it has simulated ``max_paths``
+    paths, in which case it is reported as not converged.
+
+    Parameters
+    ----------
+    statistic : {"median_terminal", "ruin_rate", "growth_rate"}
+        What to estimate: the median terminal wealth, with a distribution-free
+        interval from order statistics, which is unbounded until there are
+        enough paths for its ranks to fall inside the sample; the share of paths stopped early by
+        bankruptcy or the drawdown limit, with a Wilson score interval; or the
+        mean per-trial log growth rate, with a normal interval.
+    target_width : float
+        The widest acceptable confidence interval, in the statistic's units.
+    confidence : float, default=0.95
+        The coverage of the confidence interval.
+    batch_paths : int, default=100
+        The number of paths each batch adds to a cell.
+    max_paths : int, default=10000
+        The most paths any one cell may simulate.
+
+    Raises
+    ------
+    ValueError
+        If ``statistic`` is not a known name, if ``target_width`` is not finite
+        and greater than 0, if ``confidence`` is not strictly between 0 and 1,
+        or if ``batch_paths`` or ``max_paths`` is not a positive integer.
+
+    Examples
+    --------
+    >>> from keeks.binary_strategies import FixedFractionStrategy
+    >>> runner = SequentialRunner("growth_rate", target_width=0.001)
+    >>> cells = {
+    ...     fraction: path_cell(
+    ...         FixedFractionStrategy(
+    ...             fraction=fraction, payoff=1.0, loss=1.0, transaction_cost=0.0
+    ...         ),
+    ...         probability=0.55,
+    ...         trials=200,
+    ...         max_draw_down=None,
+    ...         seed=1,
+    ...     )
+    ...     for fraction in (0.02, 0.1)
+    ... }
+    >>> runner.run(cells)["paths"].tolist()
+    [100, 900]
+    """
+
+    def __init__(
+        self,
+        statistic,
+        target_width,
+        confidence=0.95,
+        batch_paths=100,
+        max_paths=10_000,
+    ):
+        if statistic not in STATISTICS:
+            raise ValueError(
+                f"Statistic must be one of {sorted(STATISTICS)}, got {statistic!r}"
+            )
+        target_width = _require_finite(target_width, "Target width")
+        if target_width <= 0:
+            raise ValueError("Target width must be greater than 0")
+        confidence = _require_finite(confidence, "Confidence")
+        if not 0 < confidence < 1:
+            raise ValueError("Confidence must be strictly between 0 and 1")
+
+        self.statistic = statistic
+        self.target_width = target_width
+        self.confidence = confidence
+        self.batch_paths = _positive_int(batch_paths, "Batch paths")
+        self.max_paths = _positive_int(max_paths, "Maximum paths")
+
+    def run(self, cells):
+        """
+        Simulate every cell until it converges or exhausts its budget.
+
+        Parameters
+        ----------
+        cells : dict
+            Maps each cell's name to a callable ``cell(batch, paths)`` that
+            simulates batch number ``batch`` of ``paths`` paths and returns a
+            DataFrame with one row per path and at least the column the
+            statistic needs: ``terminal``, ``ruined`` or ``growth_rate``.
+            :func:`path_cell` builds one.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per cell, in the order given, with the ``cell`` name, the
+            ``estimate``, its ``lower`` and ``upper`` bounds and ``width``, the
+            ``paths`` and ``batches`` spent, and whether it ``converged``.
+
+        Raises
+        ------
+        ValueError
+            If ``cells`` is empty.
+        """
+        cells = dict(cells)
+        if not cells:
+            raise ValueError("Cells must not be empty")
+        interval = STATISTICS[self.statistic]
+        z = statistics.NormalDist().inv_cdf(0.5 + self.confidence / 2)
+
+        batches = {name: [] for name in cells}
+        rows = {}
+        while len(rows) < len(cells):
+            for name, cell in cells.items():
+                if name in rows:
+                    continue
+                spent = sum(len(batch) for batch in batches[name])
+                paths = min(self.batch_paths, self.max_paths - spent)
+                batches[name].append(cell(len(batches[name]), paths))
+
+                frame = pd.concat(batches[name], ignore_index=True)
+                estimate, lower, upper = interval(frame, z)
+                converged = upper - lower <= self.target_width
+                if converged or len(frame) >= self.max_paths:
+                    rows[name] = {
+                        "cell": name,
+                        "estimate": estimate,
+                        "lower": lower,
+                        "upper": upper,
+                        "width": upper - lower,
+                        "paths": len(frame),
+                        "batches": len(batches[name]),
+                        "converged": converged,
+                    }
+        return pd.DataFrame([rows[name] for name in cells])
@@ -0,0 +1,248 @@
+"""
+Asynchronous stake sizing with micro-batching.
+
+A quoting API that sizes one market per request spends most of each request on
+per-call overhead rather than on the sizing arithmetic. :class:`SizingService`
+collects the requests that arrive for a strategy within a short window and
+sizes them with one ``evaluate_batch`` call, then resolves every request's
+future from the batch. :func:`serve` puts a service behind a local TCP or Unix
+socket speaking newline-delimited JSON, as an in-process stand-in for a real
+front end when load testing.
+"""
+
+import asyncio
+import json
+import operator
+
+from keeks.utils import (
+    _is_stateless_strategy,
+    _require_finite,
+    _validate_stake_fractions,
+)
+
+
+class SizingService:
+    """
+    Size concurrent requests in batches, one batch per strategy.
+
+    The first request for a strategy opens a batch and starts a timer of
+    ``max_delay`` seconds. The batch is sized when the timer fires or when it
+    reaches ``max_batch_size`` requests, whichever comes first, so a request
+    waits at most ``max_delay`` plus the time to size its batch. Each request
+    gets exactly what ``strategy.evaluate(probability, current_bankroll)`` would
+    have returned.
+
+    Parameters
+    ----------
+    strategies : dict
+        The strategies to serve, keyed by the name requests refer to them by.
+    max_batch_size : int, default=256
+        The number of requests that closes a batch before its timer fires.
+    max_delay : float, default=0.001
+        The longest a batch stays open, in seconds. Zero still coalesces every
+        request made before the event loop next runs its callbacks.
+
+    Attributes
+    ----------
+    requests : int
+        The number of requests sized so far.
+    batches : int
+        The number of ``evaluate_batch`` calls made so far.
+
+    Raises
+    ------
+    ValueError
+        If a strategy exposes ``update_bankroll`` or ``record_result``, since a
+        strategy that learns from outcomes cannot size unrelated requests side by
+        side, if ``max_batch_size`` is not a positive integer, or if
+        ``max_delay`` is not finite and nonnegative.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> from keeks.binary_strategies import KellyCriterion
+    >>> service = SizingService(
+    ...     {"kelly": KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)}
+    ... )
+    >>> async def quote():
+    ...     return await asyncio.gather(
+    ...         service.size("kelly", 0.6, 1000.0),
+    ...         service.size("kelly", 0.7, 1000.0),
+    ...     )
+    >>> [round(stake, 2) for stake in asyncio.run(quote())]
+    [0.2, 0.4]
+    >>> service.batches
+    1
+    """
+
+    def __init__(self, strategies, max_batch_size=256, max_delay=0.001):
+        strategies = dict(strategies)
+        for name, strategy in strategies.items():
+            if not _is_stateless_strategy(strategy):
+                raise ValueError(
+                    f"Strategy {name!r} exposes update_bankroll or record_result; "
+                    "only stateless strategies can be sized in batches"
+                )
+        try:
+            if isinstance(max_batch_size, bool):
+                raise TypeError
+            max_batch_size = operator.index(max_batch_size)
+        except TypeError as exc:
+            raise ValueError("Maximum batch size must be a positive integer") from exc
+        if max_batch_size <= 0:
+            raise ValueError("Maximum batch size must be a positive integer")
+        max_delay = _require_finite(max_delay, "Maximum delay")
+        if max_delay < 0:
+            raise ValueError("Maximum delay must be non-negative")
+
+        self.strategies = strategies
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.requests = 0
+        self.batches = 0
+        self._pending = {name: [] for name in strategies}
+        self._timers = {}
+
+    async def size(self, strategy, probability, current_bankroll):
+        """
+        Return the stake fraction for one request once its batch is sized.
+
+        Parameters
+        ----------
+        strategy : str
+            The name of the strategy to size with.
+        probability : float
+            The probability of winning, within ``[0, 1]``.
+        current_bankroll : float
+            The bankroll the stake is a fraction of.
+
+        Returns
+        -------
+        float
+            The proportion of the bankroll to bet.
+
+        Raises
+        ------
+        ValueError
+            If ``strategy`` is not served, if ``probability`` is not finite
+            within ``[0, 1]`` or ``current_bankroll`` is not finite, or if the
+            strategy returns a non-finite or out-of-range stake fraction.
+        """
+        try:
+            served = strategy in self._pending
+        except TypeError:
+            # An unhashable name, such as a list decoded from JSON.
+            served = False
+        if not served:
+            raise ValueError(f"Unknown strategy {strategy!r}")
+        probability = _require_finite(probability, "Probability")
+        if not 0 <= probability <= 1:
+            raise ValueError("Probability must be between 0 and 1")
+        current_bankroll = _require_finite(current_bankroll, "Current bankroll")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending[strategy]
+        pending.append((probability, current_bankroll, future))
+        if len(pending) >= self.max_batch_size:
+            self._flush(strategy)
+        elif len(pending) == 1:
+            self._timers[strategy] = loop.call_later(
+                self.max_delay, self._flush, strategy
+            )
+        return await future
+
+    def flush(self):
+        """Size every open batch now instead of waiting for its timer."""
+        for strategy in self._pending:
+            self._flush(strategy)
+
+    def _flush(self, strategy):
+        timer = self._timers.pop(strategy, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending[strategy]
+        if not batch:
+            return
+        self._pending[strategy] = []
+        self.requests += len(batch)
+        self.batches += 1
+
+        probabilities, bankrolls, futures = zip(*batch, strict=True)
+        try:
+            stakes = self.strategies[strategy].evaluate_batch(probabilities, bankrolls)
+            stakes = _validate_stake_fractions(stakes).tolist()
+        except Exception as exc:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for stake, future in zip(stakes, futures, strict=True):
+            # A caller that gave up waiting has cancelled its future.
+            if not future.done():
+                future.set_result(stake)
+
+
+async def serve(service, host="127.0.0.1", port=0, path=None):
+    """
+    Serve a :class:`SizingService` over a local socket.
+
+    Each line a client sends is one JSON request,
+    ``{"id": ..., "strategy": ..., "probability": ..., "bankroll": ...}``, and
+    is answered with one JSON line, ``{"id": ..., "stake": ...}`` or
+    ``{"id": ..., "error": ...}``. Requests on a connection are handled
+    concurrently, so a client that pipelines them has them batched together and
+    may see answers out of order; ``id`` is echoed back to match them up.
+
+    Parameters
+    ----------
+    service : SizingService
+        The service that sizes each request.
+    host : str, default="127.0.0.1"
+        The interface to listen on when serving TCP.
+    port : int, default=0
+        The TCP port to listen on. Zero picks a free port, which can be read
+        from ``server.sockets[0].getsockname()``.
+    path : str or os.PathLike, optional
+        Listen on this Unix socket instead of TCP.
+
+    Returns
+    -------
+    asyncio.Server
+        The listening server. Close it with ``server.close()`` followed by
+        ``await server.wait_closed()``, or use it as an async context manager.
+    """
+
+    async def handle(reader, writer):
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                task = asyncio.create_task(_answer(service, line, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            await asyncio.gather(*tasks)
+            await writer.drain()
+        finally:
+            writer.close()
+
+    if path is not None:
+        return await asyncio.start_unix_server(handle, path=path)
+    return await asyncio.start_server(handle, host=host, port=port)
+
+
+async def _answer(service, line, writer):
+    request_id = None
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("Request must be a JSON object")
+        request_id = request.get("id")
+        stake = await service.size(
+            request["strategy"], request["probability"], request["bankroll"]
+        )
+        response = {"id": request_id, "stake": stake}
+    except KeyError as exc:
+        response = {"id": request_id, "error": f"Request is missing {exc.args[0]!r}"}
+    except ValueError as exc:
+        response = {"id": request_id, "error": str(exc)}
+    writer.write(json.dumps(response).encode() + b"\n")
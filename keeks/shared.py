@@ -0,0 +1,155 @@
+"""
+Pre-drawn matrices that worker processes read without copying.
+
+A process pool either has every worker regenerate the random draws it needs or
+sends them pickled with each job, which for a ``(paths, trials)`` matrix of
+10^5 by 10^4 draws costs gigabytes per worker. :class:`SharedArrays` allocates
+such matrices once in one :mod:`multiprocessing.shared_memory` block. Pickling
+it sends only the block's name and layout, and unpickling it in a worker
+attaches NumPy views onto the same memory, so memory use does not grow with the
+number of workers.
+"""
+
+import collections.abc
+import contextlib
+import math
+import operator
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Every array starts on a cache line.
+_ALIGNMENT = 64
+
+
+class SharedArrays(collections.abc.Mapping):
+    """
+    Named NumPy arrays in one shared-memory block.
+
+    The arrays are allocated zeroed and are filled in place, row by row if
+    they are too large to build elsewhere first. Look them up by name like a
+    dict. Passing the object to a worker process, as a job argument or through
+    a pool's ``initializer``, pickles only the block's name and the arrays'
+    layout; the worker's copy attaches to the same memory, so its arrays are
+    views of the creator's and nothing is copied.
+
+    The creating process owns the block: :meth:`close` on the owner, or
+    leaving its ``with`` block, frees the memory once every process has
+    closed it. Workers must be started by :mod:`multiprocessing`, as pool
+    workers are, so the creator's resource tracker sees every attachment.
+
+    Parameters
+    ----------
+    specs : dict
+        The arrays to allocate, each name mapped to a ``(shape, dtype)`` pair.
+        ``dtype`` is anything ``numpy.dtype`` accepts, except object dtypes.
+
+    Raises
+    ------
+    ValueError
+        If a shape is not a tuple of nonnegative integers or a dtype holds
+        Python objects.
+
+    Examples
+    --------
+    >>> import pickle
+    >>> with SharedArrays({"outcomes": ((3, 4), bool)}) as shared:
+    ...     shared["outcomes"][1] = True
+    ...     attached = pickle.loads(pickle.dumps(shared))
+    ...     print(attached["outcomes"].sum())
+    ...     attached.close()
+    4
+    """
+
+    def __init__(self, specs):
+        layout = {}
+        size = 0
+        for name, (shape, dtype) in dict(specs).items():
+            shape = _shape(shape, name)
+            dtype = np.dtype(dtype)
+            if dtype.hasobject:
+                raise ValueError(f"Array {name!r} must not hold Python objects")
+            nbytes = math.prod(shape) * dtype.itemsize
+            offset = -(-size // _ALIGNMENT) * _ALIGNMENT if nbytes else 0
+            layout[name] = (shape, dtype.str, offset)
+            size = max(size, offset + nbytes)
+        self._layout = layout
+        self._owner = True
+        # A block cannot be empty, even when every array is.
+        self._memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        self._arrays = self._views()
+
+    def __getitem__(self, name):
+        return self._arrays[name]
+
+    def __iter__(self):
+        return iter(self._layout)
+
+    def __len__(self):
+        return len(self._layout)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        return {"name": self._memory.name, "layout": self._layout}
+
+    def __setstate__(self, state):
+        self._layout = state["layout"]
+        self._owner = False
+        if sys.version_info >= (3, 13):
+            # The creator's tracker already cleans up after the block.
+            self._memory = shared_memory.SharedMemory(state["name"], track=False)
+        else:
+            self._memory = shared_memory.SharedMemory(state["name"])
+        self._arrays = self._views()
+
+    @property
+    def name(self):
+        """The name of the shared-memory block."""
+        return self._memory.name
+
+    @property
+    def nbytes(self):
+        """The size of the shared-memory block, in bytes."""
+        return self._memory.size
+
+    def close(self):
+        """
+        Detach from the block, and free it if this process created it.
+
+        Arrays taken from this object before closing remain readable until
+        they are garbage collected, but must not be relied on afterwards.
+        """
+        self._arrays = {}
+        with contextlib.suppress(BufferError):
+            # Views still alive keep the mapping until they are collected.
+            self._memory.close()
+        if self._owner:
+            self._owner = False
+            self._memory.unlink()
+
+    def _views(self):
+        return {
+            name: np.ndarray(shape, dtype, buffer=self._memory.buf, offset=offset)
+            for name, (shape, dtype, offset) in self._layout.items()
+        }
+
+
+def _shape(shape, name):
+    lengths = shape if isinstance(shape, (tuple, list)) else (shape,)
+    try:
+        if any(isinstance(length, bool) for length in lengths):
+            raise TypeError
+        shape = tuple(operator.index(length) for length in lengths)
+    except TypeError as exc:
+        raise ValueError(
+            f"Shape of {name!r} must be a tuple of nonnegative integers"
+        ) from exc
+    if any(length < 0 for length in shape):
+        raise ValueError(f"Shape of {name!r} must be a tuple of nonnegative integers")
+    return shape
@@ -2,20 +2,48 @@
 Simulators for evaluating betting strategies in the keeks package.
 
 This module provides various simulators for testing betting strategies:
+- AsynchronousBinarySimulator: Lets bets overlap and settle after a delay
+- BootstrapSimulator: Resamples blocks of recorded bets into many paths
+- CorrelatedMarketSimulator: Settles a bet on each of several correlated markets per trial
+- MeanEstimate: A variance-reduced per-path mean from PathSimulator paths
+- PathSimulator: Steps many independent repeated-bet paths together with NumPy
 - RandomBinarySimulator: Simulates bets with random probabilities
 - RandomUncertainBinarySimulator: Adds uncertainty to the actual outcome probabilities
 - RepeatedBinarySimulator: Simulates repeated bets with a fixed probability
+- ReplaySimulator: Replays recorded bets streamed from a CSV or Parquet file
+- SimulationProfile: Opt-in per-phase timing counters for a simulation loop
+- TailEstimate: A likelihood-weighted event probability from PathSimulator paths
 
 These simulators can be used to evaluate the performance of different betting strategies
 under various conditions.
 """
 
+from keeks.simulators.asynchronous_binary import AsynchronousBinarySimulator
+from keeks.simulators.bootstrap import BootstrapSimulator
+from keeks.simulators.correlated import CorrelatedMarketSimulator
+from keeks.simulators.paths import (
+    MeanEstimate,
+    PathResults,
+    PathSimulator,
+    TailEstimate,
+)
+from keeks.simulators.profiling import SimulationProfile
 from keeks.simulators.random_binary import RandomBinarySimulator
 from keeks.simulators.random_uncertain_binary import RandomUncertainBinarySimulator
 from keeks.simulators.repeated_binary import RepeatedBinarySimulator
+from keeks.simulators.replay import ReplaySimulator
 
 __all__ = [
+    "AsynchronousBinarySimulator",
+    "BootstrapSimulator",
+    "CorrelatedMarketSimulator",
+    "MeanEstimate",
+    "PathResults",
+    "PathSimulator",
     "RandomBinarySimulator",
     "RandomUncertainBinarySimulator",
     "RepeatedBinarySimulator",
+    "ReplaySimulator",
+    "SimulationProfile",
+    "TailEstimate",
 ]
@@ -0,0 +1,244 @@
+import heapq
+import operator
+import random
+
+from keeks.utils import (
+    RuinError,
+    _outcome_random,
+    _stake_fraction_validator,
+    _update_strategy_bankroll,
+    _validate_simulator_controls,
+    _validate_simulator_probability,
+    _validate_simulator_seed,
+    _validate_strategy_odds,
+)
+
+
+class AsynchronousBinarySimulator:
+    """
+    Event-driven simulator for overlapping binary bets that settle later.
+
+    Every other simulator settles each bet before the next one is sized. Here a
+    bet opened at trial ``t`` stays open until trial ``t + delay``, where
+    ``delay`` is drawn uniformly from ``[min_settlement_delay,
+    max_settlement_delay]``, so several stakes can be outstanding at once. While
+    a stake is open its worst-case settlement (``loss * stake`` plus the flat
+    fee) is locked, and new bets are sized against ``BankRoll.bettable_funds``
+    net of that locked exposure.
+
+    Open bets live in a heap keyed on their due trial, so opening and settling a
+    bet are both ``O(log n)`` in the number of open positions. Heap entries are
+    plain integers that index fixed-size slot lists allocated once per run, so a
+    long run does not build a container per bet.
+
+    With both delays equal to 1 every bet settles before the next is sized and
+    the run reproduces ``RepeatedBinarySimulator`` draw for draw.
+
+    Parameters
+    ----------
+    payoff : float
+        The amount won per unit bet on a successful outcome.
+    loss : float
+        The amount lost per unit bet on an unsuccessful outcome.
+    transaction_costs : float
+        The flat fee charged once per settled bet, regardless of outcome. This is
+        an absolute bankroll amount, not a fraction of the stake, so it does not
+        scale with bet size: it is subtracted from a winning settlement and added
+        to a losing one. Note this differs in unit from the singular
+        ``transaction_cost`` taken by strategies in ``keeks.binary_strategies``,
+        which is a per-unit fraction of the bet used for sizing.
+    probability : float
+        The fixed probability of a successful outcome for all trials.
+    trials : int, default=1000
+        The number of event times at which a new bet may be opened.
+    min_settlement_delay : int, default=1
+        The shortest number of trials a bet stays open.
+    max_settlement_delay : int, default=1
+        The longest number of trials a bet stays open.
+    seed : int, numpy.random.SeedSequence or None, default=None
+        Seed for a private outcome and delay generator. When omitted, the
+        process-global ``random`` generator is used for backward compatibility.
+        A ``SeedSequence`` seeds the generator from its child stream 0.
+
+    Raises
+    ------
+    ValueError
+        If ``payoff`` is not finite and positive, if ``loss`` or
+        ``transaction_costs`` is not finite and nonnegative, if ``probability``
+        is not finite within ``[0, 1]``, if ``trials`` is not a nonnegative
+        integer, if the settlement delays are not positive integers with
+        ``min_settlement_delay <= max_settlement_delay``, or if ``seed`` is not
+        a nonnegative integer, a ``SeedSequence`` or ``None``.
+    """
+
+    def __init__(
+        self,
+        payoff,
+        loss,
+        transaction_costs,
+        probability,
+        trials=1000,
+        min_settlement_delay=1,
+        max_settlement_delay=1,
+        seed=None,
+    ):
+        (
+            self.payoff,
+            self.loss,
+            self.transaction_costs,
+            self.trials,
+        ) = _validate_simulator_controls(payoff, loss, transaction_costs, trials)
+        self.probability = _validate_simulator_probability(probability, "Probability")
+        self.min_settlement_delay = _validate_settlement_delay(
+            min_settlement_delay, "Minimum settlement delay"
+        )
+        self.max_settlement_delay = _validate_settlement_delay(
+            max_settlement_delay, "Maximum settlement delay"
+        )
+        if self.min_settlement_delay > self.max_settlement_delay:
+            raise ValueError(
+                "Minimum settlement delay must not exceed maximum settlement delay"
+            )
+        self.seed = _validate_simulator_seed(seed)
+        self._outcome_rng = _outcome_random(self.seed)
+
+    def evaluate_strategy(self, strategy, bankroll):
+        """
+        Evaluate a betting strategy with overlapping, delayed settlements.
+
+        At each trial every open bet that has come due is settled first, in due
+        order and then in the order it was opened. Unless open bets lock all of
+        the bettable funds, the strategy is then asked for a stake fraction with
+        ``bankroll.total_funds``, and a new bet of that fraction of the bettable
+        funds not already locked by open bets is opened.
+        Bets still open after the last trial are settled in the same order. The
+        simulation stops early if the bankroll is depleted (bankruptcy) or a
+        settlement trips a bankroll safeguard; bets still open at that point are
+        abandoned unsettled.
+
+        Parameters
+        ----------
+        strategy : BaseStrategy
+            The betting strategy to evaluate.
+        bankroll : BankRoll
+            The bankroll to use for the simulation.
+
+        Returns
+        -------
+        None
+            The bankroll object is updated in-place with the results of the simulation.
+
+        Raises
+        ------
+        ValueError
+            If ``strategy`` is a ``BaseStrategy`` whose ``payoff`` or ``loss``
+            differs from this simulator's, since it would then size bets against
+            different odds than the ones the simulator settles at, or if the
+            strategy returns a non-finite or out-of-range stake fraction.
+        """
+        _validate_strategy_odds(strategy, self.payoff, self.loss)
+        validate_stake = _stake_fraction_validator()
+
+        trials = self.trials
+        # A bet opened at trial t settles no later than trial t + max delay, and
+        # due bets settle before the next one opens, so slot t % max delay is
+        # always free again by the time trial t + max delay reuses it.
+        capacity = self.max_settlement_delay
+        stakes = [0.0] * capacity
+        exposures = [0.0] * capacity
+        opened_funds = [0.0] * capacity
+        outcomes = [False] * capacity
+        # Keys are due * trials + opening trial: unique, ordered by due trial and
+        # then by opening order, and decodable without a per-bet tuple.
+        queue = []
+        locked = 0.0
+        draw = random.random if self._outcome_rng is None else self._outcome_rng.random
+        fixed_delay = self.min_settlement_delay == self.max_settlement_delay
+        record_result = getattr(strategy, "record_result", None)
+        record_result = record_result if callable(record_result) else None
+
+        def settle(key):
+            nonlocal locked
+            slot = (key % trials) % capacity
+            stake = stakes[slot]
+            won = outcomes[slot]
+            locked -= exposures[slot]
+            if not queue:
+                # Repeated subtraction drifts; nothing is open, so nothing is locked.
+                locked = 0.0
+            if won:
+                amt = (self.payoff * stake) - self.transaction_costs
+                if amt >= 0:
+                    bankroll.deposit(amt)
+                else:
+                    bankroll.withdraw(abs(amt))
+                return_pct = amt / opened_funds[slot]
+            else:
+                amt = (self.loss * stake) + self.transaction_costs
+                bankroll.withdraw(amt)
+                return_pct = -amt / opened_funds[slot]
+            if record_result is not None:
+                record_result(won, return_pct)
+
+        try:
+            for trial in range(trials):
+                while queue and queue[0] < (trial + 1) * trials:
+                    settle(heapq.heappop(queue))
+
+                current_bankroll = bankroll.total_funds
+
+                # Stop if bankrupt
+                if current_bankroll <= 0:
+                    return
+
+                _update_strategy_bankroll(strategy, current_bankroll)
+
+                # Open bets can lock every bettable dollar, leaving no bet to
+                # offer: a strategy asked anyway would count one as placed
+                free = bankroll.bettable_funds - locked
+                if free <= 0:
+                    continue
+
+                proportion = validate_stake(
+                    strategy.evaluate(self.probability, current_bankroll)
+                )
+
+                # Only open a bet with a positive stake (avoid charging costs on no-bet)
+                stake = free * proportion
+                if stake > 0:
+                    slot = trial % capacity
+                    outcomes[slot] = draw() < self.probability
+                    delay = (
+                        self.min_settlement_delay if fixed_delay else self._draw_delay()
+                    )
+                    stakes[slot] = stake
+                    exposures[slot] = (self.loss * stake) + self.transaction_costs
+                    opened_funds[slot] = current_bankroll
+                    locked += exposures[slot]
+                    heapq.heappush(queue, (trial + delay) * trials + trial)
+
+            while queue:
+                settle(heapq.heappop(queue))
+        except RuinError:
+            # Settlement exceeded a bankroll safeguard; stop gracefully
+            return
+
+    def _draw_delay(self):
+        # Scaling one uniform is several times cheaper than randint, which
+        # matters when every event draws a delay.
+        rng = random if self._outcome_rng is None else self._outcome_rng
+        span = self.max_settlement_delay - self.min_settlement_delay + 1
+        return self.min_settlement_delay + int(rng.random() * span)
+
+
+def _validate_settlement_delay(delay, name):
+    """Validate a settlement delay, which must be a positive integer."""
+    try:
+        if isinstance(delay, bool):
+            raise TypeError
+        delay = operator.index(delay)
+    except TypeError as exc:
+        raise ValueError(f"{name} must be a positive integer") from exc
+    if delay <= 0:
+        raise ValueError(f"{name} must be a positive integer")
+    return delay
@@ -0,0 +1,321 @@
+import operator
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from keeks.utils import (
+    _child_seed,
+    _positive_int,
+    _require_finite,
+    _validate_simulator_seed,
+)
+
+from .paths import _STREAM_PATHS, PathResults, _run_paths
+from .replay import REPLAY_COLUMNS, _column, _validate_chunk
+
+# Rows validated at a time, so a memory-mapped source is never read whole.
+_VALIDATION_ROWS = 1_000_000
+# Block indices drawn at a time, in (trials, paths) entries.
+_INDEX_ENTRIES = 1 << 20
+
+
+class BootstrapSimulator:
+    """
+    Simulator that replays stationary-bootstrap resamples of recorded bets.
+
+    Every path is a sequence of ``trials`` rows resampled from a record of real
+    bets, each row the probability the strategy is given, the ``payoff`` and
+    ``loss`` the bet settled at and whether it won, as in ``ReplaySimulator``.
+    Rows are resampled in blocks (the stationary bootstrap): a path starts at a
+    random row, and after each bet either moves on to the next recorded row or,
+    with probability ``1 / mean_block_length``, jumps to a new random row,
+    wrapping around at the end of the record. Runs of wins and losses, and
+    shifts in the quoted odds, survive within each block, so strategies are
+    stressed against the history's own dependence rather than the independent
+    draws of ``RepeatedBinarySimulator``.
+
+    The block indices for all paths are drawn together, a bounded number of
+    trials at a time, and each trial gathers every path's row from the source
+    array with one indexing operation. Paths are stepped together as in
+    ``PathSimulator``, through the strategy's ``vectorize`` form, and each path
+    matches ``ReplaySimulator`` replaying its :meth:`bets` to the cent.
+
+    Parameters
+    ----------
+    source : pandas.DataFrame, numpy.ndarray, str or os.PathLike
+        The recorded bets: a DataFrame with the ``probability``, ``payoff``,
+        ``loss`` and ``outcome`` columns, a ``(rows, 4)`` array with those
+        columns in that order, or the path of a ``.npy`` file holding such an
+        array, which is opened memory-mapped. A DataFrame is copied into one
+        contiguous array; an array, including a ``numpy.memmap``, is used as
+        it is.
+    transaction_costs : float, default=0.0
+        The flat fee charged once per settled bet, regardless of outcome. This is
+        an absolute bankroll amount, not a fraction of the stake, so it does not
+        scale with bet size: it is subtracted from a winning settlement and added
+        to a losing one. Note this differs in unit from the singular
+        ``transaction_cost`` taken by strategies in ``keeks.binary_strategies``,
+        which is a per-unit fraction of the bet used for sizing.
+    trials : int, default=1000
+        The number of bets on each path.
+    paths : int, default=1000
+        The number of resampled paths.
+    mean_block_length : float, default=20.0
+        The expected number of consecutive recorded rows in a block, at least
+        1. Use roughly the span over which recorded results are correlated; 1
+        resamples rows independently.
+    seed : int, numpy.random.SeedSequence or None, default=None
+        Seed for the block draws. A ``SeedSequence`` draws each block of 256
+        paths from its own child stream, so a path's rows depend only on the
+        seed and its index. When omitted, every run draws fresh blocks.
+    columns : dict, optional
+        Column names for any of the roles ``"probability"``, ``"payoff"``,
+        ``"loss"`` and ``"outcome"`` whose DataFrame column is not named after
+        the role.
+
+    Raises
+    ------
+    ValueError
+        If ``transaction_costs`` is not finite and nonnegative, if ``trials``
+        is not a nonnegative integer, if ``paths`` is not a positive integer,
+        if ``mean_block_length`` is not finite and at least 1, if ``seed`` is
+        not a nonnegative integer, a ``SeedSequence`` or ``None``, if
+        ``columns`` names an unknown role, or if the source is empty, has the
+        wrong shape or columns, or holds a row that ``ReplaySimulator`` would
+        reject.
+
+    Notes
+    -----
+    Strategy odds are not compared with the recorded ones, because the recorded
+    ``payoff`` and ``loss`` may change from row to row. The strategy sizes every
+    bet with its own odds; the simulator settles it with the row's.
+    """
+
+    def __init__(
+        self,
+        source,
+        transaction_costs=0.0,
+        trials=1000,
+        paths=1000,
+        mean_block_length=20.0,
+        seed=None,
+        columns=None,
+    ):
+        transaction_costs = _require_finite(transaction_costs, "Transaction costs")
+        if transaction_costs < 0:
+            raise ValueError("Transaction costs must be non-negative")
+        try:
+            if isinstance(trials, bool):
+                raise TypeError
+            trials = operator.index(trials)
+        except TypeError as exc:
+            raise ValueError("Trials must be a nonnegative integer") from exc
+        if trials < 0:
+            raise ValueError("Trials must be a nonnegative integer")
+        mean_block_length = _require_finite(mean_block_length, "Mean block length")
+        if mean_block_length < 1:
+            raise ValueError("Mean block length must be at least 1")
+
+        self.transaction_costs = transaction_costs
+        self.trials = trials
+        self.paths = _positive_int(paths, "Paths")
+        self.mean_block_length = mean_block_length
+        self.seed = _validate_simulator_seed(seed)
+        self.data = _source_array(source, columns)
+
+    def indices(self):
+        """
+        Return the recorded rows a seeded run resamples.
+
+        Returns
+        -------
+        numpy.ndarray
+            ``(trials, paths)`` row numbers into the source. Without a seed
+            every call, like every run, draws afresh.
+        """
+        chunks = list(self._index_chunks())
+        if not chunks:
+            return np.empty((0, self.paths), dtype=np.int64)
+        return np.concatenate(chunks)
+
+    def bets(self, path):
+        """
+        Return one path's resampled bets in ``ReplaySimulator`` form.
+
+        Parameters
+        ----------
+        path : int
+            The path number, from 0 to ``paths - 1``.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per trial with the ``probability``, ``payoff``, ``loss``
+            and ``outcome`` the path bets on, for replaying with any strategy,
+            including one without a vectorized form.
+
+        Raises
+        ------
+        ValueError
+            If ``path`` is not a path number.
+        """
+        try:
+            if isinstance(path, bool):
+                raise TypeError
+            path = operator.index(path)
+        except TypeError as exc:
+            raise ValueError("Path must be an integer") from exc
+        if not 0 <= path < self.paths:
+            raise ValueError(f"Path must be between 0 and {self.paths - 1}")
+        rows = [chunk[:, path] for chunk in self._index_chunks()]
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        return pd.DataFrame(self.data[rows], columns=list(REPLAY_COLUMNS))
+
+    def evaluate_strategy(self, strategy, bankroll, profile=None):
+        """
+        Evaluate a betting strategy on every resampled path.
+
+        Parameters
+        ----------
+        strategy : BaseStrategy
+            The betting strategy to evaluate. It is vectorized with
+            ``strategy.vectorize(paths)`` and is not itself modified.
+        bankroll : BankRoll
+            The bankroll every path starts as a copy of: its ``total_funds``,
+            ``percent_bettable`` and ``max_draw_down``. It is not modified.
+        profile : SimulationProfile, optional
+            Counters that accumulate the time and calls spent in each phase of
+            the loop, one call per trial rather than per path.
+
+        Returns
+        -------
+        PathResults
+            Each path's terminal funds, settled bets, trials started, whether a
+            safeguard stopped it and its deepest drawdown. Every weight is 1.
+
+        Raises
+        ------
+        ValueError
+            If the strategy returns a non-finite or out-of-range stake fraction
+            for a running path.
+        NotImplementedError
+            If the strategy keeps state between bets and has no vectorized
+            form; replay its paths' :meth:`bets` with ``ReplaySimulator``
+            instead.
+        """
+        sizer = strategy.vectorize(self.paths)
+        rows = (row for chunk in self._index_chunks() for row in chunk)
+        data = self.data
+
+        def draw():
+            bets = data[next(rows)]
+            return bets[:, 0], bets[:, 1], bets[:, 2], bets[:, 3] == 1
+
+        paths = _run_paths(
+            sizer, bankroll, self.trials, draw, self.transaction_costs, profile
+        )
+        return PathResults(**paths, weights=np.ones(self.paths))
+
+    def _index_chunks(self):
+        """
+        The resampled row numbers, in ``(trials, paths)`` chunks of trials.
+
+        Each chunk is drawn at once: whether every entry starts a new block,
+        and a random start row for every entry that does. An entry's row is
+        the start of its latest block advanced by the trials since, or the
+        previous chunk's last row advanced when no block has started yet.
+        """
+        rows = len(self.data)
+        chunk_trials = max(1, _INDEX_ENTRIES // self.paths)
+        draw = self._block_draws(rows)
+        previous = None
+        for first in range(0, self.trials, chunk_trials):
+            size = min(chunk_trials, self.trials - first)
+            begins, starts = draw(size)
+            if previous is None:
+                begins[0] = True
+
+            steps = np.arange(size)[:, None]
+            latest = np.maximum.accumulate(np.where(begins, steps, -1), axis=0)
+            begun = latest >= 0
+            latest = np.maximum(latest, 0)
+            origin = np.take_along_axis(starts, latest, axis=0)
+            if previous is not None:
+                origin = np.where(begun, origin, previous + 1)
+                latest = np.where(begun, latest, 0)
+            index = (origin + steps - latest) % rows
+            previous = index[-1]
+            yield index
+
+    def _block_draws(self, rows):
+        """
+        Return ``draw(trials)``, the next rows of block starts and start rows.
+
+        An integer seed, or none, draws every chunk from one generator. A
+        ``SeedSequence`` draws each block of ``_STREAM_PATHS`` paths from its
+        own child stream, a trial at a time and a whole block even where the
+        last one is cut short, so a path's rows depend only on the seed and
+        its index, not on the number of paths or the chunk size.
+        """
+        if not isinstance(self.seed, np.random.SeedSequence):
+            rng = np.random.default_rng(self.seed)
+
+            def draw(trials):
+                begins = rng.random((trials, self.paths)) < 1.0 / self.mean_block_length
+                return begins, rng.integers(0, rows, (trials, self.paths))
+
+            return draw
+
+        streams = [
+            np.random.default_rng(_child_seed(self.seed, block))
+            for block in range(-(-self.paths // _STREAM_PATHS))
+        ]
+
+        def draw(trials):
+            uniforms = np.concatenate(
+                [rng.random((trials, 2, _STREAM_PATHS)) for rng in streams], axis=2
+            )[:, :, : self.paths]
+            begins = uniforms[:, 0] < 1.0 / self.mean_block_length
+            # Rounding can carry u * rows up to rows itself for u just below 1.
+            starts = np.minimum((uniforms[:, 1] * rows).astype(np.int64), rows - 1)
+            return begins, starts
+
+        return draw
+
+
+def _source_array(source, columns):
+    """The recorded bets as a validated ``(rows, 4)`` float array."""
+    columns = dict(columns or {})
+    unknown = set(columns) - set(REPLAY_COLUMNS)
+    if unknown:
+        raise ValueError(
+            f"Unknown bootstrap column roles {sorted(unknown)}; expected "
+            f"some of {list(REPLAY_COLUMNS)}"
+        )
+
+    if isinstance(source, pd.DataFrame):
+        names = [columns.get(role, role) for role in REPLAY_COLUMNS]
+        missing = [name for name in names if name not in source.columns]
+        if missing:
+            raise ValueError(f"Bootstrap source is missing columns {missing}")
+        data = np.column_stack([_column(source, name) for name in names])
+    else:
+        if isinstance(source, (str, os.PathLike)):
+            source = np.load(Path(os.fspath(source)), mmap_mode="r")
+        data = source
+        if not isinstance(data, np.ndarray) or data.ndim != 2 or data.shape[1] != 4:
+            raise ValueError(
+                "Bootstrap source array must have shape (rows, 4), with columns "
+                f"{list(REPLAY_COLUMNS)}"
+            )
+        if data.dtype != np.float64:
+            data = data.astype(np.float64)
+
+    if not len(data):
+        raise ValueError("Bootstrap source must not be empty")
+    for offset in range(0, len(data), _VALIDATION_ROWS):
+        chunk = np.asarray(data[offset : offset + _VALIDATION_ROWS])
+        _validate_chunk(*chunk.T, offset=offset, source="Bootstrap")
+    return data
@@ -0,0 +1,341 @@
+import statistics
+
+import numpy as np
+
+from keeks.utils import (
+    _TRUSTED,
+    RuinError,
+    _require_finite,
+    _update_strategy_bankroll,
+    _validate_simulator_controls,
+    _validate_simulator_seed,
+    _validate_stake_fractions,
+    _validate_strategy_odds,
+)
+
+from .profiling import _instrument
+
+COPULAS = ("gaussian", "t")
+
+# Normal draws generated at a time, in (trials, markets) entries.
+_DRAW_ENTRIES = 1 << 20
+
+
+class CorrelatedMarketSimulator:
+    """
+    Simulator that settles a bet on every one of several correlated markets per trial.
+
+    Each trial offers one bet on each market at once, all at the same odds but
+    each with its own win probability, and their outcomes are dependent: market
+    ``i`` wins when its coordinate of a correlated latent draw falls below the
+    quantile that gives it probability ``probabilities[i]``. The latent draw
+    comes from a Gaussian copula, or from a Student t copula whose shared
+    scale makes markets lose together more often in the tails. The correlation
+    matrix is factored once when the simulator is built, and latent draws for
+    many trials are generated together from that factor.
+
+    The strategy sizes every market against the same bankroll, through its
+    ``evaluate_batch`` where it has one. If the stake fractions add up to more
+    than 1 they are scaled down together so the trial's stakes never exceed
+    the bettable funds. The trial's bets settle together as one net deposit or
+    withdrawal, each charged its own flat fee.
+
+    Parameters
+    ----------
+    payoff : float
+        The amount won per unit bet on a successful outcome, in every market.
+    loss : float
+        The amount lost per unit bet on an unsuccessful outcome, in every
+        market.
+    transaction_costs : float
+        The flat fee charged once per settled bet, regardless of outcome. This is
+        an absolute bankroll amount, not a fraction of the stake, so it does not
+        scale with bet size: it is subtracted from a winning settlement and added
+        to a losing one. Note this differs in unit from the singular
+        ``transaction_cost`` taken by strategies in ``keeks.binary_strategies``,
+        which is a per-unit fraction of the bet used for sizing.
+    probabilities : array-like of float
+        Each market's probability of a successful outcome, within ``[0, 1]``.
+    correlation : array-like of float
+        The ``(markets, markets)`` correlation matrix of the copula: symmetric
+        and positive semidefinite with a unit diagonal.
+    trials : int, default=1000
+        The number of trials, each settling one bet per market.
+    copula : {"gaussian", "t"}, default="gaussian"
+        The dependence between markets' outcomes. The t copula needs the
+        optional ``scipy`` dependency for its quantiles.
+    degrees_of_freedom : float, default=4.0
+        The degrees of freedom of the t copula; smaller values mean stronger
+        tail dependence. Ignored by the Gaussian copula.
+    seed : int, numpy.random.SeedSequence or None, default=None
+        Seed for the latent draws. When omitted, every run draws fresh
+        outcomes.
+
+    Raises
+    ------
+    ValueError
+        If ``payoff`` is not finite and positive, if ``loss`` or
+        ``transaction_costs`` is not finite and nonnegative, if a probability
+        is not finite within ``[0, 1]``, if ``correlation`` is not a valid
+        correlation matrix for the markets, if ``trials`` is not a nonnegative
+        integer, if ``copula`` is unknown, if ``degrees_of_freedom`` is not
+        finite and greater than 0, or if ``seed`` is not a nonnegative integer,
+        a ``SeedSequence`` or ``None``.
+    ImportError
+        If ``copula`` is ``"t"`` and ``scipy`` is not installed.
+
+    Examples
+    --------
+    >>> from keeks.bankroll import BankRoll
+    >>> from keeks.binary_strategies import FixedFractionStrategy
+    >>> simulator = CorrelatedMarketSimulator(
+    ...     payoff=1.0, loss=1.0, transaction_costs=0.0,
+    ...     probabilities=[0.55, 0.6], correlation=[[1.0, 0.5], [0.5, 1.0]],
+    ...     trials=100, seed=1,
+    ... )
+    >>> outcomes = simulator.outcomes()
+    >>> outcomes.shape
+    (100, 2)
+    >>> strategy = FixedFractionStrategy(
+    ...     fraction=0.05, payoff=1.0, loss=1.0, transaction_cost=0.0
+    ... )
+    >>> bankroll = BankRoll(1000.0, max_draw_down=None)
+    >>> simulator.evaluate_strategy(strategy, bankroll)
+    >>> len(bankroll.history)
+    101
+    """
+
+    def __init__(
+        self,
+        payoff,
+        loss,
+        transaction_costs,
+        probabilities,
+        correlation,
+        trials=1000,
+        copula="gaussian",
+        degrees_of_freedom=4.0,
+        seed=None,
+    ):
+        (
+            self.payoff,
+            self.loss,
+            self.transaction_costs,
+            self.trials,
+        ) = _validate_simulator_controls(payoff, loss, transaction_costs, trials)
+        self.probabilities = _validate_probabilities(probabilities)
+        self.markets = len(self.probabilities)
+        self.correlation = _validate_correlation(correlation, self.markets)
+        if copula not in COPULAS:
+            raise ValueError(f"Copula must be one of {list(COPULAS)}, got {copula!r}")
+        self.copula = copula
+        degrees_of_freedom = _require_finite(degrees_of_freedom, "Degrees of freedom")
+        if degrees_of_freedom <= 0:
+            raise ValueError("Degrees of freedom must be greater than 0")
+        self.degrees_of_freedom = degrees_of_freedom
+        self.seed = _validate_simulator_seed(seed)
+        self._factor = _correlation_factor(self.correlation)
+        self._thresholds = self._quantiles()
+
+    def outcomes(self):
+        """
+        Return the outcomes a seeded run settles against.
+
+        Returns
+        -------
+        numpy.ndarray of bool
+            ``(trials, markets)``, true where that market's bet on that trial
+            wins. Without a seed every call, like every run, draws afresh.
+        """
+        chunks = list(self._outcome_chunks())
+        if not chunks:
+            return np.empty((0, self.markets), dtype=bool)
+        return np.concatenate(chunks)
+
+    def evaluate_strategy(self, strategy, bankroll, profile=None):
+        """
+        Evaluate a betting strategy on every market over the trials.
+
+        For each trial the strategy is asked for a stake fraction per market
+        with ``bankroll.total_funds``, the fractions are scaled down together
+        if they add up to more than 1, and every market's bet settles at once
+        against the bankroll. The simulation stops early if the bankroll is
+        depleted (bankruptcy) or the net settlement trips a bankroll
+        safeguard.
+
+        Parameters
+        ----------
+        strategy : BaseStrategy
+            The betting strategy to evaluate. Each market is sized with
+            ``strategy.evaluate_batch(probabilities, total_funds)`` when the
+            strategy has it, and with one ``evaluate`` call per market
+            otherwise. A ``record_result`` hook hears each settled bet in
+            market order.
+        bankroll : BankRoll
+            The bankroll to use for the simulation.
+        profile : SimulationProfile, optional
+            Counters that accumulate the time and calls spent in each phase of
+            the loop, one call per trial rather than per market.
+
+        Returns
+        -------
+        None
+            The bankroll object is updated in-place with the results of the simulation.
+
+        Raises
+        ------
+        ValueError
+            If ``strategy`` is a ``BaseStrategy`` whose ``payoff`` or ``loss``
+            differs from this simulator's, or if the strategy returns a
+            non-finite or out-of-range stake fraction.
+        """
+        _validate_strategy_odds(strategy, self.payoff, self.loss)
+        probabilities = self.probabilities
+        evaluate_batch = getattr(strategy, "evaluate_batch", None)
+        if not callable(evaluate_batch):
+
+            def evaluate_batch(probabilities, current_bankroll):
+                return [
+                    strategy.evaluate(probability, current_bankroll)
+                    for probability in probabilities.tolist()
+                ]
+
+        validate = (
+            (lambda stakes: np.asarray(stakes, dtype=float))
+            if _TRUSTED.get()
+            else _validate_stake_fractions
+        )
+        record_result = getattr(strategy, "record_result", None)
+        record_result = (
+            _instrument(profile, "record", record_result)
+            if callable(record_result)
+            else None
+        )
+        rows = (row for chunk in self._outcome_chunks() for row in chunk)
+        draw = _instrument(profile, "draw", lambda: next(rows))
+        update = _instrument(profile, "update", _update_strategy_bankroll)
+        evaluate = _instrument(profile, "evaluate", evaluate_batch)
+        validate = _instrument(profile, "validate", validate)
+        deposit = _instrument(profile, "settle", bankroll.deposit)
+        withdraw = _instrument(profile, "settle", bankroll.withdraw)
+        fee = self.transaction_costs
+
+        for _ in range(self.trials):
+            current_bankroll = bankroll.total_funds
+
+            # Stop if bankrupt
+            if current_bankroll <= 0:
+                break
+
+            update(strategy, current_bankroll)
+            proportions = validate(evaluate(probabilities, current_bankroll))
+            won = draw()
+
+            total = float(proportions.sum())
+            if total <= 0:
+                continue
+            if total > 1:
+                # Jointly the stakes may not exceed the bettable funds.
+                proportions = proportions / total
+            betting = proportions > 0
+            stakes = bankroll.bettable_funds * proportions
+            amounts = np.where(
+                won, self.payoff * stakes - fee, -(self.loss * stakes + fee)
+            )
+            net = float(amounts[betting].sum())
+            try:
+                if net >= 0:
+                    deposit(net)
+                else:
+                    withdraw(-net)
+            except RuinError:
+                # Settlement exceeded a bankroll safeguard; stop gracefully
+                break
+
+            if record_result is not None:
+                return_pcts = amounts / current_bankroll
+                for market in np.flatnonzero(betting).tolist():
+                    record_result(bool(won[market]), float(return_pcts[market]))
+
+    def _quantiles(self):
+        """Latent thresholds below which each market wins."""
+        probabilities = self.probabilities
+        if self.copula == "t":
+            try:
+                from scipy.stats import t
+            except ImportError as exc:
+                raise ImportError(
+                    "The t copula requires the optional scipy dependency: "
+                    "pip install scipy"
+                ) from exc
+            return t.ppf(probabilities, self.degrees_of_freedom)
+        normal = statistics.NormalDist()
+        return np.array(
+            [
+                -np.inf if p == 0 else np.inf if p == 1 else normal.inv_cdf(p)
+                for p in probabilities.tolist()
+            ]
+        )
+
+    def _outcome_chunks(self):
+        """The outcomes in ``(trials, markets)`` chunks, one latent draw per row."""
+        rng = np.random.default_rng(self.seed)
+        chunk_trials = max(1, _DRAW_ENTRIES // self.markets)
+        for first in range(0, self.trials, chunk_trials):
+            size = min(chunk_trials, self.trials - first)
+            latent = rng.standard_normal((size, self.markets)) @ self._factor.T
+            if self.copula == "t":
+                # One shared scale per trial is what couples the tails.
+                scale = rng.chisquare(self.degrees_of_freedom, size)
+                latent *= np.sqrt(self.degrees_of_freedom / scale)[:, None]
+            yield latent < self._thresholds
+
+
+def _validate_probabilities(probabilities):
+    try:
+        probabilities = np.array(probabilities, dtype=float)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Probabilities must be finite numbers") from exc
+    if probabilities.ndim != 1 or not probabilities.size:
+        raise ValueError("Probabilities must be a non-empty sequence, one per market")
+    if not np.isfinite(probabilities).all():
+        raise ValueError("Probabilities must be finite numbers")
+    if ((probabilities < 0) | (probabilities > 1)).any():
+        raise ValueError("Probabilities must be between 0 and 1")
+    return probabilities
+
+
+def _validate_correlation(correlation, markets):
+    try:
+        correlation = np.array(correlation, dtype=float)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Correlation must be a matrix of finite numbers") from exc
+    if correlation.shape != (markets, markets):
+        raise ValueError(
+            f"Correlation must be a ({markets}, {markets}) matrix, one row and "
+            "column per market"
+        )
+    if not np.isfinite(correlation).all():
+        raise ValueError("Correlation must be a matrix of finite numbers")
+    if not np.allclose(correlation, correlation.T):
+        raise ValueError("Correlation must be symmetric")
+    if not np.allclose(np.diag(correlation), 1.0):
+        raise ValueError("Correlation must have a unit diagonal")
+    return correlation
+
+
+def _correlation_factor(correlation):
+    """
+    A matrix ``L`` with ``L @ L.T == correlation``, computed once per simulator.
+
+    The Cholesky factor when the matrix is positive definite; otherwise, for
+    perfectly correlated markets, the eigenvectors of the positive semidefinite
+    matrix scaled by the square roots of their eigenvalues, ``V * sqrt(w)``.
+    """
+    try:
+        return np.linalg.cholesky(correlation)
+    except np.linalg.LinAlgError:
+        values, vectors = np.linalg.eigh(correlation)
+        if values.min() < -1e-10:
+            raise ValueError("Correlation must be positive semidefinite") from None
+        return vectors * np.sqrt(np.clip(values, 0.0, None))
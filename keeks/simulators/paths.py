@@ -0,0 +1,1017 @@
+import itertools
+import math
+import statistics
+from dataclasses import dataclass
+
+import numpy as np
+
+from keeks.utils import (
+    _TRUSTED,
+    _child_seed,
+    _is_stateless_strategy,
+    _positive_int,
+    _require_finite,
+    _validate_simulator_controls,
+    _validate_simulator_probability,
+    _validate_simulator_seed,
+    _validate_stake_fractions,
+    _validate_strategy_odds,
+)
+
+from .profiling import _instrument
+from .quasi_random import _sobol_outcomes, _validate_qmc_trials
+
+# Beyond this many cents a float has no fractional cents left to round, and the
+# scaled value no longer carries an exact fractional part to test.
+_EXACT_CENTS = 2.0**52
+
+# Outcomes the log-domain engine settles at a time, in (trials, paths) entries.
+_LOG_DOMAIN_ENTRIES = 1 << 18
+
+# The largest relative difference from stepped funds a log-domain path may have.
+_LOG_DOMAIN_DRIFT = 0.01
+
+# Paths per child stream of a SeedSequence seed, and the trials each stream
+# draws at a time for the stepped engine.
+_STREAM_PATHS = 256
+_STREAM_TRIALS = 64
+
+
+@dataclass(frozen=True)
+class PathResults:
+    """
+    Per-path outcome of a :meth:`PathSimulator.evaluate_strategy` run.
+
+    Every attribute but ``antithetic`` and ``qmc_replicates`` is an array with
+    one entry per path, or ``None``.
+
+    Attributes
+    ----------
+    terminal : numpy.ndarray
+        Each path's final ``total_funds``.
+    bets : numpy.ndarray
+        The number of bets each path settled.
+    trials_started : numpy.ndarray
+        The number of trials each path began before it finished or stopped.
+    stopped : numpy.ndarray of bool
+        Whether a settlement on the path was refused by the bankruptcy or
+        drawdown safeguard, which ends the path as it ends a scalar run.
+    max_drawdown : numpy.ndarray
+        The deepest fall of the path's ``total_funds`` below its running peak,
+        as a fraction of that peak.
+    weights : numpy.ndarray
+        Each path's likelihood ratio: the probability of its outcomes under the
+        simulator's ``probability`` over their probability under the
+        ``sampling_probability`` they were drawn with. All ones when outcomes
+        are drawn at ``probability`` itself.
+    control : numpy.ndarray or None
+        Each path's wins among the outcomes drawn for it, less their known
+        expectation ``probability * draws``, so it has mean zero; see
+        :meth:`mean`. The log growth of any fixed-fraction bet on the path,
+        ``log(1 + f * payoff)`` per win and ``log(1 - f * loss)`` per loss, is
+        this times a constant plus its known mean, so it is the same control
+        variate. ``None`` when outcomes are tilted, since its mean under the
+        tilted draws is not zero.
+    antithetic : bool
+        Whether the second half of the paths was drawn from the mirrored
+        uniforms of the first half, path ``i`` pairing with path
+        ``i + paths // 2``.
+    qmc_replicates : int or None
+        The number of independently scrambled Sobol' sequences the paths were
+        drawn from, each a contiguous block of ``paths // qmc_replicates``
+        paths, or ``None`` for pseudo-random paths.
+    """
+
+    terminal: np.ndarray
+    bets: np.ndarray
+    trials_started: np.ndarray
+    stopped: np.ndarray
+    max_drawdown: np.ndarray
+    weights: np.ndarray
+    control: np.ndarray | None = None
+    antithetic: bool = False
+    qmc_replicates: int | None = None
+
+    def estimate(self, events, confidence=0.95):
+        """
+        Estimate the probability of an event from these paths.
+
+        Each path counts with its likelihood ratio, so the estimate is unbiased
+        for the event's probability under the simulator's ``probability`` even
+        when the outcomes were drawn from a tilted ``sampling_probability``.
+
+        Parameters
+        ----------
+        events : array-like of bool
+            Whether the event happened on each path, for example
+            ``results.stopped`` or ``results.max_drawdown >= 0.5``.
+        confidence : float, default=0.95
+            The coverage of the normal confidence interval.
+
+        Returns
+        -------
+        TailEstimate
+            The estimate, its standard error and confidence interval.
+
+        Raises
+        ------
+        ValueError
+            If ``events`` does not have one entry per path, or if
+            ``confidence`` is not strictly between 0 and 1.
+        """
+        events = self._per_path(events, bool, "Events")
+        z = _normal_quantile(confidence)
+
+        weighted = np.where(events, self.weights, 0.0)
+        probability = float(weighted.mean())
+        standard_error = self._standard_error(weighted)
+        hit_weights = self.weights[events]
+        effective_hits = (
+            float(hit_weights.sum() ** 2 / (hit_weights**2).sum())
+            if hit_weights.size
+            else 0.0
+        )
+        return TailEstimate(
+            probability=probability,
+            standard_error=standard_error,
+            lower=max(0.0, probability - z * standard_error),
+            upper=min(1.0, probability + z * standard_error),
+            confidence=confidence,
+            hits=int(events.sum()),
+            effective_hits=effective_hits,
+        )
+
+    def mean(self, values, control=False, confidence=0.95):
+        """
+        Estimate the expected value of a per-path quantity.
+
+        The paths are weighted by their likelihood ratios. Antithetic pairs and
+        quasi-Monte Carlo replicates are averaged into one unit each first,
+        since the paths within one are not independent. With ``control``, the regression of the units on their
+        :attr:`control` is subtracted: terminal wealth and the
+        fixed-fraction log growth rise and fall with the same wins, so most of
+        the luck of the draw cancels while the mean stays the same. The
+        coefficient is estimated from the same paths, a bias that shrinks as
+        ``1 / paths``.
+
+        Parameters
+        ----------
+        values : array-like of float
+            One value per path, for example ``results.terminal``.
+        control : bool, default=False
+            Whether to apply the control-variate correction.
+        confidence : float, default=0.95
+            The coverage of the normal confidence interval.
+
+        Returns
+        -------
+        MeanEstimate
+            The estimate, its standard error and confidence interval, and the
+            variance reduction it achieved over independent paths.
+
+        Raises
+        ------
+        ValueError
+            If ``values`` does not have one finite entry per path, if
+            ``confidence`` is not strictly between 0 and 1, or if ``control``
+            is requested on tilted paths.
+        """
+        values = self._per_path(values, float, "Values")
+        if not np.isfinite(values).all():
+            raise ValueError("Values must be finite")
+        z = _normal_quantile(confidence)
+        if control and self.control is None:
+            raise ValueError("Control variates need untilted paths")
+
+        weighted = self.weights * values
+        plain = (
+            float(weighted.var(ddof=1)) / len(weighted)
+            if len(weighted) > 1
+            else math.inf
+        )
+        units = self._units(weighted)
+        if control:
+            controls = self._units(self.control)
+            covariance = np.cov(units, controls)
+            if covariance[1, 1] > 0:
+                units = units - covariance[0, 1] / covariance[1, 1] * controls
+        mean = float(units.mean())
+        standard_error = (
+            float(units.std(ddof=1)) / math.sqrt(len(units))
+            if len(units) > 1
+            else math.inf
+        )
+        return MeanEstimate(
+            mean=mean,
+            standard_error=standard_error,
+            lower=mean - z * standard_error,
+            upper=mean + z * standard_error,
+            confidence=confidence,
+            variance_reduction=(
+                plain / standard_error**2 if standard_error > 0 else math.inf
+            ),
+        )
+
+    def _per_path(self, values, dtype, name):
+        values = np.asarray(values, dtype=dtype)
+        if values.shape != self.weights.shape:
+            raise ValueError(f"{name} must have one entry per path")
+        return values
+
+    def _units(self, values):
+        """The independent units of ``values``: paths, or pair or replicate means."""
+        if self.qmc_replicates is not None:
+            return values.reshape(self.qmc_replicates, -1).mean(axis=1)
+        if not self.antithetic:
+            return values
+        half = len(values) // 2
+        return (values[:half] + values[half:]) / 2
+
+    def _standard_error(self, weighted):
+        """The standard error of ``weighted.mean()``."""
+        units = self._units(weighted)
+        if len(units) < 2:
+            return math.inf
+        return float(units.std(ddof=1)) / math.sqrt(len(units))
+
+
+@dataclass(frozen=True)
+class TailEstimate:
+    """
+    A probability estimated by :meth:`PathResults.estimate`.
+
+    Attributes
+    ----------
+    probability : float
+        The likelihood-weighted fraction of paths on which the event happened.
+    standard_error : float
+        The standard error of ``probability``.
+    lower, upper : float
+        The normal confidence interval at ``confidence``, clipped to
+        ``[0, 1]``. With no hits it collapses to ``[0, 0]``: the paths show
+        the event is rare, not how rare.
+    confidence : float
+        The coverage of the interval.
+    hits : int
+        The number of paths on which the event happened.
+    effective_hits : float
+        How many equally weighted hits the weighted ones are worth,
+        ``sum(w) ** 2 / sum(w ** 2)`` over the hits. Far fewer than ``hits``
+        means a few paths dominate the estimate and the tilt is too strong.
+    """
+
+    probability: float
+    standard_error: float
+    lower: float
+    upper: float
+    confidence: float
+    hits: int
+    effective_hits: float
+
+
+@dataclass(frozen=True)
+class MeanEstimate:
+    """
+    An expected value estimated by :meth:`PathResults.mean`.
+
+    Attributes
+    ----------
+    mean : float
+        The estimate.
+    standard_error : float
+        The standard error of ``mean``.
+    lower, upper : float
+        The normal confidence interval at ``confidence``.
+    confidence : float
+        The coverage of the interval.
+    variance_reduction : float
+        The variance of a plain mean over as many independent, uncorrected
+        paths, divided by the variance of this estimate: how many times more
+        paths the plain estimate would need for the same standard error.
+    """
+
+    mean: float
+    standard_error: float
+    lower: float
+    upper: float
+    confidence: float
+    variance_reduction: float
+
+
+class PathSimulator:
+    """
+    Simulator that steps many independent paths of repeated bets together.
+
+    Every path is the game of ``RepeatedBinarySimulator``: ``trials`` bets at a
+    fixed ``probability``, settled against its own copy of a bankroll. Instead
+    of one Python loop iteration per trial per path, each trial sizes and
+    settles every path with a handful of array operations, using the
+    strategy's ``vectorize`` form. Stateless strategies vectorize through
+    ``evaluate_batch``; ``CPPIStrategy`` keeps its floor and peak per path and
+    ``DynamicBankrollManagement`` its window of recent results.
+
+    Each path's outcome for trial *t* is drawn whether or not that path bets,
+    so path *i* meets the same outcomes whatever the strategy, and runs with
+    the same ``seed`` compare strategies on common random numbers. This is the
+    one difference from ``RepeatedBinarySimulator``, which only draws when a bet
+    is placed: a path here is exactly what ``ReplaySimulator`` produces when it
+    replays that path's outcomes, down to the cent.
+
+    Rare events such as ruin under a conservative strategy may never happen in
+    a feasible number of paths. Given a ``sampling_probability``, outcomes are
+    drawn at that win probability instead, typically a lower one so that
+    losing runs are common, and each path carries its likelihood ratio in
+    ``PathResults.weights``. :meth:`PathResults.estimate` weights the paths by
+    it, which makes its estimates unbiased for the true ``probability``
+    (importance sampling with an exponentially tilted outcome distribution).
+    Only the outcomes of bets a path placed enter its weight.
+
+    Two variance reductions cut the paths a mean needs. With ``antithetic``,
+    the second half of the paths is drawn from ``1 - u`` for the uniforms ``u``
+    of the first half, so a lucky path is paired with an unlucky one. And
+    :meth:`PathResults.mean` can correct a per-path quantity with a control
+    variate whose mean is known exactly: the path's fixed-fraction log growth.
+    Each estimate reports the variance reduction it achieved.
+
+    Given ``qmc_replicates``, the outcomes come from scrambled Sobol'
+    sequences instead of pseudo-random draws (randomized quasi-Monte Carlo):
+    each path is one point of a sequence with one dimension per trial, so the
+    paths cover the space of outcome sequences far more evenly than
+    independent draws. The paths are split among ``qmc_replicates``
+    independently scrambled sequences, and the spread of the replicate means
+    gives the error bars. Smooth statistics such as the mean log growth
+    converge much faster than ``1 / sqrt(paths)``. This needs the optional
+    ``scipy`` dependency.
+
+    With ``log_domain``, a stateless strategy is not stepped trial by trial at
+    all. Its stake fraction ``f`` at a fixed probability never changes, so
+    every win multiplies a path's funds by ``1 + f * payoff`` and every loss by
+    ``1 - f * loss``, and a block of trials is one cumulative sum of log
+    returns over a ``(trials, paths)`` matrix of outcomes, with the deepest
+    drawdown taken from its running maxima. Whether the drawdown or bankruptcy
+    safeguard refuses a loss then depends on ``f`` alone, so a path either
+    stops at its first loss, found by a vectorized scan, or never does. The
+    outcomes are the stepped run's, but stakes are sized from the exact funds
+    rather than from funds rounded to the cent before every bet, so funds
+    agree with the stepped run to within 1% and usually to a cent or two.
+    Paths that fall to within cents of ruin, drift further than that, or meet
+    a safeguard too close to call are stepped again exactly, as is any run
+    with a flat ``transaction_costs`` fee, which does not scale with the
+    funds, or with a stateful strategy, whose stake does not stay fixed.
+
+    Parameters
+    ----------
+    payoff : float
+        The amount won per unit bet on a successful outcome.
+    loss : float
+        The amount lost per unit bet on an unsuccessful outcome.
+    transaction_costs : float
+        The flat fee charged once per settled bet, regardless of outcome. This is
+        an absolute bankroll amount, not a fraction of the stake, so it does not
+        scale with bet size: it is subtracted from a winning settlement and added
+        to a losing one. Note this differs in unit from the singular
+        ``transaction_cost`` taken by strategies in ``keeks.binary_strategies``,
+        which is a per-unit fraction of the bet used for sizing.
+    probability : float
+        The fixed probability of a successful outcome for all trials.
+    trials : int, default=1000
+        The number of betting trials to simulate on each path.
+    paths : int, default=1000
+        The number of independent paths.
+    seed : int, numpy.random.SeedSequence or None, default=None
+        Seed for the outcome generator. When omitted, every run draws fresh
+        outcomes. A ``SeedSequence`` gives every block of 256 paths its own
+        child stream instead of drawing all of them from one, so a path's
+        outcomes depend only on the seed and the path's index: a run of more
+        paths or trials extends a run of fewer bit for bit. With
+        ``antithetic`` this holds for the first half of the paths, which the
+        second half mirrors.
+    sampling_probability : float or None, default=None
+        The win probability outcomes are drawn with, strictly between 0 and 1.
+        For even-money bets, ``1 - probability`` reverses the drift and is a
+        good start for ruin and drawdown events. By default outcomes are drawn
+        at ``probability`` and every weight is 1.
+    antithetic : bool, default=False
+        Draw the second half of the paths from the mirrored uniforms of the
+        first half. ``paths`` must then be even.
+    qmc_replicates : int or None, default=None
+        Draw the outcomes from this many independently scrambled Sobol'
+        sequences, each giving a power-of-two share of the ``paths``. Eight to
+        thirty-two replicates are enough for error bars. ``trials`` may then
+        be at most 21201, the dimensions the sequence supports. By default
+        outcomes are pseudo-random.
+    log_domain : bool, default=False
+        Simulate stateless strategies with the log-domain engine when
+        ``transaction_costs`` is zero, trading agreement to the cent for a few
+        array passes per block of trials. Other runs are stepped as usual.
+
+    Raises
+    ------
+    ValueError
+        If ``payoff`` is not finite and positive, if ``loss`` or
+        ``transaction_costs`` is not finite and nonnegative, if ``probability``
+        is not finite within ``[0, 1]``, if ``trials`` is not a nonnegative
+        integer, if ``paths`` is not a positive integer, if ``seed`` is not
+        a nonnegative integer, a ``SeedSequence`` or ``None``, if
+        ``sampling_probability`` is
+        not strictly between 0 and 1, if ``antithetic`` is set with an odd
+        number of paths or together with ``qmc_replicates``, if
+        ``qmc_replicates`` is not a positive integer that leaves a power of
+        two paths per replicate, or if there are too many ``trials`` for the
+        Sobol' sequence.
+    ImportError
+        If ``qmc_replicates`` is set and ``scipy`` is not installed. This is
+        raised when the outcomes are drawn.
+
+    Examples
+    --------
+    >>> from keeks.bankroll import BankRoll
+    >>> from keeks.binary_strategies import CPPIStrategy
+    >>> simulator = PathSimulator(
+    ...     payoff=1.0, loss=1.0, transaction_costs=0.0, probability=0.55,
+    ...     trials=200, paths=500, seed=1,
+    ... )
+    >>> strategy = CPPIStrategy(
+    ...     floor_fraction=0.8, multiplier=2.0, initial_bankroll=1000.0,
+    ...     payoff=1.0, loss=1.0,
+    ... )
+    >>> results = simulator.evaluate_strategy(strategy, BankRoll(1000.0))
+    >>> results.terminal.shape
+    (500,)
+    >>> bool(results.terminal.min() >= 800.0)
+    True
+    """
+
+    def __init__(
+        self,
+        payoff,
+        loss,
+        transaction_costs,
+        probability,
+        trials=1000,
+        paths=1000,
+        seed=None,
+        sampling_probability=None,
+        antithetic=False,
+        qmc_replicates=None,
+        log_domain=False,
+    ):
+        (
+            self.payoff,
+            self.loss,
+            self.transaction_costs,
+            self.trials,
+        ) = _validate_simulator_controls(payoff, loss, transaction_costs, trials)
+        self.probability = _validate_simulator_probability(probability, "Probability")
+        self.paths = _positive_int(paths, "Paths")
+        self.seed = _validate_simulator_seed(seed)
+        if sampling_probability is not None:
+            sampling_probability = _require_finite(
+                sampling_probability, "Sampling probability"
+            )
+            if not 0 < sampling_probability < 1:
+                raise ValueError(
+                    "Sampling probability must be strictly between 0 and 1"
+                )
+        self.sampling_probability = sampling_probability
+        antithetic = bool(antithetic)
+        if antithetic and self.paths % 2:
+            raise ValueError("Paths must be even for antithetic pairs")
+        self.antithetic = antithetic
+        if qmc_replicates is not None:
+            qmc_replicates = _positive_int(qmc_replicates, "QMC replicates")
+            if antithetic:
+                raise ValueError(
+                    "Antithetic paths cannot be combined with QMC replicates"
+                )
+            points, remainder = divmod(self.paths, qmc_replicates)
+            if remainder or points & (points - 1):
+                raise ValueError("Paths per QMC replicate must be a whole power of two")
+            _validate_qmc_trials(self.trials, 1)
+        self.qmc_replicates = qmc_replicates
+        self.log_domain = bool(log_domain)
+
+    def outcomes(self):
+        """
+        Return the outcomes a seeded run settles against.
+
+        Returns
+        -------
+        numpy.ndarray of bool
+            ``(trials, paths)``, true where the bet on that trial of that path
+            wins, drawn at ``sampling_probability`` when one is set. Without a
+            seed every call, like every run, draws afresh.
+        """
+        if self.qmc_replicates is not None:
+            return _sobol_outcomes(
+                self.trials,
+                self.paths,
+                self.qmc_replicates,
+                self.seed,
+                self._draw_probability,
+            )
+        return self._outcome_rows(self._uniform_source(self.seed), self.trials)
+
+    def evaluate_strategy(self, strategy, bankroll, profile=None):
+        """
+        Evaluate a betting strategy on every path.
+
+        Parameters
+        ----------
+        strategy : BaseStrategy
+            The betting strategy to evaluate. It is vectorized with
+            ``strategy.vectorize(paths)`` and is not itself modified.
+        bankroll : BankRoll
+            The bankroll every path starts as a copy of: its ``total_funds``,
+            ``percent_bettable`` and ``max_draw_down``. It is not modified.
+        profile : SimulationProfile, optional
+            Counters that accumulate the time and calls spent in each phase of
+            the loop, one call per trial rather than per path. The log-domain
+            engine counts one ``evaluate`` call per run and one ``draw`` and
+            ``settle`` call per block of trials.
+
+        Returns
+        -------
+        PathResults
+            Each path's terminal funds, settled bets, trials started, whether a
+            safeguard stopped it, its deepest drawdown and its likelihood ratio.
+
+        Raises
+        ------
+        ValueError
+            If ``strategy`` is a ``BaseStrategy`` whose ``payoff`` or ``loss``
+            differs from this simulator's, or if the strategy returns a
+            non-finite or out-of-range stake fraction for a running path.
+        NotImplementedError
+            If the strategy keeps state between bets and has no vectorized
+            form.
+        """
+        _validate_strategy_odds(strategy, self.payoff, self.loss)
+        sizer = strategy.vectorize(self.paths)
+        if (
+            self.log_domain
+            and self.transaction_costs == 0
+            and _is_stateless_strategy(strategy)
+        ):
+            paths, wins, log_weight = self._log_domain_paths(
+                strategy, sizer, bankroll, profile
+            )
+        else:
+            paths, wins, log_weight = self._stepped_paths(sizer, bankroll, profile)
+        # Every trial that began drew an outcome for every path.
+        draws = int(paths["trials_started"].max())
+        return PathResults(
+            **paths,
+            weights=np.exp(log_weight),
+            control=(
+                wins - self.probability * draws
+                if self.sampling_probability is None
+                else None
+            ),
+            antithetic=self.antithetic,
+            qmc_replicates=self.qmc_replicates,
+        )
+
+    def _stepped_paths(self, sizer, bankroll, profile, outcomes=None):
+        """
+        Step every path of ``sizer`` trial by trial through ``_run_paths``.
+
+        ``outcomes()`` returns the next trial's outcome for each of the
+        sizer's paths; by default they are drawn from the simulator's seed.
+        """
+        if outcomes is None:
+            outcomes = self._outcome_drawer(self.seed)
+
+        # Per-outcome log likelihood ratios; zero unless outcomes are tilted.
+        log_ratio_won, log_ratio_lost = self._log_ratios()
+        log_weight = np.zeros(sizer.paths)
+        wins = np.zeros(sizer.paths, dtype=np.int64)
+
+        def draw():
+            return self.probability, self.payoff, self.loss, outcomes()
+
+        def observe(won, betting):
+            wins[:] += won
+            if log_ratio_won or log_ratio_lost:
+                log_weight[:] += np.where(
+                    betting, np.where(won, log_ratio_won, log_ratio_lost), 0.0
+                )
+
+        paths = _run_paths(
+            sizer,
+            bankroll,
+            self.trials,
+            draw,
+            self.transaction_costs,
+            profile,
+            observe,
+        )
+        return paths, wins, log_weight
+
+    def _log_domain_paths(self, strategy, sizer, bankroll, profile):
+        """
+        Settle a fixed stake fraction over blocks of trials by cumulative sums.
+
+        Returns the same ``(paths, wins, log_weight)`` as ``_stepped_paths``.
+        Paths whose bankruptcy or safeguard decisions the multiplicative model
+        cannot settle with certainty are stepped again exactly.
+        """
+        validate = (
+            (lambda stakes: stakes) if _TRUSTED.get() else _validate_stake_fractions
+        )
+        draw = _instrument(profile, "draw", self._outcome_blocks)
+        evaluate = _instrument(profile, "evaluate", sizer.evaluate)
+        settle = _instrument(profile, "settle", _settle_log_domain)
+
+        # Every pass over the outcomes must see the same ones.
+        seed = self.seed if self.seed is not None else np.random.SeedSequence().entropy
+        paths = self.paths
+        funds = float(bankroll.total_funds)
+        total = _round_cents(np.full(paths, funds))
+        proportion = np.zeros(paths)
+        if total[0] > 0:
+            proportion = np.asarray(
+                validate(evaluate(self.probability, total)), dtype=float
+            )
+
+        # A lost bet takes ``exposure`` of the funds, and is refused if that is
+        # more than ``limit``, so a path stops at its first loss or never.
+        percent_bettable = bankroll.percent_bettable
+        stake = percent_bettable * proportion
+        exposure = self.loss * stake
+        limit = 1.0
+        if bankroll.max_draw_down is not None:
+            limit = min(limit, bankroll.max_draw_down)
+        with np.errstate(divide="ignore"):
+            log_won = np.log1p(self.payoff * stake)
+            log_lost = np.log1p(-np.minimum(exposure, 1.0))
+
+        log_start = np.log(funds) if total[0] > 0 else -np.inf
+        state = {
+            "log_bank": np.full(paths, log_start),
+            "log_peak": np.full(paths, log_start),
+            "log_low": np.full(paths, log_start),
+            "log_drawdown": np.zeros(paths),
+            "inverse_funds": np.zeros(paths),
+            "running": total > 0,
+            "stopped": np.zeros(paths, dtype=bool),
+            "bets": np.zeros(paths, dtype=np.int64),
+            "trials_started": np.zeros(paths, dtype=np.int64),
+        }
+        betting = proportion > 0
+        log_ratio_won, log_ratio_lost = self._log_ratios()
+        log_weight = np.zeros(paths)
+        wins = np.zeros(paths, dtype=np.int64)
+
+        for won in draw(seed):
+            if not state["running"].any():
+                break
+            started = settle(state, won, log_won, log_lost, exposure > limit, betting)
+            # The stepped engine draws a trial's outcomes only if a path began it.
+            wins += won[: started.max()].sum(axis=0)
+            if log_ratio_won or log_ratio_lost:
+                bet = (np.arange(len(won))[:, None] < started) & betting
+                won_bets = (won & bet).sum(axis=0)
+                lost_bets = bet.sum(axis=0) - won_bets
+                log_weight += won_bets * log_ratio_won + lost_bets * log_ratio_lost
+
+        terminal = _round_cents(np.exp(state["log_bank"]))
+        results = {
+            "terminal": terminal,
+            "bets": state["bets"],
+            "trials_started": state["trials_started"],
+            "stopped": state["stopped"],
+            "max_drawdown": -np.expm1(state["log_drawdown"]),
+        }
+
+        # The stepped engine stakes from funds rounded to the cent, which moves
+        # its funds up to half a cent per unit staked away from these on every
+        # bet. Relative to the funds after each bet, and doubled for
+        # compounding, that bounds how far apart the engines drift. A path is
+        # kept only if the bound is small and no refusal or bankruptcy check
+        # could have gone the other way within it.
+        low = np.exp(state["log_low"])
+        cent_error = 2 * max(self.payoff, self.loss) * proportion * 0.005
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drift = cent_error * state["inverse_funds"] + 1e-9
+            rounding = 0.01 * exposure / (percent_bettable * low * (1 - drift))
+            exact = (
+                (drift < _LOG_DOMAIN_DRIFT)
+                & (low * (1 - drift) > 0.0051)
+                & (np.abs(exposure - limit) > rounding)
+            )
+        inexact = np.flatnonzero(~exact & (state["trials_started"] > 0))
+        if inexact.size:
+            rows = itertools.chain.from_iterable(
+                block[:, inexact] for block in self._outcome_blocks(seed)
+            )
+            stepped, _, stepped_log_weight = self._stepped_paths(
+                strategy.vectorize(inexact.size),
+                bankroll,
+                profile,
+                lambda: next(rows),
+            )
+            for name, values in stepped.items():
+                results[name][inexact] = values
+            log_weight[inexact] = stepped_log_weight
+            wins = self._count_wins(seed, int(results["trials_started"].max()))
+        return results, wins, log_weight
+
+    def _count_wins(self, seed, draws):
+        """Each path's wins among the first ``draws`` outcomes drawn for it."""
+        wins = np.zeros(self.paths, dtype=np.int64)
+        for won in self._outcome_blocks(seed):
+            if draws <= 0:
+                break
+            wins += won[:draws].sum(axis=0)
+            draws -= len(won)
+        return wins
+
+    def _outcome_blocks(self, seed):
+        """
+        Yield the outcomes drawn from ``seed`` in ``(trials, paths)`` blocks.
+
+        The blocks hold exactly the outcomes ``_outcome_drawer`` returns one
+        trial at a time from the same seed.
+        """
+        block = max(1, _LOG_DOMAIN_ENTRIES // self.paths)
+        if self.qmc_replicates is not None:
+            outcomes = _sobol_outcomes(
+                self.trials,
+                self.paths,
+                self.qmc_replicates,
+                seed,
+                self._draw_probability,
+            )
+            for first in range(0, self.trials, block):
+                yield outcomes[first : first + block]
+            return
+        uniforms = self._uniform_source(seed)
+        for first in range(0, self.trials, block):
+            yield self._outcome_rows(uniforms, min(block, self.trials - first))
+
+    def _outcome_drawer(self, seed):
+        """A callable returning the next trial's outcome for every path."""
+        if self.qmc_replicates is not None:
+            # Sobol' points cannot be drawn a dimension at a time.
+            rows = iter(self.outcomes())
+            return lambda: next(rows)
+        uniforms = self._uniform_source(seed)
+        return lambda: self._outcome_rows(uniforms, 1)[0]
+
+    def _uniform_source(self, seed):
+        """
+        Return ``uniforms(trials)``, drawing the next ``trials`` rows of uniforms.
+
+        A row holds one uniform per path, or per antithetic pair. An integer
+        seed, or none, draws every row from one generator; a ``SeedSequence``
+        draws each block of columns from its own child stream.
+        """
+        columns = self.paths // 2 if self.antithetic else self.paths
+        if isinstance(seed, np.random.SeedSequence):
+            return _PathStreams(seed, columns)
+        rng = np.random.default_rng(seed)
+        return lambda trials: rng.random((trials, columns))
+
+    def _outcome_rows(self, uniforms, trials):
+        """The outcomes of the next ``trials`` trials, as ``(trials, paths)``."""
+        rows = uniforms(trials)
+        if self.antithetic:
+            rows = np.concatenate([rows, 1.0 - rows], axis=1)
+        return rows < self._draw_probability
+
+    @property
+    def _draw_probability(self):
+        if self.sampling_probability is None:
+            return self.probability
+        return self.sampling_probability
+
+    def _log_ratios(self):
+        """Log likelihood ratios of a won and a lost outcome, as ``(won, lost)``."""
+        if self.sampling_probability is None:
+            return 0.0, 0.0
+        sampling = self.sampling_probability
+        with np.errstate(divide="ignore"):
+            return (
+                float(np.log(self.probability) - np.log(sampling)),
+                float(np.log1p(-self.probability) - np.log1p(-sampling)),
+            )
+
+
+class _PathStreams:
+    """
+    Outcome uniforms with one child stream per block of ``_STREAM_PATHS`` columns.
+
+    Called with a number of trials, returns the next ``(trials, columns)`` rows.
+    Each stream fills a whole block a trial at a time, even where the last
+    block is cut short, so a column's uniforms depend only on the seed and the
+    column's index, not on the number of columns or of rows requested at once.
+    Rows are drawn at least ``_STREAM_TRIALS`` at a time and handed out from a
+    buffer, so stepping one trial at a time does not cost a call per stream.
+    """
+
+    def __init__(self, seed, columns):
+        self._streams = [
+            np.random.default_rng(_child_seed(seed, block))
+            for block in range(-(-columns // _STREAM_PATHS))
+        ]
+        self._columns = columns
+        self._buffer = np.empty((0, columns))
+
+    def __call__(self, trials):
+        if trials > len(self._buffer):
+            fresh = max(trials - len(self._buffer), _STREAM_TRIALS)
+            drawn = np.hstack(
+                [rng.random((fresh, _STREAM_PATHS)) for rng in self._streams]
+            )
+            self._buffer = np.concatenate([self._buffer, drawn[:, : self._columns]])
+        rows, self._buffer = self._buffer[:trials], self._buffer[trials:]
+        return rows
+
+
+def _run_paths(sizer, bankroll, trials, draw, fee, profile=None, observe=None):
+    """
+    Step every path of ``sizer`` through ``trials`` bets, settling like ``BankRoll``.
+
+    ``draw()`` returns the next trial's ``(probability, payoff, loss, won)``,
+    each either shared by every path or one entry per path, and
+    ``observe(won, betting)``, when given, sees each trial's outcomes and which
+    paths bet on them. Returns the per-path fields of :class:`PathResults`
+    that do not depend on how the outcomes were drawn.
+    """
+    validate = (lambda stakes: stakes) if _TRUSTED.get() else _validate_stake_fractions
+
+    draw = _instrument(profile, "draw", draw)
+    update = _instrument(profile, "update", sizer.update_bankroll)
+    evaluate = _instrument(profile, "evaluate", sizer.evaluate)
+    validate = _instrument(profile, "validate", validate)
+    settle = _instrument(profile, "settle", _settle)
+    record = _instrument(profile, "record", sizer.record_result)
+
+    paths = sizer.paths
+    bank = np.full(paths, float(bankroll.total_funds))
+    percent_bettable = bankroll.percent_bettable
+    max_draw_down = bankroll.max_draw_down
+    peak = np.zeros(paths)
+    max_drawdown = np.zeros(paths)
+    running = np.ones(paths, dtype=bool)
+    stopped = np.zeros(paths, dtype=bool)
+    bets = np.zeros(paths, dtype=np.int64)
+    trials_started = np.zeros(paths, dtype=np.int64)
+
+    for _ in range(trials):
+        total = _round_cents(bank)
+        # Stop if bankrupt
+        peak = np.maximum(peak, total)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            max_drawdown = np.fmax(max_drawdown, 1.0 - total / peak)
+        running &= total > 0
+        if not running.any():
+            break
+        trials_started += running
+
+        update(total)
+        probability, payoff, loss, won = draw()
+        proportion = evaluate(probability, total)
+        validate(proportion[running])
+
+        betting = running & (proportion > 0)
+        if observe is not None:
+            observe(won, betting)
+        bettable = (
+            total if percent_bettable == 1.0 else _round_cents(bank * percent_bettable)
+        )
+        bank, amount, refused = settle(
+            bank,
+            bettable * proportion,
+            won,
+            betting,
+            payoff,
+            loss,
+            fee,
+            max_draw_down,
+        )
+
+        # Settlement exceeded a bankroll safeguard; stop gracefully
+        stopped |= refused
+        running &= ~refused
+        settled = betting & ~refused
+        bets += settled
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return_pct = np.where(won, amount, -amount) / total
+        record(won, return_pct, settled)
+
+    terminal = _round_cents(bank)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        max_drawdown = np.fmax(max_drawdown, 1.0 - terminal / peak)
+    return {
+        "terminal": terminal,
+        "bets": bets,
+        "trials_started": trials_started,
+        "stopped": stopped,
+        "max_drawdown": max_drawdown,
+    }
+
+
+def _settle(bank, bet_amount, won, betting, payoff, loss, fee, max_draw_down):
+    """
+    Settle one trial's bets on every path the way ``BankRoll`` settles one.
+
+    Returns the new funds, each bet's signed settlement amount as the scalar
+    loop computes it, and which paths had their settlement refused.
+    """
+    amount = np.where(won, payoff * bet_amount - fee, loss * bet_amount + fee)
+    depositing = betting & won & (amount >= 0)
+    withdrawing = betting & ~depositing
+    withdrawal = np.where(won, -amount, amount)
+
+    refused = withdrawing & (bank - withdrawal < 0)
+    if max_draw_down is not None:
+        refused |= withdrawing & (withdrawal > max_draw_down * bank)
+
+    bank = np.where(depositing, bank + amount, bank)
+    bank = np.where(withdrawing & ~refused, bank - withdrawal, bank)
+    return bank, amount, refused
+
+
+def _settle_log_domain(state, won, log_won, log_lost, refuses, betting):
+    """
+    Settle a block of outcomes on every running path of a fixed-fraction run.
+
+    ``state`` holds each path's log funds, running peak, lowest funds, deepest
+    drawdown and counters, and is updated in place. The funds after each trial
+    of the block are one cumulative sum of log returns, and the running maximum
+    of that sum gives the drawdowns. A path whose losses are refused stops at
+    the first loss of the block, found by a first-passage scan, having settled
+    only wins before it. Returns the number of the block's trials each path
+    began.
+    """
+    trials = len(won)
+    running = state["running"]
+    log_funds = np.cumsum(np.where(won, log_won, log_lost), axis=0)
+    log_funds += state["log_bank"]
+    log_peak = np.maximum(np.maximum.accumulate(log_funds, axis=0), state["log_peak"])
+    with np.errstate(invalid="ignore"):
+        log_drawdown = np.fmin(
+            state["log_drawdown"], (log_funds - log_peak).min(axis=0)
+        )
+
+    first = np.full(len(refuses), trials)
+    stopping = np.flatnonzero(running & refuses & betting)
+    if stopping.size:
+        lost = ~won[:, stopping]
+        first[stopping] = np.where(lost.any(axis=0), lost.argmax(axis=0), trials)
+    stops = first < trials
+    # Up to its first loss a stopping path has only won.
+    settled = np.where(stops, state["log_bank"] + first * log_won, log_funds[-1])
+    inverse = np.exp(-log_funds)
+    if stops.any():
+        settling = np.arange(trials)[:, None] < first[stops]
+        inverse[:, stops] = np.where(settling, inverse[:, stops], 0.0)
+
+    def advance(name, values):
+        state[name] = np.where(running, values, state[name])
+
+    advance("log_bank", settled)
+    advance("log_peak", np.where(stops, settled, log_peak[-1]))
+    advance(
+        "log_low",
+        np.where(
+            stops, state["log_low"], np.fmin(state["log_low"], log_funds.min(axis=0))
+        ),
+    )
+    advance("log_drawdown", np.where(stops, state["log_drawdown"], log_drawdown))
+    advance("inverse_funds", state["inverse_funds"] + inverse.sum(axis=0))
+    started = np.where(running, first + stops, 0)
+    state["stopped"] |= running & stops
+    state["bets"] += np.where(running & betting, first, 0)
+    state["trials_started"] += started
+    state["running"] = running & ~stops
+    return started
+
+
+def _round_cents(values):
+    """
+    Round to cents exactly as ``round(value, 2)`` does, elementwise.
+
+    ``BankRoll`` rounds with Python's ``round``, which decides decimal ties on
+    the exact binary value. ``np.round`` scales by 100 first and can land on the
+    other side of a tie, so values within rounding error of a half cent, and any
+    too large to hold a fraction of a cent, are rounded by Python instead.
+    """
+    scaled = values * 100
+    rounded = np.rint(scaled) / 100
+    fraction = np.abs(scaled - np.floor(scaled) - 0.5)
+    exact = (fraction <= np.abs(scaled) * 1e-13) | ~(np.abs(scaled) < _EXACT_CENTS)
+    if exact.any():
+        index = np.flatnonzero(exact)
+        rounded[index] = [round(value, 2) for value in values[index].tolist()]
+    return rounded
+
+
+def _normal_quantile(confidence):
+    """The two-sided normal quantile for a confidence level."""
+    confidence = _require_finite(confidence, "Confidence")
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be strictly between 0 and 1")
+    return statistics.NormalDist().inv_cdf(0.5 + confidence / 2)
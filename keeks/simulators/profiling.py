@@ -0,0 +1,130 @@
+import time
+
+PROFILE_PHASES = ("draw", "update", "evaluate", "validate", "settle", "record")
+
+
+class SimulationProfile:
+    """
+    Per-phase wall-clock counters for a simulation loop.
+
+    Pass an instance as ``profile`` to a simulator's ``evaluate_strategy`` and
+    every call the loop makes is timed with ``time.perf_counter_ns`` and
+    attributed to one of these phases:
+
+    ``draw``
+        Random draws for outcomes and, where the simulator samples them,
+        probabilities.
+    ``update``
+        The strategy's ``update_bankroll`` hook.
+    ``evaluate``
+        ``strategy.evaluate``.
+    ``validate``
+        Stake-fraction validation of what ``evaluate`` returned.
+    ``settle``
+        ``BankRoll`` deposits and withdrawals.
+    ``record``
+        The strategy's ``record_result`` hook.
+
+    Counters accumulate across runs until :meth:`reset`, so one profile can
+    cover every path of a benchmark cell. Without a profile the simulators bind
+    the original callables and the loop carries no timing code at all.
+
+    Examples
+    --------
+    >>> from keeks.bankroll import BankRoll
+    >>> from keeks.binary_strategies import KellyCriterion
+    >>> from keeks.simulators import RepeatedBinarySimulator
+    >>> profile = SimulationProfile()
+    >>> simulator = RepeatedBinarySimulator(
+    ...     payoff=1.0, loss=1.0, transaction_costs=0.0, probability=0.6,
+    ...     trials=50, seed=1,
+    ... )
+    >>> strategy = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    >>> simulator.evaluate_strategy(strategy, BankRoll(1000.0), profile=profile)
+    >>> profile.calls["evaluate"]
+    50
+    """
+
+    def __init__(self):
+        self.elapsed_ns = dict.fromkeys(PROFILE_PHASES, 0)
+        self.calls = dict.fromkeys(PROFILE_PHASES, 0)
+
+    def wrap(self, phase, func):
+        """
+        Return ``func`` wrapped so each call is counted against ``phase``.
+
+        Parameters
+        ----------
+        phase : str
+            One of ``PROFILE_PHASES``.
+        func : callable
+            The callable to time.
+
+        Returns
+        -------
+        callable
+            A function with the same arguments and result as ``func``.
+
+        Raises
+        ------
+        ValueError
+            If ``phase`` is not a known phase.
+        """
+        if phase not in self.elapsed_ns:
+            raise ValueError(
+                f"Unknown profile phase {phase!r}; expected one of "
+                f"{list(PROFILE_PHASES)}"
+            )
+        elapsed_ns, calls = self.elapsed_ns, self.calls
+        clock = time.perf_counter_ns
+
+        def timed(*args):
+            start = clock()
+            try:
+                return func(*args)
+            finally:
+                elapsed_ns[phase] += clock() - start
+                calls[phase] += 1
+
+        return timed
+
+    @property
+    def total_ns(self):
+        """int: Time accumulated across every phase, in nanoseconds."""
+        return sum(self.elapsed_ns.values())
+
+    def reset(self):
+        """Zero every counter."""
+        for phase in PROFILE_PHASES:
+            self.elapsed_ns[phase] = 0
+            self.calls[phase] = 0
+
+    def as_rows(self):
+        """
+        Summarise the counters as one dict per phase.
+
+        Returns
+        -------
+        list of dict
+            Rows with ``phase``, ``calls``, ``total_ms``, ``mean_ns`` and
+            ``share`` (the phase's fraction of the profiled time), in
+            ``PROFILE_PHASES`` order.
+        """
+        total = self.total_ns
+        return [
+            {
+                "phase": phase,
+                "calls": self.calls[phase],
+                "total_ms": self.elapsed_ns[phase] / 1e6,
+                "mean_ns": self.elapsed_ns[phase] / self.calls[phase]
+                if self.calls[phase]
+                else 0.0,
+                "share": self.elapsed_ns[phase] / total if total else 0.0,
+            }
+            for phase in PROFILE_PHASES
+        ]
+
+
+def _instrument(profile, phase, func):
+    """Return ``func`` timed against ``phase``, or untouched without a profile."""
+    return func if profile is None else profile.wrap(phase, func)
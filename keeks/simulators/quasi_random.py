@@ -0,0 +1,113 @@
+"""Scrambled Sobol' draws for the simulators' quasi-Monte Carlo mode."""
+
+import numpy as np
+
+from keeks.utils import _child_seed
+
+# The most dimensions scipy's Sobol' direction numbers cover.
+_MAX_DIMENSIONS = 21201
+
+
+def _sobol_module():
+    try:
+        from scipy.stats import qmc
+    except ImportError as exc:
+        raise ImportError(
+            "Quasi-Monte Carlo simulation requires the optional scipy "
+            "dependency: pip install 'keeks[qmc]'"
+        ) from exc
+    return qmc
+
+
+def _validate_qmc_trials(trials, width):
+    """Check that ``width`` dimensions per trial fit in the Sobol' sequence."""
+    if trials * width > _MAX_DIMENSIONS:
+        raise ValueError(
+            f"Trials must be at most {_MAX_DIMENSIONS // width} "
+            "for quasi-Monte Carlo simulation"
+        )
+
+
+def _sobol_outcomes(trials, paths, replicates, seed, probability):
+    """
+    ``(trials, paths)`` outcomes from independently scrambled Sobol' sequences.
+
+    Each path is one point of a sequence over ``trials`` dimensions, won
+    wherever a coordinate is below ``probability``, and the paths are split
+    into ``replicates`` contiguous blocks drawn from sequences with
+    independent scrambles.
+    """
+    qmc = _sobol_module()
+    points = paths // replicates
+    outcomes = np.empty((trials, paths), dtype=bool)
+    if not trials:
+        return outcomes
+    if isinstance(seed, np.random.SeedSequence):
+        # Spawning would advance the caller's sequence, and the next run's scrambles.
+        children = [_child_seed(seed, replicate) for replicate in range(replicates)]
+    else:
+        children = np.random.SeedSequence(seed).spawn(replicates)
+    for replicate, child in enumerate(children):
+        sampler = qmc.Sobol(d=trials, scramble=True, seed=np.random.default_rng(child))
+        start = replicate * points
+        uniforms = sampler.random(points).T
+        outcomes[:, start : start + points] = uniforms < probability
+    return outcomes
+
+
+class _SobolPaths:
+    """
+    A scrambled Sobol' sequence whose points are whole scalar paths.
+
+    Each point has ``width`` dimensions per trial, so every trial reads the
+    same coordinates of its path's point whether or not it bets, and paths
+    drawn in sequence fill the unit cube evenly.
+    """
+
+    def __init__(self, trials, width, seed):
+        if isinstance(seed, np.random.SeedSequence):
+            seed = np.random.default_rng(seed)
+        self._sampler = _sobol_module().Sobol(
+            d=max(1, trials * width), scramble=True, seed=seed
+        )
+        self._dimensions = trials * width
+        self._width = width
+        self._drawn = 0
+
+    def path(self):
+        """The next point, as one row of ``width`` uniforms per trial."""
+        self._drawn += 1
+        point = self._sampler.random(1)[0, : self._dimensions]
+        return _SobolPath(point, self._width)
+
+    def rewind(self):
+        """Put back the last point, so a rejected run does not consume it."""
+        self._drawn -= 1
+        self._sampler.reset()
+        if self._drawn:
+            self._sampler.fast_forward(self._drawn)
+
+
+class _SobolPath:
+    """One point handed out a trial at a time, as the simulators draw."""
+
+    def __init__(self, point, width):
+        from scipy.special import ndtri
+
+        self._rows = iter(
+            zip(point.reshape(-1, width), ndtri(point).reshape(-1, width), strict=True)
+        )
+        self._uniforms = self._normals = None
+
+    def probability(self, mean, stdev):
+        """Start the next trial and return its normal probability draw."""
+        self._uniforms, self._normals = next(self._rows)
+        return mean + stdev * float(self._normals[0]) if stdev else mean
+
+    def normal(self, mean, stdev):
+        """The current trial's second coordinate as a normal draw."""
+        return mean + stdev * float(self._normals[1]) if stdev else mean
+
+    def uniform(self):
+        """The current trial's outcome uniform, its last coordinate."""
+        return float(self._uniforms[-1])
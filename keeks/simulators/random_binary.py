@@ -5,14 +5,19 @@ import numpy as np
 
 from keeks.utils import (
     RuinError,
+    _outcome_random,
+    _probability_generator,
+    _stake_fraction_validator,
     _update_strategy_bankroll,
     _validate_simulator_controls,
     _validate_simulator_seed,
     _validate_simulator_stdev,
-    _validate_stake_fraction,
     _validate_strategy_odds,
 )
 
+from .profiling import _instrument
+from .quasi_random import _SobolPaths, _validate_qmc_trials
+
 
 class RandomBinarySimulator:
     """
@@ -40,22 +45,41 @@ class RandomBinarySimulator:
     stdev : float, default=0.1
         The standard deviation of the normal distribution used to generate probabilities.
         Samples are clamped to [0.0, 1.0].
-    seed : int or None, default=None
+    seed : int, numpy.random.SeedSequence or None, default=None
         Seed for private outcome and probability generators. When omitted, the
         process-global ``random`` and ``numpy.random`` generators are used for
-        backward compatibility.
+        backward compatibility. A ``SeedSequence`` seeds the outcome and
+        probability generators from its independent child streams 0 and 1.
+    qmc : bool, default=False
+        Draw each run's probabilities and outcomes from the next point of a
+        scrambled Sobol' sequence instead, two dimensions per trial, so that
+        successive runs cover the space of draws evenly (quasi-Monte Carlo).
+        A power-of-two number of runs keeps the sequence balanced, and
+        simulators with different seeds give independent replicates for
+        error bars. ``seed`` then seeds the scramble. Needs the optional
+        ``scipy`` dependency and at most 10600 ``trials``.
 
     Raises
     ------
     ValueError
         If ``payoff`` is not finite and positive, if ``loss``,
         ``transaction_costs`` or ``stdev`` is not finite and nonnegative, or if
-        ``trials`` is not a nonnegative integer, or if ``seed`` is not a
-        nonnegative integer or ``None``.
+        ``trials`` is not a nonnegative integer, if ``seed`` is not a
+        nonnegative integer, a ``SeedSequence`` or ``None``, or if ``qmc`` is
+        set with too many ``trials``.
+    ImportError
+        If ``qmc`` is set and ``scipy`` is not installed.
     """
 
     def __init__(
-        self, payoff, loss, transaction_costs, trials=1000, stdev=0.1, seed=None
+        self,
+        payoff,
+        loss,
+        transaction_costs,
+        trials=1000,
+        stdev=0.1,
+        seed=None,
+        qmc=False,
     ):
         (
             self.payoff,
@@ -65,12 +89,15 @@ class RandomBinarySimulator:
         ) = _validate_simulator_controls(payoff, loss, transaction_costs, trials)
         self.stdev = _validate_simulator_stdev(stdev, "Standard deviation")
         self.seed = _validate_simulator_seed(seed)
-        self._outcome_rng = random.Random(self.seed) if self.seed is not None else None
-        self._probability_rng = (
-            np.random.default_rng(self.seed) if self.seed is not None else None
-        )
-
-    def evaluate_strategy(self, strategy, bankroll):
+        self._outcome_rng = _outcome_random(self.seed)
+        self._probability_rng = _probability_generator(self.seed)
+        self.qmc = bool(qmc)
+        self._sobol = None
+        if self.qmc:
+            _validate_qmc_trials(self.trials, 2)
+            self._sobol = _SobolPaths(self.trials, 2, self.seed)
+
+    def evaluate_strategy(self, strategy, bankroll, profile=None):
         """
         Evaluate a betting strategy over multiple trials.
 
@@ -84,6 +111,9 @@ class RandomBinarySimulator:
             The betting strategy to evaluate.
         bankroll : BankRoll
             The bankroll to use for the simulation.
+        profile : SimulationProfile, optional
+            Counters that accumulate the time and calls spent in each phase of
+            the loop. When omitted the loop runs without any timing code.
 
         Returns
         -------
@@ -99,13 +129,34 @@ class RandomBinarySimulator:
             strategy returns a non-finite or out-of-range stake fraction.
         """
         _validate_strategy_odds(strategy, self.payoff, self.loss)
+        validate_stake = _instrument(profile, "validate", _stake_fraction_validator())
+        evaluate = _instrument(profile, "evaluate", strategy.evaluate)
+        update = _instrument(profile, "update", _update_strategy_bankroll)
+        if self._sobol is None:
+            uniform = (
+                random.random if self._outcome_rng is None else self._outcome_rng.random
+            )
+            probability_normal = self._draw_normal
+        else:
+            path = self._sobol.path()
+            uniform, probability_normal = path.uniform, path.probability
+        draw = _instrument(profile, "draw", uniform)
+        normal = _instrument(profile, "draw", probability_normal)
+        deposit = _instrument(profile, "settle", bankroll.deposit)
+        withdraw = _instrument(profile, "settle", bankroll.withdraw)
+        record_result = getattr(strategy, "record_result", None)
+        record_result = (
+            _instrument(profile, "record", record_result)
+            if callable(record_result)
+            else None
+        )
 
         for _ in range(self.trials):
             # Stop if bankrupt
             if bankroll.total_funds <= 0:
                 break
 
-            _update_strategy_bankroll(strategy, bankroll.total_funds)
+            update(strategy, bankroll.total_funds)
 
             probability_state = (
                 np.random.get_state()
@@ -113,20 +164,14 @@ class RandomBinarySimulator:
                 else copy.deepcopy(self._probability_rng.bit_generator.state)
             )
             # Normal samples are unbounded; only [0, 1] values are probabilities.
-            probability = min(
-                1.0,
-                max(
-                    0.0,
-                    np.random.normal(0.5, self.stdev, 1)[0]
-                    if self._probability_rng is None
-                    else self._probability_rng.normal(0.5, self.stdev),
-                ),
-            )
-            proportion = strategy.evaluate(probability, bankroll.total_funds)
+            probability = min(1.0, max(0.0, normal(0.5, self.stdev)))
+            proportion = evaluate(probability, bankroll.total_funds)
             try:
-                proportion = _validate_stake_fraction(proportion)
+                proportion = validate_stake(proportion)
             except ValueError:
-                if self._probability_rng is None:
+                if self._sobol is not None:
+                    self._sobol.rewind()
+                elif self._probability_rng is None:
                     np.random.set_state(probability_state)
                 else:
                     self._probability_rng.bit_generator.state = probability_state
@@ -137,27 +182,28 @@ class RandomBinarySimulator:
                 current_bankroll = bankroll.total_funds
                 bet_amount = bankroll.bettable_funds * proportion
                 try:
-                    outcome = (
-                        random.random()
-                        if self._outcome_rng is None
-                        else self._outcome_rng.random()
-                    )
-                    won = outcome < probability
+                    won = draw() < probability
                     if won:
                         amt = (self.payoff * bet_amount) - self.transaction_costs
                         if amt >= 0:
-                            bankroll.deposit(amt)
+                            deposit(amt)
                         else:
-                            bankroll.withdraw(abs(amt))
+                            withdraw(abs(amt))
                         return_pct = amt / current_bankroll
                     else:
                         amt = (self.loss * bet_amount) + self.transaction_costs
-                        bankroll.withdraw(amt)
+                        withdraw(amt)
                         return_pct = -amt / current_bankroll
                 except RuinError:
                     # Settlement exceeded a bankroll safeguard; stop gracefully
                     break
 
-                record_result = getattr(strategy, "record_result", None)
-                if callable(record_result):
+                if record_result is not None:
                     record_result(won, return_pct)
+
+    def _draw_normal(self, mean, stdev):
+        # The global generator keeps its historical size-1 draw so unseeded
+        # runs stay stream-compatible with earlier releases.
+        if self._probability_rng is None:
+            return np.random.normal(mean, stdev, 1)[0]
+        return self._probability_rng.normal(mean, stdev)
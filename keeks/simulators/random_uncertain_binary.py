@@ -5,14 +5,19 @@ import numpy as np
 
 from keeks.utils import (
     RuinError,
+    _outcome_random,
+    _probability_generator,
+    _stake_fraction_validator,
     _update_strategy_bankroll,
     _validate_simulator_controls,
     _validate_simulator_seed,
     _validate_simulator_stdev,
-    _validate_stake_fraction,
     _validate_strategy_odds,
 )
 
+from .profiling import _instrument
+from .quasi_random import _SobolPaths, _validate_qmc_trials
+
 
 class RandomUncertainBinarySimulator:
     """
@@ -44,18 +49,32 @@ class RandomUncertainBinarySimulator:
         The standard deviation of the normal distribution used to add uncertainty
         to the actual outcome probability. The resulting outcome probability is
         clamped to [0.0, 1.0].
-    seed : int or None, default=None
+    seed : int, numpy.random.SeedSequence or None, default=None
         Seed for private outcome, probability, and uncertainty generators. When
         omitted, the process-global ``random`` and ``numpy.random`` generators
-        are used for backward compatibility.
+        are used for backward compatibility. A ``SeedSequence`` seeds the
+        outcome generator and the NumPy generator behind the probabilities and
+        uncertainties from its independent child streams 0 and 1.
+    qmc : bool, default=False
+        Draw each run's probabilities, uncertainties and outcomes from the
+        next point of a scrambled Sobol' sequence instead, three dimensions
+        per trial, so that successive runs cover the space of draws evenly
+        (quasi-Monte Carlo). A power-of-two number of runs keeps the
+        sequence balanced, and simulators with different seeds give
+        independent replicates for error bars. ``seed`` then seeds the
+        scramble. Needs the optional ``scipy`` dependency and at most 7067
+        ``trials``.
 
     Raises
     ------
     ValueError
         If ``payoff`` is not finite and positive, if ``loss``,
         ``transaction_costs``, ``stdev`` or ``uncertainty_stdev`` is not finite
-        and nonnegative, if ``trials`` is not a nonnegative integer, or if
-        ``seed`` is not a nonnegative integer or ``None``.
+        and nonnegative, if ``trials`` is not a nonnegative integer, if
+        ``seed`` is not a nonnegative integer, a ``SeedSequence`` or ``None``,
+        or if ``qmc`` is set with too many ``trials``.
+    ImportError
+        If ``qmc`` is set and ``scipy`` is not installed.
     """
 
     def __init__(
@@ -67,6 +86,7 @@ class RandomUncertainBinarySimulator:
         stdev=0.1,
         uncertainty_stdev=0.05,
         seed=None,
+        qmc=False,
     ):
         (
             self.payoff,
@@ -79,12 +99,15 @@ class RandomUncertainBinarySimulator:
             uncertainty_stdev, "Uncertainty standard deviation"
         )
         self.seed = _validate_simulator_seed(seed)
-        self._outcome_rng = random.Random(self.seed) if self.seed is not None else None
-        self._probability_rng = (
-            np.random.default_rng(self.seed) if self.seed is not None else None
-        )
-
-    def evaluate_strategy(self, strategy, bankroll):
+        self._outcome_rng = _outcome_random(self.seed)
+        self._probability_rng = _probability_generator(self.seed)
+        self.qmc = bool(qmc)
+        self._sobol = None
+        if self.qmc:
+            _validate_qmc_trials(self.trials, 3)
+            self._sobol = _SobolPaths(self.trials, 3, self.seed)
+
+    def evaluate_strategy(self, strategy, bankroll, profile=None):
         """
         Evaluate a betting strategy over multiple trials with uncertainty.
 
@@ -99,6 +122,9 @@ class RandomUncertainBinarySimulator:
             The betting strategy to evaluate.
         bankroll : BankRoll
             The bankroll to use for the simulation.
+        profile : SimulationProfile, optional
+            Counters that accumulate the time and calls spent in each phase of
+            the loop. When omitted the loop runs without any timing code.
 
         Returns
         -------
@@ -114,13 +140,36 @@ class RandomUncertainBinarySimulator:
             strategy returns a non-finite or out-of-range stake fraction.
         """
         _validate_strategy_odds(strategy, self.payoff, self.loss)
+        validate_stake = _instrument(profile, "validate", _stake_fraction_validator())
+        evaluate = _instrument(profile, "evaluate", strategy.evaluate)
+        update = _instrument(profile, "update", _update_strategy_bankroll)
+        if self._sobol is None:
+            uniform = (
+                random.random if self._outcome_rng is None else self._outcome_rng.random
+            )
+            probability_normal = uncertainty_normal = self._draw_normal
+        else:
+            path = self._sobol.path()
+            uniform = path.uniform
+            probability_normal, uncertainty_normal = path.probability, path.normal
+        draw = _instrument(profile, "draw", uniform)
+        normal = _instrument(profile, "draw", probability_normal)
+        uncertainty = _instrument(profile, "draw", uncertainty_normal)
+        deposit = _instrument(profile, "settle", bankroll.deposit)
+        withdraw = _instrument(profile, "settle", bankroll.withdraw)
+        record_result = getattr(strategy, "record_result", None)
+        record_result = (
+            _instrument(profile, "record", record_result)
+            if callable(record_result)
+            else None
+        )
 
         for _ in range(self.trials):
             # Stop if bankrupt
             if bankroll.total_funds <= 0:
                 break
 
-            _update_strategy_bankroll(strategy, bankroll.total_funds)
+            update(strategy, bankroll.total_funds)
 
             probability_state = (
                 np.random.get_state()
@@ -128,20 +177,14 @@ class RandomUncertainBinarySimulator:
                 else copy.deepcopy(self._probability_rng.bit_generator.state)
             )
             # Normal samples are unbounded; only [0, 1] values are probabilities.
-            probability = min(
-                1.0,
-                max(
-                    0.0,
-                    np.random.normal(0.5, self.stdev, 1)[0]
-                    if self._probability_rng is None
-                    else self._probability_rng.normal(0.5, self.stdev),
-                ),
-            )
-            proportion = strategy.evaluate(probability, bankroll.total_funds)
+            probability = min(1.0, max(0.0, normal(0.5, self.stdev)))
+            proportion = evaluate(probability, bankroll.total_funds)
             try:
-                proportion = _validate_stake_fraction(proportion)
+                proportion = validate_stake(proportion)
             except ValueError:
-                if self._probability_rng is None:
+                if self._sobol is not None:
+                    self._sobol.rewind()
+                elif self._probability_rng is None:
                     np.random.set_state(probability_state)
                 else:
                     self._probability_rng.bit_generator.state = probability_state
@@ -152,39 +195,31 @@ class RandomUncertainBinarySimulator:
                 current_bankroll = bankroll.total_funds
                 bet_amount = bankroll.bettable_funds * proportion
                 outcome_probability = min(
-                    1.0,
-                    max(
-                        0.0,
-                        probability
-                        + (
-                            np.random.normal(0, self.uncertainty_stdev, 1)[0]
-                            if self._probability_rng is None
-                            else self._probability_rng.normal(0, self.uncertainty_stdev)
-                        ),
-                    ),
+                    1.0, max(0.0, probability + uncertainty(0, self.uncertainty_stdev))
                 )
                 try:
-                    outcome = (
-                        random.random()
-                        if self._outcome_rng is None
-                        else self._outcome_rng.random()
-                    )
-                    won = outcome < outcome_probability
+                    won = draw() < outcome_probability
                     if won:
                         amt = (self.payoff * bet_amount) - self.transaction_costs
                         if amt >= 0:
-                            bankroll.deposit(amt)
+                            deposit(amt)
                         else:
-                            bankroll.withdraw(abs(amt))
+                            withdraw(abs(amt))
                         return_pct = amt / current_bankroll
                     else:
                         amt = (self.loss * bet_amount) + self.transaction_costs
-                        bankroll.withdraw(amt)
+                        withdraw(amt)
                         return_pct = -amt / current_bankroll
                 except RuinError:
                     # Settlement exceeded a bankroll safeguard; stop gracefully
                     break
 
-                record_result = getattr(strategy, "record_result", None)
-                if callable(record_result):
+                if record_result is not None:
                     record_result(won, return_pct)
+
+    def _draw_normal(self, mean, stdev):
+        # The global generator keeps its historical size-1 draw so unseeded
+        # runs stay stream-compatible with earlier releases.
+        if self._probability_rng is None:
+            return np.random.normal(mean, stdev, 1)[0]
+        return self._probability_rng.normal(mean, stdev)
@@ -2,14 +2,17 @@ import random
 
 from keeks.utils import (
     RuinError,
+    _outcome_random,
+    _stake_fraction_validator,
     _update_strategy_bankroll,
     _validate_simulator_controls,
     _validate_simulator_probability,
     _validate_simulator_seed,
-    _validate_stake_fraction,
     _validate_strategy_odds,
 )
 
+from .profiling import _instrument
+
 
 class RepeatedBinarySimulator:
     """
@@ -35,9 +38,10 @@ class RepeatedBinarySimulator:
         The fixed probability of a successful outcome for all trials.
     trials : int, default=1000
         The number of betting trials to simulate.
-    seed : int or None, default=None
+    seed : int, numpy.random.SeedSequence or None, default=None
         Seed for a private outcome generator. When omitted, the process-global
-        ``random`` generator is used for backward compatibility.
+        ``random`` generator is used for backward compatibility. A
+        ``SeedSequence`` seeds the generator from its child stream 0.
 
     Raises
     ------
@@ -45,7 +49,8 @@ class RepeatedBinarySimulator:
         If ``payoff`` is not finite and positive, if ``loss`` or
         ``transaction_costs`` is not finite and nonnegative, if ``probability``
         is not finite within ``[0, 1]``, or if ``trials`` is not a nonnegative
-        integer, or if ``seed`` is not a nonnegative integer or ``None``.
+        integer, or if ``seed`` is not a nonnegative integer, a
+        ``SeedSequence`` or ``None``.
     """
 
     def __init__(
@@ -59,9 +64,9 @@ class RepeatedBinarySimulator:
         ) = _validate_simulator_controls(payoff, loss, transaction_costs, trials)
         self.probability = _validate_simulator_probability(probability, "Probability")
         self.seed = _validate_simulator_seed(seed)
-        self._outcome_rng = random.Random(self.seed) if self.seed is not None else None
+        self._outcome_rng = _outcome_random(self.seed)
 
-    def evaluate_strategy(self, strategy, bankroll):
+    def evaluate_strategy(self, strategy, bankroll, profile=None):
         """
         Evaluate a betting strategy over multiple trials with fixed probability.
 
@@ -75,6 +80,9 @@ class RepeatedBinarySimulator:
             The betting strategy to evaluate.
         bankroll : BankRoll
             The bankroll to use for the simulation.
+        profile : SimulationProfile, optional
+            Counters that accumulate the time and calls spent in each phase of
+            the loop. When omitted the loop runs without any timing code.
 
         Returns
         -------
@@ -90,17 +98,33 @@ class RepeatedBinarySimulator:
             strategy returns a non-finite or out-of-range stake fraction.
         """
         _validate_strategy_odds(strategy, self.payoff, self.loss)
+        validate_stake = _instrument(profile, "validate", _stake_fraction_validator())
+        evaluate = _instrument(profile, "evaluate", strategy.evaluate)
+        update = _instrument(profile, "update", _update_strategy_bankroll)
+        draw = _instrument(
+            profile,
+            "draw",
+            random.random if self._outcome_rng is None else self._outcome_rng.random,
+        )
+        deposit = _instrument(profile, "settle", bankroll.deposit)
+        withdraw = _instrument(profile, "settle", bankroll.withdraw)
+        record_result = getattr(strategy, "record_result", None)
+        record_result = (
+            _instrument(profile, "record", record_result)
+            if callable(record_result)
+            else None
+        )
 
         for _ in range(self.trials):
             # Stop if bankrupt
             if bankroll.total_funds <= 0:
                 break
 
-            _update_strategy_bankroll(strategy, bankroll.total_funds)
+            update(strategy, bankroll.total_funds)
 
             # Get the proportion to bet
-            proportion = _validate_stake_fraction(
-                strategy.evaluate(self.probability, bankroll.total_funds)
+            proportion = validate_stake(
+                evaluate(self.probability, bankroll.total_funds)
             )
 
             # Only process the bet if proportion > 0 (avoid charging costs on no-bet)
@@ -108,27 +132,21 @@ class RepeatedBinarySimulator:
                 current_bankroll = bankroll.total_funds
                 bet_amount = bankroll.bettable_funds * proportion
                 try:
-                    outcome = (
-                        random.random()
-                        if self._outcome_rng is None
-                        else self._outcome_rng.random()
-                    )
-                    won = outcome < self.probability
+                    won = draw() < self.probability
                     if won:
                         amt = (self.payoff * bet_amount) - self.transaction_costs
                         if amt >= 0:
-                            bankroll.deposit(amt)
+                            deposit(amt)
                         else:
-                            bankroll.withdraw(abs(amt))
+                            withdraw(abs(amt))
                         return_pct = amt / current_bankroll
                     else:
                         amt = (self.loss * bet_amount) + self.transaction_costs
-                        bankroll.withdraw(amt)
+                        withdraw(amt)
                         return_pct = -amt / current_bankroll
                 except RuinError:
                     # Settlement exceeded a bankroll safeguard; stop gracefully
                     break
 
-                record_result = getattr(strategy, "record_result", None)
-                if callable(record_result):
+                if record_result is not None:
                     record_result(won, return_pct)
@@ -0,0 +1,283 @@
+import operator
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from keeks.utils import (
+    RuinError,
+    _is_stateless_strategy,
+    _require_finite,
+    _stake_fraction_validator,
+    _update_strategy_bankroll,
+)
+
+REPLAY_COLUMNS = ("probability", "payoff", "loss", "outcome")
+
+_FILE_FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+
+
+class ReplaySimulator:
+    """
+    Simulator that replays recorded bets instead of drawing synthetic ones.
+
+    Each row of the source is one bet: the probability the strategy is given,
+    the ``payoff`` and ``loss`` per unit staked that the bet actually settled at,
+    and whether it won. Rows are read in chunks of ``chunksize``, so only one
+    chunk is ever held in memory and a file larger than RAM can be replayed end
+    to end. CSV files are read with pandas; Parquet files need the optional
+    ``pyarrow`` dependency and are read one record batch at a time.
+
+    Parameters
+    ----------
+    source : str, os.PathLike or pandas.DataFrame
+        A CSV or Parquet file of recorded bets, or a DataFrame already in
+        memory.
+    transaction_costs : float, default=0.0
+        The flat fee charged once per settled bet, regardless of outcome. This is
+        an absolute bankroll amount, not a fraction of the stake, so it does not
+        scale with bet size: it is subtracted from a winning settlement and added
+        to a losing one. Note this differs in unit from the singular
+        ``transaction_cost`` taken by strategies in ``keeks.binary_strategies``,
+        which is a per-unit fraction of the bet used for sizing.
+    chunksize : int, default=100_000
+        The number of rows read and validated at a time.
+    columns : dict, optional
+        Column names for any of the roles ``"probability"``, ``"payoff"``,
+        ``"loss"`` and ``"outcome"`` whose column is not named after the role.
+    file_format : {"csv", "parquet"} or None, default=None
+        The format of a file ``source``. When omitted it is inferred from the
+        file suffix (``.csv``, ``.parquet`` or ``.pq``).
+    vectorized : bool, default=False
+        Size every bet of a chunk up front instead of calling
+        ``strategy.evaluate`` once per row. Only strategies without an
+        ``update_bankroll`` or ``record_result`` hook qualify, and their stake
+        fraction may depend on the bankroll only through whether it is
+        positive, as is true of every stateless strategy shipped with keeks.
+
+    Raises
+    ------
+    ValueError
+        If ``transaction_costs`` is not finite and nonnegative, if ``chunksize``
+        is not a positive integer, if ``columns`` names an unknown role, or if
+        the format of a file source is unknown.
+
+    Notes
+    -----
+    Strategy odds are not compared with the recorded ones, because the recorded
+    ``payoff`` and ``loss`` may change from row to row. The strategy sizes every
+    bet with its own odds; the replay settles it with the row's.
+    """
+
+    def __init__(
+        self,
+        source,
+        transaction_costs=0.0,
+        chunksize=100_000,
+        columns=None,
+        file_format=None,
+        vectorized=False,
+    ):
+        transaction_costs = _require_finite(transaction_costs, "Transaction costs")
+        if transaction_costs < 0:
+            raise ValueError("Transaction costs must be non-negative")
+        try:
+            if isinstance(chunksize, bool):
+                raise TypeError
+            chunksize = operator.index(chunksize)
+        except TypeError as exc:
+            raise ValueError("Chunk size must be a positive integer") from exc
+        if chunksize <= 0:
+            raise ValueError("Chunk size must be a positive integer")
+
+        columns = dict(columns or {})
+        unknown = set(columns) - set(REPLAY_COLUMNS)
+        if unknown:
+            raise ValueError(
+                f"Unknown replay column roles {sorted(unknown)}; expected "
+                f"some of {list(REPLAY_COLUMNS)}"
+            )
+
+        if not isinstance(source, pd.DataFrame):
+            source = Path(os.fspath(source))
+            if file_format is None:
+                file_format = _FILE_FORMATS.get(source.suffix.lower())
+            if file_format not in ("csv", "parquet"):
+                raise ValueError(
+                    "File format must be 'csv' or 'parquet'; pass file_format "
+                    "when the file suffix does not say which"
+                )
+
+        self.source = source
+        self.transaction_costs = transaction_costs
+        self.chunksize = chunksize
+        self.columns = {role: columns.get(role, role) for role in REPLAY_COLUMNS}
+        self.file_format = file_format
+        self.vectorized = bool(vectorized)
+
+    def evaluate_strategy(self, strategy, bankroll):
+        """
+        Evaluate a betting strategy against every recorded bet in order.
+
+        For each row the strategy is evaluated with the recorded probability and
+        the bankroll is settled with the recorded outcome and odds. The replay
+        stops early, without reading the rest of the source, if the bankroll is
+        depleted (bankruptcy) or a settlement trips a bankroll safeguard.
+
+        Parameters
+        ----------
+        strategy : BaseStrategy
+            The betting strategy to evaluate.
+        bankroll : BankRoll
+            The bankroll to use for the simulation.
+
+        Returns
+        -------
+        None
+            The bankroll object is updated in-place with the results of the simulation.
+
+        Raises
+        ------
+        ValueError
+            If a chunk holds a probability outside ``[0, 1]``, a non-positive
+            payoff, a negative loss, an outcome other than 0 or 1, or a missing
+            or non-finite value, if the strategy returns a non-finite or
+            out-of-range stake fraction, or if ``vectorized`` is set for a
+            strategy that exposes a feedback hook.
+        ImportError
+            If the source is a Parquet file and ``pyarrow`` is not installed.
+        """
+        if self.vectorized and not _is_stateless_strategy(strategy):
+            raise ValueError(
+                "Vectorized replay needs a stateless strategy; this one exposes "
+                "update_bankroll or record_result, so each bet depends on the "
+                "ones before it"
+            )
+
+        validate_stake = _stake_fraction_validator()
+        record_result = getattr(strategy, "record_result", None)
+        record_result = record_result if callable(record_result) else None
+        fee = self.transaction_costs
+
+        for probabilities, payoffs, losses, outcomes in self._chunks():
+            if self.vectorized:
+                proportions = self._size_chunk(
+                    strategy, probabilities, bankroll.total_funds, validate_stake
+                )
+            probabilities = probabilities.tolist()
+            rows = zip(
+                payoffs.tolist(), losses.tolist(), outcomes.tolist(), strict=True
+            )
+            for index, (payoff, loss, won) in enumerate(rows):
+                current_bankroll = bankroll.total_funds
+
+                # Stop if bankrupt
+                if current_bankroll <= 0:
+                    return
+
+                if self.vectorized:
+                    proportion = proportions[index]
+                else:
+                    _update_strategy_bankroll(strategy, current_bankroll)
+                    proportion = validate_stake(
+                        strategy.evaluate(probabilities[index], current_bankroll)
+                    )
+
+                # Only process the bet if proportion > 0 (avoid charging costs on no-bet)
+                if proportion > 0:
+                    bet_amount = bankroll.bettable_funds * proportion
+                    try:
+                        if won:
+                            amt = (payoff * bet_amount) - fee
+                            if amt >= 0:
+                                bankroll.deposit(amt)
+                            else:
+                                bankroll.withdraw(abs(amt))
+                            return_pct = amt / current_bankroll
+                        else:
+                            amt = (loss * bet_amount) + fee
+                            bankroll.withdraw(amt)
+                            return_pct = -amt / current_bankroll
+                    except RuinError:
+                        # Settlement exceeded a bankroll safeguard; stop gracefully
+                        return
+
+                    if record_result is not None:
+                        record_result(won, return_pct)
+
+    @staticmethod
+    def _size_chunk(strategy, probabilities, current_bankroll, validate_stake):
+        # Recorded probabilities repeat heavily (quoted prices sit on a grid), so
+        # each distinct one is evaluated once and scattered back to its rows.
+        if current_bankroll <= 0:
+            return [0.0] * len(probabilities)
+        distinct, inverse = np.unique(probabilities, return_inverse=True)
+        sized = np.array(
+            [
+                validate_stake(strategy.evaluate(p, current_bankroll))
+                for p in distinct.tolist()
+            ],
+            dtype=float,
+        )
+        return sized[inverse].tolist()
+
+    def _chunks(self):
+        names = [self.columns[role] for role in REPLAY_COLUMNS]
+        offset = 0
+        for frame in self._frames(names):
+            arrays = [_column(frame, name) for name in names]
+            _validate_chunk(*arrays, offset=offset)
+            probabilities, payoffs, losses, outcomes = arrays
+            yield probabilities, payoffs, losses, outcomes.astype(bool)
+            offset += len(probabilities)
+
+    def _frames(self, names):
+        if isinstance(self.source, pd.DataFrame):
+            missing = [name for name in names if name not in self.source.columns]
+            if missing:
+                raise ValueError(f"Replay source is missing columns {missing}")
+            for start in range(0, len(self.source), self.chunksize):
+                yield self.source.iloc[start : start + self.chunksize]
+        elif self.file_format == "csv":
+            with pd.read_csv(
+                self.source, usecols=names, chunksize=self.chunksize
+            ) as reader:
+                yield from reader
+        else:
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as exc:
+                raise ImportError(
+                    "Replaying a Parquet file requires the optional pyarrow "
+                    "dependency: pip install 'keeks[parquet]'"
+                ) from exc
+            parquet_file = pq.ParquetFile(self.source)
+            for batch in parquet_file.iter_batches(
+                batch_size=self.chunksize, columns=names
+            ):
+                yield batch.to_pandas()
+
+
+def _column(frame, name):
+    try:
+        return frame[name].to_numpy(dtype=float)
+    except (TypeError, ValueError) as exc:
+        raise ValueError(f"Replay column {name!r} must be numeric") from exc
+
+
+def _validate_chunk(probabilities, payoffs, losses, outcomes, offset, source="Replay"):
+    """Validate one chunk of recorded bets with whole-array checks."""
+    checks = (
+        (np.isfinite(probabilities), "probability must be a finite number"),
+        (np.isfinite(payoffs), "payoff must be a finite number"),
+        (np.isfinite(losses), "loss must be a finite number"),
+        ((probabilities >= 0) & (probabilities <= 1), "probability must be in [0, 1]"),
+        (payoffs > 0, "payoff must be greater than 0"),
+        (losses >= 0, "loss must be non-negative"),
+        ((outcomes == 0) | (outcomes == 1), "outcome must be 0 or 1"),
+    )
+    for valid, message in checks:
+        if not valid.all():
+            row = offset + int(np.argmin(valid))
+            raise ValueError(f"{source} row {row}: {message}")
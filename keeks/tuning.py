@@ -0,0 +1,446 @@
+"""
+Parameter search for strategies by successive halving.
+
+Picking ``FractionalKellyCriterion.fraction`` or ``CPPIStrategy.multiplier`` by
+hand means running a few guesses and eyeballing the results. :class:`StrategyTuner`
+searches a grid of parameters instead: every candidate is simulated on a few
+paths, the weaker ones are dropped, and the survivors are simulated on more
+paths, so most of the simulation goes to the candidates that are hard to tell
+apart.
+
+Every candidate is simulated on the same outcome paths (common random numbers),
+so a difference in score comes from the parameters rather than from one
+candidate drawing luckier outcomes than another.
+"""
+
+import concurrent.futures
+import itertools
+import math
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from keeks.bankroll import BankRoll
+from keeks.shared import SharedArrays
+from keeks.simulators.replay import ReplaySimulator
+from keeks.utils import (
+    WEALTH_FLOOR,
+    RuinError,
+    _child_seed,
+    _positive_int,
+    _require_finite,
+    _validate_simulator_controls,
+    _validate_simulator_probability,
+    _validate_simulator_seed,
+)
+
+OBJECTIVES = {
+    "median_growth": lambda paths: paths["growth_rate"].median(),
+    "p5_terminal": lambda paths: paths["terminal"].quantile(0.05),
+    "ruin_rate": lambda paths: -paths["ruined"].mean(),
+}
+
+
+@dataclass(frozen=True)
+class TuningResult:
+    """
+    The outcome of a :meth:`StrategyTuner.tune` run.
+
+    Attributes
+    ----------
+    best_params : dict
+        The parameters of the best candidate in the final rung.
+    best_score : float
+        Its objective value on the final rung's paths.
+    history : pandas.DataFrame
+        One row per candidate per rung it was simulated in, with the rung, the
+        number of paths, the parameters, the score and whether it survived.
+    seed : int or numpy.random.SeedSequence
+        The seed the outcome paths were drawn from, so that the run can be
+        reproduced even if none was given.
+    simulated_paths : int
+        The number of (candidate, path) simulations run in total.
+    """
+
+    best_params: dict
+    best_score: float
+    history: pd.DataFrame
+    seed: int | np.random.SeedSequence
+    simulated_paths: int
+
+
+@dataclass(frozen=True)
+class _Market:
+    """What a worker process needs to rebuild any outcome path on its own."""
+
+    seed: int | np.random.SeedSequence
+    probability: float
+    payoff: float
+    loss: float
+    transaction_costs: float
+    trials: int
+    initial_funds: float
+    max_draw_down: float | None
+
+
+class _StopFlagBankRoll(BankRoll):
+    """A BankRoll that records whether a settlement was refused.
+
+    The replay catches ``RuinError`` and stops, which leaves no signal that a
+    path ended early; recording it here is what makes a ruin rate measurable.
+    """
+
+    def __init__(self, initial_funds, max_draw_down):
+        super().__init__(initial_funds=initial_funds, max_draw_down=max_draw_down)
+        self.stopped = False
+
+    def withdraw(self, amt):
+        try:
+            super().withdraw(amt)
+        except RuinError:
+            self.stopped = True
+            raise
+
+
+class StrategyTuner:
+    """
+    Search a grid of strategy parameters by successive halving.
+
+    Every combination of the values in ``space`` is a candidate. Each rung
+    simulates the survivors on some number of outcome paths and keeps the best
+    ``1 / eta`` of them by ``objective``, so ``ceil(log_eta(candidates))`` rungs
+    leave one. The rungs are scheduled back from ``max_paths``: the last one
+    simulates ``max_paths`` paths, and each earlier one ``eta`` times fewer, but
+    never fewer than ``min_paths``. The winner is therefore always chosen on
+    ``max_paths`` paths, however small the grid. Paths simulated in one rung are
+    reused in the next, so only the new paths cost anything.
+
+    Each path is a run of ``trials`` bets at a fixed ``probability``, settled
+    with :class:`~keeks.simulators.ReplaySimulator` against outcomes drawn
+    once per path, so every candidate meets the same outcomes and every rung
+    extends the same paths.
+
+    Parameters
+    ----------
+    factory : callable
+        Called as ``factory(**params)`` to build a fresh strategy for each path.
+        Fix the parameters that are not searched with ``functools.partial``,
+        which also keeps the factory picklable when ``workers`` is set.
+    space : dict
+        The values to try for each searched parameter, keyed by parameter name.
+    objective : {"median_growth", "p5_terminal", "ruin_rate"} or callable, default="median_growth"
+        What to maximize: the median per-trial log growth rate, the 5th
+        percentile of terminal wealth, or the fewest paths stopped early by
+        bankruptcy or the drawdown limit. A callable is given a DataFrame with
+        one row per path and columns ``terminal``, ``growth_rate`` and
+        ``ruined``, and returns a score where higher is better.
+    probability : float, default=0.55
+        The probability each bet wins.
+    payoff : float, default=1.0
+        The amount won per unit bet on a win.
+    loss : float, default=1.0
+        The amount lost per unit bet on a loss.
+    transaction_costs : float, default=0.0
+        The flat fee charged once per settled bet, as in the simulators.
+    trials : int, default=500
+        The number of bets per path.
+    initial_funds : float, default=1000.0
+        The bankroll each path starts from.
+    max_draw_down : float or None, default=0.3
+        The drawdown limit of each path's bankroll.
+    min_paths : int, default=9
+        The fewest paths any rung simulates.
+    max_paths : int, default=243
+        The number of paths in the last rung, and the most any rung simulates.
+    eta : int, default=3
+        The factor by which each rung cuts the candidates and grows the paths.
+    seed : int, numpy.random.SeedSequence or None, default=None
+        Seed for the outcome paths. Path *i* is drawn from its own stream, the
+        seed's child *i* for a ``SeedSequence``, so results are identical
+        however many workers run them. When omitted, one is drawn and reported
+        in the result.
+    workers : int or None, default=None
+        Simulate candidates in a process pool of this size. By default they are
+        simulated in this process.
+
+    Raises
+    ------
+    ValueError
+        If ``space`` is empty or holds an empty list of values, if
+        ``objective`` is not a known name or a callable, if ``min_paths`` or
+        ``max_paths`` is not a positive integer or ``min_paths`` exceeds
+        ``max_paths``, if ``eta`` is not an integer of at least 2, if
+        ``workers`` is not a positive integer or ``None``, or if a market or
+        bankroll setting is out of range as it would be for a simulator.
+
+    Examples
+    --------
+    >>> from functools import partial
+    >>> from keeks.binary_strategies import FractionalKellyCriterion
+    >>> tuner = StrategyTuner(
+    ...     partial(
+    ...         FractionalKellyCriterion, payoff=1.0, loss=1.0, transaction_cost=0.0
+    ...     ),
+    ...     {"fraction": [0.1, 0.25, 0.5, 1.0]},
+    ...     trials=100,
+    ...     min_paths=4,
+    ...     max_paths=16,
+    ...     eta=2,
+    ...     seed=7,
+    ... )
+    >>> result = tuner.tune()
+    >>> result.best_params
+    {'fraction': 1.0}
+    """
+
+    def __init__(
+        self,
+        factory,
+        space,
+        objective="median_growth",
+        probability=0.55,
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.0,
+        trials=500,
+        initial_funds=1000.0,
+        max_draw_down=0.3,
+        min_paths=9,
+        max_paths=243,
+        eta=3,
+        seed=None,
+        workers=None,
+    ):
+        space = {name: list(values) for name, values in dict(space).items()}
+        if not space or not all(space.values()):
+            raise ValueError("Space must give at least one value for each parameter")
+        if not callable(objective) and objective not in OBJECTIVES:
+            raise ValueError(
+                f"Objective must be one of {sorted(OBJECTIVES)} or a callable, "
+                f"got {objective!r}"
+            )
+        min_paths = _positive_int(min_paths, "Minimum paths")
+        max_paths = _positive_int(max_paths, "Maximum paths")
+        if min_paths > max_paths:
+            raise ValueError("Minimum paths must not exceed maximum paths")
+        eta = _positive_int(eta, "Eta")
+        if eta < 2:
+            raise ValueError("Eta must be an integer of at least 2")
+        if workers is not None:
+            workers = _positive_int(workers, "Workers")
+
+        payoff, loss, transaction_costs, trials = _validate_simulator_controls(
+            payoff, loss, transaction_costs, trials
+        )
+        initial_funds = _require_finite(initial_funds, "Initial funds")
+        if initial_funds <= 0:
+            raise ValueError("Initial funds must be greater than 0")
+        # Checked by the bankroll itself, before any work is done.
+        BankRoll(initial_funds=initial_funds, max_draw_down=max_draw_down)
+
+        self.factory = factory
+        self.space = space
+        self.objective = objective
+        self.probability = _validate_simulator_probability(probability, "Probability")
+        self.payoff = payoff
+        self.loss = loss
+        self.transaction_costs = transaction_costs
+        self.trials = trials
+        self.initial_funds = initial_funds
+        self.max_draw_down = max_draw_down
+        self.min_paths = min_paths
+        self.max_paths = max_paths
+        self.eta = eta
+        self.seed = _validate_simulator_seed(seed)
+        self.workers = workers
+
+    def candidates(self):
+        """
+        List every combination of the values in ``space``.
+
+        Returns
+        -------
+        list of dict
+            One parameter dict per candidate, in grid order.
+        """
+        names = list(self.space)
+        return [
+            dict(zip(names, values, strict=True))
+            for values in itertools.product(*self.space.values())
+        ]
+
+    def tune(self):
+        """
+        Run the search.
+
+        Returns
+        -------
+        TuningResult
+            The best candidate, its score and the full search history.
+        """
+        seed = self.seed
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy)
+        market = _Market(
+            seed,
+            self.probability,
+            self.payoff,
+            self.loss,
+            self.transaction_costs,
+            self.trials,
+            self.initial_funds,
+            self.max_draw_down,
+        )
+        score = OBJECTIVES.get(self.objective, self.objective)
+
+        candidates = self.candidates()
+        paths = [[] for _ in candidates]
+        survivors = list(range(len(candidates)))
+        rows = []
+        simulated = 0
+        # The number of cuts that leave one candidate, ceil(log_eta(candidates)),
+        # counted in integers; a lone candidate still gets one rung to score it.
+        rungs = 1
+        while self.eta**rungs < len(candidates):
+            rungs += 1
+
+        # Every path's outcomes are drawn once, up front. Pool workers attach
+        # to one shared copy instead of redrawing them or receiving them pickled.
+        shape = (self.max_paths, self.trials)
+        shared = executor = None
+        if self.workers is None:
+            outcomes = _draw_outcomes(market, np.empty(shape, dtype=bool))
+        else:
+            shared = SharedArrays({"outcomes": (shape, bool)})
+            outcomes = None
+        try:
+            if shared is not None:
+                _draw_outcomes(market, shared["outcomes"])
+                executor = concurrent.futures.ProcessPoolExecutor(
+                    self.workers, initializer=_attach_outcomes, initargs=(shared,)
+                )
+            for rung in itertools.count():
+                # Scheduled back from max_paths, so the final cut is made on
+                # every path however few candidates the grid holds.
+                path_count = max(
+                    self.min_paths,
+                    self.max_paths // self.eta ** max(rungs - 1 - rung, 0),
+                )
+                needed = [
+                    (index, len(paths[index]))
+                    for index in survivors
+                    if len(paths[index]) < path_count
+                ]
+                jobs = [
+                    (
+                        self.factory,
+                        candidates[index],
+                        market,
+                        start,
+                        path_count,
+                        outcomes,
+                    )
+                    for index, start in needed
+                ]
+                mapped = (
+                    executor.map(_simulate_paths, *zip(*jobs, strict=True))
+                    if executor is not None and jobs
+                    else itertools.starmap(_simulate_paths, jobs)
+                )
+                for (index, start), results in zip(needed, mapped, strict=True):
+                    paths[index].extend(results)
+                    simulated += path_count - start
+
+                scores = {
+                    index: float(score(_path_frame(paths[index][:path_count])))
+                    for index in survivors
+                }
+                # Ties go to the candidate listed first in the grid.
+                ranked = sorted(survivors, key=lambda index: -scores[index])
+                keep = math.ceil(len(survivors) / self.eta)
+                last = keep == 1 or path_count >= self.max_paths
+                if last:
+                    keep = 1
+                for position, index in enumerate(ranked):
+                    rows.append(
+                        {
+                            "rung": rung,
+                            "paths": path_count,
+                            **candidates[index],
+                            "score": scores[index],
+                            "kept": position < keep,
+                        }
+                    )
+                if last:
+                    break
+                survivors = sorted(ranked[:keep])
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if shared is not None:
+                shared.close()
+
+        best = ranked[0]
+        return TuningResult(
+            best_params=candidates[best],
+            best_score=scores[best],
+            history=pd.DataFrame(rows),
+            seed=seed,
+            simulated_paths=simulated,
+        )
+
+
+def _path_frame(results):
+    return pd.DataFrame(results, columns=["terminal", "growth_rate", "ruined"])
+
+
+def _draw_outcomes(market, outcomes):
+    """Fill ``outcomes`` with each path's wins, one row per path, and return it."""
+    for path in range(len(outcomes)):
+        # Keyed on the path index alone, so path i is the same sequence of
+        # outcomes for every candidate, every rung and every worker process.
+        rng = np.random.default_rng(_child_seed(market.seed, path))
+        outcomes[path] = rng.random(market.trials) < market.probability
+    return outcomes
+
+
+# The outcome matrix of a pool worker, attached once when the worker starts.
+_WORKER_OUTCOMES = None
+
+
+def _attach_outcomes(shared):
+    global _WORKER_OUTCOMES
+    _WORKER_OUTCOMES = shared
+
+
+def _simulate_paths(factory, params, market, start, stop, outcomes=None):
+    """
+    Simulate one candidate on paths ``start`` to ``stop``; run in workers.
+
+    ``outcomes`` holds each path's wins as a row; a pool worker reads them from
+    its attached shared matrix instead.
+    """
+    if outcomes is None:
+        outcomes = _WORKER_OUTCOMES["outcomes"]
+    results = []
+    for path in range(start, stop):
+        bets = pd.DataFrame(
+            {
+                "probability": market.probability,
+                "payoff": market.payoff,
+                "loss": market.loss,
+                "outcome": outcomes[path],
+            }
+        )
+        bankroll = _StopFlagBankRoll(market.initial_funds, market.max_draw_down)
+        ReplaySimulator(
+            bets, transaction_costs=market.transaction_costs
+        ).evaluate_strategy(factory(**params), bankroll)
+
+        terminal = bankroll.total_funds
+        growth = (
+            math.log(max(terminal, WEALTH_FLOOR) / market.initial_funds) / market.trials
+        )
+        results.append((terminal, growth, bankroll.stopped or terminal <= 0))
+    return results
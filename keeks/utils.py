@@ -1,13 +1,22 @@
+import contextlib
+import contextvars
 import math
 import operator
+import random
 import warnings
 
 import numpy as np
 
 PROBABILITY_SUM_TOLERANCE = 1e-12
 
+# Terminal wealth floor used only so a fully depleted path has a finite log
+# growth rate; the path also counts as ruined in its own right.
+WEALTH_FLOOR = 0.01
+
 _UNSET = object()
 
+_TRUSTED = contextvars.ContextVar("keeks_trusted_inputs", default=False)
+
 
 class RuinError(Exception):
     """
@@ -70,8 +79,62 @@ def crra_utility(wealth, risk_aversion=1.0):
     return (wealth ** (1 - risk_aversion)) / (1 - risk_aversion)
 
 
+@contextlib.contextmanager
+def trusted_inputs():
+    """
+    Skip per-element input validation for the duration of a ``with`` block.
+
+    Every call path in keeks validates what it is given: simulators check each
+    stake fraction a strategy returns, ``BankRoll`` checks each amount it
+    settles, and the entry-price functions re-check their gamble arrays on every
+    call. That is the right default, but in a hot loop over inputs that were
+    already validated it is repeated work. Inside this block those per-element
+    checks are skipped:
+
+    * simulators coerce each stake fraction with ``float`` instead of
+      validating it;
+    * ``BankRoll`` deposits, withdrawals, bets and fund movements skip the
+      finite, nonnegative amount check (bankruptcy and ``max_draw_down``
+      safeguards are still enforced, since they are results, not input checks);
+    * ``expected_utility``, ``find_indifference_price`` and the strategies'
+      ``calculate_max_entry_price`` skip the gamble array checks, while still
+      adding the implicit zero-payout outcome.
+
+    Constructors, whole-array checks such as a ``ReplaySimulator`` chunk, and
+    scalar controls like ``tolerance`` are validated as usual; they run once per
+    call rather than once per element, and a bad ``tolerance`` would stall the
+    search rather than return a wrong number.
+
+    Results on valid inputs are identical with and without this block. On
+    invalid inputs the behaviour inside it is undefined, so validate once up
+    front (an ordinary call outside the block does that) and only then enter it.
+
+    The mode is held in a context variable, so it applies to the current thread
+    or asyncio task and to nothing running concurrently alongside it.
+
+    Examples
+    --------
+    >>> from keeks.bankroll import BankRoll
+    >>> bankroll = BankRoll(initial_funds=100.0)
+    >>> with trusted_inputs():
+    ...     bankroll.deposit(5.0)
+    >>> bankroll.total_funds
+    105.0
+    """
+    token = _TRUSTED.set(True)
+    try:
+        yield
+    finally:
+        _TRUSTED.reset(token)
+
+
 def _normalize_gamble(outcomes, probabilities):
     """Validate a gamble and add its implicit zero-payout outcome."""
+    if _TRUSTED.get():
+        outcomes = np.asarray(outcomes, dtype=float)
+        probabilities = np.asarray(probabilities, dtype=float)
+        return _complete_gamble(outcomes, probabilities, probabilities.sum())
+
     try:
         outcomes = np.asarray(outcomes, dtype=float)
         probabilities = np.asarray(probabilities, dtype=float)
@@ -92,6 +155,11 @@ def _normalize_gamble(outcomes, probabilities):
     total_probability = probabilities.sum()
     if total_probability > 1 + PROBABILITY_SUM_TOLERANCE:
         raise ValueError("Probabilities must sum to no more than one")
+    return _complete_gamble(outcomes, probabilities, total_probability)
+
+
+def _complete_gamble(outcomes, probabilities, total_probability):
+    """Renormalize rounding excess and add the implicit zero-payout outcome."""
     if total_probability > 1:
         probabilities = probabilities / total_probability
         total_probability = 1.0
@@ -113,6 +181,19 @@ def _require_finite(value, name):
     return value
 
 
+def _positive_int(value, name):
+    """Coerce ``value`` to a positive integer, rejecting bools, or raise."""
+    try:
+        if isinstance(value, bool):
+            raise TypeError
+        value = operator.index(value)
+    except TypeError as exc:
+        raise ValueError(f"{name} must be a positive integer") from exc
+    if value <= 0:
+        raise ValueError(f"{name} must be a positive integer")
+    return value
+
+
 def _validate_entry_price_scalars(
     current_wealth, tolerance, max_search_fraction, risk_aversion=_UNSET
 ):
@@ -182,18 +263,74 @@ def _validate_simulator_controls(payoff, loss, transaction_costs, trials):
 
 
 def _validate_simulator_seed(seed):
-    """Validate an optional simulator seed, which must be a nonnegative integer."""
-    if seed is None:
-        return None
+    """
+    Validate an optional simulator seed.
+
+    A seed is a nonnegative integer or a ``numpy.random.SeedSequence``, which is
+    kept as given so that child streams can be derived from it.
+    """
+    if seed is None or isinstance(seed, np.random.SeedSequence):
+        return seed
     try:
         seed = operator.index(seed)
     except TypeError as exc:
-        raise ValueError("Seed must be a nonnegative integer or None") from exc
+        raise ValueError(
+            "Seed must be a nonnegative integer, a SeedSequence or None"
+        ) from exc
     if seed < 0:
-        raise ValueError("Seed must be a nonnegative integer or None")
+        raise ValueError("Seed must be a nonnegative integer, a SeedSequence or None")
     return seed
 
 
+def _child_seed(seed, *key):
+    """
+    Return the seed of the independent stream ``key`` under a simulator seed.
+
+    A ``SeedSequence``'s child is the one ``seed.spawn`` would hand out at
+    position ``key``, derived without advancing the sequence's spawn counter,
+    so the same seed gives the same children in every run, process and order.
+    An integer seed's child is seeded with ``[seed, *key]``, the entropy the
+    per-path and per-batch streams have always used.
+    """
+    if isinstance(seed, np.random.SeedSequence):
+        return np.random.SeedSequence(
+            seed.entropy,
+            spawn_key=(*seed.spawn_key, *key),
+            pool_size=seed.pool_size,
+        )
+    return np.random.SeedSequence([seed, *key])
+
+
+def _outcome_random(seed):
+    """
+    Return a scalar simulator's ``random.Random`` outcome stream, or ``None``.
+
+    An integer seeds it directly. A ``SeedSequence`` seeds it from its child
+    stream 0, leaving child 1 to :func:`_probability_generator`.
+    """
+    if seed is None:
+        return None
+    if isinstance(seed, np.random.SeedSequence):
+        seed = int.from_bytes(
+            _child_seed(seed, 0).generate_state(8).tobytes(), "little"
+        )
+    return random.Random(seed)
+
+
+def _probability_generator(seed):
+    """
+    Return a scalar simulator's NumPy probability stream, or ``None``.
+
+    An integer seeds it directly, and a ``SeedSequence`` from its child
+    stream 1, independent of the outcome stream.
+    """
+    if seed is None:
+        return None
+    if isinstance(seed, np.random.SeedSequence):
+        seed = _child_seed(seed, 1)
+    return np.random.default_rng(seed)
+
+
 def _validate_simulator_probability(probability, name):
     """Validate a simulator's fixed probability, which must be finite in [0, 1]."""
     probability = _require_finite(probability, name)
@@ -257,6 +394,26 @@ def _validate_stake_fraction(value):
     return value
 
 
+def _validate_stake_fractions(stakes):
+    """Check a batch of strategy results the way each one is checked alone."""
+    stakes = np.asarray(stakes, dtype=float)
+    if not np.isfinite(stakes).all():
+        raise ValueError("Strategy stake fraction must be a finite number")
+    if ((stakes < 0) | (stakes > 1)).any():
+        raise ValueError("Strategy stake fraction must be between 0 and 1")
+    return stakes
+
+
+def _stake_fraction_validator():
+    """
+    Return the per-trial stake-fraction check for the current input mode.
+
+    Simulators look this up once per run rather than once per trial, so a
+    :func:`trusted_inputs` block costs the hot loop nothing to consult.
+    """
+    return float if _TRUSTED.get() else _validate_stake_fraction
+
+
 def _update_strategy_bankroll(strategy, current_bankroll):
     """Update a strategy's bankroll state when it exposes a callable hook."""
     update_bankroll = getattr(strategy, "update_bankroll", None)
@@ -264,6 +421,21 @@ def _update_strategy_bankroll(strategy, current_bankroll):
         update_bankroll(current_bankroll)
 
 
+def _is_stateless_strategy(strategy):
+    """
+    Report whether a strategy exposes neither simulator feedback hook.
+
+    A strategy without a callable ``update_bankroll`` or ``record_result`` has no
+    way to learn from the run, so its stake fraction for a given probability does
+    not depend on what came before. That is what lets a simulator size many bets
+    at once instead of one ``evaluate`` call at a time.
+    """
+    return not any(
+        callable(getattr(strategy, hook, None))
+        for hook in ("update_bankroll", "record_result")
+    )
+
+
 def _expected_utility(
     outcomes, probabilities, current_wealth, entry_price, risk_aversion
 ):
@@ -0,0 +1,316 @@
+"""AdaptiveKellyCriterion: Kelly sizing on odds and quotes learned from its results."""
+
+import numpy as np
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import AdaptiveKellyCriterion, KellyCriterion
+from keeks.simulators import AsynchronousBinarySimulator, CorrelatedMarketSimulator
+
+
+def _strategy(**kwargs):
+    settings = {"payoff": 1.0, "loss": 1.0, "transaction_cost": 0.0}
+    settings.update(kwargs)
+    return AdaptiveKellyCriterion(**settings)
+
+
+def test_without_shrinkage_or_results_it_is_kelly():
+    adaptive = _strategy(transaction_cost=0.02, shrinkage=0.0)
+    kelly = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.02)
+    for probability in (0.4, 0.5, 0.55, 0.7, 0.95):
+        assert adaptive.evaluate(probability, 1000.0) == pytest.approx(
+            kelly.evaluate(probability, 1000.0), rel=1e-12, abs=1e-15
+        )
+
+
+def test_calibration_is_the_shrunk_surprise_of_the_bets_placed():
+    strategy = _strategy(prior_strength=20.0, decay=1.0)
+    results = [(0.6, True)] * 7 + [(0.6, False)] * 3 + [(0.8, True)] * 5
+    results += [(0.8, False)] * 5
+    for quote, won in results:
+        assert strategy.evaluate(quote, 1000.0) > 0
+        strategy.record_result(won)
+    # 12 wins against 14 expected from the quotes, over 20 prior results.
+    assert strategy.calibration == pytest.approx((12 - 14) / 40)
+    mean, variance = strategy.estimated_win_rate(0.7)
+    assert mean == pytest.approx(0.65)
+    assert variance == pytest.approx(0.65 * 0.35 / 41)
+
+
+def test_each_quote_keeps_its_own_stake():
+    rng = np.random.default_rng(1)
+    strategy = _strategy(decay=1.0)
+    # Quotes between 55% and 75%, each five points optimistic.
+    for quote in np.round(rng.uniform(0.55, 0.75, 4_000), 2):
+        if strategy.evaluate(quote, 1000.0) > 0:
+            strategy.record_result(bool(rng.random() < quote - 0.05))
+    assert strategy.calibration == pytest.approx(-0.05, abs=0.01)
+    strong, _ = strategy.estimated_win_rate(0.75)
+    weak, _ = strategy.estimated_win_rate(0.56)
+    assert strong - weak == pytest.approx(0.19)
+    stakes = [strategy.evaluate(quote, 1000.0) for quote in (0.56, 0.65, 0.75)]
+    assert stakes == sorted(stakes)
+    assert stakes[0] < 0.01 < 0.3 < stakes[-1]
+
+
+def test_stakes_follow_the_realized_win_rate():
+    rng = np.random.default_rng(0)
+    strategy = _strategy(decay=1.0)
+    # The quote says 60%; the bets actually win 55% of the time.
+    for won in rng.random(4_000) < 0.55:
+        if strategy.evaluate(0.6, 1000.0) > 0:
+            strategy.record_result(bool(won))
+    mean, _ = strategy.estimated_win_rate(0.6)
+    assert mean == pytest.approx(0.55, abs=0.02)
+    assert strategy.evaluate(0.6, 1000.0) < KellyCriterion(1.0, 1.0, 0.0).evaluate(
+        0.6, 1000.0
+    ) * (2 / 3)
+
+
+def test_realized_odds_are_learned_from_a_lone_open_bet():
+    strategy = _strategy(prior_strength=10.0, decay=1.0)
+    for won in [True, False] * 5:
+        stake = strategy.evaluate(0.6, 1000.0)
+        # Wins pay 0.8 and losses cost 1.1 per unit staked.
+        strategy.record_result(won, stake * 0.8 if won else -stake * 1.1)
+    assert strategy.estimated_payoff == pytest.approx((10 * 1.0 + 5 * 0.8) / 15)
+    assert strategy.estimated_loss == pytest.approx((10 * 1.0 + 5 * 1.1) / 15)
+    assert strategy.open_bets == 0
+
+
+def test_overlapping_results_count_the_configured_odds():
+    strategy, other = _strategy(), _strategy()
+    first = strategy.evaluate(0.6, 1000.0)
+    strategy.evaluate(0.6, 1000.0)
+    # Either result could settle either bet, so neither return is learned.
+    strategy.record_result(True, first * 0.5)
+    strategy.record_result(False, -first * 2.0)
+    other.evaluate(0.6, 1000.0)
+    other.evaluate(0.6, 1000.0)
+    other.record_result(True)
+    other.record_result(False)
+    assert strategy.estimated_payoff == 1.0
+    assert strategy.estimated_loss == 1.0
+    assert vars(strategy) == vars(other)
+
+
+def test_results_without_a_return_count_the_configured_odds():
+    strategy = _strategy(payoff=0.9, loss=1.2)
+    strategy.evaluate(0.7, 1000.0)
+    strategy.record_result(True)
+    assert strategy.win_amount == 0.9
+    assert strategy.estimated_payoff == pytest.approx(0.9)
+
+
+def test_uncertainty_shrinks_the_stake():
+    kelly = KellyCriterion(1.0, 1.0, 0.0).evaluate(0.6, 1000.0)
+    stakes = [
+        _strategy(prior_strength=prior).evaluate(0.6, 1000.0)
+        for prior in (5.0, 50.0, 500.0, 5_000.0)
+    ]
+    assert stakes == sorted(stakes)
+    assert stakes[-1] < kelly
+    assert stakes[-1] == pytest.approx(kelly, rel=0.01)
+
+    by_shrinkage = [
+        _strategy(shrinkage=shrinkage).evaluate(0.6, 1000.0)
+        for shrinkage in (0.0, 1.0, 4.0)
+    ]
+    assert by_shrinkage == sorted(by_shrinkage, reverse=True)
+    assert by_shrinkage[0] == pytest.approx(kelly)
+
+
+def test_decay_bounds_the_evidence_and_ages_it_per_bet_offered():
+    strategy = _strategy(prior_strength=10.0, decay=0.9)
+    for _ in range(500):
+        strategy.evaluate(0.6, 1000.0)
+        strategy.record_result(True)
+    assert strategy.results == pytest.approx(1 / (1 - 0.9))
+
+    # Bets offered but not placed still age the evidence, back to the quote.
+    for _ in range(500):
+        strategy.evaluate(0.4, 1000.0)
+    mean, _ = strategy.estimated_win_rate(0.6)
+    assert mean == pytest.approx(0.6)
+
+
+def test_a_stop_in_betting_does_not_last_by_default():
+    strategy = _strategy()
+    while strategy.evaluate(0.55, 1000.0) > 0:
+        strategy.record_result(False)
+    idle = 1
+    while strategy.evaluate(0.55, 1000.0) == 0:
+        idle += 1
+    assert idle < 100
+
+    # Without decay the strategy never learns it was wrong to stop.
+    strategy = _strategy(decay=1.0)
+    while strategy.evaluate(0.55, 1000.0) > 0:
+        strategy.record_result(False)
+    assert all(strategy.evaluate(0.55, 1000.0) == 0 for _ in range(10_000))
+
+
+@pytest.mark.parametrize("delay", [1, 5, 20])
+def test_overlapping_bets_leave_the_calibration_unbiased(delay):
+    simulator = AsynchronousBinarySimulator(
+        1.0,
+        1.0,
+        0.0,
+        0.6,
+        trials=3_000,
+        min_settlement_delay=delay,
+        max_settlement_delay=delay,
+        seed=1,
+    )
+    strategy = _strategy()
+    simulator.evaluate_strategy(strategy, BankRoll(1000.0, max_draw_down=None))
+    assert strategy.results > 50
+    assert strategy.calibration == pytest.approx(0.0, abs=0.05)
+    assert strategy.open_bets <= delay
+    # Even money, learned from lone bets or assumed for overlapping ones.
+    assert strategy.estimated_payoff == pytest.approx(1.0)
+    assert strategy.estimated_loss == pytest.approx(1.0)
+    # Shrunk below Kelly's 0.2 by what a hundred results leave uncertain.
+    assert 0.08 < strategy.evaluate(0.6, 1000.0) < 0.2
+
+
+def test_flat_fees_lower_the_odds_learned_from_settled_bets():
+    simulator = AsynchronousBinarySimulator(
+        1.0,
+        1.0,
+        1.0,
+        0.6,
+        trials=500,
+        min_settlement_delay=1,
+        max_settlement_delay=1,
+        seed=1,
+    )
+    strategy = _strategy()
+    simulator.evaluate_strategy(strategy, BankRoll(1000.0, max_draw_down=None))
+    assert strategy.open_bets == 0
+    assert strategy.estimated_payoff < 1.0 < strategy.estimated_loss
+
+
+def test_concurrent_markets_are_sized_by_their_own_quotes():
+    simulator = CorrelatedMarketSimulator(
+        1.0, 1.0, 0.0, [0.75, 0.56], [[1.0, 0.3], [0.3, 1.0]], trials=3_000, seed=1
+    )
+    strategy = _strategy()
+    simulator.evaluate_strategy(strategy, BankRoll(1000.0, max_draw_down=None))
+    assert strategy.calibration == pytest.approx(0.0, abs=0.05)
+    strong, weak = strategy.evaluate_batch([0.75, 0.56], 1000.0)
+    assert strong > 0.3
+    assert weak < 0.1
+
+
+def test_state_does_not_grow():
+    strategy = _strategy()
+    state = dict(vars(strategy))
+    for won in [True, False] * 500:
+        strategy.evaluate(0.6, 1000.0)
+        strategy.record_result(won, 0.01 if won else -0.01)
+    assert vars(strategy).keys() == state.keys()
+    assert all(
+        type(getattr(strategy, name)) is float
+        for name in (
+            "wins",
+            "results",
+            "quoted",
+            "placed",
+            "win_amount",
+            "loss_amount",
+            "last_stake",
+        )
+    )
+    assert strategy.open_bets == 0
+
+
+def _drive(make, paths=30, trials=80, seed=0):
+    """Step a vectorized strategy and one scalar copy per path on random data."""
+    rng = np.random.default_rng(seed)
+    vectorized = make().vectorize(paths)
+    scalars = [make() for _ in range(paths)]
+    bankrolls = np.full(paths, 1000.0)
+    for _ in range(trials):
+        probability = np.round(rng.uniform(0.45, 0.75, paths), 2)
+        stakes = vectorized.evaluate(probability, bankrolls)
+        expected = [
+            strategy.evaluate(float(p), float(b))
+            for strategy, p, b in zip(scalars, probability, bankrolls, strict=True)
+        ]
+        np.testing.assert_array_equal(stakes, expected)
+
+        won = rng.random(paths) < probability
+        settled = (stakes > 0) & (rng.random(paths) < 0.9)
+        return_pct = np.where(won, stakes, -stakes) * rng.uniform(0.5, 1.5, paths)
+        vectorized.record_result(won, return_pct, settled)
+        for strategy, w, r, s in zip(scalars, won, return_pct, settled, strict=True):
+            if s:
+                strategy.record_result(bool(w), float(r))
+        bankrolls = np.round(bankrolls * (1 + return_pct * settled), 2)
+    return vectorized, scalars
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [
+        {},
+        {"prior_strength": 3.0, "decay": 0.95},
+        {"decay": 1.0},
+        {"transaction_cost": 0.05, "shrinkage": 0.0},
+        {"payoff": 0.8, "loss": 1.3, "shrinkage": 3.0, "min_probability": 0.55},
+    ],
+)
+def test_paths_match_scalar_instances(settings):
+    vectorized, scalars = _drive(lambda: _strategy(**settings))
+    for name in (
+        "wins",
+        "results",
+        "quoted",
+        "placed",
+        "win_amount",
+        "loss_amount",
+        "open_bets",
+        "last_stake",
+    ):
+        np.testing.assert_array_equal(
+            getattr(vectorized, name),
+            [getattr(strategy, name) for strategy in scalars],
+        )
+
+
+def test_paths_start_from_the_instance_state():
+    def make():
+        strategy = _strategy(prior_strength=5.0, decay=0.9)
+        for won in (True, False, True, True):
+            strategy.evaluate(0.6, 1000.0)
+            strategy.record_result(won, 0.03 if won else -0.02)
+        return strategy
+
+    _drive(make, trials=20)
+
+
+def test_entry_price_is_kellys():
+    adaptive = _strategy(transaction_cost=0.01)
+    kelly = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.01)
+    arguments = ([-50.0, 100.0], [0.5, 0.5], 1000.0)
+    assert adaptive.calculate_max_entry_price(
+        *arguments
+    ) == kelly.calculate_max_entry_price(*arguments)
+
+
+@pytest.mark.parametrize(
+    ("overrides", "match"),
+    [
+        ({"prior_strength": 0.0}, "Prior strength must be greater than 0"),
+        ({"prior_strength": float("inf")}, "Prior strength must be a finite"),
+        ({"decay": 0.0}, "Decay must be greater than 0 and at most 1"),
+        ({"decay": 1.01}, "Decay must be greater than 0 and at most 1"),
+        ({"shrinkage": -0.5}, "Shrinkage must be non-negative"),
+        ({"shrinkage": float("nan")}, "Shrinkage must be a finite"),
+        ({"min_probability": 1.5}, "Minimum probability must be between 0 and 1"),
+    ],
+)
+def test_invalid_settings_are_rejected(overrides, match):
+    with pytest.raises(ValueError, match=match):
+        _strategy(**overrides)
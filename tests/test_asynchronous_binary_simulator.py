@@ -0,0 +1,240 @@
+"""Overlapping bets with delayed settlement.
+
+``AsynchronousBinarySimulator`` keeps open stakes in a settlement queue and sizes
+new bets against the bettable funds those stakes have not already locked. With a
+one-trial delay nothing ever overlaps, so it must reproduce
+``RepeatedBinarySimulator`` exactly; with longer delays the properties worth
+pinning are the settlement order and the locked-exposure arithmetic.
+"""
+
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import (
+    CPPIStrategy,
+    DynamicBankrollManagement,
+    FixedFractionStrategy,
+    KellyCriterion,
+)
+from keeks.simulators.asynchronous_binary import AsynchronousBinarySimulator
+from keeks.simulators.repeated_binary import RepeatedBinarySimulator
+
+
+def _fixed(fraction=0.1):
+    return FixedFractionStrategy(
+        fraction=fraction, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [
+        lambda: _fixed(),
+        lambda: KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0),
+        lambda: CPPIStrategy(
+            floor_fraction=0.5,
+            multiplier=2.0,
+            initial_bankroll=1000.0,
+            payoff=1.0,
+            loss=1.0,
+        ),
+        lambda: DynamicBankrollManagement(
+            base_fraction=0.1, payoff=1.0, loss=1.0, transaction_cost=0.0
+        ),
+    ],
+)
+def test_unit_delay_reproduces_repeated_simulator(factory):
+    common = {
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_costs": 0.5,
+        "probability": 0.6,
+        "trials": 200,
+        "seed": 7,
+    }
+    repeated = BankRoll(initial_funds=1000.0, max_draw_down=None)
+    RepeatedBinarySimulator(**common).evaluate_strategy(factory(), repeated)
+    queued = BankRoll(initial_funds=1000.0, max_draw_down=None)
+    AsynchronousBinarySimulator(**common).evaluate_strategy(factory(), queued)
+
+    assert queued.history == repeated.history
+
+
+def test_open_stakes_lock_bettable_funds():
+    class Spy:
+        def __init__(self):
+            self.returns = []
+
+        def evaluate(self, _probability, _current_bankroll):
+            return 0.5
+
+        def record_result(self, _won, return_pct):
+            self.returns.append(return_pct)
+
+    # Three bets open before the first settles: each takes half of what the
+    # earlier ones left unlocked, so the stakes are 500, 250 and 125.
+    strategy = Spy()
+    bankroll = BankRoll(initial_funds=1000.0, max_draw_down=None)
+    AsynchronousBinarySimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.0,
+        probability=1.0,
+        trials=3,
+        min_settlement_delay=5,
+        max_settlement_delay=5,
+        seed=1,
+    ).evaluate_strategy(strategy, bankroll)
+
+    assert bankroll.history == [1000.0, 1500.0, 1750.0, 1875.0]
+    assert strategy.returns == pytest.approx([0.5, 0.25, 0.125])
+
+
+def test_bets_settle_in_due_order_then_opening_order(monkeypatch):
+    settled = []
+
+    class Spy:
+        def __init__(self):
+            self.trial = 0
+
+        def evaluate(self, _probability, _current_bankroll):
+            self.trial += 1
+            return 0.01 * self.trial
+
+        def record_result(self, _won, return_pct):
+            settled.append(return_pct)
+
+    simulator = AsynchronousBinarySimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.0,
+        probability=1.0,
+        trials=3,
+        min_settlement_delay=1,
+        max_settlement_delay=3,
+        seed=3,
+    )
+    # Opened at trials 0, 1, 2 and due at 3, 2, 3: the trial-1 bet settles
+    # first, then the two due together in the order they were opened.
+    delays = iter([3, 1, 1])
+    monkeypatch.setattr(simulator, "_draw_delay", lambda: next(delays))
+    simulator.evaluate_strategy(Spy(), BankRoll(initial_funds=1000.0))
+
+    # Stakes are 10, (1000 - 10) * 0.02 and, after the trial-1 bet has paid
+    # out, (1019.8 - 10) * 0.03 of a 1019.8 bankroll.
+    assert settled == pytest.approx([0.0198, 0.01, 1009.8 * 0.03 / 1019.8])
+
+
+def test_delayed_runs_are_seed_reproducible():
+    def run(seed):
+        bankroll = BankRoll(initial_funds=1000.0, max_draw_down=None)
+        AsynchronousBinarySimulator(
+            payoff=1.0,
+            loss=1.0,
+            transaction_costs=0.0,
+            probability=0.55,
+            trials=500,
+            min_settlement_delay=1,
+            max_settlement_delay=20,
+            seed=seed,
+        ).evaluate_strategy(_fixed(0.02), bankroll)
+        return bankroll.history
+
+    assert run(11) == run(11)
+    assert run(11) != run(12)
+
+
+def test_locked_exposure_never_overdraws_the_bankroll():
+    class AlwaysBet:
+        def evaluate(self, _probability, _current_bankroll):
+            return 0.9
+
+    bankroll = BankRoll(initial_funds=1000.0, max_draw_down=None)
+    AsynchronousBinarySimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.0,
+        probability=0.0,
+        trials=50,
+        min_settlement_delay=10,
+        max_settlement_delay=10,
+        seed=5,
+    ).evaluate_strategy(AlwaysBet(), bankroll)
+
+    # Every bet loses, yet each was sized on funds the open ones had not locked:
+    # 900 of 1000, then 90 of the 100 left, and so on, so no loss overdraws.
+    assert min(bankroll.history) >= 0
+    assert bankroll.history[:4] == [1000.0, 100.0, 10.0, 1.0]
+
+
+def test_no_bet_opens_while_exposure_locks_the_whole_bankroll():
+    class AllIn:
+        def __init__(self):
+            self.offers = 0
+            self.results = 0
+
+        def evaluate(self, _probability, _current_bankroll):
+            self.offers += 1
+            return 1.0
+
+        def record_result(self, _won, _return_pct):
+            self.results += 1
+
+    # The first bet locks its 1,000 stake plus the 5 fee, leaving nothing to
+    # stake on the next two trials, so they offer no bet and pay no fee.
+    strategy = AllIn()
+    bankroll = BankRoll(initial_funds=1000.0, max_draw_down=None)
+    AsynchronousBinarySimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=5.0,
+        probability=1.0,
+        trials=3,
+        min_settlement_delay=5,
+        max_settlement_delay=5,
+        seed=1,
+    ).evaluate_strategy(strategy, bankroll)
+
+    assert bankroll.history == [1000.0, 1995.0]
+    assert strategy.offers == 1
+    assert strategy.results == 1
+
+
+def test_tripped_safeguard_stops_the_run():
+    bankroll = BankRoll(initial_funds=1000.0, max_draw_down=0.3)
+    AsynchronousBinarySimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.0,
+        probability=0.0,
+        trials=100,
+        min_settlement_delay=2,
+        max_settlement_delay=4,
+        seed=5,
+    ).evaluate_strategy(_fixed(0.5), bankroll)
+
+    assert bankroll.history == [1000.0]
+
+
+@pytest.mark.parametrize(
+    ("overrides", "message"),
+    [
+        ({"min_settlement_delay": 0}, "Minimum settlement delay"),
+        ({"max_settlement_delay": 1.5}, "Maximum settlement delay"),
+        ({"max_settlement_delay": True}, "Maximum settlement delay"),
+        (
+            {"min_settlement_delay": 3, "max_settlement_delay": 2},
+            "must not exceed",
+        ),
+    ],
+)
+def test_invalid_settlement_delays_are_rejected(overrides, message):
+    kwargs = {
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_costs": 0.0,
+        "probability": 0.5,
+    }
+    kwargs.update(overrides)
+    with pytest.raises(ValueError, match=message):
+        AsynchronousBinarySimulator(**kwargs)
@@ -0,0 +1,110 @@
+"""Rendering long bankroll histories, one at a time or as a fan chart.
+
+Everything is saved through ``fname`` so no window opens; the drawn artists are
+read back from the current figure.
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+from keeks.bankroll import BankRoll
+
+
+@pytest.fixture(autouse=True)
+def _close_figures():
+    yield
+    plt.close("all")
+
+
+def _bankroll(history):
+    bankroll = BankRoll(float(history[0]))
+    bankroll.history = list(history)
+    return bankroll
+
+
+def _walk(steps, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.round(1000 * np.exp(np.cumsum(rng.normal(0, 0.01, steps))), 2)
+
+
+def test_short_history_is_drawn_in_full(tmp_path):
+    bankroll = _bankroll([1000.0, 1100.0, 990.0])
+    bankroll.plot_history(fname=tmp_path / "history.png")
+
+    (line,) = plt.gca().lines
+    assert list(line.get_xdata()) == [0, 1, 2]
+    assert list(line.get_ydata()) == bankroll.history
+    assert line.get_marker() == "o"
+    assert (tmp_path / "history.png").exists()
+
+
+def test_long_history_keeps_every_bucket_extreme(tmp_path):
+    history = _walk(100_003)
+    _bankroll(history).plot_history(fname=tmp_path / "history.png", max_points=200)
+
+    (line,) = plt.gca().lines
+    steps, values = line.get_xdata(), line.get_ydata()
+    assert len(steps) <= 204
+    assert (np.diff(steps) > 0).all()
+    np.testing.assert_array_equal(values, history[steps])
+    assert steps[0] == 0 and steps[-1] == len(history) - 1
+    assert values.min() == history.min() and values.max() == history.max()
+    # Each bucket of ceil(100_003 / 100) steps contributes its own extremes.
+    for start in range(0, len(history), 1001):
+        bucket = history[start : start + 1001]
+        drawn = values[(steps >= start) & (steps < start + 1001)]
+        assert drawn.min() == bucket.min() and drawn.max() == bucket.max()
+
+
+def test_default_budget_follows_the_figure_width(tmp_path):
+    with plt.rc_context({"figure.figsize": (4.0, 3.0), "figure.dpi": 50}):
+        _bankroll(_walk(10_000)).plot_history(fname=tmp_path / "history.png")
+    assert len(plt.gca().lines[0].get_xdata()) <= 2 * 200 + 2
+
+
+def test_fan_chart_summarizes_histories_step_by_step(tmp_path):
+    histories = [_walk(1_000, seed) for seed in range(40)]
+    # A run stopped early holds its last funds.
+    histories.append(_walk(300, 40))
+    held = np.concatenate([histories[-1], np.full(700, histories[-1][-1])])
+    bankrolls = [_bankroll(history) for history in histories]
+
+    BankRoll.plot_histories(bankrolls, fname=tmp_path / "fan.png", max_points=100)
+
+    axes = plt.gca()
+    (median,) = axes.lines
+    steps = median.get_xdata()
+    assert len(steps) == 100 and steps[0] == 0 and steps[-1] == 999
+    funds = np.array(histories[:-1] + [held])[:, steps]
+    np.testing.assert_allclose(median.get_ydata(), np.median(funds, axis=0))
+    assert len(axes.collections) == 2
+    assert [text.get_text() for text in axes.get_legend().get_texts()] == [
+        "90% interval",
+        "50% interval",
+        "median",
+    ]
+    assert (tmp_path / "fan.png").exists()
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"max_points": 0}, "max_points must be a positive integer"),
+        ({"max_points": 2.5}, "max_points must be a positive integer"),
+        ({"intervals": (0.5, 1.0)}, "intervals must be between 0 and 1"),
+    ],
+)
+def test_invalid_plot_settings_are_rejected(kwargs, match):
+    bankroll = _bankroll(_walk(10))
+    with pytest.raises(ValueError, match=match):
+        BankRoll.plot_histories([bankroll], **kwargs)
+    if "max_points" in kwargs:
+        with pytest.raises(ValueError, match=match):
+            bankroll.plot_history(**kwargs)
+    assert not plt.get_fignums()
+
+
+def test_fan_chart_needs_bankrolls():
+    with pytest.raises(ValueError, match="bankrolls must not be empty"):
+        BankRoll.plot_histories([])
@@ -0,0 +1,151 @@
+"""Stationary-bootstrap paths resampled from recorded bets.
+
+Every resampled path is a sequence of recorded rows, so replaying its
+``bets()`` through ``ReplaySimulator`` is the exact reference for what the
+vectorized run must produce on that path.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import (
+    CPPIStrategy,
+    DynamicBankrollManagement,
+    KellyCriterion,
+)
+from keeks.simulators import BootstrapSimulator, PathResults, ReplaySimulator, bootstrap
+
+
+def _history(rows=300, seed=0):
+    rng = np.random.default_rng(seed)
+    probabilities = np.round(rng.uniform(0.45, 0.7, rows), 2)
+    return pd.DataFrame(
+        {
+            "probability": probabilities,
+            "payoff": rng.choice([0.8, 1.0, 1.5], rows),
+            "loss": 1.0,
+            "outcome": (rng.random(rows) < probabilities).astype(int),
+        }
+    )
+
+
+def _simulator(source=None, **kwargs):
+    settings = {"trials": 150, "paths": 40, "mean_block_length": 10, "seed": 3}
+    settings.update(kwargs)
+    return BootstrapSimulator(_history() if source is None else source, **settings)
+
+
+STRATEGIES = {
+    "kelly": lambda: KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0),
+    "cppi": lambda: CPPIStrategy(
+        floor_fraction=0.8,
+        multiplier=3.0,
+        initial_bankroll=1000.0,
+        payoff=1.0,
+        loss=1.0,
+        transaction_cost=0.0,
+    ),
+    "dynamic": lambda: DynamicBankrollManagement(
+        base_fraction=0.1, payoff=1.0, loss=1.0, transaction_cost=0.0
+    ),
+}
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+def test_paths_match_replaying_their_bets(name):
+    make = STRATEGIES[name]
+    simulator = _simulator(transaction_costs=0.5)
+    results = simulator.evaluate_strategy(make(), BankRoll(1000.0, max_draw_down=0.4))
+
+    assert isinstance(results, PathResults)
+    np.testing.assert_array_equal(results.weights, 1.0)
+    for path in range(simulator.paths):
+        bankroll = BankRoll(1000.0, max_draw_down=0.4)
+        ReplaySimulator(simulator.bets(path), transaction_costs=0.5).evaluate_strategy(
+            make(), bankroll
+        )
+        assert results.terminal[path] == bankroll.total_funds
+
+
+def test_blocks_run_through_consecutive_rows():
+    indices = _simulator(trials=2_000, paths=200, mean_block_length=8).indices()
+    continues = np.diff(indices, axis=0) % 300 == 1
+    # A new block lands on the next row once in 300 draws.
+    assert continues.mean() == pytest.approx(1 - 1 / 8 + 1 / 8 / 300, abs=0.005)
+
+    independent = _simulator(trials=2_000, paths=200, mean_block_length=1).indices()
+    assert (np.diff(independent, axis=0) % 300 == 1).mean() < 0.01
+
+
+def test_blocks_carry_across_index_chunks(monkeypatch):
+    # Force a chunk of three trials, and blocks far longer than the run.
+    monkeypatch.setattr(bootstrap, "_INDEX_ENTRIES", 3 * 40)
+    indices = _simulator(mean_block_length=1e9, trials=700).indices()
+    expected = (indices[0] + np.arange(700)[:, None]) % 300
+    np.testing.assert_array_equal(indices, expected)
+
+
+def test_seed_fixes_the_resample():
+    first = _simulator().indices()
+    np.testing.assert_array_equal(first, _simulator().indices())
+    assert not np.array_equal(first, _simulator(seed=4).indices())
+    assert _simulator(trials=0).indices().shape == (0, 40)
+
+
+def test_memory_mapped_source_matches_the_frame(tmp_path):
+    history = _history()
+    path = tmp_path / "history.npy"
+    np.save(path, history.to_numpy(dtype=float))
+
+    mapped = _simulator(path)
+    assert isinstance(mapped.data, np.memmap)
+    strategy = STRATEGIES["kelly"]
+    np.testing.assert_array_equal(
+        mapped.evaluate_strategy(strategy(), BankRoll(1000.0)).terminal,
+        _simulator(history).evaluate_strategy(strategy(), BankRoll(1000.0)).terminal,
+    )
+
+
+def test_columns_can_be_renamed():
+    renamed = _history().rename(columns={"probability": "p", "outcome": "won"})
+    simulator = _simulator(renamed, columns={"probability": "p", "outcome": "won"})
+    np.testing.assert_array_equal(simulator.data, _simulator().data)
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"transaction_costs": -1.0}, "Transaction costs"),
+        ({"trials": -1}, "Trials"),
+        ({"paths": 0}, "Paths"),
+        ({"mean_block_length": 0.5}, "Mean block length"),
+        ({"mean_block_length": float("inf")}, "Mean block length"),
+        ({"seed": -1}, "Seed"),
+        ({"columns": {"odds": "payoff"}}, "Unknown bootstrap column roles"),
+    ],
+)
+def test_invalid_settings_are_rejected(kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        _simulator(**kwargs)
+
+
+def test_invalid_sources_are_rejected():
+    history = _history()
+    history.loc[3, "outcome"] = 2
+    with pytest.raises(ValueError, match="Bootstrap row 3: outcome must be 0 or 1"):
+        _simulator(history)
+    with pytest.raises(ValueError, match="missing columns"):
+        _simulator(_history().drop(columns="loss"))
+    with pytest.raises(ValueError, match="empty"):
+        _simulator(_history().iloc[:0])
+    with pytest.raises(ValueError, match=r"shape \(rows, 4\)"):
+        _simulator(np.ones((10, 3)))
+
+
+def test_invalid_path_number_is_rejected():
+    simulator = _simulator()
+    for path in (-1, 40, 1.5, True):
+        with pytest.raises(ValueError, match="Path"):
+            simulator.bets(path)
@@ -0,0 +1,152 @@
+"""The thread-safe bankroll with stake reservations.
+
+The guarantee worth testing is the one ``BankRoll`` cannot give under
+contention: once reservations are admitted, they settle in any order and from
+any thread without a single loss exceeding the drawdown limit or the bankroll
+going negative.
+"""
+
+import contextlib
+import itertools
+import random
+import threading
+
+import pytest
+
+from keeks.bankroll import BankRoll, ConcurrentBankRoll
+from keeks.utils import RuinError
+
+
+def _worst_excess_loss(history, max_draw_down):
+    # History is recorded in cents, so a loss right at the limit can appear to
+    # overshoot it by up to a cent of rounding on each side.
+    return max(
+        (
+            (before - after) - max_draw_down * before
+            for before, after in itertools.pairwise(history)
+        ),
+        default=0.0,
+    )
+
+
+ROUNDING = 0.011
+
+
+def test_reservations_settle_wins_and_losses():
+    bankroll = ConcurrentBankRoll(initial_funds=1000.0, max_draw_down=0.3)
+    win = bankroll.reserve(100.0)
+    loss = bankroll.reserve(50.0)
+    released = bankroll.reserve(25.0)
+    assert bankroll.reserved_funds == 175.0
+    assert bankroll.available_funds == 825.0
+
+    bankroll.commit(win, 80.0)
+    bankroll.commit(loss, -50.0)
+    bankroll.release(released)
+
+    assert bankroll.total_funds == 1030.0
+    assert bankroll.reserved_funds == 0.0
+    assert bankroll.history == [1000.0, 1080.0, 1030.0]
+
+
+def test_reservations_are_limited_by_bettable_funds():
+    bankroll = ConcurrentBankRoll(
+        initial_funds=1000.0, percent_bettable=0.5, max_draw_down=None
+    )
+    bankroll.reserve(400.0)
+    with pytest.raises(ValueError, match="exceeds available"):
+        bankroll.reserve(150.0)
+    with pytest.raises(ValueError, match="exceeds bettable"):
+        bankroll.bet(150.0)
+
+
+def test_reservations_that_could_jointly_breach_the_drawdown_are_refused():
+    bankroll = ConcurrentBankRoll(initial_funds=1000.0, max_draw_down=0.3)
+    bankroll.reserve(200.0)
+    bankroll.reserve(200.0)
+    # Alone, 200 is within the limit; after two 200 losses, of the 600 left, it
+    # is not.
+    with pytest.raises(RuinError):
+        bankroll.reserve(200.0)
+    with pytest.raises(RuinError):
+        bankroll.withdraw(200.0)
+    bankroll.reserve(100.0)
+
+
+def test_admitted_reservations_settle_safely_in_any_order():
+    rng = random.Random(11)
+    for _ in range(200):
+        bankroll = ConcurrentBankRoll(initial_funds=1000.0, max_draw_down=0.25)
+        tokens = {}
+        for _ in range(20):
+            amount = rng.uniform(1.0, 200.0)
+            with contextlib.suppress(RuinError, ValueError):
+                tokens[bankroll.reserve(amount)] = amount
+        order = list(tokens)
+        rng.shuffle(order)
+        for token in order:
+            bankroll.commit(token, -tokens[token])
+        assert _worst_excess_loss(bankroll.history, 0.25) <= ROUNDING
+        assert bankroll.total_funds >= 0
+
+
+def test_settlement_errors_leave_the_reservation_open():
+    bankroll = ConcurrentBankRoll(initial_funds=1000.0)
+    token = bankroll.reserve(50.0)
+    with pytest.raises(ValueError, match="exceeds the 50.0 reserved"):
+        bankroll.commit(token, -60.0)
+    with pytest.raises(ValueError, match="finite"):
+        bankroll.commit(token, float("nan"))
+    assert bankroll.reserved_funds == 50.0
+    bankroll.release(token)
+    with pytest.raises(ValueError, match="No open reservation"):
+        bankroll.release(token)
+    with pytest.raises(ValueError, match="amount"):
+        bankroll.reserve(-1.0)
+
+
+def test_direct_operations_match_bankroll_without_reservations():
+    plain = BankRoll(initial_funds=1000.0, max_draw_down=0.3)
+    shared = ConcurrentBankRoll(initial_funds=1000.0, max_draw_down=0.3)
+    for bankroll in (plain, shared):
+        bankroll.deposit(200.0)
+        bankroll.bet(300.0)
+        bankroll.withdraw(100.0)
+        bankroll.add_funds(5.0)
+        bankroll.remove_funds(50.0)
+        with pytest.raises(RuinError):
+            bankroll.withdraw(400.0)
+    assert shared.history == plain.history
+
+
+def test_contended_reservations_keep_the_safeguards():
+    bankroll = ConcurrentBankRoll(initial_funds=10_000.0, max_draw_down=0.05)
+    results = []
+    lock = threading.Lock()
+
+    def bettor(seed):
+        rng = random.Random(seed)
+        net = 0.0
+        for _ in range(2_000):
+            stake = rng.uniform(1.0, 150.0)
+            try:
+                token = bankroll.reserve(stake)
+            except (RuinError, ValueError):
+                continue
+            pnl = stake * 0.9 if rng.random() < 0.5 else -stake
+            bankroll.commit(token, pnl)
+            net += pnl
+        with lock:
+            results.append(net)
+
+    threads = [threading.Thread(target=bettor, args=(seed,)) for seed in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 8
+    assert bankroll.reserved_funds == 0.0
+    assert bankroll._bank == pytest.approx(10_000.0 + sum(results))
+    assert _worst_excess_loss(bankroll.history, 0.05) <= ROUNDING
+    assert min(bankroll.history) >= 0
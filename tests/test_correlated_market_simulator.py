@@ -0,0 +1,181 @@
+"""Concurrent bets on markets whose outcomes are drawn from a copula.
+
+At even odds the joint win probability of two markets under a Gaussian copula
+is known in closed form, which pins the dependence down; settlement is checked
+against a plain ``BankRoll`` replay of the simulator's own outcomes.
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import FixedFractionStrategy, KellyCriterion
+from keeks.simulators import CorrelatedMarketSimulator, correlated
+
+
+def _equicorrelation(markets, rho):
+    return np.full((markets, markets), rho) + (1 - rho) * np.eye(markets)
+
+
+def _simulator(markets=4, rho=0.5, **kwargs):
+    settings = {
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_costs": 0.0,
+        "probabilities": np.linspace(0.5, 0.65, markets),
+        "correlation": _equicorrelation(markets, rho),
+        "trials": 200,
+        "seed": 7,
+    }
+    settings.update(kwargs)
+    return CorrelatedMarketSimulator(**settings)
+
+
+def _fixed_fraction(fraction):
+    return FixedFractionStrategy(
+        fraction=fraction, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+
+
+def test_marginals_and_joint_wins_match_the_gaussian_copula():
+    rho = 0.6
+    outcomes = _simulator(
+        markets=2, rho=rho, probabilities=[0.5, 0.5], trials=200_000
+    ).outcomes()
+    assert outcomes.mean(axis=0) == pytest.approx([0.5, 0.5], abs=0.005)
+    both = (outcomes[:, 0] & outcomes[:, 1]).mean()
+    assert both == pytest.approx(0.25 + math.asin(rho) / (2 * math.pi), abs=0.005)
+
+
+def test_t_copula_loses_together_more_often():
+    pytest.importorskip("scipy")
+    settings = {"markets": 10, "rho": 0.3, "probabilities": [0.8] * 10}
+    settings["trials"] = 100_000
+    gaussian = _simulator(**settings).outcomes()
+    t = _simulator(copula="t", degrees_of_freedom=3.0, **settings).outcomes()
+
+    assert t.mean(axis=0) == pytest.approx([0.8] * 10, abs=0.01)
+    assert (~t).all(axis=1).mean() > 2 * (~gaussian).all(axis=1).mean()
+
+
+def _replay(simulator, fraction):
+    """Settle ``simulator.outcomes()`` by hand, one net amount per trial."""
+    bankroll = BankRoll(1000.0, percent_bettable=0.5, max_draw_down=None)
+    scale = min(1.0, 1.0 / (fraction * simulator.markets))
+    for won in simulator.outcomes():
+        stakes = bankroll.bettable_funds * fraction * scale
+        net = sum(stakes if w else -stakes for w in won.tolist())
+        if net >= 0:
+            bankroll.deposit(net)
+        else:
+            bankroll.withdraw(-net)
+    return bankroll
+
+
+@pytest.mark.parametrize("fraction", [0.02, 0.3])
+def test_settlement_matches_a_bankroll_replay(fraction):
+    simulator = _simulator(markets=5)
+    bankroll = BankRoll(1000.0, percent_bettable=0.5, max_draw_down=None)
+    simulator.evaluate_strategy(_fixed_fraction(fraction), bankroll)
+    # Five legs of 0.3 are scaled down to 0.2 each, betting all bettable funds.
+    np.testing.assert_allclose(
+        bankroll.history, _replay(simulator, fraction).history, rtol=1e-6
+    )
+
+
+class _Recorder:
+    def __init__(self):
+        self.calls = 0
+        self.results = []
+
+    def evaluate(self, probability, _current_bankroll):
+        self.calls += 1
+        return 0.05 if probability > 0.55 else 0.0
+
+    def record_result(self, won, return_pct):
+        self.results.append((won, return_pct))
+
+
+def test_strategies_without_a_batch_method_are_sized_per_market():
+    simulator = _simulator(trials=30)
+    strategy = _Recorder()
+    simulator.evaluate_strategy(strategy, BankRoll(1000.0, max_draw_down=None))
+
+    assert strategy.calls == 30 * 4
+    # Only the two markets above 0.55 bet, and each is heard in market order.
+    assert len(strategy.results) == 30 * 2
+    outcomes = simulator.outcomes()[:, 2:].ravel().tolist()
+    assert [won for won, _ in strategy.results] == outcomes
+
+
+def test_kelly_sizes_every_market_in_one_batch():
+    simulator = _simulator(markets=200, trials=500)
+    strategy = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    batches = []
+
+    def evaluate_batch(probabilities, current_bankroll):
+        batches.append(len(probabilities))
+        return KellyCriterion.evaluate_batch(strategy, probabilities, current_bankroll)
+
+    strategy.evaluate_batch = evaluate_batch
+    bankroll = BankRoll(1000.0, percent_bettable=0.5, max_draw_down=None)
+    simulator.evaluate_strategy(strategy, bankroll)
+    assert batches == [200] * 500
+    assert len(bankroll.history) == 501
+
+
+def test_drawdown_safeguard_stops_the_run():
+    simulator = _simulator(rho=0.9, probabilities=[0.5] * 4, trials=500)
+    bankroll = BankRoll(1000.0, max_draw_down=0.2)
+    simulator.evaluate_strategy(_fixed_fraction(0.25), bankroll)
+    assert len(bankroll.history) < 501
+    assert bankroll.total_funds > 0
+
+
+def test_perfectly_correlated_markets_move_together():
+    simulator = _simulator(rho=1.0, probabilities=[0.6] * 4)
+    outcomes = simulator.outcomes()
+    assert (outcomes == outcomes[:, :1]).all()
+
+
+def test_seed_fixes_the_outcomes():
+    np.testing.assert_array_equal(_simulator().outcomes(), _simulator().outcomes())
+    assert not np.array_equal(_simulator().outcomes(), _simulator(seed=8).outcomes())
+    assert _simulator(trials=0).outcomes().shape == (0, 4)
+
+
+def test_chunked_draws_continue_one_stream(monkeypatch):
+    whole = _simulator(trials=1_000).outcomes()
+    # Force chunks of three trials.
+    monkeypatch.setattr(correlated, "_DRAW_ENTRIES", 3 * 4)
+    np.testing.assert_array_equal(_simulator(trials=1_000).outcomes(), whole)
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"probabilities": []}, "Probabilities must be a non-empty"),
+        ({"probabilities": [0.5, 1.2, 0.5, 0.5]}, "between 0 and 1"),
+        ({"probabilities": [0.5, np.nan, 0.5, 0.5]}, "finite"),
+        ({"correlation": np.eye(3)}, r"\(4, 4\) matrix"),
+        ({"correlation": np.triu(_equicorrelation(4, 0.5))}, "symmetric"),
+        ({"correlation": 2 * np.eye(4)}, "unit diagonal"),
+        ({"correlation": _equicorrelation(4, -0.5)}, "positive semidefinite"),
+        ({"copula": "clayton"}, "Copula"),
+        ({"degrees_of_freedom": 0.0}, "Degrees of freedom"),
+        ({"trials": -1}, "Trials"),
+    ],
+)
+def test_invalid_settings_are_rejected(kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        _simulator(**kwargs)
+
+
+def test_strategy_odds_must_match():
+    with pytest.raises(ValueError, match="payoff"):
+        _simulator().evaluate_strategy(
+            KellyCriterion(payoff=2.0, loss=1.0, transaction_cost=0.0),
+            BankRoll(1000.0),
+        )
@@ -0,0 +1,91 @@
+"""Batch evaluation of strategies.
+
+``evaluate_batch`` exists so that many stakes can be sized in one call, and it is
+only safe to swap in if every element is exactly what ``evaluate`` returns, so
+the vectorized overrides are compared bit for bit against the scalar path. The
+one exception is the Merton share, whose batch squares the mean return with
+NumPy rather than Python's ``**``; the two may round differently in the last
+bit, so it is compared to within rounding.
+"""
+
+import numpy as np
+import pytest
+
+from keeks.binary_strategies import (
+    CPPIStrategy,
+    DrawdownAdjustedKelly,
+    DynamicBankrollManagement,
+    FixedFractionStrategy,
+    FractionalKellyCriterion,
+    KellyCriterion,
+    MertonShare,
+    NaiveStrategy,
+    OptimalF,
+)
+
+PROBABILITIES = np.concatenate(
+    [np.linspace(0.0, 1.0, 401), np.random.default_rng(3).random(400)]
+)
+
+ODDS = [(1.0, 1.0, 0.0), (2.5, 0.5, 0.01), (0.3, 1.7, 0.2), (1.0, 0.0, 1.5)]
+
+FACTORIES = {
+    "kelly": lambda a, b, c: KellyCriterion(a, b, c),
+    "kelly_low_threshold": lambda a, b, c: KellyCriterion(a, b, c, min_probability=0.1),
+    "fractional_kelly": lambda a, b, c: FractionalKellyCriterion(a, b, c, 0.3),
+    "drawdown_kelly": lambda a, b, c: DrawdownAdjustedKelly(a, b, c, 0.1),
+    "naive": lambda a, b, c: NaiveStrategy(a, b, c),
+    "fixed_fraction": lambda a, b, c: FixedFractionStrategy(0.4, a, b, c),
+    "optimal_f": lambda a, b, c: OptimalF(a, b, c, win_rate=0.6),
+    "merton": lambda a, b, c: MertonShare(a, b, c),
+    "merton_bold": lambda a, b, c: MertonShare(a, b, c, risk_aversion=0.5),
+}
+
+
+@pytest.mark.parametrize("odds", ODDS)
+@pytest.mark.parametrize("name", sorted(FACTORIES))
+@pytest.mark.parametrize("bankroll", [1000.0, 0.0, -5.0])
+def test_batch_matches_scalar_evaluation_exactly(name, odds, bankroll):
+    strategy = FACTORIES[name](*odds)
+    expected = [strategy.evaluate(p, bankroll) for p in PROBABILITIES.tolist()]
+    stakes = strategy.evaluate_batch(PROBABILITIES, bankroll)
+    if name.startswith("merton"):
+        np.testing.assert_allclose(stakes, expected, rtol=1e-12, atol=0.0)
+    else:
+        np.testing.assert_array_equal(stakes, expected)
+
+
+def test_bankroll_can_vary_per_element():
+    strategy = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    stakes = strategy.evaluate_batch([0.6, 0.6, 0.7], [1000.0, 0.0, 5.0])
+    np.testing.assert_array_equal(
+        stakes,
+        [strategy.evaluate(0.6, 1000.0), 0.0, strategy.evaluate(0.7, 5.0)],
+    )
+
+
+def test_default_batch_calls_evaluate_in_order():
+    strategy = DynamicBankrollManagement(
+        base_fraction=0.1, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+    reference = DynamicBankrollManagement(
+        base_fraction=0.1, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+    probabilities = [0.55, 0.6, 0.65]
+    np.testing.assert_array_equal(
+        strategy.evaluate_batch(probabilities, 1000.0),
+        [reference.evaluate(p, 1000.0) for p in probabilities],
+    )
+
+
+def test_batch_keeps_the_input_shape():
+    strategy = CPPIStrategy(
+        floor_fraction=0.8,
+        multiplier=2.0,
+        initial_bankroll=1000.0,
+        payoff=1.0,
+        loss=1.0,
+        transaction_cost=0.0,
+    )
+    assert strategy.evaluate_batch(np.full((2, 3), 0.6), 1000.0).shape == (2, 3)
+    assert KellyCriterion(1.0, 1.0, 0.0).evaluate_batch([], 1000.0).shape == (0,)
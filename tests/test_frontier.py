@@ -0,0 +1,155 @@
+"""Growth-versus-drawdown frontiers traced on common random numbers."""
+
+from functools import partial
+
+import numpy as np
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import (
+    CPPIStrategy,
+    FixedFractionStrategy,
+    FractionalKellyCriterion,
+)
+from keeks.frontier import efficient_frontier
+from keeks.simulators import PathSimulator
+from keeks.utils import WEALTH_FLOOR
+
+_FIXED = partial(FixedFractionStrategy, payoff=1.0, loss=1.0)
+
+
+def _simulator(**overrides):
+    settings = {
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_costs": 0.0,
+        "probability": 0.55,
+        "trials": 300,
+        "paths": 300,
+        "seed": 3,
+        "log_domain": True,
+    }
+    settings.update(overrides)
+    return PathSimulator(**settings)
+
+
+def _frontier(**overrides):
+    arguments = {
+        "factory": _FIXED,
+        "space": {"fraction": [0.02, 0.05, 0.1, 0.2, 0.3]},
+        "simulator": _simulator(),
+        "bankroll": BankRoll(1000.0, max_draw_down=None),
+    }
+    arguments.update(overrides)
+    return efficient_frontier(**arguments)
+
+
+def test_points_are_the_quantiles_of_each_settings_paths():
+    result = _frontier(growth_quantile=0.25, drawdown_quantile=0.9, refinements=0)
+    assert result.points["round"].eq(0).all()
+    for _, row in result.points.iterrows():
+        paths = _simulator().evaluate_strategy(
+            _FIXED(fraction=row["fraction"]), BankRoll(1000.0, max_draw_down=None)
+        )
+        growth = np.log(np.maximum(paths.terminal, WEALTH_FLOOR) / 1000.0) / 300
+        assert row["growth"] == np.quantile(growth, 0.25)
+        assert row["drawdown"] == np.quantile(paths.max_drawdown, 0.9)
+        assert row["stopped"] == paths.stopped.mean()
+
+
+def test_pareto_set_is_exactly_the_undominated_points():
+    result = _frontier()
+    points = result.points
+    for _, row in points.iterrows():
+        dominated = (
+            (points["growth"] >= row["growth"])
+            & (points["drawdown"] <= row["drawdown"])
+            & (
+                (points["growth"] > row["growth"])
+                | (points["drawdown"] < row["drawdown"])
+            )
+        ).any()
+        assert row["pareto"] == (not dominated)
+
+    assert result.pareto["drawdown"].is_monotonic_increasing
+    assert result.pareto["growth"].is_monotonic_increasing
+    # Staking beyond Kelly's 0.1 adds drawdown and loses growth.
+    assert result.pareto["fraction"].max() <= 0.1
+    assert result.knee["fraction"] in result.pareto["fraction"].tolist()
+
+
+def test_refinement_bisects_around_the_knee():
+    coarse = _frontier(refinements=0)
+    refined = _frontier(refinements=3)
+
+    first = refined.points[refined.points["round"] == 1]
+    knee = coarse.knee["fraction"]
+    pareto = coarse.pareto["fraction"].tolist()
+    position = pareto.index(knee)
+    neighbours = pareto[max(position - 1, 0) : position + 2]
+    assert sorted(first["fraction"]) == pytest.approx(
+        sorted((knee + other) / 2 for other in neighbours if other != knee)
+    )
+    assert refined.points["round"].max() == 3
+    assert len(refined.points) == len(coarse.points) + 6
+    assert not refined.points.duplicated(subset=["fraction"]).any()
+
+
+def test_refinement_stops_when_nothing_is_left_to_bisect():
+    result = _frontier(space={"fraction": [0.05]}, refinements=5)
+    assert len(result.points) == 1
+    assert result.knee == {"fraction": 0.05}
+
+
+def test_grids_of_several_parameters_refine_every_parameter():
+    cppi = partial(CPPIStrategy, initial_bankroll=1000.0, payoff=1.0, loss=1.0)
+    result = _frontier(
+        factory=cppi,
+        space={"multiplier": [1.0, 3.0], "floor_fraction": [0.5, 0.8]},
+        simulator=_simulator(log_domain=False, paths=100, trials=100),
+        refinements=1,
+    )
+    grid = result.points[result.points["round"] == 0]
+    assert len(grid) == 4
+    assert set(result.knee) == {"multiplier", "floor_fraction"}
+    refined = result.points[result.points["round"] == 1]
+    assert len(refined) >= 1
+    assert refined["multiplier"].between(1.0, 3.0).all()
+    assert refined["floor_fraction"].between(0.5, 0.8).all()
+
+
+def test_unseeded_runs_report_the_seed_they_shared():
+    kelly = partial(
+        FractionalKellyCriterion, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+    space = {"fraction": [0.25, 0.5, 1.0]}
+    simulator = _simulator(seed=None)
+    result = _frontier(factory=kelly, space=space, simulator=simulator)
+    assert simulator.seed is None
+
+    replay = _frontier(
+        factory=kelly, space=space, simulator=_simulator(seed=result.seed)
+    )
+    assert replay.seed == result.seed
+    assert replay.points.equals(result.points)
+
+
+@pytest.mark.parametrize(
+    ("overrides", "match"),
+    [
+        ({"space": {}}, "Space must give at least one value"),
+        ({"space": {"fraction": []}}, "Space must give at least one value"),
+        ({"growth_quantile": 1.5}, "Growth quantile must be between 0 and 1"),
+        ({"drawdown_quantile": float("nan")}, "Drawdown quantile must be a finite"),
+        ({"refinements": -1}, "Refinements must be a nonnegative integer"),
+        ({"refinements": True}, "Refinements must be a nonnegative integer"),
+        ({"simulator": _simulator(trials=0)}, "at least one trial"),
+        (
+            {"simulator": _simulator(sampling_probability=0.45)},
+            "Frontiers need untilted paths",
+        ),
+    ],
+)
+def test_invalid_settings_are_rejected(overrides, match):
+    with pytest.raises(ValueError, match=match):
+        _frontier(**overrides)
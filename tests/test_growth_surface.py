@@ -0,0 +1,159 @@
+"""Closed-form growth and return moments of stateless strategies on market grids."""
+
+import functools
+import math
+
+import numpy as np
+import pytest
+
+from keeks.binary_strategies import (
+    CPPIStrategy,
+    FixedFractionStrategy,
+    FractionalKellyCriterion,
+    KellyCriterion,
+)
+from keeks.growth import GROWTH_FIELDS, growth_surface
+
+_HALF_KELLY = functools.partial(FractionalKellyCriterion, fraction=0.5)
+
+
+def _moments(strategy, probability):
+    """The per-bet moments of one market, outcome by outcome."""
+    stake = strategy.evaluate(probability, 1000.0)
+    cost = strategy.transaction_cost
+    outcomes = [
+        (probability, stake * (strategy.payoff - cost)),
+        (1 - probability, -stake * (strategy.loss + cost)),
+    ]
+    growth = sum(weight * math.log1p(value) for weight, value in outcomes)
+    mean = sum(weight * value for weight, value in outcomes)
+    return {
+        "stake": stake,
+        "growth_rate": growth,
+        "growth_variance": sum(
+            weight * (math.log1p(value) - growth) ** 2 for weight, value in outcomes
+        ),
+        "mean_return": mean,
+        "return_variance": sum(
+            weight * (value - mean) ** 2 for weight, value in outcomes
+        ),
+    }
+
+
+def test_surfaces_match_each_market_evaluated_alone():
+    probability = np.linspace(0.3, 0.9, 7)[:, None, None]
+    payoff = np.array([0.8, 1.0, 2.5])[None, :, None]
+    transaction_cost = np.array([0.0, 0.03])
+    surface = growth_surface(
+        _HALF_KELLY, probability, payoff, 1.2, transaction_cost=transaction_cost
+    )
+
+    assert surface.shape == (7, 3, 2)
+    for index in np.ndindex(surface.shape):
+        strategy = _HALF_KELLY(
+            payoff=float(surface.payoff[index]),
+            loss=1.2,
+            transaction_cost=float(surface.transaction_cost[index]),
+        )
+        expected = _moments(strategy, float(surface.probability[index]))
+        for field in GROWTH_FIELDS:
+            assert getattr(surface, field)[index] == pytest.approx(
+                expected[field], rel=1e-12, abs=1e-15
+            ), (field, index)
+
+
+def test_growth_matches_simulated_log_returns():
+    rng = np.random.default_rng(4)
+    surface = growth_surface(KellyCriterion, 0.6, payoff=1.5, loss=1.0)
+    stake = float(surface.stake)
+    won = rng.random(400_000) < 0.6
+    log_returns = np.where(won, np.log1p(1.5 * stake), np.log1p(-stake))
+    assert float(surface.growth_rate) == pytest.approx(log_returns.mean(), rel=0.02)
+    assert float(surface.growth_variance) == pytest.approx(log_returns.var(), rel=0.02)
+
+
+def test_kelly_grows_fastest():
+    probability = np.linspace(0.52, 0.95, 50)
+    kelly = growth_surface(KellyCriterion, probability, payoff=1.3, loss=0.9)
+    for fraction in (0.25, 0.5, 0.9):
+        fractional = growth_surface(
+            functools.partial(FractionalKellyCriterion, fraction=fraction),
+            probability,
+            payoff=1.3,
+            loss=0.9,
+        )
+        assert (fractional.growth_rate < kelly.growth_rate).all()
+        assert (fractional.growth_variance < kelly.growth_variance).all()
+
+
+def test_ruin_and_certain_outcomes():
+    all_in = functools.partial(FixedFractionStrategy, fraction=1.0, min_probability=0.0)
+    surface = growth_surface(all_in, [0.0, 0.5, 1.0])
+    np.testing.assert_array_equal(surface.growth_rate, [-np.inf, -np.inf, np.log(2)])
+    np.testing.assert_array_equal(surface.growth_variance, [0.0, np.inf, 0.0])
+    np.testing.assert_array_equal(surface.mean_return, [-1.0, 0.0, 1.0])
+    np.testing.assert_array_equal(surface.return_variance, [0.0, 1.0, 0.0])
+
+
+def test_markets_without_an_edge_are_not_staked():
+    surface = growth_surface(KellyCriterion, np.linspace(0.0, 0.5, 6))
+    for field in GROWTH_FIELDS:
+        np.testing.assert_array_equal(getattr(surface, field), 0.0)
+
+
+def test_one_strategy_is_built_per_market():
+    built = []
+
+    def factory(**odds):
+        built.append(odds)
+        return KellyCriterion(**odds)
+
+    surface = growth_surface(
+        factory,
+        np.linspace(0.5, 0.7, 1_000)[:, None],
+        payoff=[1.0, 2.0, 1.0, 2.0],
+        transaction_cost=[0.0, 0.0, 0.01, 0.01],
+    )
+    assert surface.shape == (1_000, 4)
+    assert built == [
+        {"payoff": payoff, "loss": 1.0, "transaction_cost": cost}
+        for payoff in (1.0, 2.0)
+        for cost in (0.0, 0.01)
+    ]
+
+
+def test_to_frame_has_one_row_per_point():
+    surface = growth_surface(_HALF_KELLY, [[0.55], [0.6]], transaction_cost=[0.0, 0.02])
+    frame = surface.to_frame()
+    assert list(frame.columns) == [
+        "probability",
+        "payoff",
+        "loss",
+        "transaction_cost",
+        *GROWTH_FIELDS,
+    ]
+    assert frame["probability"].tolist() == [0.55, 0.55, 0.6, 0.6]
+    assert frame["transaction_cost"].tolist() == [0.0, 0.02, 0.0, 0.02]
+    np.testing.assert_array_equal(frame["stake"], surface.stake.ravel())
+
+
+def test_stateful_strategies_are_rejected():
+    cppi = functools.partial(
+        CPPIStrategy, floor_fraction=0.7, multiplier=4.0, initial_bankroll=1000.0
+    )
+    with pytest.raises(ValueError, match="CPPIStrategy exposes update_bankroll"):
+        growth_surface(cppi, 0.6)
+
+
+@pytest.mark.parametrize(
+    ("arguments", "match"),
+    [
+        ({"probability": [0.5, 1.2]}, "Probability must be between 0 and 1"),
+        ({"probability": [0.5, np.nan]}, "Probability must be between 0 and 1"),
+        ({"probability": [0.5, 0.6], "payoff": [1.0, 2.0, 3.0]}, "broadcast"),
+        ({"probability": 0.6, "payoff": [1.0, -1.0]}, "Payoff"),
+    ],
+)
+def test_invalid_grids_are_rejected(arguments, match):
+    with pytest.raises(ValueError, match=match):
+        growth_surface(KellyCriterion, **arguments)
@@ -0,0 +1,134 @@
+"""Tail probabilities from tilted outcome paths.
+
+A fixed-fraction bettor at even money ends below a wealth level exactly when it
+wins too few of its bets, so the binomial distribution gives the true
+probability of events far too rare to see without tilting.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import FixedFractionStrategy, KellyCriterion
+from keeks.simulators import PathSimulator, ReplaySimulator, TailEstimate
+
+TRIALS = 100
+PROBABILITY = 0.6
+FRACTION = 0.1
+
+
+def _simulator(**kwargs):
+    settings = {
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_costs": 0.0,
+        "probability": PROBABILITY,
+        "trials": TRIALS,
+        "paths": 20_000,
+        "seed": 2,
+    }
+    settings.update(kwargs)
+    return PathSimulator(**settings)
+
+
+def _fixed_fraction():
+    return FixedFractionStrategy(
+        fraction=FRACTION, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+
+
+def _few_wins(wins):
+    """The true probability of at most ``wins`` wins, and a wealth level between
+    ending with ``wins`` and ``wins + 1`` of them."""
+    probability = sum(
+        math.comb(TRIALS, k) * PROBABILITY**k * (1 - PROBABILITY) ** (TRIALS - k)
+        for k in range(wins + 1)
+    )
+    level = (
+        1000.0
+        * (1 + FRACTION) ** (wins + 0.5)
+        * (1 - FRACTION) ** (TRIALS - wins - 0.5)
+    )
+    return probability, level
+
+
+@pytest.mark.parametrize("wins", [35, 30])
+def test_tilted_paths_estimate_rare_events(wins):
+    truth, level = _few_wins(wins)
+    results = _simulator(sampling_probability=0.35).evaluate_strategy(
+        _fixed_fraction(), BankRoll(1000.0, max_draw_down=None)
+    )
+    estimate = results.estimate(results.terminal < level, confidence=0.999)
+
+    assert isinstance(estimate, TailEstimate)
+    assert estimate.hits > 1_000
+    assert estimate.lower <= truth <= estimate.upper
+    assert estimate.probability == pytest.approx(truth, rel=0.1)
+
+
+def test_untilted_paths_miss_the_same_event():
+    _, level = _few_wins(30)
+    results = _simulator().evaluate_strategy(
+        _fixed_fraction(), BankRoll(1000.0, max_draw_down=None)
+    )
+    estimate = results.estimate(results.terminal < level)
+
+    np.testing.assert_array_equal(results.weights, 1.0)
+    assert estimate.hits == 0
+    assert (estimate.probability, estimate.lower, estimate.upper) == (0.0, 0.0, 0.0)
+
+
+def test_common_event_agrees_with_and_without_tilt():
+    truth, level = _few_wins(55)
+    for sampling_probability in (None, 0.5):
+        results = _simulator(
+            sampling_probability=sampling_probability
+        ).evaluate_strategy(_fixed_fraction(), BankRoll(1000.0, max_draw_down=None))
+        estimate = results.estimate(results.terminal < level, confidence=0.999)
+        assert estimate.lower <= truth <= estimate.upper
+
+
+def test_only_placed_bets_enter_the_weight():
+    # Kelly declines a bet with negative edge, so no outcome moves the weight.
+    results = _simulator(probability=0.45, sampling_probability=0.2).evaluate_strategy(
+        KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0), BankRoll(1000.0)
+    )
+    np.testing.assert_array_equal(results.weights, 1.0)
+
+
+def test_max_drawdown_matches_the_bankroll_history():
+    simulator = _simulator(paths=25, trials=200, probability=0.52)
+    results = simulator.evaluate_strategy(
+        _fixed_fraction(), BankRoll(1000.0, max_draw_down=0.2)
+    )
+    for path, outcomes in enumerate(simulator.outcomes().T):
+        bankroll = BankRoll(1000.0, max_draw_down=0.2)
+        bets = pd.DataFrame(
+            {"probability": 0.52, "payoff": 1.0, "loss": 1.0, "outcome": outcomes}
+        )
+        ReplaySimulator(bets, transaction_costs=0.0).evaluate_strategy(
+            _fixed_fraction(), bankroll
+        )
+        history = np.array(bankroll.history)
+        expected = np.max(1.0 - history / np.maximum.accumulate(history))
+        assert results.max_drawdown[path] == pytest.approx(expected, abs=1e-12)
+
+
+def test_invalid_estimate_arguments_are_rejected():
+    results = _simulator(paths=10).evaluate_strategy(
+        _fixed_fraction(), BankRoll(1000.0)
+    )
+    with pytest.raises(ValueError, match="one entry per path"):
+        results.estimate(np.ones(3, dtype=bool))
+    for confidence in (0.0, 1.0, float("nan")):
+        with pytest.raises(ValueError, match="Confidence"):
+            results.estimate(results.stopped, confidence=confidence)
+
+
+@pytest.mark.parametrize("sampling_probability", [0.0, 1.0, -0.1, float("inf")])
+def test_invalid_sampling_probability_is_rejected(sampling_probability):
+    with pytest.raises(ValueError, match="Sampling probability"):
+        _simulator(sampling_probability=sampling_probability)
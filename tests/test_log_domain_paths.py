@@ -0,0 +1,170 @@
+"""The log-domain engine for fixed-fraction paths.
+
+It settles the stepped engine's outcomes multiplicatively from exact funds, so
+every stop, bet count and weight must match the stepped run while funds may
+differ by the cents the stepped run rounds stakes to. Paths it cannot settle
+with certainty, and runs it does not apply to, must match to the cent.
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import (
+    CPPIStrategy,
+    FixedFractionStrategy,
+    KellyCriterion,
+)
+from keeks.simulators import PathSimulator, SimulationProfile
+from keeks.simulators import paths as paths_module
+
+
+def _fixed(fraction):
+    return FixedFractionStrategy(
+        fraction=fraction, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+
+
+def _simulators(**overrides):
+    settings = {
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_costs": 0.0,
+        "probability": 0.55,
+        "trials": 300,
+        "paths": 100,
+        "seed": 3,
+    }
+    settings.update(overrides)
+    return PathSimulator(**settings), PathSimulator(**settings, log_domain=True)
+
+
+def _assert_same_paths(stepped, log_domain, rtol=0.0):
+    for name in ("bets", "trials_started", "stopped"):
+        np.testing.assert_array_equal(
+            getattr(log_domain, name), getattr(stepped, name), err_msg=name
+        )
+    np.testing.assert_allclose(log_domain.weights, stepped.weights, rtol=1e-12)
+    if stepped.control is None:
+        assert log_domain.control is None
+    else:
+        np.testing.assert_array_equal(log_domain.control, stepped.control)
+    np.testing.assert_allclose(log_domain.terminal, stepped.terminal, rtol=rtol)
+    np.testing.assert_allclose(
+        log_domain.max_drawdown, stepped.max_drawdown, rtol=rtol, atol=1e-4
+    )
+
+
+@pytest.mark.parametrize(
+    ("fraction", "max_draw_down", "percent_bettable", "probability"),
+    list(itertools.product([0.05, 0.6], [None, 0.12, 0.5], [1.0, 0.5], [0.45, 0.6])),
+)
+def test_paths_match_the_stepped_engine(
+    fraction, max_draw_down, percent_bettable, probability
+):
+    stepped, log_domain = _simulators(probability=probability)
+    bankroll_kwargs = {
+        "initial_funds": 1000.0,
+        "percent_bettable": percent_bettable,
+        "max_draw_down": max_draw_down,
+    }
+    _assert_same_paths(
+        stepped.evaluate_strategy(_fixed(fraction), BankRoll(**bankroll_kwargs)),
+        log_domain.evaluate_strategy(_fixed(fraction), BankRoll(**bankroll_kwargs)),
+        rtol=0.01,
+    )
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"sampling_probability": 0.4},
+        {"antithetic": True},
+        {"qmc_replicates": 4, "paths": 128},
+    ],
+    ids=["tilted", "antithetic", "qmc"],
+)
+def test_outcome_designs_are_shared(overrides):
+    if "qmc_replicates" in overrides:
+        pytest.importorskip("scipy")
+    stepped, log_domain = _simulators(**overrides)
+    strategy = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    _assert_same_paths(
+        stepped.evaluate_strategy(strategy, BankRoll(1000.0, max_draw_down=0.15)),
+        log_domain.evaluate_strategy(strategy, BankRoll(1000.0, max_draw_down=0.15)),
+        rtol=0.01,
+    )
+
+
+def test_refused_losses_stop_paths_at_their_first_loss():
+    _, log_domain = _simulators(probability=0.5, trials=1000)
+    results = log_domain.evaluate_strategy(
+        _fixed(0.2), BankRoll(initial_funds=1000.0, max_draw_down=0.1)
+    )
+    assert results.stopped.all()
+    np.testing.assert_array_equal(results.trials_started, results.bets + 1)
+    np.testing.assert_allclose(results.terminal, 1000.0 * 1.2**results.bets, atol=0.01)
+    np.testing.assert_array_equal(results.max_drawdown, 0.0)
+
+
+@pytest.mark.parametrize(
+    ("fraction", "max_draw_down", "probability"),
+    [(0.3, 0.3, 0.55), (1.0, None, 0.6), (0.3, None, 0.45)],
+    ids=["safeguard-tie", "all-in", "near-ruin"],
+)
+def test_undecidable_paths_are_stepped_exactly(fraction, max_draw_down, probability):
+    # A loss of exactly the drawdown limit or of everything is refused or not
+    # by the funds' sub-cent remainder, and funds falling towards ruin end up
+    # staking fractions of a cent.
+    stepped, log_domain = _simulators(probability=probability, trials=400)
+    _assert_same_paths(
+        stepped.evaluate_strategy(
+            _fixed(fraction), BankRoll(1000.0, max_draw_down=max_draw_down)
+        ),
+        log_domain.evaluate_strategy(
+            _fixed(fraction), BankRoll(1000.0, max_draw_down=max_draw_down)
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    ("strategy", "fee"),
+    [
+        (_fixed(0.1), 0.5),
+        (
+            CPPIStrategy(
+                floor_fraction=0.7,
+                multiplier=4.0,
+                initial_bankroll=1000.0,
+                payoff=1.0,
+                loss=1.0,
+            ),
+            0.0,
+        ),
+    ],
+    ids=["fee", "stateful"],
+)
+def test_other_runs_are_stepped(strategy, fee):
+    stepped, log_domain = _simulators(transaction_costs=fee)
+    _assert_same_paths(
+        stepped.evaluate_strategy(strategy, BankRoll(1000.0)),
+        log_domain.evaluate_strategy(strategy, BankRoll(1000.0)),
+    )
+
+
+def test_blocks_continue_each_other(monkeypatch):
+    _, log_domain = _simulators(probability=0.6)
+    strategy = _fixed(0.1)
+    whole = log_domain.evaluate_strategy(strategy, BankRoll(1000.0))
+    monkeypatch.setattr(paths_module, "_LOG_DOMAIN_ENTRIES", 700)
+    profile = SimulationProfile()
+    blocked = log_domain.evaluate_strategy(strategy, BankRoll(1000.0), profile=profile)
+
+    # Seven trials of 100 paths per block.
+    assert profile.calls["settle"] == 43
+    assert profile.calls["evaluate"] == 1
+    np.testing.assert_array_equal(blocked.bets, whole.bets)
+    np.testing.assert_allclose(blocked.terminal, whole.terminal, rtol=1e-12)
+    np.testing.assert_allclose(blocked.max_drawdown, whole.max_drawdown, rtol=1e-12)
@@ -8,6 +8,7 @@ import pytest
 
 import keeks.binary_strategies as binary_strategies
 from keeks.binary_strategies import (
+    AdaptiveKellyCriterion,
     CPPIStrategy,
     DrawdownAdjustedKelly,
     DynamicBankrollManagement,
@@ -33,6 +34,9 @@ STRATEGY_FACTORIES = {
     "DrawdownAdjustedKelly": lambda: DrawdownAdjustedKelly(
         payoff=1.0, loss=1.0, transaction_cost=0.01, max_acceptable_drawdown=0.2
     ),
+    "AdaptiveKellyCriterion": lambda: AdaptiveKellyCriterion(
+        payoff=1.0, loss=1.0, transaction_cost=0.01
+    ),
     "OptimalF": lambda: OptimalF(
         payoff=1.0, loss=1.0, transaction_cost=0.01, win_rate=0.6
     ),
@@ -0,0 +1,255 @@
+"""The path-vectorized simulator.
+
+Stepping paths together is only a speedup if nothing else changes, so every
+path is compared, to the cent, against the scalar strategy replaying that
+path's outcomes through ``ReplaySimulator``.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import (
+    AdaptiveKellyCriterion,
+    CPPIStrategy,
+    DynamicBankrollManagement,
+    FixedFractionStrategy,
+    KellyCriterion,
+)
+from keeks.simulators import (
+    PathResults,
+    PathSimulator,
+    ReplaySimulator,
+    SimulationProfile,
+)
+from keeks.simulators.paths import _round_cents
+from keeks.utils import trusted_inputs
+
+
+def _cppi():
+    return CPPIStrategy(
+        floor_fraction=0.7,
+        multiplier=4.0,
+        initial_bankroll=1000.0,
+        payoff=1.0,
+        loss=1.0,
+        transaction_cost=0.01,
+    )
+
+
+def _kelly():
+    return KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+
+
+def _dynamic():
+    return DynamicBankrollManagement(
+        base_fraction=0.1,
+        payoff=1.0,
+        loss=1.0,
+        transaction_cost=0.01,
+        window_size=7,
+        max_fraction=0.3,
+        min_fraction=0.02,
+    )
+
+
+def _adaptive():
+    return AdaptiveKellyCriterion(
+        payoff=1.0, loss=1.0, transaction_cost=0.01, prior_strength=20.0, decay=0.98
+    )
+
+
+def _scalar_paths(simulator, factory, bankroll_kwargs):
+    """Replay each path's outcomes through a fresh scalar strategy."""
+    terminal, bets = [], []
+    for outcomes in simulator.outcomes().T:
+        bets_frame = pd.DataFrame(
+            {
+                "probability": simulator.probability,
+                "payoff": simulator.payoff,
+                "loss": simulator.loss,
+                "outcome": outcomes,
+            }
+        )
+        bankroll = BankRoll(**bankroll_kwargs)
+        ReplaySimulator(
+            bets_frame, transaction_costs=simulator.transaction_costs
+        ).evaluate_strategy(factory(), bankroll)
+        terminal.append(bankroll.total_funds)
+        bets.append(len(bankroll.history) - 1)
+    return terminal, bets
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [_cppi, _kelly, _dynamic, _adaptive],
+    ids=["cppi", "kelly", "dynamic", "adaptive"],
+)
+@pytest.mark.parametrize(
+    ("seed", "fee", "max_draw_down", "percent_bettable", "probability"),
+    [
+        (seed, *settings)
+        for seed, settings in enumerate(
+            itertools.product([0.0, 0.5], [None, 0.12], [1.0, 0.5], [0.52, 0.6])
+        )
+    ],
+)
+def test_every_path_matches_the_scalar_strategy(
+    factory, seed, fee, max_draw_down, percent_bettable, probability
+):
+    simulator = PathSimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=fee,
+        probability=probability,
+        trials=150,
+        paths=40,
+        seed=seed,
+    )
+    bankroll_kwargs = {
+        "initial_funds": 1000.0,
+        "percent_bettable": percent_bettable,
+        "max_draw_down": max_draw_down,
+    }
+    results = simulator.evaluate_strategy(factory(), BankRoll(**bankroll_kwargs))
+    terminal, bets = _scalar_paths(simulator, factory, bankroll_kwargs)
+
+    np.testing.assert_array_equal(results.terminal, terminal)
+    np.testing.assert_array_equal(results.bets, bets)
+
+
+def test_safeguard_stops_are_reported_per_path():
+    simulator = PathSimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.0, probability=0.5, paths=50, seed=4
+    )
+    strategy = FixedFractionStrategy(
+        fraction=0.2, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+    results = simulator.evaluate_strategy(
+        strategy, BankRoll(initial_funds=1000.0, max_draw_down=0.1)
+    )
+    # Every path stops at its first loss, having started one more trial than it
+    # settled.
+    assert results.stopped.all()
+    np.testing.assert_array_equal(results.trials_started, results.bets + 1)
+    np.testing.assert_array_equal(
+        results.terminal, np.round(1000.0 * 1.2**results.bets, 2)
+    )
+
+
+def test_strategy_and_bankroll_are_left_untouched():
+    strategy = _cppi()
+    bankroll = BankRoll(initial_funds=1000.0)
+    simulator = PathSimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.0, probability=0.6, seed=1
+    )
+    results = simulator.evaluate_strategy(strategy, bankroll)
+
+    assert isinstance(results, PathResults)
+    assert results.terminal.max() > 1000.0
+    assert bankroll.history == [1000.0]
+    assert strategy.peak_bankroll == 1000.0
+    assert strategy.floor == 700.0
+
+
+def test_seeded_runs_share_outcomes():
+    def simulator(seed):
+        return PathSimulator(
+            payoff=1.0,
+            loss=1.0,
+            transaction_costs=0.0,
+            probability=0.55,
+            trials=50,
+            paths=20,
+            seed=seed,
+        )
+
+    np.testing.assert_array_equal(simulator(3).outcomes(), simulator(3).outcomes())
+    first = simulator(3).evaluate_strategy(_kelly(), BankRoll(1000.0))
+    again = simulator(3).evaluate_strategy(_kelly(), BankRoll(1000.0))
+    np.testing.assert_array_equal(first.terminal, again.terminal)
+
+
+def test_profile_counts_one_call_per_trial():
+    profile = SimulationProfile()
+    simulator = PathSimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.0, probability=0.55, trials=25
+    )
+    simulator.evaluate_strategy(_cppi(), BankRoll(1000.0), profile=profile)
+    assert profile.calls["evaluate"] == 25
+    assert profile.calls["settle"] == 25
+
+
+def test_invalid_stakes_are_rejected_unless_trusted():
+    class Overbet(KellyCriterion):
+        def evaluate_batch(self, _probabilities, current_bankroll):
+            return np.full(np.shape(current_bankroll), 1.5)
+
+    simulator = PathSimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.0, probability=0.55, trials=5
+    )
+    strategy = Overbet(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        simulator.evaluate_strategy(strategy, BankRoll(1000.0, max_draw_down=None))
+    with trusted_inputs():
+        simulator.evaluate_strategy(strategy, BankRoll(1000.0, max_draw_down=None))
+
+
+def test_stateful_strategy_without_a_vectorized_form_is_refused():
+    class Streaky(KellyCriterion):
+        def record_result(self, won, return_pct=None):
+            pass
+
+    strategy = Streaky(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    simulator = PathSimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.0, probability=0.55
+    )
+    with pytest.raises(NotImplementedError, match="vectorized"):
+        simulator.evaluate_strategy(strategy, BankRoll(1000.0))
+
+
+def test_mismatched_odds_are_refused():
+    simulator = PathSimulator(
+        payoff=2.0, loss=1.0, transaction_costs=0.0, probability=0.55
+    )
+    with pytest.raises(ValueError, match="payoff"):
+        simulator.evaluate_strategy(_kelly(), BankRoll(1000.0))
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"paths": 0}, "Paths"),
+        ({"paths": 1.5}, "Paths"),
+        ({"paths": True}, "Paths"),
+        ({"trials": -1}, "Trials"),
+        ({"probability": 1.5}, "Probability"),
+        ({"seed": -1}, "Seed"),
+    ],
+)
+def test_invalid_configuration_is_rejected(kwargs, match):
+    settings = {
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_costs": 0.0,
+        "probability": 0.55,
+    }
+    settings.update(kwargs)
+    with pytest.raises(ValueError, match=match):
+        PathSimulator(**settings)
+
+
+def test_cent_rounding_matches_python_round_on_ties():
+    rng = np.random.default_rng(0)
+    values = np.concatenate(
+        [
+            rng.uniform(0.0, 5_000.0, 20_000),
+            np.round(rng.uniform(0.0, 5_000.0, 20_000), 2) + 0.005,
+            [0.0, 1e300, 2.675, 1.005],
+        ]
+    )
+    expected = [round(value, 2) for value in values.tolist()]
+    np.testing.assert_array_equal(_round_cents(values), expected)
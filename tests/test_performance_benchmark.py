@@ -0,0 +1,114 @@
+"""Guards for the performance benchmark.
+
+The timings themselves are machine-dependent and are not asserted. What is
+tested is the harness a regression check relies on: every strategy and
+simulator has a case, a run produces a comparable report, and the comparison
+flags exactly the cases that slowed down past the threshold.
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+import keeks.binary_strategies as binary_strategies
+import keeks.simulators as simulators
+
+BENCHMARK_DIR = Path(__file__).resolve().parents[1] / "benchmarks"
+
+
+def _load_benchmark():
+    spec = importlib.util.spec_from_file_location(
+        "performance_benchmark", BENCHMARK_DIR / "performance_benchmark.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+BENCHMARK = _load_benchmark()
+
+
+def _report(**rates):
+    return {
+        "environment": {},
+        "results": {name: {"per_second": rate} for name, rate in rates.items()},
+    }
+
+
+def test_every_strategy_and_simulator_has_a_case():
+    built = {
+        type(factory()).__name__ for factory in BENCHMARK.STRATEGY_FACTORIES.values()
+    }
+    assert built == set(binary_strategies.__all__)
+
+    timed = {
+        type(factory()).__name__ for factory in BENCHMARK.SIMULATOR_FACTORIES.values()
+    }
+    assert timed == {name for name in simulators.__all__ if name.endswith("Simulator")}
+
+
+def test_committed_baseline_covers_every_case():
+    baseline = json.loads((BENCHMARK_DIR / "performance_baseline.json").read_text())
+    assert set(baseline["results"]) == {name for name, _, _ in BENCHMARK.CASES}
+    assert {"python", "platform", "packages"} <= set(baseline["environment"])
+
+
+def test_a_short_run_produces_a_report(tmp_path):
+    output = tmp_path / "performance.json"
+    status = BENCHMARK.main(
+        [
+            "--filter",
+            "BankRoll.settle",
+            "--repeats",
+            "1",
+            "--output",
+            str(output),
+            "--baseline",
+            str(tmp_path / "missing.json"),
+        ]
+    )
+    report = json.loads(output.read_text())
+    assert status == 0
+    assert list(report["results"]) == ["BankRoll.settle"]
+    assert report["results"]["BankRoll.settle"]["per_second"] > 0
+
+
+def test_a_filtered_update_keeps_the_other_baseline_entries(tmp_path):
+    baseline = tmp_path / "baseline.json"
+    recorded = _report(other_case=5.0, **{"BankRoll.settle": 1.0})
+    recorded["environment"] = {"git_commit": "earlier"}
+    baseline.write_text(json.dumps(recorded))
+    status = BENCHMARK.main(
+        [
+            "--filter",
+            "BankRoll.settle",
+            "--repeats",
+            "1",
+            "--output",
+            str(tmp_path / "performance.json"),
+            "--baseline",
+            str(baseline),
+            "--update-baseline",
+        ]
+    )
+    updated = json.loads(baseline.read_text())
+    assert status == 0
+    assert set(updated["results"]) == {"other_case", "BankRoll.settle"}
+    assert updated["results"]["other_case"] == {"per_second": 5.0}
+    settle = updated["results"]["BankRoll.settle"]
+    assert settle["per_second"] != 1.0
+    assert "python" in settle["environment"]
+    assert updated["environment"] == {"git_commit": "earlier"}
+
+
+@pytest.mark.parametrize(
+    ("current", "regressed"),
+    [(100.0, False), (80.0, False), (70.0, True)],
+)
+def test_comparison_applies_the_threshold(current, regressed):
+    regressions = BENCHMARK.compare(
+        _report(case=current, new_case=1.0), _report(case=100.0), threshold=0.25
+    )
+    assert [r["name"] for r in regressions] == (["case"] if regressed else [])
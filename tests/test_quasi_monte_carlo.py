@@ -0,0 +1,232 @@
+"""Outcome and probability draws from scrambled Sobol' sequences.
+
+Each trial of a scrambled Sobol' sequence puts exactly one of every ``n`` points
+in each interval of width ``1 / n``, so the share of wins a trial hands out
+across a power-of-two block of paths is pinned to within one path. That
+stratification is what the faster convergence rests on, and is checked
+directly alongside the estimates it produces.
+"""
+
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import CPPIStrategy, FixedFractionStrategy
+from keeks.simulators import (
+    PathSimulator,
+    RandomBinarySimulator,
+    RandomUncertainBinarySimulator,
+    ReplaySimulator,
+)
+
+pytest.importorskip("scipy")
+
+TRIALS = 200
+PROBABILITY = 0.55
+FRACTION = 0.05
+EXPECTED_GROWTH = TRIALS * (
+    PROBABILITY * math.log1p(FRACTION) + (1 - PROBABILITY) * math.log1p(-FRACTION)
+)
+
+
+def _simulator(**kwargs):
+    settings = {
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_costs": 0.0,
+        "probability": PROBABILITY,
+        "trials": TRIALS,
+        "paths": 2_048,
+        "seed": 4,
+        "qmc_replicates": 16,
+    }
+    settings.update(kwargs)
+    return PathSimulator(**settings)
+
+
+def _fixed_fraction():
+    return FixedFractionStrategy(
+        fraction=FRACTION, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+
+
+def _log_growth(**kwargs):
+    results = _simulator(**kwargs).evaluate_strategy(
+        _fixed_fraction(), BankRoll(1000.0, max_draw_down=None)
+    )
+    return results, np.log(results.terminal / 1000.0)
+
+
+def test_each_replicate_hands_out_wins_evenly():
+    outcomes = _simulator().outcomes()
+    wins = outcomes.reshape(TRIALS, 16, 128).sum(axis=2)
+    assert set(np.unique(wins)) <= {70, 71}
+
+
+def test_sobol_mean_log_growth_converges_far_faster():
+    results, growth = _log_growth()
+    estimate = results.mean(growth, confidence=0.999)
+
+    assert results.qmc_replicates == 16
+    assert estimate.lower <= EXPECTED_GROWTH <= estimate.upper
+    assert estimate.variance_reduction > 30
+
+    pseudo, pseudo_growth = _log_growth(qmc_replicates=None)
+    assert pseudo.mean(pseudo_growth).standard_error > 5 * estimate.standard_error
+
+
+def test_tilted_sobol_paths_stay_unbiased():
+    # Ending below this level means winning at most 84 of the bets.
+    level = 1000.0 * (1 + FRACTION) ** 84.5 * (1 - FRACTION) ** 115.5
+    truth = sum(
+        math.comb(TRIALS, k) * PROBABILITY**k * (1 - PROBABILITY) ** (TRIALS - k)
+        for k in range(85)
+    )
+    results = _simulator(sampling_probability=0.4).evaluate_strategy(
+        _fixed_fraction(), BankRoll(1000.0, max_draw_down=None)
+    )
+    estimate = results.estimate(results.terminal < level, confidence=0.999)
+    assert estimate.lower <= truth <= estimate.upper
+    assert estimate.probability == pytest.approx(truth, rel=0.2)
+
+
+def test_sobol_paths_match_the_scalar_replay():
+    def cppi():
+        return CPPIStrategy(
+            floor_fraction=0.8,
+            multiplier=3.0,
+            initial_bankroll=1000.0,
+            payoff=1.0,
+            loss=1.0,
+            transaction_cost=0.0,
+        )
+
+    simulator = _simulator(paths=16, trials=100, qmc_replicates=2)
+    results = simulator.evaluate_strategy(cppi(), BankRoll(1000.0))
+    for path, outcomes in enumerate(simulator.outcomes().T):
+        bankroll = BankRoll(1000.0)
+        bets = pd.DataFrame(
+            {
+                "probability": PROBABILITY,
+                "payoff": 1.0,
+                "loss": 1.0,
+                "outcome": outcomes,
+            }
+        )
+        ReplaySimulator(bets, transaction_costs=0.0).evaluate_strategy(cppi(), bankroll)
+        assert results.terminal[path] == bankroll.total_funds
+
+
+def test_seed_fixes_the_scramble():
+    first = _simulator(paths=64, trials=20).outcomes()
+    np.testing.assert_array_equal(first, _simulator(paths=64, trials=20).outcomes())
+    assert not np.array_equal(first, _simulator(paths=64, trials=20, seed=5).outcomes())
+    assert _simulator(trials=0).outcomes().shape == (0, 2_048)
+
+
+def test_single_replicate_has_no_error_bars():
+    results, growth = _log_growth(paths=256, qmc_replicates=1)
+    estimate = results.mean(growth)
+    assert estimate.mean == pytest.approx(EXPECTED_GROWTH, abs=0.01)
+    assert estimate.standard_error == math.inf
+
+
+class _Recorder:
+    def __init__(self):
+        self.probabilities = []
+        self.wins = []
+
+    def evaluate(self, probability, _current_bankroll):
+        self.probabilities.append(probability)
+        return 0.01
+
+    def record_result(self, won, _return_pct):
+        self.wins.append(won)
+
+
+def _scalar_runs(simulator, runs):
+    recorders = []
+    for _ in range(runs):
+        recorder = _Recorder()
+        simulator.evaluate_strategy(recorder, BankRoll(1000.0, max_draw_down=None))
+        recorders.append(recorder)
+    return recorders
+
+
+@pytest.mark.parametrize(
+    "simulator_cls", [RandomBinarySimulator, RandomUncertainBinarySimulator]
+)
+def test_scalar_runs_share_out_outcomes_evenly(simulator_cls):
+    settings = {"stdev": 0.0, "seed": 3, "qmc": True}
+    if simulator_cls is RandomUncertainBinarySimulator:
+        settings["uncertainty_stdev"] = 0.0
+    simulator = simulator_cls(1.0, 1.0, 0.0, trials=50, **settings)
+    wins = np.array([recorder.wins for recorder in _scalar_runs(simulator, 64)])
+    # Every trial is won on exactly half of 64 runs at probability 0.5.
+    np.testing.assert_array_equal(wins.sum(axis=0), 32)
+
+
+def test_scalar_probabilities_are_stratified_normals():
+    simulator = RandomBinarySimulator(1.0, 1.0, 0.0, trials=10, stdev=0.1, qmc=True)
+    probabilities = np.array(
+        [recorder.probabilities for recorder in _scalar_runs(simulator, 256)]
+    )
+    # A stratified sample of 256 normals sits much closer to the mean than
+    # independent draws, whose standard error would be 0.1 / 16.
+    assert np.abs(probabilities.mean(axis=0) - 0.5).max() < 0.001
+
+
+@pytest.mark.parametrize(
+    "simulator_cls", [RandomBinarySimulator, RandomUncertainBinarySimulator]
+)
+def test_rejected_scalar_run_does_not_consume_its_point(simulator_cls):
+    class Overbet(_Recorder):
+        def evaluate(self, probability, _current_bankroll):
+            self.probabilities.append(probability)
+            return 2.0
+
+    reused = simulator_cls(1.0, 1.0, 0.0, trials=5, seed=1, qmc=True)
+    with pytest.raises(ValueError):
+        reused.evaluate_strategy(Overbet(), BankRoll(1000.0))
+
+    fresh = simulator_cls(1.0, 1.0, 0.0, trials=5, seed=1, qmc=True)
+    for first, second in zip(
+        _scalar_runs(reused, 3), _scalar_runs(fresh, 3), strict=True
+    ):
+        assert first.probabilities == second.probabilities
+        assert first.wins == second.wins
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"qmc_replicates": 0}, "QMC replicates"),
+        ({"paths": 2_000}, "power of two"),
+        ({"paths": 60, "qmc_replicates": 3}, "power of two"),
+        ({"antithetic": True}, "Antithetic"),
+        ({"trials": 21_202}, "Trials must be at most 21201"),
+    ],
+)
+def test_invalid_path_settings_are_rejected(kwargs, match):
+    with pytest.raises(ValueError, match=match):
+        _simulator(**kwargs)
+
+
+def test_invalid_scalar_settings_are_rejected():
+    with pytest.raises(ValueError, match="Trials must be at most 10600"):
+        RandomBinarySimulator(1.0, 1.0, 0.0, trials=10_601, qmc=True)
+    with pytest.raises(ValueError, match="Trials must be at most 7067"):
+        RandomUncertainBinarySimulator(1.0, 1.0, 0.0, trials=7_068, qmc=True)
+
+
+def test_missing_scipy_is_reported(monkeypatch):
+    monkeypatch.setitem(sys.modules, "scipy.stats", None)
+    simulator = _simulator(paths=16)
+    with pytest.raises(ImportError, match=r"keeks\[qmc\]"):
+        simulator.outcomes()
+    with pytest.raises(ImportError, match=r"keeks\[qmc\]"):
+        RandomBinarySimulator(1.0, 1.0, 0.0, qmc=True)
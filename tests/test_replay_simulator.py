@@ -0,0 +1,202 @@
+"""Backtesting against recorded bets.
+
+``ReplaySimulator`` streams recorded rows in chunks, so the properties worth
+pinning are that chunking never changes the result, that a recorded run settles
+exactly like the synthetic simulator it was recorded from, and that the
+vectorized sizing path agrees with calling ``evaluate`` row by row.
+"""
+
+import random
+
+import pandas as pd
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import (
+    DynamicBankrollManagement,
+    FixedFractionStrategy,
+    KellyCriterion,
+    MertonShare,
+)
+from keeks.simulators.repeated_binary import RepeatedBinarySimulator
+from keeks.simulators.replay import ReplaySimulator
+
+
+def _recorded(rows=300, probability=0.6, seed=4):
+    outcome_rng = random.Random(seed)
+    return pd.DataFrame(
+        {
+            "probability": [probability] * rows,
+            "payoff": [1.0] * rows,
+            "loss": [1.0] * rows,
+            "outcome": [int(outcome_rng.random() < probability) for _ in range(rows)],
+        }
+    )
+
+
+def _mixed(rows=500, seed=9):
+    rng = random.Random(seed)
+    probabilities = [round(rng.uniform(0.4, 0.7), 2) for _ in range(rows)]
+    return pd.DataFrame(
+        {
+            "probability": probabilities,
+            "payoff": [rng.choice([0.8, 1.0, 1.2]) for _ in range(rows)],
+            "loss": [1.0] * rows,
+            "outcome": [int(rng.random() < p) for p in probabilities],
+        }
+    )
+
+
+def _replay(source, strategy, **kwargs):
+    bankroll = BankRoll(initial_funds=1000.0, max_draw_down=None)
+    ReplaySimulator(source, **kwargs).evaluate_strategy(strategy, bankroll)
+    return bankroll.history
+
+
+def _kelly():
+    return KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+
+
+def test_replay_of_a_recorded_run_matches_the_synthetic_simulator():
+    strategy = FixedFractionStrategy(fraction=0.1, payoff=1.0, loss=1.0)
+    bankroll = BankRoll(initial_funds=1000.0, max_draw_down=None)
+    RepeatedBinarySimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.25,
+        probability=0.6,
+        trials=300,
+        seed=4,
+    ).evaluate_strategy(strategy, bankroll)
+
+    replayed = _replay(
+        _recorded(),
+        FixedFractionStrategy(fraction=0.1, payoff=1.0, loss=1.0),
+        transaction_costs=0.25,
+    )
+
+    assert replayed == bankroll.history
+
+
+@pytest.mark.parametrize("chunksize", [1, 7, 64, 10_000])
+def test_chunk_size_does_not_change_the_result(chunksize):
+    source = _mixed()
+    assert _replay(source, _kelly(), chunksize=chunksize) == _replay(source, _kelly())
+
+
+def test_csv_and_parquet_files_replay_like_the_frame(tmp_path):
+    source = _mixed()
+    expected = _replay(source, _kelly())
+
+    csv_path = tmp_path / "history.csv"
+    source.to_csv(csv_path, index=False)
+    assert _replay(csv_path, _kelly(), chunksize=50) == expected
+    assert _replay(str(csv_path), _kelly(), chunksize=50) == expected
+
+    pytest.importorskip("pyarrow")
+    parquet_path = tmp_path / "history.parquet"
+    source.to_parquet(parquet_path, index=False)
+    assert _replay(parquet_path, _kelly(), chunksize=50) == expected
+
+
+def test_columns_can_be_renamed(tmp_path):
+    source = _mixed()
+    renamed = source.rename(columns={"probability": "p", "outcome": "won"})
+    path = tmp_path / "renamed.dat"
+    renamed.to_csv(path, index=False)
+
+    assert _replay(
+        path,
+        _kelly(),
+        columns={"probability": "p", "outcome": "won"},
+        file_format="csv",
+    ) == _replay(source, _kelly())
+
+
+@pytest.mark.parametrize(
+    "factory",
+    [
+        _kelly,
+        lambda: MertonShare(payoff=1.0, loss=1.0, transaction_cost=0.01),
+        lambda: FixedFractionStrategy(fraction=0.05, payoff=1.0, loss=1.0),
+    ],
+)
+def test_vectorized_sizing_matches_row_by_row(factory):
+    source = _mixed()
+    assert _replay(source, factory(), vectorized=True, chunksize=64) == _replay(
+        source, factory()
+    )
+
+
+def test_vectorized_sizing_refuses_stateful_strategies():
+    strategy = DynamicBankrollManagement(
+        base_fraction=0.1, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+    with pytest.raises(ValueError, match="stateless"):
+        _replay(_mixed(), strategy, vectorized=True)
+
+
+def test_stateful_strategies_learn_from_recorded_outcomes():
+    strategy = DynamicBankrollManagement(
+        base_fraction=0.1, payoff=1.0, loss=1.0, transaction_cost=0.0, window_size=3
+    )
+    _replay(_recorded(rows=5), strategy)
+    assert len(strategy.results) == 3
+
+
+def test_bankruptcy_stops_before_reading_later_chunks(tmp_path):
+    class AllIn:
+        def evaluate(self, _probability, _current_bankroll):
+            return 1.0
+
+    source = _recorded(rows=10)
+    source["outcome"] = 0
+    source.loc[9, "probability"] = 2.0
+    path = tmp_path / "bad_tail.csv"
+    source.to_csv(path, index=False)
+
+    # The invalid row sits in a chunk the replay never reaches.
+    history = _replay(path, AllIn(), chunksize=2)
+    assert history == [1000.0, 0.0]
+
+
+@pytest.mark.parametrize(
+    ("column", "value", "message"),
+    [
+        ("probability", 1.5, "probability must be in"),
+        ("probability", float("nan"), "probability must be a finite"),
+        ("payoff", 0.0, "payoff must be greater"),
+        ("loss", -1.0, "loss must be non-negative"),
+        ("outcome", 2, "outcome must be 0 or 1"),
+    ],
+)
+def test_invalid_rows_are_reported_by_position(column, value, message):
+    source = _recorded(rows=20)
+    source[column] = source[column].astype(float)
+    source.loc[13, column] = value
+    with pytest.raises(ValueError, match=f"row 13: {message}"):
+        _replay(source, _kelly(), chunksize=8)
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"transaction_costs": -1}, "Transaction costs"),
+        ({"chunksize": 0}, "Chunk size"),
+        ({"chunksize": 2.5}, "Chunk size"),
+        ({"columns": {"odds": "x"}}, "Unknown replay column"),
+    ],
+)
+def test_invalid_configuration_is_rejected(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        ReplaySimulator(_recorded(rows=2), **kwargs)
+
+
+def test_unknown_file_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError, match="File format"):
+        ReplaySimulator(tmp_path / "history.txt")
+
+
+def test_missing_frame_column_is_reported():
+    with pytest.raises(ValueError, match="missing columns"):
+        _replay(_recorded(rows=2).drop(columns="loss"), _kelly())
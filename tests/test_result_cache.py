@@ -0,0 +1,205 @@
+"""Content-addressed keys and the on-disk LRU store behind them."""
+
+import inspect
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import keeks.utils
+from keeks import cache
+from keeks.binary_strategies import (
+    FractionalKellyCriterion,
+    KellyCriterion,
+    vectorized,
+)
+from keeks.cache import ResultCache, cache_key
+from keeks.simulators import BootstrapSimulator, RepeatedBinarySimulator, paths
+
+
+def _kelly(**overrides):
+    settings = {"payoff": 1.0, "loss": 1.0, "transaction_cost": 0.0}
+    settings.update(overrides)
+    return KellyCriterion(**settings)
+
+
+def _simulator(**overrides):
+    settings = {
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_costs": 0.0,
+        "probability": 0.55,
+        "trials": 500,
+        "seed": 1,
+    }
+    settings.update(overrides)
+    return RepeatedBinarySimulator(**settings)
+
+
+def test_keys_are_stable_across_processes():
+    script = (
+        "from keeks.binary_strategies import KellyCriterion\n"
+        "from keeks.cache import cache_key\n"
+        "print(cache_key(KellyCriterion(1.0, 1.0, 0.0), {'b': 2, 'a': {1, 2}}))\n"
+    )
+    environment = dict(os.environ, PYTHONHASHSEED="123")
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=environment,
+    ).stdout.strip()
+    assert output == cache_key(_kelly(), {"a": {2, 1}, "b": 2})
+
+
+@pytest.mark.parametrize(
+    "changed",
+    [
+        lambda: (_kelly(transaction_cost=0.01), _simulator()),
+        lambda: (
+            FractionalKellyCriterion(1.0, 1.0, 0.0, fraction=1.0),
+            _simulator(),
+        ),
+        lambda: (_kelly(), _simulator(seed=2)),
+        lambda: (_kelly(), _simulator(trials=501)),
+        lambda: (_kelly(), _simulator(probability=0.56)),
+    ],
+)
+def test_keys_change_with_what_produced_the_result(changed):
+    assert cache_key(*changed()) != cache_key(_kelly(), _simulator())
+
+
+def test_keys_describe_arrays_frames_and_code():
+    values = np.arange(6.0)
+    assert cache_key(values) == cache_key(values.copy())
+    assert cache_key(values) != cache_key(values.reshape(2, 3))
+    assert cache_key(values) != cache_key(values.astype(np.float32))
+
+    frame = pd.DataFrame({"probability": [0.5, 0.6], "outcome": [1, 0]})
+    assert cache_key(frame) == cache_key(frame.copy())
+    assert cache_key(frame) != cache_key(frame.iloc[::-1])
+
+    def first():
+        return 1
+
+    def second():
+        return 2
+
+    assert cache_key(first) != cache_key(second)
+    assert cache_key(float("nan")) == cache_key(float("nan"))
+
+
+def test_editing_a_class_source_changes_its_keys(monkeypatch):
+    before = cache_key(_kelly())
+    monkeypatch.setattr(cache, "_file_digest", lambda path: f"edited {path}")
+    assert cache_key(_kelly()) != before
+
+
+@pytest.mark.parametrize("module", [keeks.utils, vectorized, paths])
+def test_editing_code_a_class_delegates_to_changes_its_keys(monkeypatch, module):
+    bets = np.array([[0.6, 1.0, 1.0, 1.0], [0.6, 1.0, 1.0, 0.0]])
+    simulator = BootstrapSimulator(bets, trials=5, paths=2, seed=1)
+    kelly, bootstrap = cache_key(_kelly()), cache_key(simulator)
+    setting = cache_key(_Setting(1))
+    edited = inspect.getsourcefile(module)
+    digest = cache._file_digest
+    monkeypatch.setattr(
+        cache,
+        "_file_digest",
+        lambda path: f"edited {path}" if path == edited else digest(path),
+    )
+    assert cache_key(_kelly()) != kelly
+    assert cache_key(simulator) != bootstrap
+    assert cache_key(_Setting(1)) == setting
+
+
+@dataclass(frozen=True)
+class _Setting:
+    trials: int
+
+
+def test_dataclasses_are_described_by_their_fields():
+    assert cache_key(_Setting(5)) == cache_key(_Setting(5))
+    assert cache_key(_Setting(5)) != cache_key(_Setting(6))
+
+
+def test_undescribable_parts_are_rejected():
+    with pytest.raises(TypeError, match="Cannot build a cache key from object"):
+        cache_key(object())
+
+
+def test_values_and_arrays_round_trip(tmp_path):
+    store = ResultCache(tmp_path)
+    key = cache_key("cell")
+    assert key not in store
+    assert store.get(key, "missing") == "missing"
+    assert store.get_arrays(key) is None
+
+    arrays = {"terminal": np.array([1.5, 2.5]), "reason": np.array(["", "ruin"])}
+    store.put(key, {"median": 2.0}, arrays=arrays)
+    assert key in store
+    assert store.get(key) == {"median": 2.0}
+    loaded = store.get_arrays(key)
+    np.testing.assert_array_equal(loaded["terminal"], arrays["terminal"])
+    np.testing.assert_array_equal(loaded["reason"], arrays["reason"])
+
+    # Storing again without arrays drops the old ones.
+    store.put(key, {"median": 3.0})
+    assert store.get_arrays(key) is None
+    assert ResultCache(tmp_path).get(key) == {"median": 3.0}
+
+
+def test_fetch_computes_only_on_a_miss(tmp_path):
+    store = ResultCache(tmp_path)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return None
+
+    assert store.fetch("key", compute) is None
+    assert store.fetch("key", compute) is None
+    assert len(calls) == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    store = ResultCache(tmp_path, max_bytes=10_000)
+    payload = bytes(3_000)
+    for step, key in enumerate("abc"):
+        store.put(key, payload)
+        # Spread the recency stamps beyond the filesystem's timestamp resolution.
+        os.utime(store._value_path(key), ns=(step * 10**9, step * 10**9))
+    store.get("a")
+
+    store.put("d", payload)
+    assert [key in store for key in "abcd"] == [True, False, True, True]
+    assert store.size <= 10_000
+
+    store.clear()
+    assert store.size == 0
+    assert "a" not in store
+
+
+def test_entries_larger_than_the_store_are_not_kept(tmp_path):
+    store = ResultCache(tmp_path, max_bytes=100)
+    store.put("large", bytes(1_000))
+    assert "large" not in store
+
+
+def test_unreadable_entries_are_misses(tmp_path):
+    store = ResultCache(tmp_path)
+    store.put("key", 1)
+    store._value_path("key").write_bytes(b"not a pickle")
+    assert store.get("key", "missing") == "missing"
+    assert "key" not in store
+
+
+@pytest.mark.parametrize("max_bytes", [0, -1, 1.5, True])
+def test_invalid_size_limit_is_rejected(tmp_path, max_bytes):
+    with pytest.raises(ValueError, match="max_bytes must be a positive integer"):
+        ResultCache(tmp_path, max_bytes=max_bytes)
@@ -0,0 +1,194 @@
+"""SeedSequence seeds and the independent child streams spawned from them."""
+
+from functools import partial
+
+import numpy as np
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import FractionalKellyCriterion, KellyCriterion
+from keeks.cache import cache_key
+from keeks.sequential import path_cell
+from keeks.simulators import (
+    AsynchronousBinarySimulator,
+    BootstrapSimulator,
+    CorrelatedMarketSimulator,
+    PathSimulator,
+    RandomBinarySimulator,
+    RandomUncertainBinarySimulator,
+    RepeatedBinarySimulator,
+    bootstrap,
+)
+from keeks.tuning import StrategyTuner
+from keeks.utils import _child_seed
+
+_KELLY = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+
+
+def _paths(seed, **overrides):
+    settings = {
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_costs": 0.0,
+        "probability": 0.55,
+        "trials": 200,
+        "paths": 600,
+        "seed": seed,
+    }
+    settings.update(overrides)
+    return PathSimulator(**settings)
+
+
+def test_children_are_spawned_children_without_advancing_the_seed():
+    seed = np.random.SeedSequence(11)
+    children = [_child_seed(seed, index) for index in range(3)]
+    assert seed.n_children_spawned == 0
+    for child, spawned in zip(
+        children, np.random.SeedSequence(11).spawn(3), strict=True
+    ):
+        np.testing.assert_array_equal(
+            child.generate_state(4), spawned.generate_state(4)
+        )
+    grandchild = _child_seed(children[1], 2)
+    np.testing.assert_array_equal(
+        grandchild.generate_state(4), _child_seed(seed, 1, 2).generate_state(4)
+    )
+    # Integer seeds keep the [seed, key] streams they have always used.
+    np.testing.assert_array_equal(
+        _child_seed(11, 4).generate_state(4),
+        np.random.SeedSequence([11, 4]).generate_state(4),
+    )
+
+
+def test_paths_depend_only_on_the_seed_and_their_index():
+    seed = np.random.SeedSequence(5)
+    outcomes = _paths(seed).outcomes()
+    np.testing.assert_array_equal(outcomes, _paths(seed).outcomes())
+    # Fewer paths, cutting the last stream's block short, and fewer trials.
+    np.testing.assert_array_equal(
+        _paths(seed, paths=300, trials=150).outcomes(), outcomes[:150, :300]
+    )
+    assert seed.n_children_spawned == 0
+    assert not np.array_equal(_paths(np.random.SeedSequence(6)).outcomes(), outcomes)
+
+
+@pytest.mark.parametrize("log_domain", [False, True])
+def test_engines_settle_the_outcomes_they_report(log_domain):
+    seed = np.random.SeedSequence(7)
+    simulator = _paths(seed, log_domain=log_domain)
+    results = simulator.evaluate_strategy(_KELLY, BankRoll(1000.0, max_draw_down=None))
+    won = simulator.outcomes().sum(axis=0)
+    np.testing.assert_array_equal(results.control, won - 0.55 * 200)
+
+
+def test_antithetic_and_qmc_paths_accept_sequences():
+    seed = np.random.SeedSequence(8)
+    mirrored = _paths(seed, antithetic=True).outcomes()
+    first = _paths(seed, paths=300).outcomes()
+    np.testing.assert_array_equal(mirrored[:, :300], first)
+
+    pytest.importorskip("scipy")
+    qmc = _paths(seed, paths=64, qmc_replicates=4)
+    np.testing.assert_array_equal(qmc.outcomes(), qmc.outcomes())
+    assert seed.n_children_spawned == 0
+
+
+def test_tuner_results_do_not_depend_on_the_workers():
+    seed = np.random.SeedSequence(9)
+    tuner = partial(
+        StrategyTuner,
+        partial(FractionalKellyCriterion, payoff=1.0, loss=1.0, transaction_cost=0.0),
+        {"fraction": [0.25, 0.5, 1.0]},
+        trials=60,
+        min_paths=2,
+        max_paths=6,
+        seed=seed,
+    )
+    serial = tuner().tune()
+    pooled = tuner(workers=2).tune()
+    assert serial.seed is seed
+    assert serial.history.equals(pooled.history)
+    assert seed.n_children_spawned == 0
+
+
+def test_sequential_batches_come_from_the_seeds_children():
+    seed = np.random.SeedSequence(10)
+    cell = path_cell(_KELLY, 0.55, trials=50, seed=seed)
+    second = cell(1, 40)
+    assert second.equals(cell(1, 40))
+    assert second.equals(path_cell(_KELLY, 0.55, trials=50, seed=seed)(1, 40))
+    expected = _paths(_child_seed(seed, 1), paths=40, trials=50).evaluate_strategy(
+        _KELLY, BankRoll(1000.0)
+    )
+    np.testing.assert_array_equal(second["terminal"], expected.terminal)
+
+
+@pytest.mark.parametrize(
+    "build",
+    [
+        lambda seed: RepeatedBinarySimulator(1.0, 1.0, 0.0, 0.55, 200, seed=seed),
+        lambda seed: RandomBinarySimulator(1.0, 1.0, 0.0, trials=200, seed=seed),
+        lambda seed: RandomUncertainBinarySimulator(
+            1.0, 1.0, 0.0, trials=200, seed=seed
+        ),
+        lambda seed: AsynchronousBinarySimulator(
+            1.0, 1.0, 0.0, 0.55, 200, max_settlement_delay=3, seed=seed
+        ),
+    ],
+    ids=["repeated", "random", "uncertain", "asynchronous"],
+)
+def test_scalar_simulators_replay_a_sequence(build):
+    def run(seed):
+        bankroll = BankRoll(1000.0, max_draw_down=None)
+        build(seed).evaluate_strategy(_KELLY, bankroll)
+        return bankroll.total_funds
+
+    seed = np.random.SeedSequence(12)
+    assert run(seed) == run(np.random.SeedSequence(12))
+    assert seed.n_children_spawned == 0
+
+
+def test_array_simulators_accept_sequences():
+    seed = np.random.SeedSequence(13)
+    bets = np.column_stack(
+        [np.full(50, 0.55), np.ones(50), np.ones(50), np.arange(50) % 2]
+    )
+    bootstrap = BootstrapSimulator(bets, trials=30, paths=20, seed=seed)
+    np.testing.assert_array_equal(bootstrap.indices(), bootstrap.indices())
+    correlated = CorrelatedMarketSimulator(
+        1.0, 1.0, 0.0, [0.55, 0.6], [[1.0, 0.3], [0.3, 1.0]], trials=40, seed=seed
+    )
+    np.testing.assert_array_equal(correlated.outcomes(), correlated.outcomes())
+
+
+def test_bootstrap_paths_depend_only_on_the_seed_and_their_index(monkeypatch):
+    # 300 paths draw their rows 2 trials at a time, 10 paths all 30 at once.
+    monkeypatch.setattr(bootstrap, "_INDEX_ENTRIES", 600)
+    seed = np.random.SeedSequence(14)
+    bets = np.column_stack(
+        [np.full(50, 0.55), np.ones(50), np.ones(50), np.arange(50) % 2]
+    )
+    rows = BootstrapSimulator(bets, trials=30, paths=300, seed=seed).indices()
+    # Fewer paths, cutting the last stream's block short.
+    fewer = BootstrapSimulator(bets, trials=30, paths=10, seed=seed)
+    np.testing.assert_array_equal(fewer.indices(), rows[:, :10])
+    assert seed.n_children_spawned == 0
+
+
+def test_cache_keys_describe_sequences():
+    assert cache_key(np.random.SeedSequence(1)) == cache_key(np.random.SeedSequence(1))
+    assert cache_key(np.random.SeedSequence(1)) != cache_key(np.random.SeedSequence(2))
+    assert cache_key(_child_seed(np.random.SeedSequence(1), 0)) != cache_key(
+        np.random.SeedSequence(1)
+    )
+    spawned = np.random.SeedSequence(1)
+    spawned.spawn(2)
+    assert cache_key(spawned) == cache_key(np.random.SeedSequence(1))
+
+
+@pytest.mark.parametrize("seed", [-1, 1.5, "seed", np.random.default_rng(1)])
+def test_other_seeds_are_rejected(seed):
+    with pytest.raises(
+        ValueError, match="Seed must be a nonnegative integer, a SeedSequence or None"
+    ):
+        _paths(seed)
@@ -0,0 +1,147 @@
+"""Sequential Monte Carlo stopped at a target precision.
+
+The runner is worth using only if it spends paths where the uncertainty is and
+its intervals mean what they say, so both are checked alongside the stopping
+rules themselves.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from keeks.binary_strategies import FixedFractionStrategy
+from keeks.sequential import STATISTICS, SequentialRunner, path_cell
+
+
+def _cell(fraction, seed=1, **kwargs):
+    settings = {"probability": 0.55, "trials": 200, "max_draw_down": None}
+    settings.update(kwargs)
+    strategy = FixedFractionStrategy(
+        fraction=fraction, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+    return path_cell(strategy, seed=seed, **settings)
+
+
+def test_noisier_cells_get_more_paths():
+    runner = SequentialRunner("growth_rate", target_width=0.001)
+    summary = runner.run({"small": _cell(0.02), "large": _cell(0.1)})
+
+    assert summary["cell"].tolist() == ["small", "large"]
+    assert summary["converged"].all()
+    assert (summary["width"] <= 0.001).all()
+    assert summary["paths"].iloc[0] < summary["paths"].iloc[1]
+    assert (summary["paths"] == summary["batches"] * 100).all()
+
+
+def test_budget_stops_a_cell_that_cannot_converge():
+    runner = SequentialRunner(
+        "median_terminal", target_width=1.0, batch_paths=64, max_paths=150
+    )
+    summary = runner.run({"cell": _cell(0.1)}).iloc[0]
+
+    assert not summary["converged"]
+    # The last batch is cut to the budget.
+    assert summary["paths"] == 150
+    assert summary["batches"] == 3
+    assert summary["lower"] <= summary["estimate"] <= summary["upper"]
+
+
+def test_median_interval_is_unbounded_until_its_ranks_fit_the_sample():
+    def cell(batch, paths):  # noqa: ARG001
+        return pd.DataFrame({"terminal": np.full(paths, 1000.0)})
+
+    runner = SequentialRunner("median_terminal", target_width=1.0, batch_paths=1)
+    summary = runner.run({"flat": cell}).iloc[0]
+
+    # At 95% the ranks n/2 -+ z * sqrt(n) / 2 first fall inside the sample at
+    # 8 paths, where [min, max] covers the median with probability 1 - 2 / 2**8.
+    assert summary["converged"]
+    assert summary["paths"] == 8
+    assert summary["width"] == 0.0
+
+    short = SequentialRunner(
+        "median_terminal", target_width=1.0, batch_paths=1, max_paths=7
+    ).run({"flat": cell})
+    assert not short["converged"].iloc[0]
+    assert short["width"].iloc[0] == math.inf
+
+
+def test_ruin_interval_is_not_degenerate_before_any_ruin():
+    runner = SequentialRunner("ruin_rate", target_width=0.02, batch_paths=100)
+    summary = runner.run({"safe": _cell(0.02, max_draw_down=0.3)}).iloc[0]
+
+    assert summary["estimate"] == 0.0
+    assert summary["upper"] > 0.0
+    # With no ruins the Wilson interval is [0, z**2 / (n + z**2)], which first
+    # drops under 0.02 at 200 paths.
+    assert summary["paths"] == 200
+
+
+def test_seeded_cells_reproduce_their_batches():
+    first = _cell(0.1, seed=9)
+    again = _cell(0.1, seed=9)
+    pd.testing.assert_frame_equal(first(3, 20), again(3, 20))
+    assert not first(0, 20).equals(first(1, 20))
+
+
+@pytest.mark.parametrize("statistic", sorted(STATISTICS))
+def test_intervals_cover_a_known_answer(statistic):
+    rng = np.random.default_rng(0)
+    count = 4_000
+    growth = rng.normal(0.002, 0.01, count)
+    paths = pd.DataFrame(
+        {
+            "terminal": rng.exponential(1000.0, count),
+            "growth_rate": growth,
+            "ruined": rng.random(count) < 0.1,
+        }
+    )
+    truth = {
+        "median_terminal": 1000.0 * math.log(2),
+        "ruin_rate": 0.1,
+        "growth_rate": 0.002,
+    }[statistic]
+    estimate, lower, upper = STATISTICS[statistic](paths, 2.576)
+    assert lower <= truth <= upper
+    assert lower <= estimate <= upper
+
+
+def test_custom_cells_only_need_the_statistic_column():
+    calls = []
+
+    def cell(batch, paths):
+        calls.append((batch, paths))
+        return pd.DataFrame({"ruined": np.arange(paths) % 10 == 0})
+
+    summary = SequentialRunner("ruin_rate", target_width=0.1).run({"custom": cell})
+    assert calls[0] == (0, 100)
+    assert summary["estimate"].iloc[0] == pytest.approx(0.1)
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"statistic": "mean_terminal"}, "Statistic"),
+        ({"target_width": 0.0}, "Target width"),
+        ({"target_width": float("nan")}, "Target width"),
+        ({"confidence": 1.0}, "Confidence"),
+        ({"batch_paths": 0}, "Batch paths"),
+        ({"max_paths": True}, "Maximum paths"),
+    ],
+)
+def test_invalid_settings_are_rejected(kwargs, match):
+    settings = {"statistic": "ruin_rate", "target_width": 0.05}
+    settings.update(kwargs)
+    with pytest.raises(ValueError, match=match):
+        SequentialRunner(**settings)
+
+
+def test_empty_cells_and_bad_markets_are_rejected():
+    with pytest.raises(ValueError, match="Cells"):
+        SequentialRunner("ruin_rate", target_width=0.05).run({})
+    with pytest.raises(ValueError, match="Probability"):
+        _cell(0.1, probability=1.5)
+    with pytest.raises(ValueError, match="Initial funds"):
+        _cell(0.1, initial_funds=0.0)
@@ -0,0 +1,100 @@
+"""Arrays in shared memory that pickle as a name and attach without copying."""
+
+import concurrent.futures
+import pickle
+from multiprocessing import shared_memory
+
+import numpy as np
+import pytest
+
+from keeks.shared import SharedArrays
+
+_ATTACHED = None
+
+
+def _attach(shared):
+    global _ATTACHED
+    _ATTACHED = shared
+
+
+def _row_sum(row):
+    return float(_ATTACHED["draws"][row].sum())
+
+
+def _mark(row):
+    _ATTACHED["outcomes"][row] = True
+
+
+def test_arrays_are_laid_out_aligned_and_zeroed():
+    specs = {
+        "outcomes": ((3, 5), bool),
+        "draws": ((3, 5), np.float64),
+        "none": (0, int),
+    }
+    with SharedArrays(specs) as shared:
+        assert list(shared) == ["outcomes", "draws", "none"]
+        assert shared["outcomes"].shape == (3, 5)
+        assert shared["outcomes"].dtype == bool
+        assert shared["draws"].dtype == np.float64
+        assert shared["none"].shape == (0,)
+        assert shared["draws"].ctypes.data % 64 == 0
+        assert not shared["outcomes"].any() and not shared["draws"].any()
+        assert shared.nbytes >= 64 + 3 * 5 * 8
+
+
+def test_pickled_copies_view_the_same_memory():
+    with SharedArrays({"draws": ((2, 3), float)}) as shared:
+        payload = pickle.dumps(shared)
+        assert len(payload) < 500
+        attached = pickle.loads(payload)
+        shared["draws"][1, 2] = 7.0
+        assert attached["draws"][1, 2] == 7.0
+        attached["draws"][0, 0] = -1.0
+        assert shared["draws"][0, 0] == -1.0
+        attached.close()
+        # Closing an attachment leaves the block to its creator.
+        assert shared["draws"][0, 0] == -1.0
+
+
+def test_pool_workers_read_and_write_one_copy():
+    with SharedArrays(
+        {"draws": ((8, 1_000), float), "outcomes": ((8, 1_000), bool)}
+    ) as shared:
+        shared["draws"][:] = np.arange(8)[:, None]
+        with concurrent.futures.ProcessPoolExecutor(
+            2, initializer=_attach, initargs=(shared,)
+        ) as executor:
+            assert list(executor.map(_row_sum, range(8))) == [
+                1_000.0 * row for row in range(8)
+            ]
+            list(executor.map(_mark, [1, 5]))
+        assert shared["outcomes"].all(axis=1).tolist() == [
+            row in (1, 5) for row in range(8)
+        ]
+
+
+def test_closing_the_creator_frees_the_block():
+    shared = SharedArrays({"draws": ((4,), float)})
+    name = shared.name
+    view = shared["draws"]
+    shared.close()
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name)
+    assert view.shape == (4,)
+    with pytest.raises(KeyError):
+        shared["draws"]
+    shared.close()
+
+
+@pytest.mark.parametrize(
+    ("specs", "match"),
+    [
+        ({"draws": ((-1, 3), float)}, "Shape of 'draws'"),
+        ({"draws": ((2.5,), float)}, "Shape of 'draws'"),
+        ({"draws": ((True,), float)}, "Shape of 'draws'"),
+        ({"labels": ((3,), object)}, "must not hold Python objects"),
+    ],
+)
+def test_invalid_specs_are_rejected(specs, match):
+    with pytest.raises(ValueError, match=match):
+        SharedArrays(specs)
@@ -0,0 +1,95 @@
+"""Per-phase profiling of the simulation loop.
+
+A profile is only useful if it observes without interfering, so the properties
+pinned here are that a profiled run settles exactly like an unprofiled one and
+that every call the loop makes lands in the phase it belongs to.
+"""
+
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import DynamicBankrollManagement, KellyCriterion
+from keeks.simulators import (
+    RandomBinarySimulator,
+    RandomUncertainBinarySimulator,
+    RepeatedBinarySimulator,
+    SimulationProfile,
+)
+from keeks.simulators.profiling import PROFILE_PHASES
+
+SIMULATORS = {
+    "repeated": lambda: RepeatedBinarySimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.0, probability=0.6, seed=5
+    ),
+    "random": lambda: RandomBinarySimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.0, seed=5
+    ),
+    "uncertain": lambda: RandomUncertainBinarySimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.0, seed=5
+    ),
+}
+
+
+def _dynamic():
+    return DynamicBankrollManagement(
+        base_fraction=0.1, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+
+
+def _run(factory, profile=None):
+    bankroll = BankRoll(initial_funds=1000.0, max_draw_down=None)
+    factory().evaluate_strategy(_dynamic(), bankroll, profile=profile)
+    return bankroll.history
+
+
+@pytest.mark.parametrize("name", sorted(SIMULATORS))
+def test_profiled_run_matches_unprofiled_run(name):
+    assert _run(SIMULATORS[name], SimulationProfile()) == _run(SIMULATORS[name])
+
+
+@pytest.mark.parametrize("name", sorted(SIMULATORS))
+def test_every_loop_call_is_attributed_to_its_phase(name):
+    profile = SimulationProfile()
+    history = _run(SIMULATORS[name], profile)
+    bets = len(history) - 1
+    calls = profile.calls
+
+    assert calls["evaluate"] == calls["validate"] == calls["update"] == 1000
+    assert calls["settle"] == calls["record"] == bets
+    assert calls["draw"] >= bets
+    assert all(profile.elapsed_ns[phase] > 0 for phase in PROFILE_PHASES)
+
+
+def test_counters_accumulate_across_runs_until_reset():
+    profile = SimulationProfile()
+    strategy = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    for _ in range(2):
+        SIMULATORS["repeated"]().evaluate_strategy(
+            strategy, BankRoll(initial_funds=1000.0, max_draw_down=None), profile
+        )
+    assert profile.calls["evaluate"] == 2000
+    assert profile.calls["record"] == 0
+
+    rows = profile.as_rows()
+    assert [row["phase"] for row in rows] == list(PROFILE_PHASES)
+    assert sum(row["share"] for row in rows) == pytest.approx(1.0)
+
+    profile.reset()
+    assert profile.total_ns == 0
+    assert set(profile.calls.values()) == {0}
+
+
+def test_a_raising_call_is_still_counted():
+    profile = SimulationProfile()
+
+    def fail():
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        profile.wrap("settle", fail)()
+    assert profile.calls["settle"] == 1
+
+
+def test_unknown_phase_is_rejected():
+    with pytest.raises(ValueError, match="Unknown profile phase"):
+        SimulationProfile().wrap("sleep", lambda: None)
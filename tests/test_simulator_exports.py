@@ -1,15 +1,44 @@
 import keeks.simulators as simulators
+from keeks.simulators.asynchronous_binary import AsynchronousBinarySimulator
+from keeks.simulators.bootstrap import BootstrapSimulator
+from keeks.simulators.correlated import CorrelatedMarketSimulator
+from keeks.simulators.paths import (
+    MeanEstimate,
+    PathResults,
+    PathSimulator,
+    TailEstimate,
+)
+from keeks.simulators.profiling import SimulationProfile
 from keeks.simulators.random_binary import RandomBinarySimulator
 from keeks.simulators.random_uncertain_binary import RandomUncertainBinarySimulator
 from keeks.simulators.repeated_binary import RepeatedBinarySimulator
+from keeks.simulators.replay import ReplaySimulator
 
 
 def test_simulator_exports_are_leaf_module_classes():
     assert simulators.__all__ == [
+        "AsynchronousBinarySimulator",
+        "BootstrapSimulator",
+        "CorrelatedMarketSimulator",
+        "MeanEstimate",
+        "PathResults",
+        "PathSimulator",
         "RandomBinarySimulator",
         "RandomUncertainBinarySimulator",
         "RepeatedBinarySimulator",
+        "ReplaySimulator",
+        "SimulationProfile",
+        "TailEstimate",
     ]
+    assert simulators.AsynchronousBinarySimulator is AsynchronousBinarySimulator
+    assert simulators.BootstrapSimulator is BootstrapSimulator
+    assert simulators.CorrelatedMarketSimulator is CorrelatedMarketSimulator
+    assert simulators.MeanEstimate is MeanEstimate
+    assert simulators.PathResults is PathResults
+    assert simulators.PathSimulator is PathSimulator
     assert simulators.RandomBinarySimulator is RandomBinarySimulator
     assert simulators.RandomUncertainBinarySimulator is RandomUncertainBinarySimulator
     assert simulators.RepeatedBinarySimulator is RepeatedBinarySimulator
+    assert simulators.ReplaySimulator is ReplaySimulator
+    assert simulators.SimulationProfile is SimulationProfile
+    assert simulators.TailEstimate is TailEstimate
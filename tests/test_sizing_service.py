@@ -0,0 +1,176 @@
+"""The micro-batching sizing service.
+
+Batching must be invisible to callers: every request resolves to what a direct
+``evaluate`` call returns, a bad request or strategy fails only its own batch,
+and the socket front end answers every line it is sent.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from keeks.binary_strategies import (
+    CPPIStrategy,
+    FixedFractionStrategy,
+    KellyCriterion,
+    MertonShare,
+)
+from keeks.service import SizingService, serve
+
+STRATEGIES = {
+    "kelly": KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.01),
+    "merton": MertonShare(payoff=1.0, loss=1.0, transaction_cost=0.0),
+    "fixed": FixedFractionStrategy(fraction=0.05, payoff=1.0, loss=1.0),
+}
+
+REQUESTS = [
+    (name, 0.4 + 0.001 * i, 1000.0 + i)
+    for i in range(300)
+    for name in sorted(STRATEGIES)
+]
+
+
+def _gather(service, requests=REQUESTS):
+    async def run():
+        return await asyncio.gather(
+            *(service.size(name, p, bankroll) for name, p, bankroll in requests)
+        )
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("max_batch_size", [1, 7, 256, 10_000])
+def test_every_request_gets_its_direct_evaluation(max_batch_size):
+    service = SizingService(STRATEGIES, max_batch_size=max_batch_size)
+    expected = [
+        STRATEGIES[name].evaluate(p, bankroll) for name, p, bankroll in REQUESTS
+    ]
+    assert _gather(service) == expected
+    assert service.requests == len(REQUESTS)
+
+
+def test_concurrent_requests_are_coalesced_per_strategy():
+    service = SizingService(STRATEGIES, max_batch_size=128, max_delay=0.05)
+    _gather(service)
+    # 300 requests per strategy close batches of 128, 128 and then 44 on the
+    # timer.
+    assert service.batches == 3 * len(STRATEGIES)
+
+
+def test_a_failing_strategy_fails_only_its_batch():
+    class Broken(KellyCriterion):
+        def evaluate_batch(self, probabilities, current_bankroll):
+            return super().evaluate_batch(probabilities, current_bankroll) + 2.0
+
+    service = SizingService(
+        {"broken": Broken(1.0, 1.0, 0.0), "kelly": STRATEGIES["kelly"]}
+    )
+
+    async def run():
+        return await asyncio.gather(
+            service.size("broken", 0.6, 1000.0),
+            service.size("kelly", 0.6, 1000.0),
+            return_exceptions=True,
+        )
+
+    broken, kelly = asyncio.run(run())
+    assert isinstance(broken, ValueError)
+    assert kelly == STRATEGIES["kelly"].evaluate(0.6, 1000.0)
+
+
+@pytest.mark.parametrize(
+    ("request_args", "message"),
+    [
+        (("missing", 0.5, 1.0), "Unknown strategy"),
+        ((["kelly"], 0.5, 1.0), "Unknown strategy"),
+        (("kelly", 1.5, 1.0), "Probability must be between"),
+        (("kelly", float("nan"), 1.0), "Probability must be a finite"),
+        (("kelly", 0.5, float("inf")), "Current bankroll"),
+    ],
+)
+def test_invalid_requests_are_rejected(request_args, message):
+    with pytest.raises(ValueError, match=message):
+        _gather(SizingService(STRATEGIES), [request_args])
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"max_batch_size": 0}, "batch size"),
+        ({"max_batch_size": True}, "batch size"),
+        ({"max_delay": -1.0}, "delay"),
+    ],
+)
+def test_invalid_configuration_is_rejected(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        SizingService(STRATEGIES, **kwargs)
+
+
+def test_stateful_strategies_are_refused():
+    cppi = CPPIStrategy(
+        floor_fraction=0.8,
+        multiplier=2.0,
+        initial_bankroll=1000.0,
+        payoff=1.0,
+        loss=1.0,
+        transaction_cost=0.0,
+    )
+    with pytest.raises(ValueError, match="stateless"):
+        SizingService({"cppi": cppi})
+
+
+async def _exchange(lines, **server_kwargs):
+    service = SizingService(STRATEGIES)
+    async with await serve(service, **server_kwargs) as server:
+        if "path" in server_kwargs:
+            reader, writer = await asyncio.open_unix_connection(server_kwargs["path"])
+        else:
+            reader, writer = await asyncio.open_connection(
+                *server.sockets[0].getsockname()[:2]
+            )
+        for line in lines:
+            writer.write(line.encode() + b"\n")
+        writer.write_eof()
+        answers = [json.loads(answer) async for answer in reader]
+        writer.close()
+    return {answer["id"]: answer for answer in answers}
+
+
+def _wire_requests():
+    return [
+        json.dumps({"id": i, "strategy": name, "probability": p, "bankroll": bankroll})
+        for i, (name, p, bankroll) in enumerate(REQUESTS)
+    ]
+
+
+def test_socket_front_end_answers_pipelined_requests():
+    answers = asyncio.run(_exchange(_wire_requests()))
+    assert [answers[i]["stake"] for i in range(len(REQUESTS))] == [
+        STRATEGIES[name].evaluate(p, bankroll) for name, p, bankroll in REQUESTS
+    ]
+
+
+def test_socket_front_end_reports_bad_requests():
+    answers = asyncio.run(
+        _exchange(
+            [
+                '{"id": "a", "strategy": "kelly", "probability": 0.5}',
+                '{"id": "b", "strategy": "nope", "probability": 0.5, "bankroll": 1}',
+                "[1, 2]",
+                '{"id": "c", "strategy": ["x"], "probability": 0.5, "bankroll": 1}',
+            ]
+        )
+    )
+    assert answers["a"]["error"] == "Request is missing 'bankroll'"
+    assert "Unknown strategy" in answers["b"]["error"]
+    assert answers[None]["error"] == "Request must be a JSON object"
+    assert answers["c"]["error"] == "Unknown strategy ['x']"
+
+
+@pytest.mark.skipif(not hasattr(asyncio, "start_unix_server"), reason="no AF_UNIX")
+def test_unix_socket_front_end(tmp_path):
+    answers = asyncio.run(
+        _exchange(_wire_requests()[:3], path=str(tmp_path / "sizing.sock"))
+    )
+    assert len(answers) == 3
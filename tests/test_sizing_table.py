@@ -0,0 +1,139 @@
+"""Precompiled sizing tables.
+
+A table is only a drop-in for ``evaluate`` if its reported error bound actually
+holds, so every lookup is compared against the strategy it was compiled from,
+including around the jumps in stake that a grid cannot resolve.
+"""
+
+import numpy as np
+import pytest
+
+from keeks.binary_strategies import (
+    CPPIStrategy,
+    DrawdownAdjustedKelly,
+    DynamicBankrollManagement,
+    FixedFractionStrategy,
+    FractionalKellyCriterion,
+    KellyCriterion,
+    MertonShare,
+    NaiveStrategy,
+    OptimalF,
+)
+
+PROBABILITIES = np.concatenate(
+    [np.linspace(0.0, 1.0, 2_001), np.random.default_rng(5).random(2_000)]
+)
+
+FACTORIES = {
+    "kelly": lambda: KellyCriterion(1.0, 1.0, 0.0),
+    "kelly_odds": lambda: KellyCriterion(2.5, 0.5, 0.01, min_probability=0.1),
+    "fractional_kelly": lambda: FractionalKellyCriterion(1.0, 1.0, 0.01, 0.3),
+    "drawdown_kelly": lambda: DrawdownAdjustedKelly(1.0, 1.0, 0.0, 0.1),
+    "naive": lambda: NaiveStrategy(2.5, 0.5, 0.01),
+    "fixed_fraction": lambda: FixedFractionStrategy(0.4, 1.0, 1.0, 0.0),
+    "optimal_f": lambda: OptimalF(1.0, 1.0, 0.0, win_rate=0.6),
+    "merton": lambda: MertonShare(1.0, 1.0, 0.0),
+    "merton_bold": lambda: MertonShare(0.3, 1.7, 0.2, risk_aversion=0.5),
+}
+
+
+def _errors(strategy, table):
+    exact = strategy.evaluate_batch(PROBABILITIES, 1000.0)
+    batch = np.abs(table(PROBABILITIES) - exact)
+    scalar = np.abs(np.array([table(p) for p in PROBABILITIES.tolist()]) - exact)
+    return batch, scalar
+
+
+@pytest.mark.parametrize("method", ["linear", "step"])
+@pytest.mark.parametrize("name", sorted(FACTORIES))
+def test_lookups_stay_within_the_reported_bound(name, method):
+    strategy = FACTORIES[name]()
+    table = strategy.compile_table(resolution=256, method=method)
+    batch, scalar = _errors(strategy, table)
+    assert batch.max() <= table.error_bound + 1e-12
+    assert scalar.max() <= table.error_bound + 1e-12
+
+
+@pytest.mark.parametrize("name", sorted(FACTORIES))
+def test_tolerance_defers_coarse_cells_to_evaluate(name):
+    strategy = FACTORIES[name]()
+    table = strategy.compile_table(resolution=256, tolerance=1e-4)
+    batch, scalar = _errors(strategy, table)
+    assert table.error_bound <= 1e-4
+    assert batch.max() <= 1e-4 + 1e-12
+    assert scalar.max() <= 1e-4 + 1e-12
+
+
+def test_interpolation_is_exact_where_the_strategy_is_linear():
+    strategy = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    # The kink at a probability of 0.5 falls on a cell edge, so Kelly is linear
+    # within every cell and only the bound, not the lookup, is loose.
+    table = strategy.compile_table(resolution=100)
+    assert table.error_bound == pytest.approx(0.02)
+    np.testing.assert_allclose(
+        table(PROBABILITIES), strategy.evaluate_batch(PROBABILITIES, 1.0), atol=1e-15
+    )
+
+
+def test_jumps_are_served_by_the_strategy():
+    strategy = OptimalF(payoff=1.0, loss=1.0, transaction_cost=0.0, win_rate=0.6)
+    coarse = strategy.compile_table(resolution=3)
+    assert coarse.error_bound == pytest.approx(0.2)
+    table = strategy.compile_table(resolution=3, tolerance=0.01)
+    assert table.exact_cells == 1
+    assert table(0.49) == 0.0
+    assert table(0.5) == strategy.evaluate(0.5, 1.0)
+
+
+def test_lookups_clamp_probabilities_and_keep_shape():
+    table = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0).compile_table(
+        resolution=10
+    )
+    assert table(-0.5) == table(0.0)
+    assert table(1.5) == table(1.0) == 1.0
+    assert table(1) == 1.0
+    assert table(np.full((2, 3), 0.75)).shape == (2, 3)
+    assert table(np.float64(0.75)) == pytest.approx(0.5)
+    assert np.ndim(table(np.array(0.75))) == 0
+    with pytest.raises(ValueError, match="NaN"):
+        table(float("nan"))
+    with pytest.raises(ValueError, match="NaN"):
+        table([0.5, float("nan")])
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [
+        CPPIStrategy(
+            floor_fraction=0.8,
+            multiplier=2.0,
+            initial_bankroll=1000.0,
+            payoff=1.0,
+            loss=1.0,
+            transaction_cost=0.0,
+        ),
+        DynamicBankrollManagement(
+            base_fraction=0.1, payoff=1.0, loss=1.0, transaction_cost=0.0
+        ),
+    ],
+)
+def test_stateful_strategies_cannot_be_compiled(strategy):
+    with pytest.raises(ValueError, match="stateless"):
+        strategy.compile_table()
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"resolution": 0}, "Resolution"),
+        ({"resolution": 2.5}, "Resolution"),
+        ({"resolution": True}, "Resolution"),
+        ({"method": "cubic"}, "Method"),
+        ({"tolerance": -1.0}, "Tolerance"),
+        ({"tolerance": float("inf")}, "Tolerance"),
+    ],
+)
+def test_invalid_table_parameters_are_rejected(kwargs, match):
+    strategy = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    with pytest.raises(ValueError, match=match):
+        strategy.compile_table(**kwargs)
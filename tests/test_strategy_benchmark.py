@@ -8,12 +8,15 @@ and an early stop is reported rather than inferred from a short history.
 
 import importlib.util
 import random
+import sys
 from pathlib import Path
 
 import pytest
 
 import keeks.binary_strategies as binary_strategies
+from keeks.cache import ResultCache
 from keeks.simulators import repeated_binary
+from keeks.simulators.profiling import PROFILE_PHASES
 
 BENCHMARK_PATH = (
     Path(__file__).resolve().parents[1] / "benchmarks" / "strategy_benchmark.py"
@@ -138,3 +141,52 @@ def test_the_default_cap_does_not_stop_the_base_scenario(short_run):
     summary = short_run.summarise(short_run.BASE, "Kelly", results)
     assert summary["early_stop_rate"] == 0.0
     assert summary["median_trials_started"] == short_run.TRIALS
+
+
+def test_profiling_observes_without_changing_the_metrics(short_run):
+    profiles = {}
+    profile = profiles.setdefault("Kelly", BENCHMARK.SimulationProfile())
+    profiled = short_run.run_path(short_run.BASE, "Kelly", 2, profile=profile)
+    assert profiled == short_run.run_path(short_run.BASE, "Kelly", 2)
+
+    frame = short_run.profile_frame(profiles)
+    assert list(frame["phase"]) == list(PROFILE_PHASES)
+    assert frame.loc[frame["phase"] == "evaluate", "calls"].item() == 40
+
+
+def test_cached_cells_are_reused_until_their_inputs_change(
+    short_run, monkeypatch, tmp_path
+):
+    monkeypatch.setattr(short_run, "PATHS", 3)
+    monkeypatch.setattr(short_run, "SCENARIOS", [short_run.BASE])
+    cache = ResultCache(tmp_path)
+    first = short_run.run_matrix(cache=cache)
+
+    calls = []
+    run_path = short_run.run_path
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return run_path(*args, **kwargs)
+
+    monkeypatch.setattr(short_run, "run_path", counted)
+    assert short_run.run_matrix(cache=cache).equals(first)
+    assert not calls
+
+    monkeypatch.setattr(short_run, "TRIALS", 41)
+    short_run.run_matrix(cache=cache)
+    assert len(calls) == 3 * len(short_run.STRATEGY_FACTORIES)
+    key = short_run.cell_key(short_run.BASE, "Kelly")
+    assert list(cache.get_arrays(key)["trials_started"]) == [41, 41, 41]
+
+
+def test_process_pool_matches_the_serial_matrix(short_run, monkeypatch):
+    # Workers find the pooled function through the module's import name.
+    monkeypatch.setitem(sys.modules, "strategy_benchmark", short_run)
+    monkeypatch.setattr(short_run, "PATHS", 4)
+    monkeypatch.setattr(
+        short_run, "SCENARIOS", [short_run.BASE, short_run.SCENARIOS[6]]
+    )
+    assert short_run.SCENARIOS[1].estimate_stdev
+    serial = short_run.run_matrix()
+    assert short_run.run_matrix(workers=2).equals(serial)
@@ -16,6 +16,7 @@ import pytest
 
 import keeks.binary_strategies as binary_strategies
 from keeks.binary_strategies import (
+    AdaptiveKellyCriterion,
     CPPIStrategy,
     DrawdownAdjustedKelly,
     DynamicBankrollManagement,
@@ -43,6 +44,7 @@ BASE_KWARGS = {
         "transaction_cost": 0.01,
         "max_acceptable_drawdown": 0.2,
     },
+    AdaptiveKellyCriterion: {"payoff": 1.0, "loss": 1.0, "transaction_cost": 0.01},
     OptimalF: {
         "payoff": 1.0,
         "loss": 1.0,
@@ -0,0 +1,118 @@
+"""Successive-halving parameter search.
+
+The search is only trustworthy if candidates are compared on the same outcomes
+and the halving spends its paths the way it says, so those are checked along
+with the answer itself.
+"""
+
+from functools import partial
+
+import pytest
+
+from keeks.binary_strategies import FixedFractionStrategy, FractionalKellyCriterion
+from keeks.tuning import StrategyTuner
+
+KELLY = partial(FractionalKellyCriterion, payoff=1.0, loss=1.0, transaction_cost=0.0)
+FIXED = partial(FixedFractionStrategy, payoff=1.0, loss=1.0, transaction_cost=0.0)
+
+
+def _tuner(factory=KELLY, space=None, **kwargs):
+    settings = {"trials": 100, "min_paths": 4, "max_paths": 36, "seed": 3}
+    settings.update(kwargs)
+    return StrategyTuner(factory, space or {"fraction": [0.1, 0.5, 1.0]}, **settings)
+
+
+def test_growth_objective_picks_full_kelly():
+    result = _tuner(space={"fraction": [0.1, 0.25, 0.5, 0.75, 1.0]}).tune()
+    assert result.best_params == {"fraction": 1.0}
+
+
+def test_ruin_objective_picks_the_stake_the_drawdown_limit_allows():
+    result = _tuner(
+        FIXED, {"fraction": [0.5, 0.05]}, objective="ruin_rate", max_draw_down=0.3
+    ).tune()
+    assert result.best_params == {"fraction": 0.05}
+    assert result.best_score == 0.0
+
+
+def test_candidates_share_outcome_paths():
+    history = _tuner(space={"fraction": [0.5, 0.5, 0.5]}, eta=2).tune().history
+    for _, rung in history.groupby("rung"):
+        assert rung["score"].nunique() == 1
+
+
+def test_rungs_cut_candidates_and_grow_paths():
+    result = _tuner(space={"fraction": [i / 27 for i in range(1, 28)]}).tune()
+    history = result.history
+
+    assert history.groupby("rung")["paths"].first().tolist() == [4, 12, 36]
+    assert history.groupby("rung").size().tolist() == [27, 9, 3]
+    assert history.groupby("rung")["kept"].sum().tolist() == [9, 3, 1]
+    # Paths from earlier rungs are reused, not simulated again.
+    assert result.simulated_paths == 27 * 4 + 9 * 8 + 3 * 24
+    final = history[history["rung"] == history["rung"].max()]
+    assert final["score"].iloc[0] == result.best_score
+
+
+def test_grid_of_at_most_eta_candidates_is_decided_on_max_paths():
+    history = _tuner(space={"fraction": [0.1, 0.5, 1.0]}).tune().history
+    assert history["rung"].max() == 0
+    assert history["paths"].tolist() == [36, 36, 36]
+    assert history["kept"].sum() == 1
+
+
+def test_rungs_are_scheduled_back_from_max_paths():
+    result = _tuner(space={"fraction": [i / 9 for i in range(1, 10)]}).tune()
+    history = result.history
+
+    # Two cuts leave one of nine, so the first rung gets 36 / 3 paths, not 4.
+    assert history.groupby("rung")["paths"].first().tolist() == [12, 36]
+    assert history.groupby("rung")["kept"].sum().tolist() == [3, 1]
+
+
+def test_seed_reproduces_the_search():
+    first = _tuner(seed=None).tune()
+    again = _tuner(seed=first.seed).tune()
+    assert first.history.equals(again.history)
+
+
+def test_custom_objective_gets_one_row_per_path():
+    seen = []
+
+    def mean_terminal(paths):
+        seen.append(list(paths.columns))
+        return paths["terminal"].mean()
+
+    result = _tuner(objective=mean_terminal).tune()
+    assert seen[0] == ["terminal", "growth_rate", "ruined"]
+    assert result.best_params in _tuner().candidates()
+
+
+def test_process_pool_matches_serial_search():
+    serial = _tuner().tune()
+    pooled = _tuner(workers=2).tune()
+    assert pooled.history.equals(serial.history)
+    assert pooled.simulated_paths == serial.simulated_paths
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "match"),
+    [
+        ({"space": {}}, "Space"),
+        ({"space": {"fraction": []}}, "Space"),
+        ({"objective": "mean"}, "Objective"),
+        ({"min_paths": 0}, "Minimum paths"),
+        ({"min_paths": 50, "max_paths": 10}, "must not exceed"),
+        ({"eta": 1}, "Eta"),
+        ({"workers": 0}, "Workers"),
+        ({"probability": 1.5}, "Probability"),
+        ({"trials": -1}, "Trials"),
+        ({"initial_funds": 0.0}, "Initial funds"),
+        ({"max_draw_down": 2.0}, "draw"),
+        ({"seed": -1}, "Seed"),
+    ],
+)
+def test_invalid_settings_are_rejected(kwargs, match):
+    space = kwargs.pop("space", {"fraction": [0.5]})
+    with pytest.raises(ValueError, match=match):
+        StrategyTuner(KELLY, space, **kwargs)
@@ -0,0 +1,144 @@
+"""Trusted execution mode.
+
+``trusted_inputs`` only removes checks that cannot fire on valid input, so the
+guard rail is that every simulator and entry-price path returns exactly the
+same numbers inside the block as outside it.
+"""
+
+import threading
+
+import pandas as pd
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import (
+    DynamicBankrollManagement,
+    KellyCriterion,
+    NaiveStrategy,
+)
+from keeks.simulators import (
+    AsynchronousBinarySimulator,
+    RandomBinarySimulator,
+    RandomUncertainBinarySimulator,
+    RepeatedBinarySimulator,
+    ReplaySimulator,
+)
+from keeks.utils import (
+    RuinError,
+    expected_utility,
+    find_indifference_price,
+    trusted_inputs,
+)
+
+
+def _replay_source():
+    return pd.DataFrame(
+        {
+            "probability": [0.55, 0.6, 0.65, 0.5] * 50,
+            "payoff": [1.0] * 200,
+            "loss": [1.0] * 200,
+            "outcome": [1, 0, 1, 1] * 50,
+        }
+    )
+
+
+SIMULATORS = {
+    "repeated": lambda: RepeatedBinarySimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.1, probability=0.6, seed=3
+    ),
+    "random": lambda: RandomBinarySimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.1, seed=3
+    ),
+    "uncertain": lambda: RandomUncertainBinarySimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.1, seed=3
+    ),
+    "asynchronous": lambda: AsynchronousBinarySimulator(
+        payoff=1.0,
+        loss=1.0,
+        transaction_costs=0.1,
+        probability=0.6,
+        max_settlement_delay=4,
+        seed=3,
+    ),
+    "replay": lambda: ReplaySimulator(_replay_source(), transaction_costs=0.1),
+}
+
+
+def _run(factory, strategy_factory):
+    bankroll = BankRoll(initial_funds=1000.0, max_draw_down=None)
+    factory().evaluate_strategy(strategy_factory(), bankroll)
+    return bankroll.history
+
+
+@pytest.mark.parametrize("name", sorted(SIMULATORS))
+@pytest.mark.parametrize(
+    "strategy_factory",
+    [
+        lambda: KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0),
+        lambda: DynamicBankrollManagement(
+            base_fraction=0.1, payoff=1.0, loss=1.0, transaction_cost=0.0
+        ),
+    ],
+)
+def test_simulator_histories_are_identical_in_trusted_mode(name, strategy_factory):
+    expected = _run(SIMULATORS[name], strategy_factory)
+    with trusted_inputs():
+        assert _run(SIMULATORS[name], strategy_factory) == expected
+
+
+def test_entry_prices_are_identical_in_trusted_mode():
+    outcomes, probabilities = [200, -100, 50], [0.5, 0.3, 0.15]
+    strategy = KellyCriterion(payoff=1.0, loss=1.0, transaction_cost=0.0)
+    expected = (
+        find_indifference_price(outcomes, probabilities, 1000, risk_aversion=2.0),
+        expected_utility(outcomes, probabilities, 1000, 10.0, risk_aversion=2.0),
+        strategy.calculate_max_entry_price(outcomes, probabilities, 1000),
+        NaiveStrategy(
+            payoff=1.0, loss=1.0, transaction_cost=0.0
+        ).calculate_max_entry_price(outcomes, probabilities, 1000),
+    )
+    with trusted_inputs():
+        trusted = (
+            find_indifference_price(outcomes, probabilities, 1000, risk_aversion=2.0),
+            expected_utility(outcomes, probabilities, 1000, 10.0, risk_aversion=2.0),
+            strategy.calculate_max_entry_price(outcomes, probabilities, 1000),
+            NaiveStrategy(
+                payoff=1.0, loss=1.0, transaction_cost=0.0
+            ).calculate_max_entry_price(outcomes, probabilities, 1000),
+        )
+    assert trusted == expected
+
+
+def test_safeguards_still_apply_in_trusted_mode():
+    bankroll = BankRoll(initial_funds=100.0, max_draw_down=0.1)
+    with trusted_inputs(), pytest.raises(RuinError):
+        bankroll.withdraw(50.0)
+
+
+def test_validation_resumes_after_the_block():
+    bankroll = BankRoll(initial_funds=100.0)
+    with pytest.raises(RuntimeError), trusted_inputs():
+        raise RuntimeError
+    with pytest.raises(ValueError, match="amt"):
+        bankroll.deposit(float("nan"))
+
+
+def test_trusted_mode_does_not_leak_into_other_threads():
+    errors = []
+    entered, checked = threading.Event(), threading.Event()
+
+    def other_thread():
+        entered.wait()
+        try:
+            BankRoll(initial_funds=100.0).deposit(-1.0)
+        except ValueError as exc:
+            errors.append(exc)
+        checked.set()
+
+    worker = threading.Thread(target=other_thread)
+    worker.start()
+    with trusted_inputs():
+        entered.set()
+        checked.wait()
+    worker.join()
+    assert len(errors) == 1
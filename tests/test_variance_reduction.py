@@ -0,0 +1,137 @@
+"""Antithetic paths and the control variate.
+
+A fixed-fraction bettor's expected terminal wealth is known in closed form, so
+each estimator can be checked against the truth as well as for how much it
+narrows the interval.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import CPPIStrategy, FixedFractionStrategy
+from keeks.simulators import MeanEstimate, PathSimulator, ReplaySimulator
+
+TRIALS = 200
+PROBABILITY = 0.55
+FRACTION = 0.05
+EXPECTED_TERMINAL = 1000.0 * (1 + FRACTION * (2 * PROBABILITY - 1)) ** TRIALS
+
+
+def _simulator(**kwargs):
+    settings = {
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_costs": 0.0,
+        "probability": PROBABILITY,
+        "trials": TRIALS,
+        "paths": 4_000,
+        "seed": 5,
+    }
+    settings.update(kwargs)
+    return PathSimulator(**settings)
+
+
+def _fixed_fraction():
+    return FixedFractionStrategy(
+        fraction=FRACTION, payoff=1.0, loss=1.0, transaction_cost=0.0
+    )
+
+
+def _run(**kwargs):
+    return _simulator(**kwargs).evaluate_strategy(
+        _fixed_fraction(), BankRoll(1000.0, max_draw_down=None)
+    )
+
+
+@pytest.mark.parametrize(
+    ("antithetic", "control", "least_reduction"),
+    [(False, False, 0.99), (True, False, 1.5), (False, True, 3.0), (True, True, 2.0)],
+)
+def test_estimators_cover_the_true_mean_and_narrow_it(
+    antithetic, control, least_reduction
+):
+    results = _run(antithetic=antithetic)
+    estimate = results.mean(results.terminal, control=control, confidence=0.999)
+
+    assert isinstance(estimate, MeanEstimate)
+    assert estimate.lower <= EXPECTED_TERMINAL <= estimate.upper
+    assert estimate.variance_reduction >= least_reduction
+
+
+def test_plain_mean_reports_no_reduction():
+    results = _run()
+    estimate = results.mean(results.terminal)
+    assert estimate.mean == pytest.approx(results.terminal.mean())
+    assert estimate.variance_reduction == pytest.approx(1.0)
+
+
+def test_control_removes_all_noise_from_fixed_fraction_log_growth():
+    results = _run(paths=200)
+    growth = np.log(results.terminal / 1000.0)
+    expected = TRIALS * (
+        PROBABILITY * np.log1p(FRACTION) + (1 - PROBABILITY) * np.log1p(-FRACTION)
+    )
+    estimate = results.mean(growth, control=True)
+    # Log growth is linear in the wins up to cent rounding.
+    assert estimate.mean == pytest.approx(expected, abs=1e-4)
+    assert estimate.variance_reduction > 1e6
+
+
+def test_antithetic_paths_mirror_their_partners():
+    simulator = _simulator(probability=0.5, paths=10, trials=50, antithetic=True)
+    outcomes = simulator.outcomes()
+    np.testing.assert_array_equal(outcomes[:, 5:], ~outcomes[:, :5])
+
+
+def test_antithetic_paths_still_match_the_scalar_replay():
+    def cppi():
+        return CPPIStrategy(
+            floor_fraction=0.8,
+            multiplier=3.0,
+            initial_bankroll=1000.0,
+            payoff=1.0,
+            loss=1.0,
+            transaction_cost=0.0,
+        )
+
+    simulator = _simulator(paths=20, trials=100, antithetic=True)
+    results = simulator.evaluate_strategy(cppi(), BankRoll(1000.0))
+    for path, outcomes in enumerate(simulator.outcomes().T):
+        bankroll = BankRoll(1000.0)
+        bets = pd.DataFrame(
+            {
+                "probability": PROBABILITY,
+                "payoff": 1.0,
+                "loss": 1.0,
+                "outcome": outcomes,
+            }
+        )
+        ReplaySimulator(bets, transaction_costs=0.0).evaluate_strategy(cppi(), bankroll)
+        assert results.terminal[path] == bankroll.total_funds
+
+
+def test_control_is_centred_and_withheld_from_tilted_paths():
+    results = _run()
+    assert abs(results.control.mean()) < 3 * results.control.std() / np.sqrt(4_000)
+
+    tilted = _run(sampling_probability=0.45)
+    assert tilted.control is None
+    with pytest.raises(ValueError, match="untilted"):
+        tilted.mean(tilted.terminal, control=True)
+
+
+def test_invalid_mean_arguments_are_rejected():
+    results = _run(paths=10)
+    with pytest.raises(ValueError, match="one entry per path"):
+        results.mean(np.ones(3))
+    with pytest.raises(ValueError, match="finite"):
+        results.mean(np.full(10, np.inf))
+    with pytest.raises(ValueError, match="Confidence"):
+        results.mean(results.terminal, confidence=1.0)
+
+
+def test_antithetic_needs_an_even_number_of_paths():
+    with pytest.raises(ValueError, match="even"):
+        _simulator(paths=7, antithetic=True)
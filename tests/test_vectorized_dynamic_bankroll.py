@@ -0,0 +1,96 @@
+"""DynamicBankrollManagement stepped over many paths at once.
+
+The vectorized form is only a speedup if every path sizes exactly as its own
+scalar instance would, so each check drives both side by side and compares
+stakes and state bit for bit.
+"""
+
+import numpy as np
+import pytest
+
+from keeks.bankroll import BankRoll
+from keeks.binary_strategies import DynamicBankrollManagement
+from keeks.binary_strategies.vectorized import VectorizedDynamicBankrollManagement
+from keeks.simulators import PathSimulator
+
+
+def _strategy(**kwargs):
+    settings = {
+        "base_fraction": 0.1,
+        "payoff": 1.0,
+        "loss": 1.0,
+        "transaction_cost": 0.0,
+        "max_fraction": 0.3,
+        "min_fraction": 0.02,
+    }
+    settings.update(kwargs)
+    return DynamicBankrollManagement(**settings)
+
+
+def _drive(make, paths=30, trials=80, seed=0):
+    """Step a vectorized strategy and one scalar copy per path on random data."""
+    rng = np.random.default_rng(seed)
+    vectorized = make().vectorize(paths)
+    scalars = [make() for _ in range(paths)]
+    bankrolls = np.full(paths, 1000.0)
+    for _ in range(trials):
+        probability = np.round(rng.uniform(0.4, 0.7, paths), 2)
+        stakes = vectorized.evaluate(probability, bankrolls)
+        expected = [
+            strategy.evaluate(float(p), float(b))
+            for strategy, p, b in zip(scalars, probability, bankrolls, strict=True)
+        ]
+        np.testing.assert_array_equal(stakes, expected)
+
+        won = rng.random(paths) < probability
+        settled = (stakes > 0) & (rng.random(paths) < 0.9)
+        return_pct = np.where(won, stakes, -stakes) * rng.uniform(0.5, 1.5, paths)
+        vectorized.record_result(won, return_pct, settled)
+        for strategy, w, r, s in zip(scalars, won, return_pct, settled, strict=True):
+            if s:
+                strategy.record_result(bool(w), float(r))
+        bankrolls = np.round(bankrolls * (1 + return_pct * settled), 2)
+    return vectorized, scalars
+
+
+@pytest.mark.parametrize("window_size", [1, 3, 10, 20, 150])
+def test_stakes_match_scalar_instances(window_size):
+    vectorized, scalars = _drive(
+        lambda: _strategy(window_size=window_size), trials=max(80, window_size + 30)
+    )
+    for path, strategy in enumerate(scalars):
+        count = min(int(vectorized.recorded[path]), window_size)
+        assert vectorized.wins[path] == sum(r > 0 for r in strategy.results)
+        assert vectorized.losses[path] == sum(r < 0 for r in strategy.results)
+        assert count == len(strategy.results)
+        assert vectorized.peak_bankroll[path] == strategy.peak_bankroll
+
+
+def test_paths_start_from_the_instance_state():
+    def make():
+        strategy = _strategy(window_size=4)
+        for result in (0.05, -0.02, 0.0, -0.07, 0.03):
+            strategy.record_result(result > 0, result)
+        strategy.evaluate(0.6, 1500.0)
+        return strategy
+
+    _drive(make, trials=20)
+
+
+def test_sub_threshold_probability_does_not_track_the_bankroll():
+    sizer = _strategy(min_probability=0.6).vectorize(2)
+    stakes = sizer.evaluate(np.array([0.55, 0.65]), np.array([1000.0, 1000.0]))
+    assert stakes[0] == 0.0
+    assert stakes[1] > 0.0
+    assert sizer.started.tolist() == [False, True]
+
+
+def test_instance_is_not_modified():
+    strategy = _strategy()
+    simulator = PathSimulator(
+        payoff=1.0, loss=1.0, transaction_costs=0.0, probability=0.55, trials=50
+    )
+    simulator.evaluate_strategy(strategy, BankRoll(1000.0))
+    assert strategy.results == []
+    assert strategy.peak_bankroll is None
+    assert isinstance(strategy.vectorize(3), VectorizedDynamicBankrollManagement)